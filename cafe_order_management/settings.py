@@ -48,6 +48,11 @@ INSTALLED_APPS: list[str] = [
 """Список установленных приложений."""
 
 MIDDLEWARE: list[str] = [
+    'cafe_orders.middleware.MetricsMiddleware',
+    'cafe_orders.middleware.AdmissionControlMiddleware',
+    'cafe_orders.middleware.RequestTimingMiddleware',
+    'cafe_orders.middleware.SlowQueryMiddleware',
+    'cafe_orders.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,15 +63,85 @@ MIDDLEWARE: list[str] = [
 ]
 """Список middleware."""
 
+REQUEST_TIMING_ENABLED: bool = Config.REQUEST_TIMING_ENABLED
+"""Флаг замеров времени обработки запросов (SQL, представление, рендеринг) с заголовком Server-Timing."""
+
+REQUEST_TIMING_QUERY_BUDGET: int = Config.REQUEST_TIMING_QUERY_BUDGET
+"""Допустимое количество SQL-запросов на один HTTP-запрос; превышение логируется с уровнем WARNING."""
+
+METRICS_ENABLED: bool = Config.METRICS_ENABLED
+"""Флаг сбора метрик HTTP-запросов и эндпоинта /metrics."""
+
+METRICS_TOKEN: str = Config.METRICS_TOKEN
+"""Токен заголовка "Authorization: Bearer" для чтения /metrics без входа администратора (пустая строка — только администраторы)."""
+
+METRICS_MULTIPROCESS_DIR: str = Config.METRICS_MULTIPROCESS_DIR
+"""Каталог снимков метрик рабочих процессов (пустая строка — без агрегации между процессами)."""
+
+SLOW_QUERY_THRESHOLD_MS: float = Config.SLOW_QUERY_THRESHOLD_MS
+"""Порог медленного SQL-запроса в миллисекундах (0 — журнал медленных запросов выключен)."""
+
+SLOW_QUERY_LOG_FILE: str = Config.SLOW_QUERY_LOG_FILE
+"""JSONL-файл журнала медленных запросов (пустая строка — только буфер в памяти процесса)."""
+
+PROFILING_DIR: str = Config.PROFILING_DIR
+"""Каталог профилей запросов (пустая строка — профилирование выключено)."""
+
+PROFILING_TOKEN: str = Config.PROFILING_TOKEN
+"""Токен заголовка X-Profile, включающего профилирование отдельного запроса."""
+
+PROFILING_SAMPLE_RATE: float = Config.PROFILING_SAMPLE_RATE
+"""Доля случайно профилируемых запросов (от 0 до 1)."""
+
+PROFILING_MAX_FILES: int = Config.PROFILING_MAX_FILES
+"""Максимальное количество хранимых профилей; при сохранении нового профиля самые старые удаляются (0 — без ограничения)."""
+
+PROFILING_MAX_AGE_HOURS: float = Config.PROFILING_MAX_AGE_HOURS
+"""Срок хранения профилей в часах; более старые профили удаляются при сохранении нового (0 — без ограничения)."""
+
+API_THROTTLE_RATES: dict[str, str] = {
+    'read': Config.API_THROTTLE_READ_RATE,
+    'write': Config.API_THROTTLE_WRITE_RATE,
+    'delete_all': Config.API_THROTTLE_DELETE_ALL_RATE,
+}
+"""Лимиты запросов одного клиента к API заказов по областям ("<количество>/<период>", пустая строка — без ограничения)."""
+
+ADMISSION_MAX_IN_FLIGHT: int = Config.ADMISSION_MAX_IN_FLIGHT
+"""Максимальное количество одновременно обрабатываемых запросов процесса (0 — без ограничения)."""
+
+ADMISSION_API_MAX_IN_FLIGHT: int = Config.ADMISSION_API_MAX_IN_FLIGHT
+"""Максимальное количество одновременно обрабатываемых запросов к API (0 — общий лимит)."""
+
+COALESCING_RESULT_TTL: float = Config.COALESCING_RESULT_TTL
+"""Время в секундах, в течение которого переиспользуются результаты выручки и списка заказов (0 — только одновременные запросы)."""
+
+REPORT_JOB_WORKERS: int = Config.REPORT_JOB_WORKERS
+"""
+Количество потоков процесса, выполняющих фоновые задания отчетов. По умолчанию 0: задания выполняет только
+команда run_jobs (python manage.py run_jobs --loop). Чтобы выполнять их в процессах веб-сервера без отдельного
+исполнителя, задайте в .env REPORT_JOB_WORKERS=2 (количество потоков в каждом процессе).
+"""
+
+REPORT_JOBS_DIR: str = Config.REPORT_JOBS_DIR or str(BASE_DIR / 'report_jobs')
+"""Каталог файлов результатов фоновых заданий (выгрузок)."""
+
+INVALIDATION_POLL_INTERVAL: float = Config.INVALIDATION_POLL_INTERVAL
+"""Минимальный интервал в секундах между чтениями журнала сброса кэшей рабочим процессом (0 — при каждом запросе)."""
+
 ROOT_URLCONF: str = 'cafe_order_management.urls'
 """Корневой URLconf."""
 
 TEMPLATES: list[dict[str, str]] = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'cafe_orders.timing.TimedDjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -76,7 +151,37 @@ TEMPLATES: list[dict[str, str]] = [
         },
     },
 ]
-"""Список настроек шаблонов."""
+"""Список настроек шаблонов (скомпилированные шаблоны кэшируются загрузчиком cached.Loader)."""
+
+CACHES: dict[str, dict[str, str]] = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+"""Настройки кэша (в том числе для фрагментов списка заказов)."""
+
+LOGGING: dict = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'cafe_orders.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'cafe_orders.jobs': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+"""Настройки логирования."""
 
 WSGI_APPLICATION: str = 'cafe_order_management.wsgi.application'
 """Приложение WSGI."""
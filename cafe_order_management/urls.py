@@ -16,7 +16,10 @@ Including another URLconf
 """
 from django.urls import path, include
 
+from cafe_orders.views import metrics
+
 urlpatterns = [
     path('cafe_orders/', include('cafe_orders.urls')),
     path('api/', include('cafe_orders.api_urls')),
+    path('metrics', metrics, name='metrics'),
 ]
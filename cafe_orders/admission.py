@@ -0,0 +1,238 @@
+"""
+Ограничение нагрузки на API заказов.
+
+Два уровня защиты единственного пишущего соединения SQLite:
+    - OrderRateThrottle — ограничение частоты запросов каждого клиента к OrderViewSet по алгоритму
+      token bucket с отдельными бюджетами для чтения, записи и удаления всех заказов (ответ 429);
+    - ограничение количества одновременно обрабатываемых запросов (AdmissionControlMiddleware),
+      которое сбрасывает избыточную нагрузку ответом 503 до обращения к базе данных.
+
+Состояние хранится в памяти процесса: при нескольких рабочих процессах лимиты действуют
+в каждом процессе отдельно.
+"""
+
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from . import constants
+from .metrics import registry
+
+BucketKey = Tuple[str, str]
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Разбирает лимит в формате "<количество>/<период>" (например, "30/min").
+
+    Args:
+        rate: Лимит; период — s, sec, min, hour или day.
+
+    Returns:
+        Tuple[int, float]: Емкость корзины (допустимый всплеск) и скорость пополнения в токенах в секунду.
+
+    Raises:
+        ValueError: Если лимит задан некорректно.
+    """
+    count, _, period = rate.partition('/')
+    if not count.strip().isdigit() or period.strip() not in constants.THROTTLE_PERIODS or int(count) == 0:
+        raise ValueError(f"Некорректный лимит запросов: {rate!r}")
+    capacity: int = int(count)
+    return capacity, capacity / constants.THROTTLE_PERIODS[period.strip()]
+
+
+class TokenBucketRegistry:
+    """
+    Потокобезопасный набор корзин токенов по ключу (область лимита, клиент).
+
+    Корзина вмещает capacity токенов и пополняется со скоростью refill_rate токенов в секунду;
+    каждый запрос расходует один токен.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic) -> None:
+        """
+        Инициализирует пустой набор корзин.
+
+        Args:
+            timer: Источник монотонного времени в секундах.
+        """
+        self.timer = timer
+        self._lock: threading.Lock = threading.Lock()
+        self._buckets: Dict[BucketKey, Tuple[float, float]] = {}
+
+    def consume(self, key: BucketKey, capacity: int, refill_rate: float) -> float:
+        """
+        Расходует токен из корзины.
+
+        Args:
+            key: Область лимита и идентификатор клиента.
+            capacity: Емкость корзины.
+            refill_rate: Скорость пополнения в токенах в секунду.
+
+        Returns:
+            float: 0, если токен получен, иначе время в секундах до появления токена.
+        """
+        now: float = self.timer()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait: float = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / refill_rate
+            if len(self._buckets) > constants.THROTTLE_MAX_BUCKETS:
+                self._evict(now)
+        return wait
+
+    def _evict(self, now: float) -> None:
+        """
+        Удаляет корзины клиентов, не обращавшихся дольше THROTTLE_IDLE_SECONDS секунд.
+
+        Срок не меньше самого длинного периода лимита, поэтому такие корзины уже заполнены
+        и без потерь создаются заново при следующем запросе.
+
+        Args:
+            now: Текущее время.
+        """
+        cutoff: float = now - constants.THROTTLE_IDLE_SECONDS
+        self._buckets = {key: value for key, value in self._buckets.items() if value[1] >= cutoff}
+
+    def clear(self) -> None:
+        """
+        Удаляет все корзины.
+        """
+        with self._lock:
+            self._buckets.clear()
+
+
+buckets: TokenBucketRegistry = TokenBucketRegistry()
+"""Корзины токенов текущего процесса."""
+
+
+@lru_cache(maxsize=8)
+def parse_throttle_rates(rates: Tuple[Tuple[str, str], ...]) -> Dict[str, Tuple[int, float]]:
+    """
+    Разбирает лимиты запросов по областям; результат кэшируется для каждого набора лимитов.
+
+    Args:
+        rates: Пары (область, лимит); пустой лимит — без ограничения.
+
+    Returns:
+        Dict[str, Tuple[int, float]]: Емкость корзины и скорость пополнения по областям с ограничением.
+
+    Raises:
+        ImproperlyConfigured: Если какой-либо лимит задан некорректно.
+    """
+    parsed: Dict[str, Tuple[int, float]] = {}
+    for scope, rate in rates:
+        if not rate:
+            continue
+        try:
+            parsed[scope] = parse_rate(rate)
+        except ValueError as e:
+            raise ImproperlyConfigured(f"API_THROTTLE_RATES[{scope!r}]: {e}") from e
+    return parsed
+
+
+def get_throttle_rates() -> Dict[str, Tuple[int, float]]:
+    """
+    Возвращает разобранные лимиты запросов по областям из настройки API_THROTTLE_RATES.
+
+    Лимиты проверяются при запуске приложения (CafeOrdersConfig.ready), поэтому ошибка в настройке
+    не превращается в ответ 500 на каждый запрос.
+
+    Returns:
+        Dict[str, Tuple[int, float]]: Емкость корзины и скорость пополнения по областям (read, write,
+        delete_all); области без ограничения отсутствуют.
+
+    Raises:
+        ImproperlyConfigured: Если какой-либо лимит задан некорректно.
+    """
+    return parse_throttle_rates(tuple(sorted(getattr(settings, 'API_THROTTLE_RATES', {}).items())))
+
+
+class OrderRateThrottle(BaseThrottle):
+    """
+    Ограничение частоты запросов к OrderViewSet для каждого клиента.
+
+    Клиент определяется по пользователю (для аутентифицированных запросов) или по IP-адресу.
+    Область лимита определяется действием: delete_all — отдельный бюджет, безопасные методы —
+    чтение, остальные — запись. При превышении DRF возвращает 429 с заголовком Retry-After.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует ограничение с разобранными лимитами из настроек.
+        """
+        self.rates: Dict[str, Tuple[int, float]] = get_throttle_rates()
+        self.wait_seconds: Optional[float] = None
+
+    def get_scope(self, request: HttpRequest, view: object) -> str:
+        """
+        Определяет область лимита запроса.
+
+        Args:
+            request: Объект запроса DRF.
+            view: Представление.
+
+        Returns:
+            str: Область лимита (read, write или delete_all).
+        """
+        action: Optional[str] = getattr(view, 'action', None)
+        if action in constants.THROTTLE_ACTION_SCOPES:
+            return constants.THROTTLE_ACTION_SCOPES[action]
+        return constants.THROTTLE_SCOPE_READ if request.method in SAFE_METHODS else constants.THROTTLE_SCOPE_WRITE
+
+    def allow_request(self, request: HttpRequest, view: object) -> bool:
+        """
+        Расходует токен клиента в области лимита запроса.
+
+        Args:
+            request: Объект запроса DRF.
+            view: Представление.
+
+        Returns:
+            bool: True, если запрос разрешен.
+        """
+        scope: str = self.get_scope(request, view)
+        if scope not in self.rates:
+            return True
+        capacity, refill_rate = self.rates[scope]
+        user = getattr(request, 'user', None)
+        ident: str = f'user:{user.pk}' if user is not None and user.is_authenticated else self.get_ident(request)
+        self.wait_seconds = buckets.consume((scope, ident), capacity, refill_rate)
+        if self.wait_seconds:
+            registry.inc('cafe_requests_rejected_total', {'reason': 'throttled', 'scope': scope})
+            return False
+        return True
+
+    def wait(self) -> Optional[float]:
+        """
+        Возвращает рекомендуемое время ожидания перед повтором запроса.
+
+        Returns:
+            Optional[float]: Время в секундах.
+        """
+        return self.wait_seconds
+
+
+def create_slots(limit: int) -> Optional[threading.BoundedSemaphore]:
+    """
+    Создает семафор слотов одновременной обработки запросов.
+
+    Args:
+        limit: Количество слотов (0 — без ограничения).
+
+    Returns:
+        Optional[threading.BoundedSemaphore]: Семафор или None.
+    """
+    return threading.BoundedSemaphore(limit) if limit > 0 else None
@@ -0,0 +1,284 @@
+"""
+Аналитика меню: популярные блюда, загрузка по часам и дням недели, оборачиваемость столов.
+
+Статистика считается сгруппированными SQL-запросами по дню, часу, блюду и столу отдельно
+по рабочим и архивным таблицам заказов. Результаты за закрытые (прошедшие) дни сохраняются
+в DailyAnalytics, поэтому при каждом запросе заново считается текущий день и только те закрытые
+дни, заказы которых изменились после сохранения статистики (updated_at позже computed_at) или
+были удалены (Order.delete и порционное удаление сбрасывают статистику своих дней). Заказы,
+загруженные задним числом с прежней датой изменения, так не обнаруживаются: после такой загрузки
+сохраненную статистику нужно сбросить функцией clear_analytics_cache.
+
+Время занятости стола — время от создания оплаченного заказа до его последнего изменения
+(как правило, оплаты); отдельной отметки об освобождении стола в модели нет.
+"""
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from django.db.models import Count, DecimalField, DurationField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from . import constants
+from .exports import parse_export_date
+from .models import ArchivedOrder, ArchivedOrderItem, DailyAnalytics, Order, OrderItem
+from .reports import get_item_revenue_expression
+
+
+def parse_analytics_params(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Разбирает и валидирует параметры аналитики (период и количество популярных блюд).
+
+    По умолчанию период — последние ANALYTICS_DEFAULT_DAYS дней, включая текущий.
+
+    Args:
+        params: Словарь параметров (GET-параметры запроса).
+
+    Returns:
+        Dict[str, Any]: Словарь с ключами 'date_from', 'date_to', 'top'.
+
+    Raises:
+        ValueError: Если какой-либо из параметров некорректен.
+    """
+    date_to_raw: str = (params.get('date_to') or '').strip()
+    date_from_raw: str = (params.get('date_from') or '').strip()
+    date_to: date = parse_export_date(date_to_raw) if date_to_raw else timezone.localdate()
+    date_from: date = (parse_export_date(date_from_raw) if date_from_raw
+                       else date_to - timedelta(days=constants.ANALYTICS_DEFAULT_DAYS - 1))
+    if date_from > date_to:
+        raise ValueError(constants.MESSAGES['export_date_range_invalid'])
+    if (date_to - date_from).days >= constants.ANALYTICS_MAX_DAYS:
+        raise ValueError(constants.MESSAGES['analytics_range_too_long'].format(max_days=constants.ANALYTICS_MAX_DAYS))
+
+    top_raw: str = (params.get('top') or '').strip()
+    top: int = int(top_raw) if top_raw.isdigit() else constants.ANALYTICS_DEFAULT_TOP_DISHES
+    if top_raw and not (top_raw.isdigit() and 1 <= top <= constants.ANALYTICS_MAX_TOP_DISHES):
+        raise ValueError(constants.MESSAGES['analytics_top_invalid'].format(
+            max_top=constants.ANALYTICS_MAX_TOP_DISHES))
+
+    return {'date_from': date_from, 'date_to': date_to, 'top': top}
+
+
+def iter_days(date_from: date, date_to: date) -> Iterator[date]:
+    """
+    Итерирует дни периода по порядку.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+
+    Yields:
+        date: Очередной день.
+    """
+    for offset in range((date_to - date_from).days + 1):
+        yield date_from + timedelta(days=offset)
+
+
+def get_day_bounds(date_from: date, date_to: date) -> Tuple[datetime, datetime]:
+    """
+    Переводит границы периода в моменты времени текущего часового пояса.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+
+    Returns:
+        Tuple[datetime, datetime]: Начало первого дня и начало дня, следующего за последним.
+    """
+    return (timezone.make_aware(datetime.combine(date_from, time.min)),
+            timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min)))
+
+
+def compute_days(date_from: date, date_to: date) -> Dict[date, Dict[str, Any]]:
+    """
+    Вычисляет статистику по дням периода сгруппированными запросами к рабочим и архивным таблицам.
+
+    Выручка учитывает только оплаченные заказы и цены, зафиксированные в позициях.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+
+    Returns:
+        Dict[date, Dict[str, Any]]: Статистика за каждый день периода (включая дни без заказов):
+            'orders', 'revenue', заказы по часам ('hours'), блюда ('dishes'), заказы по столам ('tables'),
+            количество оплаченных заказов и суммарное время занятости по столам ('occupancy') и версия
+            формата ('version').
+    """
+    days: Dict[date, Dict[str, Any]] = {
+        day: {'version': constants.ANALYTICS_DATA_VERSION, 'orders': 0, 'revenue': '0', 'hours': {}, 'dishes': {},
+              'tables': {}, 'occupancy': {}}
+        for day in iter_days(date_from, date_to)
+    }
+    start, end = get_day_bounds(date_from, date_to)
+    archived_revenue = ExpressionWrapper(F('unit_price') * F('quantity'), output_field=DecimalField())
+    occupancy = ExpressionWrapper(F('updated_at') - F('created_at'), output_field=DurationField())
+    paid: Q = Q(order__status=constants.REVENUE_CALCULATION_STATUS)
+    cents: Decimal = Decimal(10) ** -constants.DISH_PRICE_DECIMAL_PLACES
+
+    for order_model, item_model, dish_name, revenue in (
+            (Order, OrderItem, 'dish__name', get_item_revenue_expression()),
+            (ArchivedOrder, ArchivedOrderItem, 'dish_name', archived_revenue)):
+        orders = (order_model.objects.filter(created_at__gte=start, created_at__lt=end)
+                  .annotate(day=TruncDate('created_at')).order_by())
+        for row in orders.annotate(hour=ExtractHour('created_at')).values('day', 'hour').annotate(count=Count('id')):
+            data: Dict[str, Any] = days[row['day']]
+            data['orders'] += row['count']
+            data['hours'][str(row['hour'])] = data['hours'].get(str(row['hour']), 0) + row['count']
+        for row in orders.values('day', 'table_number').annotate(count=Count('id')):
+            tables: Dict[str, int] = days[row['day']]['tables']
+            tables[str(row['table_number'])] = tables.get(str(row['table_number']), 0) + row['count']
+        for row in (orders.filter(status=constants.REVENUE_CALCULATION_STATUS).values('day', 'table_number')
+                    .annotate(count=Count('id'), duration=Sum(occupancy))):
+            table: Dict[str, Any] = days[row['day']]['occupancy'].setdefault(
+                str(row['table_number']), {'orders': 0, 'seconds': 0})
+            table['orders'] += row['count']
+            table['seconds'] += int(row['duration'].total_seconds())
+
+        items = (item_model.objects.filter(order__created_at__gte=start, order__created_at__lt=end)
+                 .annotate(day=TruncDate('order__created_at')).order_by()
+                 .values('day', name=F(dish_name))
+                 .annotate(portions=Sum('quantity'), revenue=Sum(revenue, filter=paid)))
+        for row in items:
+            data = days[row['day']]
+            dish: Dict[str, Any] = data['dishes'].setdefault(row['name'], {'quantity': 0, 'revenue': '0'})
+            dish_revenue: Decimal = Decimal(str(row['revenue'] or 0)).quantize(cents)
+            dish['quantity'] += row['portions']
+            dish['revenue'] = str(Decimal(dish['revenue']) + dish_revenue)
+            data['revenue'] = str(Decimal(data['revenue']) + dish_revenue)
+    return days
+
+
+def get_stale_days(date_from: date, date_to: date) -> List[date]:
+    """
+    Возвращает закрытые дни периода, заказы которых изменились после сохранения их статистики.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+
+    Returns:
+        List[date]: Дни, сохраненную статистику которых нужно вычислить заново.
+    """
+    start, end = get_day_bounds(date_from, date_to)
+    computed_at = DailyAnalytics.objects.filter(day=OuterRef('day')).values('computed_at')[:1]
+    return list(
+        Order.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=TruncDate('created_at')).filter(updated_at__gt=Subquery(computed_at))
+        .order_by().values_list('day', flat=True).distinct()
+    )
+
+
+def get_daily_analytics(date_from: date, date_to: date) -> Dict[date, Dict[str, Any]]:
+    """
+    Возвращает статистику по дням периода, вычисляя заново только текущий день и закрытые дни
+    без сохраненной статистики, с изменившимися заказами или в устаревшем формате.
+
+    Такие закрытые дни вычисляются одним набором запросов и сохраняются в DailyAnalytics.
+    Дни после текущего в результат не входят.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+
+    Returns:
+        Dict[date, Dict[str, Any]]: Статистика по дням (см. compute_days).
+    """
+    today: date = timezone.localdate()
+    closed_to: date = min(date_to, today - timedelta(days=1))
+    daily: Dict[date, Dict[str, Any]] = {}
+    if date_from <= closed_to:
+        daily.update(DailyAnalytics.objects.filter(day__gte=date_from, day__lte=closed_to).values_list('day', 'data'))
+        stale: List[date] = get_stale_days(date_from, closed_to) + [
+            day for day, data in daily.items() if data.get('version') != constants.ANALYTICS_DATA_VERSION]
+        if stale:
+            DailyAnalytics.objects.filter(day__in=stale).delete()
+            for day in stale:
+                daily.pop(day, None)
+        missing: List[date] = [day for day in iter_days(date_from, closed_to) if day not in daily]
+        if missing:
+            computed: Dict[date, Dict[str, Any]] = compute_days(missing[0], missing[-1])
+            DailyAnalytics.objects.bulk_create(
+                [DailyAnalytics(day=day, data=computed[day]) for day in missing], ignore_conflicts=True)
+            daily.update((day, computed[day]) for day in missing)
+    if date_from <= today <= date_to:
+        daily.update(compute_days(today, today))
+    return daily
+
+
+def build_analytics(date_from: date, date_to: date,
+                    top: int = constants.ANALYTICS_DEFAULT_TOP_DISHES) -> Dict[str, Any]:
+    """
+    Собирает аналитику меню за период из статистики по дням.
+
+    Args:
+        date_from: Первый день периода включительно.
+        date_to: Последний день периода включительно.
+        top: Количество популярных блюд в ответе.
+
+    Returns:
+        Dict[str, Any]: Период, количество заказов и выручка, популярные блюда по количеству порций
+            ('top_dishes'), заказы по часам ('hourly'), заказы по дням недели и часам ('heatmap',
+            с понедельника) и по столам ('tables'): количество заказов, число заказов в день и среднее
+            время занятости стола оплаченным заказом в минутах (None, если оплаченных заказов не было).
+    """
+    daily: Dict[date, Dict[str, Any]] = get_daily_analytics(date_from, date_to)
+    dish_quantities: Counter = Counter()
+    dish_revenue: Dict[str, Decimal] = {}
+    table_orders: Counter = Counter()
+    table_paid: Counter = Counter()
+    table_seconds: Counter = Counter()
+    heatmap: List[List[int]] = [[0] * 24 for _ in range(7)]
+    orders: int = 0
+    revenue: Decimal = Decimal('0')
+    for day, data in daily.items():
+        orders += data['orders']
+        revenue += Decimal(data['revenue'])
+        for hour, count in data['hours'].items():
+            heatmap[day.weekday()][int(hour)] += count
+        for name, dish in data['dishes'].items():
+            dish_quantities[name] += dish['quantity']
+            dish_revenue[name] = dish_revenue.get(name, Decimal('0')) + Decimal(dish['revenue'])
+        table_orders.update(data['tables'])
+        for table, occupancy in data['occupancy'].items():
+            table_paid[table] += occupancy['orders']
+            table_seconds[table] += occupancy['seconds']
+
+    days_count: int = max(len(daily), 1)
+    top_dishes: List[str] = sorted(dish_quantities, key=lambda name: (-dish_quantities[name], name))[:top]
+    return {
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'orders': orders,
+        'revenue': str(revenue),
+        'top_dishes': [{'dish': name, 'quantity': dish_quantities[name], 'revenue': str(dish_revenue[name])}
+                       for name in top_dishes],
+        'hourly': [sum(weekday[hour] for weekday in heatmap) for hour in range(24)],
+        'heatmap': heatmap,
+        'tables': [{'table_number': int(table), 'orders': count, 'orders_per_day': round(count / days_count, 2),
+                    'avg_occupancy_minutes': (round(table_seconds[table] / table_paid[table] / 60, 1)
+                                              if table_paid[table] else None)}
+                   for table, count in sorted(table_orders.items(), key=lambda item: int(item[0]))],
+    }
+
+
+def clear_analytics_cache(date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+    """
+    Удаляет сохраненную статистику закрытых дней, чтобы она была вычислена заново при следующем запросе.
+
+    Args:
+        date_from: Первый день периода включительно (опционально).
+        date_to: Последний день периода включительно (опционально).
+
+    Returns:
+        int: Количество удаленных дней.
+    """
+    queryset = DailyAnalytics.objects.all()
+    if date_from:
+        queryset = queryset.filter(day__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(day__lte=date_to)
+    return queryset.delete()[0]
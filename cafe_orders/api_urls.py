@@ -7,11 +7,20 @@ URL-конфигурация для API приложения cafe_orders.
 from typing import List, Union
 from django.urls import path, include, URLPattern, URLResolver
 from rest_framework.routers import DefaultRouter
-from .views import OrderViewSet
+from .views import OrderViewSet, kitchen_queue_api, menu_analytics, menu_import, menu_prices, report_job_detail, \
+    report_job_result, report_jobs, slow_queries
 
 router: DefaultRouter = DefaultRouter()
 router.register(r'orders', OrderViewSet, basename='order')
 
 urlpatterns: List[Union[URLPattern, URLResolver]] = [
+    path('slow-queries/', slow_queries, name='slow-queries'),
+    path('kitchen-queue/', kitchen_queue_api, name='kitchen-queue'),
+    path('analytics/', menu_analytics, name='analytics'),
+    path('menu/import/', menu_import, name='menu-import'),
+    path('menu/prices/', menu_prices, name='menu-prices'),
+    path('jobs/', report_jobs, name='report-jobs'),
+    path('jobs/<int:job_id>/', report_job_detail, name='report-job-detail'),
+    path('jobs/<int:job_id>/result/', report_job_result, name='report-job-result'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -6,4 +6,14 @@ class CafeOrdersConfig(AppConfig):
     Конфигурация приложения 'cafe_orders'.
     """
     default_auto_field: str = 'django.db.models.BigAutoField'
-    name: str = 'cafe_orders'
\ No newline at end of file
+    name: str = 'cafe_orders'
+
+    def ready(self) -> None:
+        """
+        Проверяет настройки, ошибка в которых иначе проявилась бы только при обработке запросов.
+
+        Raises:
+            ImproperlyConfigured: Если лимиты запросов API_THROTTLE_RATES заданы некорректно.
+        """
+        from .admission import get_throttle_rates
+        get_throttle_rates()
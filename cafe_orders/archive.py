@@ -0,0 +1,116 @@
+"""
+Архивация оплаченных заказов.
+
+Оплаченные заказы старше заданной границы переносятся из рабочих таблиц Order/OrderItem
+в ArchivedOrder/ArchivedOrderItem. Перенос выполняется порциями, каждая порция — в
+отдельной короткой транзакции, поэтому архивация не блокирует запись надолго и может
+безопасно запускаться по расписанию (повторный запуск просто продолжит с того же места).
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List, Optional
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from . import constants
+from .detail_cache import invalidate_order_details
+from .models import Order, OrderItem, ArchivedOrder, ArchivedOrderItem, OrderEvent, OrderTombstone
+
+
+def get_archive_cutoff(days: int = constants.ARCHIVE_AFTER_DAYS) -> datetime:
+    """
+    Возвращает момент времени, заказы старше которого подлежат архивации.
+
+    Args:
+        days: Количество дней, в течение которых заказ остается в рабочих таблицах.
+
+    Returns:
+        datetime: Граница архивации.
+
+    Raises:
+        ValueError: Если количество дней отрицательно.
+    """
+    if days < 0:
+        raise ValueError(constants.MESSAGES['archive_days_invalid'])
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_orders_chunk(orders: List[Order]) -> int:
+    """
+    Переносит порцию заказов в архив.
+
+    Должна вызываться внутри транзакции, в которой эта порция была прочитана.
+
+    Args:
+        orders: Заказы с предзагруженными позициями и блюдами.
+
+    Returns:
+        int: Количество перенесенных заказов.
+    """
+    archived_orders: List[ArchivedOrder] = []
+    archived_items: List[ArchivedOrderItem] = []
+    for order in orders:
+        items: List[OrderItem] = list(order.items.all())
+        archived_orders.append(ArchivedOrder(
+            id=order.id,
+            table_number=order.table_number,
+            status=order.status,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            total_price=sum((item.price for item in items), Decimal('0')),
+        ))
+        archived_items.extend(
+            ArchivedOrderItem(
+                order_id=order.id,
+                dish_id=item.dish_id,
+                dish_name=item.dish.name,
+                quantity=item.quantity,
+                unit_price=item.unit_price if item.unit_price is not None else item.dish.price,
+            )
+            for item in items
+        )
+
+    order_ids: List[int] = [order.id for order in orders]
+    ArchivedOrder.objects.bulk_create(archived_orders)
+    ArchivedOrderItem.objects.bulk_create(archived_items)
+    OrderItem.objects.filter(order_id__in=order_ids).delete()
+    Order.objects.filter(id__in=order_ids).delete()
+    OrderTombstone.record(order_ids, constants.TOMBSTONE_REASON_ARCHIVED)
+    OrderEvent.record_many(order_ids, constants.ORDER_EVENT_ARCHIVED)
+    invalidate_order_details(order_ids)
+    return len(orders)
+
+
+def archive_paid_orders(cutoff: Optional[datetime] = None, chunk_size: int = constants.ARCHIVE_CHUNK_SIZE,
+                        progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Переносит в архив оплаченные заказы, созданные раньше границы.
+
+    Функция идемпотентна и подходит для периодического запуска (cron, планировщик задач).
+
+    Args:
+        cutoff: Граница архивации (по умолчанию — ARCHIVE_AFTER_DAYS дней назад).
+        chunk_size: Количество заказов, переносимых в одной транзакции.
+        progress: Необязательная функция, вызываемая после каждой порции с общим числом перенесенных заказов.
+
+    Returns:
+        int: Общее количество перенесенных заказов.
+    """
+    if cutoff is None:
+        cutoff = get_archive_cutoff()
+    items_prefetch: Prefetch = Prefetch('items', queryset=OrderItem.objects.select_related('dish'))
+    archived: int = 0
+    while True:
+        with transaction.atomic():
+            orders: List[Order] = list(
+                Order.objects.filter(status=constants.ARCHIVE_STATUS, created_at__lt=cutoff)
+                .order_by('id').prefetch_related(items_prefetch)[:chunk_size]
+            )
+            if not orders:
+                return archived
+            archived += archive_orders_chunk(orders)
+        if progress is not None:
+            progress(archived)
@@ -0,0 +1,351 @@
+"""
+Бенчмарки HTML-представлений и API заказов.
+
+Для каждого размера данных база заполняется генератором datagen, после чего каждый
+сценарий выполняется заданное число раз через тестовый клиент Django. Для сценария
+фиксируются перцентили задержки и количество SQL-запросов; результаты можно сохранить
+как эталон и сравнивать с ним последующие прогоны.
+"""
+
+import json
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import constants
+from .datagen import generate_dataset
+from .models import Dish, Order
+
+
+class BenchmarkCase:
+    """
+    Сценарий бенчмарка: один HTTP-запрос с необязательной подготовкой и очисткой.
+
+    Attributes:
+        name (str): Имя сценария.
+        run (Callable): Выполняет измеряемый запрос; принимает клиент и контекст.
+        setup (Callable): Необязательная подготовка перед каждым повтором (не измеряется).
+        teardown (Callable): Необязательная очистка после каждого повтора (не измеряется).
+        destructive (bool): Сценарий изменяет данные необратимо и выполняется последним, один раз.
+    """
+
+    def __init__(self, name: str, run: Callable[[Client, Dict[str, Any]], Any],
+                 setup: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 teardown: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 destructive: bool = False) -> None:
+        """
+        Инициализирует сценарий.
+
+        Args:
+            name: Имя сценария.
+            run: Функция, выполняющая измеряемый запрос.
+            setup: Подготовка перед каждым повтором.
+            teardown: Очистка после каждого повтора.
+            destructive: Признак необратимого изменения данных.
+        """
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.destructive = destructive
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """
+    Вычисляет перцентиль методом ближайшего ранга.
+
+    Args:
+        values: Значения выборки.
+        rank: Перцентиль от 0 до 100.
+
+    Returns:
+        float: Значение перцентиля (0.0 для пустой выборки).
+    """
+    if not values:
+        return 0.0
+    ordered: List[float] = sorted(values)
+    index: int = max(0, math.ceil(rank / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def build_context() -> Dict[str, Any]:
+    """
+    Собирает идентификаторы, необходимые сценариям (активный заказ, блюдо, свободный стол).
+
+    Returns:
+        Dict[str, Any]: Контекст сценариев.
+    """
+    active_order: Optional[Order] = Order.objects.filter(status__in=['pending', 'ready']).order_by('id').first()
+    any_order: Optional[Order] = active_order or Order.objects.order_by('id').first()
+    dish: Optional[Dish] = Dish.active.order_by('id').first()
+    occupied = set(Order.objects.filter(status__in=['pending', 'ready']).values_list('table_number', flat=True))
+    free_tables: List[int] = [table for table in constants.TABLE_NUMBERS if table not in occupied]
+    return {
+        'order_id': any_order.id if any_order else 0,
+        'order_table': any_order.table_number if any_order else constants.MIN_TABLE_NUMBER,
+        'dish_id': dish.id if dish else 0,
+        'dish_name': dish.name if dish else '',
+        'free_table': free_tables[0] if free_tables else constants.MIN_TABLE_NUMBER,
+        'max_order_id': Order.objects.order_by('-id').values_list('id', flat=True).first() or 0,
+    }
+
+
+def remove_created_orders(context: Dict[str, Any]) -> None:
+    """
+    Удаляет заказы, созданные сценарием после сбора контекста.
+
+    Args:
+        context: Контекст сценариев.
+    """
+    Order.objects.filter(id__gt=context['max_order_id']).delete()
+
+
+def create_disposable_order(context: Dict[str, Any]) -> None:
+    """
+    Создает заказ, который будет удален измеряемым запросом.
+
+    Args:
+        context: Контекст сценариев.
+    """
+    order: Order = Order.objects.create(table_number=context['free_table'], status='paid')
+    order.items.create(dish_id=context['dish_id'], quantity=1)
+    context['disposable_order_id'] = order.id
+
+
+def update_order_post_data(context: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Формирует данные формсета для изменения количества в позициях заказа.
+
+    Args:
+        context: Контекст сценариев.
+
+    Returns:
+        Dict[str, str]: POST-данные формсета.
+    """
+    items = list(Order.objects.get(id=context['order_id']).items.order_by('id').values('id', 'dish_id', 'quantity'))
+    data: Dict[str, str] = {
+        'orderitems-TOTAL_FORMS': str(len(items)),
+        'orderitems-INITIAL_FORMS': str(len(items)),
+        'orderitems-MIN_NUM_FORMS': '0',
+        'orderitems-MAX_NUM_FORMS': '1000',
+    }
+    for index, item in enumerate(items):
+        data[f'orderitems-{index}-id'] = str(item['id'])
+        data[f'orderitems-{index}-dish'] = str(item['dish_id'])
+        data[f'orderitems-{index}-quantity'] = str(item['quantity'] % 4 + 1)
+    return data
+
+
+def consume(response: Any) -> Any:
+    """
+    Дочитывает потоковый ответ, чтобы измерение включало формирование всего тела.
+
+    Args:
+        response: HTTP-ответ.
+
+    Returns:
+        Any: Тот же ответ.
+    """
+    if getattr(response, 'streaming', False):
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def get_cases() -> List[BenchmarkCase]:
+    """
+    Возвращает список сценариев для всех HTML-представлений заказов и действий OrderViewSet.
+
+    Returns:
+        List[BenchmarkCase]: Сценарии в порядке выполнения.
+    """
+    api_list: str = reverse('order-list')
+    return [
+        BenchmarkCase('order_list', lambda c, ctx: c.get(reverse('order_list'))),
+        BenchmarkCase('order_list_filtered',
+                      lambda c, ctx: c.get(reverse('order_list'), {'status': 'в ожидании'})),
+        BenchmarkCase('add_order_get', lambda c, ctx: c.get(reverse('add_order'))),
+        BenchmarkCase('add_order_post', lambda c, ctx: c.post(reverse('add_order'), {
+            'table_number': str(ctx['free_table']),
+            'orderitems-TOTAL_FORMS': '1', 'orderitems-INITIAL_FORMS': '0',
+            'orderitems-MIN_NUM_FORMS': '0', 'orderitems-MAX_NUM_FORMS': '1000',
+            'orderitems-0-dish': str(ctx['dish_id']), 'orderitems-0-quantity': '2',
+        }), teardown=remove_created_orders),
+        BenchmarkCase('update_order_get',
+                      lambda c, ctx: c.get(reverse('update_order', kwargs={'order_id': ctx['order_id']}))),
+        BenchmarkCase('update_order_post',
+                      lambda c, ctx: c.post(reverse('update_order', kwargs={'order_id': ctx['order_id']}),
+                                            ctx['update_order_data']),
+                      setup=lambda ctx: ctx.update(update_order_data=update_order_post_data(ctx))),
+        BenchmarkCase('calculate_revenue', lambda c, ctx: c.get(reverse('calculate_revenue'))),
+        BenchmarkCase('dish_list', lambda c, ctx: c.get(reverse('dish_list'))),
+        BenchmarkCase('api_list', lambda c, ctx: c.get(api_list)),
+        BenchmarkCase('api_list_filtered', lambda c, ctx: c.get(api_list, {'status': 'готово'})),
+        BenchmarkCase('api_retrieve', lambda c, ctx: c.get(reverse('order-detail', args=[ctx['order_id']]))),
+        BenchmarkCase('api_create', lambda c, ctx: c.post(api_list, {
+            'table_number': ctx['free_table'], 'status': 'pending',
+            'items': [{'dish': ctx['dish_name'], 'quantity': 2}],
+        }, content_type='application/json'), teardown=remove_created_orders),
+        BenchmarkCase('api_partial_update', lambda c, ctx: c.patch(
+            reverse('order-detail', args=[ctx['order_id']]), {'status': 'ready'},
+            content_type='application/json')),
+        BenchmarkCase('api_update', lambda c, ctx: c.put(
+            reverse('order-detail', args=[ctx['order_id']]), {
+                'table_number': ctx['order_table'], 'status': 'pending',
+                'items': [{'dish': ctx['dish_name'], 'quantity': 1}],
+            }, content_type='application/json')),
+        BenchmarkCase('api_destroy',
+                      lambda c, ctx: c.delete(reverse('order-detail', args=[ctx['disposable_order_id']])),
+                      setup=create_disposable_order),
+        BenchmarkCase('api_search', lambda c, ctx: c.get(reverse('order-search'), {'q': 'pending'})),
+        BenchmarkCase('api_export', lambda c, ctx: consume(c.get(reverse('order-export'), {'status': 'paid'}))),
+        BenchmarkCase('api_archive', lambda c, ctx: c.post(reverse('order-archive'), {'days': 0},
+                                                           content_type='application/json'),
+                      destructive=True),
+        BenchmarkCase('api_delete_all', lambda c, ctx: c.post(reverse('order-delete-all')), destructive=True),
+    ]
+
+
+def measure_case(case: BenchmarkCase, client: Client, context: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    Выполняет сценарий несколько раз и собирает статистику задержек и SQL-запросов.
+
+    Args:
+        case: Сценарий.
+        client: Тестовый клиент Django.
+        context: Контекст сценариев.
+        repeat: Количество повторов.
+
+    Returns:
+        Dict[str, Any]: Перцентили и среднее задержки в миллисекундах, максимальное число запросов и статусы ответа.
+    """
+    timings: List[float] = []
+    query_counts: List[int] = []
+    status_codes: set = set()
+    for _ in range(1 if case.destructive else repeat):
+        if case.setup is not None:
+            case.setup(context)
+        with CaptureQueriesContext(connection) as queries:
+            started: float = time.perf_counter()
+            response = case.run(client, context)
+            timings.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries.captured_queries))
+        status_codes.add(response.status_code)
+        if case.teardown is not None:
+            case.teardown(context)
+
+    result: Dict[str, Any] = {
+        f'p{rank}_ms': round(percentile(timings, rank), 3) for rank in constants.BENCHMARK_PERCENTILES
+    }
+    result['mean_ms'] = round(sum(timings) / len(timings), 3)
+    result['queries'] = max(query_counts)
+    result['status_codes'] = sorted(status_codes)
+    return result
+
+
+def run_benchmarks(sizes: Dict[str, Dict[str, int]], repeat: int = constants.BENCHMARK_REPEAT,
+                   seed: int = constants.BENCHMARK_SEED, case_names: Optional[Iterable[str]] = None,
+                   reset: Optional[Callable[[], None]] = None,
+                   progress: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Прогоняет сценарии на каждом размере данных.
+
+    Перед каждым размером база очищается функцией reset и заполняется генератором данных.
+    Разрушающие сценарии выполняются в конце каждого размера.
+
+    Args:
+        sizes: Размеры данных: имя -> параметры generate_dataset.
+        repeat: Количество повторов каждого сценария.
+        seed: Начальное значение генератора данных.
+        case_names: Имена сценариев для запуска (по умолчанию все).
+        reset: Функция очистки базы данных перед заполнением.
+        progress: Необязательная функция, вызываемая после каждого сценария (размер, сценарий, результат).
+
+    Returns:
+        Dict[str, Any]: Результаты вида {размер: {сценарий: статистика}}.
+
+    Raises:
+        ValueError: Если указано неизвестное имя сценария.
+    """
+    cases: List[BenchmarkCase] = get_cases()
+    if case_names is not None:
+        selected: set = set(case_names)
+        unknown: set = selected - {case.name for case in cases}
+        if unknown:
+            raise ValueError(f"Неизвестные сценарии: {', '.join(sorted(unknown))}.")
+        cases = [case for case in cases if case.name in selected]
+    cases.sort(key=lambda case: case.destructive)
+
+    results: Dict[str, Any] = {}
+    for size_name, params in sizes.items():
+        if reset is not None:
+            reset()
+        generate_dataset(seed=seed, **params)
+        context: Dict[str, Any] = build_context()
+        client: Client = Client()
+        results[size_name] = {}
+        for case in cases:
+            results[size_name][case.name] = measure_case(case, client, context, repeat)
+            if progress is not None:
+                progress(size_name, case.name, results[size_name][case.name])
+    return results
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                          tolerance: float = constants.BENCHMARK_TOLERANCE) -> List[str]:
+    """
+    Сравнивает результаты с эталоном и возвращает описания регрессий.
+
+    Регрессией считается рост медианы задержки больше чем на tolerance или рост числа SQL-запросов.
+
+    Args:
+        results: Результаты текущего прогона.
+        baseline: Эталонные результаты.
+        tolerance: Допустимый относительный рост медианы задержки.
+
+    Returns:
+        List[str]: Описания регрессий (пустой список, если регрессий нет).
+    """
+    regressions: List[str] = []
+    for size_name, cases in results.items():
+        for case_name, current in cases.items():
+            reference: Optional[Dict[str, Any]] = baseline.get(size_name, {}).get(case_name)
+            if reference is None:
+                continue
+            if current['p50_ms'] > reference['p50_ms'] * (1 + tolerance):
+                regressions.append(f"{size_name}/{case_name}: p50 {reference['p50_ms']} -> {current['p50_ms']} мс")
+            if current['queries'] > reference['queries']:
+                regressions.append(f"{size_name}/{case_name}: SQL-запросов {reference['queries']} -> "
+                                   f"{current['queries']}")
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """
+    Загружает результаты бенчмарка из JSON-файла.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Dict[str, Any]: Результаты бенчмарка.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    """
+    Сохраняет результаты бенчмарка в JSON-файл.
+
+    Args:
+        results: Результаты бенчмарка.
+        path: Путь к файлу.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2, sort_keys=True)
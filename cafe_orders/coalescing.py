@@ -0,0 +1,154 @@
+"""
+Объединение одновременных одинаковых запросов (single-flight).
+
+Если несколько запросов одновременно запрашивают один и тот же дорогой результат (выручку,
+список заказов с одинаковыми фильтрами), вычисление выполняет только первый из них, а остальные
+ждут и получают его результат. При COALESCING_RESULT_TTL > 0 результат дополнительно
+переиспользуется указанное количество секунд, поэтому данные могут отставать на это время.
+
+Состояние хранится в памяти процесса.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+from . import constants
+from .metrics import registry
+
+CallKey = Tuple[str, Hashable]
+
+
+class InFlightCall:
+    """
+    Выполняющееся вычисление, результат которого ожидают другие запросы.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует вычисление.
+        """
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Потокобезопасный реестр выполняющихся вычислений и кратковременно сохраненных результатов.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic) -> None:
+        """
+        Инициализирует пустой реестр.
+
+        Args:
+            timer: Источник монотонного времени в секундах.
+        """
+        self.timer = timer
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[CallKey, InFlightCall] = {}
+        self._results: Dict[CallKey, Tuple[float, Any]] = {}
+
+    def do(self, name: str, params: Hashable, func: Callable[[], Any], ttl: float = 0.0) -> Any:
+        """
+        Возвращает результат вычисления, выполняя его не более одного раза одновременно.
+
+        Исключение вычисления передается всем ожидающим запросам и не сохраняется. Если вычисление
+        не завершилось за COALESCING_WAIT_TIMEOUT секунд, ожидающий запрос выполняет его сам.
+
+        Args:
+            name: Имя вычисления (используется в метриках).
+            params: Параметры, от которых зависит результат.
+            func: Функция вычисления.
+            ttl: Время в секундах, в течение которого результат переиспользуется (0 — только
+                для одновременных запросов).
+
+        Returns:
+            Any: Результат вычисления.
+        """
+        key: CallKey = (name, params)
+        with self._lock:
+            cached: Optional[Tuple[float, Any]] = self._results.get(key)
+            if cached is not None and cached[0] > self.timer():
+                registry.inc('cafe_coalesced_requests_total', {'name': name, 'result': 'cached'})
+                return cached[1]
+            call: Optional[InFlightCall] = self._calls.get(key)
+            leader: bool = call is None
+            if leader:
+                call = self._calls[key] = InFlightCall()
+
+        if not leader:
+            if not call.done.wait(constants.COALESCING_WAIT_TIMEOUT):
+                return func()
+            registry.inc('cafe_coalesced_requests_total', {'name': name, 'result': 'shared'})
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        registry.inc('cafe_coalesced_requests_total', {'name': name, 'result': 'computed'})
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and ttl > 0:
+                    self._store(key, call.result, ttl)
+            call.done.set()
+        return call.result
+
+    def _store(self, key: CallKey, result: Any, ttl: float) -> None:
+        """
+        Сохраняет результат, удаляя устаревшие результаты при превышении COALESCING_MAX_RESULTS.
+
+        Args:
+            key: Ключ вычисления.
+            result: Результат.
+            ttl: Время хранения в секундах.
+        """
+        now: float = self.timer()
+        if len(self._results) >= constants.COALESCING_MAX_RESULTS:
+            self._results = {k: v for k, v in self._results.items() if v[0] > now}
+        if len(self._results) < constants.COALESCING_MAX_RESULTS:
+            self._results[key] = (now + ttl, result)
+
+    def clear(self) -> None:
+        """
+        Удаляет сохраненные результаты.
+        """
+        with self._lock:
+            self._results.clear()
+
+
+single_flight: SingleFlight = SingleFlight()
+"""Реестр вычислений текущего процесса."""
+
+
+def get_result_ttl() -> float:
+    """
+    Возвращает время переиспользования результатов из настроек.
+
+    Returns:
+        float: Время в секундах (0 — объединяются только одновременные запросы).
+    """
+    return float(getattr(settings, 'COALESCING_RESULT_TTL', 0) or 0)
+
+
+def coalesce(name: str, params: Hashable, func: Callable[[], Any]) -> Any:
+    """
+    Выполняет вычисление через реестр текущего процесса.
+
+    Args:
+        name: Имя вычисления.
+        params: Параметры, от которых зависит результат.
+        func: Функция вычисления.
+
+    Returns:
+        Any: Результат вычисления.
+    """
+    return single_flight.do(name, params, func, get_result_ttl())
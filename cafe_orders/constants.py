@@ -12,6 +12,7 @@ URL_PATHS = {
     'delete_all_orders': 'orders/delete-all/',
     'update_order_status': 'orders/<int:pk>/update-status/',
     'calculate_revenue': 'revenue/',
+    'kitchen_queue': 'kitchen/',
 }
 
 # URL Names
@@ -28,6 +29,7 @@ URL_NAMES = {
     'delete_all_orders': 'delete_all_orders',
     'update_order_status': 'update_order_status',
     'calculate_revenue': 'calculate_revenue',
+    'kitchen_queue': 'kitchen_queue',
 }
 
 # Table Numbers
@@ -60,6 +62,7 @@ TEMPLATE_PATHS = {
     'edit_order_status': 'cafe_orders/edit_order_status.html',
     'delete_all_orders': 'cafe_orders/delete_all_orders.html',
     'revenue': 'cafe_orders/revenue.html',
+    'kitchen_queue': 'cafe_orders/kitchen_queue.html',
 }
 
 # Search Fields for OrderViewSet
@@ -71,7 +74,7 @@ MESSAGES = {
     'dish_added_error': 'Ошибка при добавлении блюда: {error}',
     'dish_updated_success': 'Блюдо успешно обновлено.',
     'dish_updated_error': 'Ошибка при обновлении блюда: {error}',
-    'dish_deleted_success': 'Блюдо успешно удалено.',
+    'dish_deleted_success': 'Блюдо убрано из меню и перенесено в архив.',
     'dish_deleted_error': 'Ошибка при удалении блюда: {error}',
     'table_number_invalid': 'Некорректный номер стола.',
     'status_invalid': 'Некорректный статус заказа.',
@@ -88,6 +91,58 @@ MESSAGES = {
     'revenue_calculation_error': 'Ошибка при расчете выручки: {error}',
     'no_free_tables': "Нет свободных столов на данный момент",
     'add_at_least_one_dish': 'Добавьте хотя бы одно блюдо к заказу.',
+    'export_format_invalid': 'Неподдерживаемый формат выгрузки: {value}. Допустимые значения: {choices}.',
+    'export_date_invalid': 'Некорректная дата {value}. Ожидается формат ГГГГ-ММ-ДД.',
+    'export_date_range_invalid': 'Дата начала периода не может быть позже даты окончания.',
+    'archive_days_invalid': 'Количество дней должно быть неотрицательным целым числом.',
+    'orders_archived_success': 'Перенесено в архив заказов: {count}.',
+    'orders_deleted_progress': 'Удалено заказов: {orders}, позиций: {items}.',
+    'sync_updated_since_invalid': 'Параметр updated_since должен быть датой и временем в формате ISO 8601.',
+    'tombstones_purged_success': 'Удалено устаревших записей об удаленных заказах: {count}.',
+    'fields_invalid': 'Неизвестные поля: {fields}. Допустимые поля заказа: {order_fields}; позиций: {item_fields}.',
+    'ids_invalid': 'Параметр ids должен содержать не более {max_ids} числовых id через запятую.',
+    'idempotency_key_invalid': 'Заголовок Idempotency-Key должен быть непустой строкой не длиннее {max_length} символов.',
+    'idempotency_key_in_progress': 'Запрос с этим Idempotency-Key еще выполняется. Повторите попытку позже.',
+    'idempotency_key_mismatch': 'Idempotency-Key уже использован для другого запроса.',
+    'idempotency_keys_purged_success': 'Удалено устаревших ключей идемпотентности: {count}.',
+    'server_overloaded': 'Сервер перегружен. Повторите запрос позже.',
+    'projection_unknown': 'Неизвестная проекция: {name}. Доступные проекции: {choices}.',
+    'projection_advanced': 'Проекция {name}: обработано событий {count}, позиция {position}.',
+    'order_events_seeded': 'Записано событий создания для заказов без истории: {count}.',
+    'kitchen_queue_rebuilt': 'Очередь кухни пересчитана, блюд в очереди: {count}.',
+    'unit_prices_backfilled': 'Зафиксирована цена в позициях заказов: {count}.',
+    'analytics_top_invalid': 'Параметр top должен быть целым числом от 1 до {max_top}.',
+    'analytics_range_too_long': 'Период аналитики не должен превышать {max_days} дней.',
+    'analytics_cache_cleared': 'Удалена сохраненная статистика за дней: {count}.',
+    'snapshot_missing': 'Каталог {path} не содержит завершенного снимка (нет manifest.json).',
+    'snapshot_incompatible': 'Снимок {path} записан в другом формате или с другим порядком байтов.',
+    'snapshot_written': 'Снимок записан в {path}: заказов {orders}, позиций {items}.',
+    'report_job_kind_invalid': 'Неизвестный тип задания: {kind}. Допустимые типы: {choices}.',
+    'report_job_params_invalid': 'Параметры задания должны быть объектом.',
+    'report_job_queue_full': 'Очередь заданий заполнена. Повторите запрос позже.',
+    'report_job_not_ready': 'Задание еще не выполнено (состояние: {status}).',
+    'report_job_failed': 'Задание завершилось с ошибкой: {error}',
+    'metrics_forbidden': 'Метрики доступны администраторам и сборщику метрик с токеном METRICS_TOKEN.',
+    'report_job_result_gone': 'Файл результата задания удален. Поставьте задание в очередь повторно.',
+    'report_jobs_processed': 'Обработано заданий: {count} (выполнено {done}, с ошибкой {failed}).',
+    'report_jobs_requeued': 'Возвращено в очередь зависших заданий: {count}.',
+    'report_jobs_purged': 'Удалено завершенных заданий: {count}.',
+    'cache_invalidations_purged': 'Удалено записей журнала сброса кэшей: {count}.',
+    'menu_format_invalid': 'Неверный формат файла меню: {value}. Допустимые форматы: {choices}.',
+    'menu_columns_invalid': 'Файл меню должен содержать столбцы: {columns}.',
+    'menu_json_invalid': 'Файл меню должен содержать список объектов с полями name и price.',
+    'menu_row_invalid': 'Строка {line}: {error}',
+    'menu_name_invalid': 'Название блюда должно быть непустым и не длиннее {max_length} символов.',
+    'menu_name_duplicate': 'Блюдо «{name}» указано несколько раз.',
+    'menu_price_invalid': 'Неверная цена: {value}. Цена должна быть неотрицательным числом с не более чем 2 знаками '
+                          'после запятой и меньше {max_value}.',
+    'menu_empty': 'Файл меню не содержит блюд.',
+    'menu_file_missing': 'Не передан файл меню (поле file).',
+    'menu_dishes_unknown': 'Блюда не найдены: {names}.',
+    'menu_percent_invalid': 'Неверный процент изменения цен: {value}. Процент должен быть числом больше -100.',
+    'menu_adjustment_invalid': 'Укажите либо процент изменения цен, либо таблицу цен.',
+    'menu_import_summary': 'Добавлено блюд: {created}, изменено: {updated}, без изменений: {unchanged}.',
+    'menu_dry_run': 'Пробный запуск: изменения не сохранены.',
 }
 
 # Form Constants
@@ -99,6 +154,15 @@ DISH_NAME_MAX_LENGTH = 100
 DISH_PRICE_MAX_DIGITS = 7
 DISH_PRICE_DECIMAL_PLACES = 2
 DISH_PRICE_MIN_VALUE = '0.00'
+DISH_ACTIVE_INDEX_NAME = 'dish_active_name_idx'
+
+# Menu Import Constants
+MENU_FORMAT_CSV = 'csv'
+MENU_FORMAT_JSON = 'json'
+MENU_FORMATS = [MENU_FORMAT_CSV, MENU_FORMAT_JSON]
+MENU_CSV_COLUMNS = ['name', 'price']
+MENU_BULK_BATCH_SIZE = 500
+MENU_FLAG_TRUE_VALUES = ['1', 'true', 'yes', 'on']
 
 # Order Model Constants
 ORDER_STATUS_CHOICES = [
@@ -117,6 +181,242 @@ ORDER_STR_FORMAT = "Заказ {id} - Стол {table_number}"
 ORDER_ITEM_STR_FORMAT = "{dish_name} x {quantity} - {price}₽"
 
 # Serializer Constants
-ORDER_ITEM_FIELDS = ['id', 'dish', 'quantity', 'price']
+ORDER_ITEM_FIELDS = ['id', 'dish', 'quantity', 'unit_price', 'price']
 ORDER_FIELDS = ['id', 'table_number', 'status', 'created_at', 'updated_at', 'total_price', 'items']
-ORDER_READ_ONLY_FIELDS = ['id', 'created_at', 'updated_at', 'total_price']
\ No newline at end of file
+ORDER_READ_ONLY_FIELDS = ['id', 'created_at', 'updated_at', 'total_price']
+
+# Export Constants
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_FORMAT_NDJSON = 'ndjson'
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON]
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_CSV: 'text/csv; charset=utf-8',
+    EXPORT_FORMAT_NDJSON: 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_FILENAME_FORMAT = "orders.{extension}"
+EXPORT_CSV_HEADER = [
+    'order_id', 'table_number', 'status', 'created_at', 'updated_at',
+    'dish', 'quantity', 'unit_price', 'item_total', 'order_total',
+]
+EXPORT_DATE_FORMAT = '%Y-%m-%d'
+
+# Archive Constants
+ARCHIVE_CHUNK_SIZE = 500
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_STATUS = 'paid'
+ARCHIVED_ORDER_STR_FORMAT = "Архивный заказ {id} - Стол {table_number}"
+
+# Chunked Deletion Constants
+DELETE_CHUNK_SIZE = 1000
+
+# Price Snapshot Constants
+BACKFILL_CHUNK_SIZE = 1000
+
+# Benchmark Constants
+BENCHMARK_SEED = 42
+BENCHMARK_REPEAT = 20
+BENCHMARK_TOLERANCE = 0.2
+BENCHMARK_PERCENTILES = [50, 90, 99]
+BENCHMARK_SIZES = {
+    'small': {'dishes': 20, 'tables': MAX_TABLE_NUMBER, 'orders': 200, 'items_per_order': 3},
+    'medium': {'dishes': 50, 'tables': MAX_TABLE_NUMBER, 'orders': 2000, 'items_per_order': 4},
+    'large': {'dishes': 100, 'tables': MAX_TABLE_NUMBER, 'orders': 20000, 'items_per_order': 5},
+}
+DATAGEN_BATCH_SIZE = 1000
+DATAGEN_DISH_NAME_FORMAT = "Блюдо {number:04d}"
+DATAGEN_MIN_PRICE = 100
+DATAGEN_MAX_PRICE = 150000
+
+# Load Generator Constants
+LOADGEN_DURATION = 30
+LOADGEN_WAITERS = 40
+LOADGEN_KITCHENS = 5
+LOADGEN_MANAGERS = 1
+LOADGEN_THINK_TIME = 0.0
+LOADGEN_POLL_INTERVAL = 0.05
+LOADGEN_REQUEST_TIMEOUT = 10
+LOADGEN_HISTORY_ORDERS = 1000
+LOADGEN_MAX_ITEMS = 4
+LOADGEN_LOCK_ERROR_MARKERS = ['database is locked', 'database table is locked']
+
+# Request Timing Constants
+TIMING_LOGGER_NAME = 'cafe_orders.timing'
+TIMING_QUERY_BUDGET = 50
+TIMING_HEADER = 'Server-Timing'
+
+# Metrics Constants
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_FILE_FORMAT = 'metrics_{pid}.json'
+METRICS_UNMATCHED_ROUTE = 'unmatched'
+METRICS_AUTH_HEADER = 'HTTP_AUTHORIZATION'
+METRICS_AUTH_SCHEME = 'Bearer'
+METRICS_DEFINITIONS = {
+    'cafe_http_requests_total': ('counter', 'Количество HTTP-запросов по маршруту, методу и коду ответа.'),
+    'cafe_http_request_duration_seconds': ('histogram', 'Время обработки HTTP-запроса по маршруту.'),
+    'cafe_http_requests_in_flight': ('gauge', 'Количество запросов, обрабатываемых в данный момент.'),
+    'cafe_db_queries_total': ('counter', 'Количество SQL-запросов по маршруту.'),
+    'cafe_db_time_seconds_total': ('counter', 'Суммарное время SQL-запросов по маршруту.'),
+    'cafe_orders_created_total': ('counter', 'Количество созданных заказов по источнику (html, api).'),
+    'cafe_order_status_transitions_total': ('counter', 'Количество смен статуса заказа.'),
+    'cafe_revenue_paid_total': ('counter', 'Сумма оплаченных заказов.'),
+    'cafe_requests_rejected_total': ('counter', 'Количество отклоненных запросов по причине (throttled, overloaded).'),
+    'cafe_coalesced_requests_total': ('counter', 'Количество дорогих вычислений по результату (computed, shared, cached).'),
+    'cafe_order_detail_cache_total': ('counter', 'Обращения к кэшу деталей заказа по результату (hit, miss).'),
+    'cafe_cache_invalidations_total': ('counter', 'Примененные сбросы кэшей по области и источнику (local, bus).'),
+}
+
+# Slow Query Log Constants
+SLOW_QUERY_BUFFER_SIZE = 200
+SLOW_QUERY_EXPLAIN_PREFIXES = {'sqlite': 'EXPLAIN QUERY PLAN ', 'postgresql': 'EXPLAIN ', 'mysql': 'EXPLAIN '}
+SLOW_QUERY_EXPLAINABLE = ('select', 'with')
+SLOW_QUERY_COMMAND_LIMIT = 20
+
+# Profiling Constants
+PROFILING_REQUEST_HEADER = 'HTTP_X_PROFILE'
+PROFILING_RESPONSE_HEADER = 'X-Profile-Id'
+PROFILE_FILENAME_FORMAT = '{timestamp}_{route}_{method}_{duration_ms}ms.prof'
+PROFILE_TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S%f'
+PROFILE_FILENAME_PATTERN = r'^\d+T\d+_(?P<route>.+)_(?P<method>[A-Z]+)_\d+ms\.prof$'
+PROFILE_SORT_KEYS = ['cumulative', 'tottime', 'ncalls']
+PROFILE_DEFAULT_MAX_FILES = 200
+PROFILE_DEFAULT_MAX_AGE_HOURS = 72
+PROFILE_TOP_FUNCTIONS = 20
+
+# Fragment Cache Constants
+FRAGMENT_CACHE_ALIAS = 'default'
+ORDER_ROW_CACHE_KEY_FORMAT = 'order_row:v{version}:{order_id}:{updated_at}:{menu_version}'
+ORDER_ROW_CACHE_VERSION = 1
+ORDER_ROW_CACHE_TIMEOUT = 60 * 60 * 24
+CSRF_TOKEN_SENTINEL = '__order_row_csrf_token__'
+ORDER_DETAIL_CACHE_KEY_FORMAT = 'order_detail:v{version}:{order_id}:{generation}:{all_generation}'
+ORDER_DETAIL_GENERATION_KEY_FORMAT = 'order_detail_generation:{scope}'
+ORDER_DETAIL_CACHE_VERSION = 1
+ORDER_DETAIL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Cache Invalidation Bus Constants
+INVALIDATION_SCOPE_ORDER_DETAIL = 'order_detail'
+INVALIDATION_SCOPE_MAX_LENGTH = 50
+INVALIDATION_KEY_MAX_LENGTH = 100
+INVALIDATION_MAX_KEYS = 100
+INVALIDATION_POLL_BATCH = 1000
+INVALIDATION_RETENTION_SECONDS = 60 * 60
+
+# Delta Sync Constants
+TOMBSTONE_REASON_DELETED = 'deleted'
+TOMBSTONE_REASON_ARCHIVED = 'archived'
+TOMBSTONE_REASON_CHOICES = [
+    (TOMBSTONE_REASON_DELETED, 'Удален'),
+    (TOMBSTONE_REASON_ARCHIVED, 'Перенесен в архив'),
+]
+TOMBSTONE_RETENTION_DAYS = 30
+SYNC_OVERLAP_SECONDS = 5
+
+# Sparse Fieldsets Constants
+ORDER_FIELD_COLUMNS = {
+    'id': ['id'],
+    'table_number': ['table_number'],
+    'status': ['status'],
+    'created_at': ['created_at'],
+    'updated_at': ['updated_at'],
+    'total_price': [],
+    'items': [],
+}
+ORDER_ITEM_FIELD_COLUMNS = {
+    'id': ['id'],
+    'dish': ['dish__name'],
+    'quantity': ['quantity'],
+    'unit_price': ['unit_price'],
+    'price': ['unit_price', 'quantity', 'dish__price'],
+}
+ORDER_TOTAL_PRICE_ITEM_FIELDS = ['price']
+ORDER_MULTI_GET_MAX_IDS = 100
+
+# Idempotency Constants
+IDEMPOTENCY_KEY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+IDEMPOTENCY_REPLAYED_HEADER = 'Idempotent-Replayed'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+IDEMPOTENCY_CLIENT_MAX_LENGTH = 64
+IDEMPOTENCY_CLAIM_ATTEMPTS = 3
+IDEMPOTENCY_CLAIM_LEASE_SECONDS = 60
+IDEMPOTENCY_KEY_UNIQUE_NAME = 'idempotency_client_key_unique'
+
+# Admission Control Constants
+THROTTLE_SCOPE_READ = 'read'
+THROTTLE_SCOPE_WRITE = 'write'
+THROTTLE_SCOPE_DELETE_ALL = 'delete_all'
+THROTTLE_ACTION_SCOPES = {'delete_all': THROTTLE_SCOPE_DELETE_ALL}
+THROTTLE_PERIODS = {'s': 1, 'sec': 1, 'min': 60, 'hour': 60 * 60, 'day': 60 * 60 * 24}
+THROTTLE_MAX_BUCKETS = 10000
+THROTTLE_IDLE_SECONDS = 60 * 60 * 24
+API_PATH_PREFIX = '/api/'
+ADMISSION_EXEMPT_PATHS = ['/metrics']
+ADMISSION_QUEUE_TIMEOUT = 0.05
+ADMISSION_RETRY_AFTER = 1
+
+# Request Coalescing Constants
+COALESCING_WAIT_TIMEOUT = 30.0
+COALESCING_MAX_RESULTS = 1000
+COALESCING_ORDER_LIST_PARAMS = {'table', 'status', 'search', 'fields', 'include', 'ids'}
+
+# Order Event Journal Constants
+ORDER_EVENT_CREATED = 'created'
+ORDER_EVENT_UPDATED = 'updated'
+ORDER_EVENT_DELETED = 'deleted'
+ORDER_EVENT_ARCHIVED = 'archived'
+ORDER_EVENT_TYPE_CHOICES = [
+    (ORDER_EVENT_CREATED, 'Создан'),
+    (ORDER_EVENT_UPDATED, 'Изменен'),
+    (ORDER_EVENT_DELETED, 'Удален'),
+    (ORDER_EVENT_ARCHIVED, 'Перенесен в архив'),
+]
+ORDER_EVENT_TRACKED_FIELDS = ['table_number', 'status', 'items']
+ACTIVE_ORDER_STATUSES = ['pending', 'ready']
+PROJECTION_BATCH_SIZE = 500
+
+# Menu Analytics Constants
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_DAYS = 366
+ANALYTICS_DEFAULT_TOP_DISHES = 10
+ANALYTICS_MAX_TOP_DISHES = 100
+ANALYTICS_DATA_VERSION = 2
+
+# Columnar Snapshot Constants
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_MANIFEST_NAME = 'manifest.json'
+SNAPSHOT_CHUNK_SIZE = 5000
+SNAPSHOT_COLUMNS = {
+    'orders': {'id': 'q', 'created_at': 'q', 'table_number': 'i', 'status': 'b'},
+    'items': {'order_id': 'q', 'dish_id': 'q', 'quantity': 'i', 'unit_cents': 'q', 'status': 'b'},
+}
+
+# Report Job Constants
+REPORT_JOB_QUEUED = 'queued'
+REPORT_JOB_RUNNING = 'running'
+REPORT_JOB_DONE = 'done'
+REPORT_JOB_FAILED = 'failed'
+REPORT_JOB_STATUS_CHOICES = [
+    (REPORT_JOB_QUEUED, 'В очереди'),
+    (REPORT_JOB_RUNNING, 'Выполняется'),
+    (REPORT_JOB_DONE, 'Выполнено'),
+    (REPORT_JOB_FAILED, 'Ошибка'),
+]
+REPORT_JOB_KIND_EXPORT = 'export'
+REPORT_JOB_KIND_ANALYTICS = 'analytics'
+REPORT_JOB_KIND_REVENUE = 'revenue'
+REPORT_JOB_KIND_CHOICES = [
+    (REPORT_JOB_KIND_EXPORT, 'Выгрузка заказов'),
+    (REPORT_JOB_KIND_ANALYTICS, 'Аналитика меню'),
+    (REPORT_JOB_KIND_REVENUE, 'Выручка'),
+]
+REPORT_JOB_FIELDS = ['id', 'kind', 'params', 'status', 'error', 'created_at', 'started_at', 'finished_at']
+REPORT_JOB_FILE_FORMAT = 'job-{id}.{extension}'
+REPORT_JOB_MAX_QUEUED = 100
+REPORT_JOB_STALE_SECONDS = 60 * 60
+REPORT_JOB_RETENTION_SECONDS = 7 * 24 * 60 * 60
+REPORT_JOB_POLL_INTERVAL = 2.0
+REPORT_JOB_RETRY_AFTER = 5
+REPORT_JOB_LOGGER_NAME = 'cafe_orders.jobs'
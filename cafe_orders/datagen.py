@@ -0,0 +1,136 @@
+"""
+Детерминированный генератор тестовых данных для бенчмарков и нагрузочного тестирования.
+
+При одинаковом seed генерируются одинаковые блюда, цены, заказы и позиции, поэтому
+замеры на разных ревизиях кода сравнимы между собой.
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import constants
+from .analytics import clear_analytics_cache
+from .kitchen import rebuild_kitchen_queue
+from .models import Dish, Order, OrderItem
+
+
+def validate_dataset_params(dishes: int, tables: int, orders: int, items_per_order: int) -> None:
+    """
+    Проверяет параметры генерации данных.
+
+    Args:
+        dishes: Количество блюд.
+        tables: Количество используемых столов.
+        orders: Количество заказов.
+        items_per_order: Количество позиций в каждом заказе.
+
+    Raises:
+        ValueError: Если параметры выходят за допустимые пределы.
+    """
+    if dishes < 1 or orders < 0 or items_per_order < 1:
+        raise ValueError("Количество блюд и позиций должно быть положительным, количество заказов — неотрицательным.")
+    if not constants.MIN_TABLE_NUMBER <= tables <= constants.MAX_TABLE_NUMBER:
+        raise ValueError(f"Количество столов должно быть от {constants.MIN_TABLE_NUMBER} "
+                         f"до {constants.MAX_TABLE_NUMBER}.")
+    if items_per_order > dishes:
+        raise ValueError("Количество позиций в заказе не может превышать количество блюд.")
+
+
+def spread_order_dates(order_dates: List[Tuple[int, datetime]]) -> None:
+    """
+    Проставляет заказам заданные даты создания и изменения одним пакетным запросом.
+
+    Поля created_at/updated_at заполняются автоматически при сохранении, поэтому даты
+    переписываются отдельно, без загрузки объектов.
+
+    Args:
+        order_dates: Пары (id заказа, дата создания).
+    """
+    table: str = connection.ops.quote_name(Order._meta.db_table)
+    params: List[Tuple[str, str, int]] = []
+    for order_id, created_at in order_dates:
+        value = connection.ops.adapt_datetimefield_value(created_at)
+        params.append((value, value, order_id))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"UPDATE {table} SET created_at = %s, updated_at = %s WHERE id = %s", params)
+
+
+def generate_dataset(dishes: int, tables: int, orders: int, items_per_order: int,
+                     seed: int = constants.BENCHMARK_SEED, days: int = 1) -> Dict[str, int]:
+    """
+    Заполняет базу данных детерминированным набором блюд, заказов и позиций.
+
+    Большинство заказов создается оплаченными; не более половины столов получают активный
+    заказ (в ожидании или готов), чтобы оставались свободные столы для новых заказов.
+    Генератор рассчитан на пустую базу данных (имена блюд уникальны).
+
+    Args:
+        dishes: Количество блюд.
+        tables: Количество используемых столов (не больше MAX_TABLE_NUMBER).
+        orders: Количество заказов.
+        items_per_order: Количество позиций в каждом заказе.
+        seed: Начальное значение генератора случайных чисел.
+        days: За сколько последних дней распределить даты создания заказов.
+
+    Returns:
+        Dict[str, int]: Количество созданных блюд ('dishes'), заказов ('orders') и позиций ('items').
+
+    Raises:
+        ValueError: Если параметры выходят за допустимые пределы.
+    """
+    validate_dataset_params(dishes, tables, orders, items_per_order)
+    rng: random.Random = random.Random(seed)
+    batch_size: int = constants.DATAGEN_BATCH_SIZE
+
+    with transaction.atomic():
+        Dish.objects.bulk_create([
+            Dish(
+                name=constants.DATAGEN_DISH_NAME_FORMAT.format(number=number),
+                price=Decimal(rng.randint(constants.DATAGEN_MIN_PRICE, constants.DATAGEN_MAX_PRICE)) / 100,
+            )
+            for number in range(1, dishes + 1)
+        ], batch_size=batch_size)
+        dish_prices: List[Tuple[int, Decimal]] = list(
+            Dish.objects.order_by('-id').values_list('id', 'price')[:dishes])[::-1]
+
+        active_count: int = min(tables // 2, orders)
+        active_tables: List[int] = rng.sample(range(1, tables + 1), active_count)
+        new_orders: List[Order] = [
+            Order(table_number=rng.randint(1, tables), status='paid')
+            for _ in range(orders - active_count)
+        ]
+        new_orders.extend(
+            Order(table_number=table, status=rng.choice(['pending', 'ready']))
+            for table in active_tables
+        )
+        last_order_id: int = Order.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        Order.objects.bulk_create(new_orders, batch_size=batch_size)
+        order_ids: List[int] = list(Order.objects.filter(id__gt=last_order_id).order_by('id')
+                                    .values_list('id', flat=True))
+
+        items: List[OrderItem] = []
+        for order_id in order_ids:
+            for dish_id, price in rng.sample(dish_prices, items_per_order):
+                items.append(OrderItem(order_id=order_id, dish_id=dish_id,
+                                       quantity=rng.randint(1, 4), unit_price=price))
+        OrderItem.objects.bulk_create(items, batch_size=batch_size)
+        # Заказы создаются в обход журнала, поэтому очередь кухни пересчитывается целиком.
+        rebuild_kitchen_queue()
+
+        if days > 1 and order_ids:
+            now: datetime = timezone.now()
+            start: datetime = now - timedelta(days=days)
+            step: float = (now - start).total_seconds() / len(order_ids)
+            spread_order_dates([
+                (order_id, start + timedelta(seconds=step * index))
+                for index, order_id in enumerate(order_ids)
+            ])
+            # Заказы перенесены в прошедшие дни, поэтому сохраненная статистика за них устарела.
+            clear_analytics_cache()
+
+    return {'dishes': dishes, 'orders': len(order_ids), 'items': len(items)}
@@ -0,0 +1,82 @@
+"""
+Порционное удаление заказов.
+
+Вместо Order.objects.all().delete(), при котором Django загружает в память все заказы
+и позиции для каскадной обработки и удерживает одну большую транзакцию на запись,
+заказы удаляются диапазонами первичных ключей: сначала позиции, затем сами заказы,
+прямыми DELETE-запросами без загрузки объектов. Каждый диапазон удаляется в отдельной
+короткой транзакции, поэтому другие запросы на запись не ждут окончания всей операции.
+В той же транзакции записываются отметки об удалении заказов для синхронизации клиентов.
+Сохраненная аналитика закрытых дней после удаления сбрасывается целиком.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from django.db import router, transaction
+from django.db.models import Max
+
+from . import constants
+from .analytics import clear_analytics_cache
+from .detail_cache import invalidate_order_details
+from .models import KitchenQueueEntry, Order, OrderEvent, OrderItem, OrderTombstone
+
+
+def delete_orders_range(first_id: int, last_id: int) -> Dict[str, int]:
+    """
+    Удаляет заказы с id в диапазоне [first_id, last_id] и их позиции прямыми DELETE-запросами.
+
+    Должна вызываться внутри транзакции.
+
+    Args:
+        first_id: Первый id диапазона включительно.
+        last_id: Последний id диапазона включительно.
+
+    Returns:
+        Dict[str, int]: Количество удаленных заказов ('orders') и позиций ('items').
+    """
+    using: str = router.db_for_write(Order)
+    items: int = OrderItem.objects.filter(order_id__gte=first_id, order_id__lte=last_id)._raw_delete(using)
+    orders: int = Order.objects.filter(id__gte=first_id, id__lte=last_id)._raw_delete(using)
+    return {'orders': orders, 'items': items}
+
+
+def delete_all_orders_chunked(chunk_size: int = constants.DELETE_CHUNK_SIZE,
+                              progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+    """
+    Удаляет все заказы, существовавшие на момент вызова, порциями по chunk_size заказов.
+
+    Заказы, созданные во время удаления (с id больше максимального на момент старта), не затрагиваются.
+
+    Args:
+        chunk_size: Количество заказов, удаляемых в одной транзакции.
+        progress: Необязательная функция, вызываемая после каждой порции с накопленными счетчиками.
+
+    Returns:
+        Dict[str, int]: Общее количество удаленных заказов ('orders') и позиций ('items').
+    """
+    totals: Dict[str, int] = {'orders': 0, 'items': 0}
+    max_id: Optional[int] = Order.objects.aggregate(max_id=Max('id'))['max_id']
+    if max_id is None:
+        return totals
+
+    last_deleted_id: int = 0
+    while last_deleted_id < max_id:
+        with transaction.atomic():
+            ids: List[int] = list(
+                Order.objects.filter(id__gt=last_deleted_id, id__lte=max_id)
+                .order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            KitchenQueueEntry.remove_orders(ids)
+            invalidate_order_details(ids)
+            OrderEvent.record_deleted(ids)
+            deleted: Dict[str, int] = delete_orders_range(ids[0], ids[-1])
+            OrderTombstone.record(ids)
+        totals['orders'] += deleted['orders']
+        totals['items'] += deleted['items']
+        last_deleted_id = ids[-1]
+        if progress is not None:
+            progress(dict(totals))
+    clear_analytics_cache()
+    return totals
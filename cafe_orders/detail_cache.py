@@ -0,0 +1,211 @@
+"""
+Кэш сериализованных деталей заказа для GET /api/orders/<id>/.
+
+Ключ записи включает счетчик поколения заказа и общий счетчик поколения всех заказов.
+Любое изменение заказа (сохранение, изменение позиций, удаление, архивация, порционное
+удаление) после фиксации транзакции увеличивает счетчик поколения заказа, изменение блюда —
+общий счетчик, поэтому старые записи больше не читаются и не нуждаются в удалении. Запрос,
+прочитавший заказ до изменения, сохраняет результат под прежним поколением и не может
+перезаписать свежие данные. После сохранения заказа через API новые данные сразу кладутся
+в кэш под новым поколением (write-through).
+
+Кэш локален для процесса (CACHES['default']); сбросы передаются остальным рабочим процессам
+через шину сброса кэшей (см. invalidation) и применяются в них не позднее чем через
+INVALIDATION_POLL_INTERVAL секунд.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+
+from . import constants
+from .invalidation import bus
+from .metrics import registry
+
+ALL_ORDERS_SCOPE: str = 'all'
+
+
+def get_cache() -> BaseCache:
+    """
+    Возвращает кэш деталей заказа.
+
+    Returns:
+        BaseCache: Кэш из настроек CACHES.
+    """
+    return caches[constants.FRAGMENT_CACHE_ALIAS]
+
+
+def get_generation_key(scope: Any) -> str:
+    """
+    Формирует ключ счетчика поколения.
+
+    Args:
+        scope: Идентификатор заказа или ALL_ORDERS_SCOPE.
+
+    Returns:
+        str: Ключ кэша.
+    """
+    return constants.ORDER_DETAIL_GENERATION_KEY_FORMAT.format(scope=scope)
+
+
+def get_generations(order_id: int) -> Dict[str, int]:
+    """
+    Возвращает текущие поколения заказа и всех заказов, создавая отсутствующие счетчики.
+
+    Новый счетчик начинается со значения текущего времени в наносекундах, поэтому вытеснение
+    счетчика из кэша не возвращает поколение к значению, под которым уже хранились данные.
+
+    Args:
+        order_id: Идентификатор заказа.
+
+    Returns:
+        Dict[str, int]: Поколение заказа ('generation') и всех заказов ('all_generation').
+    """
+    cache: BaseCache = get_cache()
+    keys: Dict[str, str] = {'generation': get_generation_key(order_id),
+                            'all_generation': get_generation_key(ALL_ORDERS_SCOPE)}
+    values: Dict[str, Any] = cache.get_many(list(keys.values()))
+    return {name: values[key] if key in values else add_generation(key) for name, key in keys.items()}
+
+
+def add_generation(key: str) -> int:
+    """
+    Создает отсутствующий счетчик поколения.
+
+    Args:
+        key: Ключ счетчика.
+
+    Returns:
+        int: Значение счетчика (созданное этим или параллельным вызовом).
+    """
+    cache: BaseCache = get_cache()
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def get_menu_version() -> int:
+    """
+    Возвращает версию меню — общий счетчик поколения всех заказов, который увеличивается при
+    изменении блюд (в том числе в других процессах, см. invalidation).
+
+    Returns:
+        int: Версия меню.
+    """
+    bus.poll()
+    key: str = get_generation_key(ALL_ORDERS_SCOPE)
+    version: Optional[int] = get_cache().get(key)
+    return add_generation(key) if version is None else version
+
+
+def bump_generations(scopes: Iterable[Any]) -> Dict[Any, int]:
+    """
+    Увеличивает счетчики поколений, после чего ранее сохраненные данные не читаются.
+
+    Args:
+        scopes: Идентификаторы заказов и/или ALL_ORDERS_SCOPE.
+
+    Returns:
+        Dict[Any, int]: Новые значения счетчиков.
+    """
+    cache: BaseCache = get_cache()
+    generations: Dict[Any, int] = {}
+    for scope in scopes:
+        key: str = get_generation_key(scope)
+        try:
+            generations[scope] = cache.incr(key)
+        except ValueError:
+            generations[scope] = time.time_ns()
+            cache.set(key, generations[scope], None)
+    return generations
+
+
+def get_detail_key(order_id: int, generations: Dict[str, int]) -> str:
+    """
+    Формирует ключ записи деталей заказа.
+
+    Args:
+        order_id: Идентификатор заказа.
+        generations: Поколения (см. get_generations).
+
+    Returns:
+        str: Ключ кэша.
+    """
+    return constants.ORDER_DETAIL_CACHE_KEY_FORMAT.format(
+        version=constants.ORDER_DETAIL_CACHE_VERSION, order_id=order_id, **generations)
+
+
+def get_order_detail(order_id: int, loader: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Возвращает детали заказа из кэша или загружает и сохраняет их.
+
+    Перед чтением кэша применяются сбросы, опубликованные другими процессами.
+
+    Args:
+        order_id: Идентификатор заказа.
+        loader: Функция, загружающая сериализованный заказ (исключения, например Http404, не кэшируются).
+
+    Returns:
+        Dict[str, Any]: Сериализованный заказ.
+    """
+    bus.poll()
+    cache: BaseCache = get_cache()
+    key: str = get_detail_key(order_id, get_generations(order_id))
+    data: Optional[Dict[str, Any]] = cache.get(key)
+    if data is not None:
+        registry.inc('cafe_order_detail_cache_total', {'result': 'hit'})
+        return data
+    registry.inc('cafe_order_detail_cache_total', {'result': 'miss'})
+    data = loader()
+    cache.set(key, data, constants.ORDER_DETAIL_CACHE_TIMEOUT)
+    return data
+
+
+def store_order_detail(order_id: int, data: Dict[str, Any]) -> None:
+    """
+    Сохраняет в кэш детали только что измененного заказа после фиксации транзакции.
+
+    Поколение заказа увеличивается перед сохранением, поэтому данные параллельных запросов,
+    прочитавших заказ до изменения, не будут прочитаны.
+
+    Args:
+        order_id: Идентификатор заказа.
+        data: Сериализованный заказ после изменения.
+    """
+    def store() -> None:
+        generations: Dict[str, int] = get_generations(order_id)
+        generations['generation'] = bump_generations([order_id])[order_id]
+        get_cache().set(get_detail_key(order_id, generations), data, constants.ORDER_DETAIL_CACHE_TIMEOUT)
+
+    transaction.on_commit(store)
+
+
+def apply_invalidation(keys: Optional[List[str]]) -> None:
+    """
+    Применяет сброс деталей заказов, полученный через шину сброса кэшей.
+
+    Args:
+        keys: Идентификаторы заказов или None (все заказы).
+    """
+    bump_generations([ALL_ORDERS_SCOPE] if keys is None else [int(key) for key in keys])
+
+
+bus.subscribe(constants.INVALIDATION_SCOPE_ORDER_DETAIL, apply_invalidation)
+
+
+def invalidate_order_details(order_ids: Iterable[int]) -> None:
+    """
+    Делает недействительными кэшированные детали заказов во всех процессах после фиксации транзакции.
+
+    Args:
+        order_ids: Идентификаторы измененных заказов.
+    """
+    bus.publish(constants.INVALIDATION_SCOPE_ORDER_DETAIL, order_ids)
+
+
+def invalidate_all_order_details() -> None:
+    """
+    Делает недействительными кэшированные детали всех заказов (например, при изменении блюда).
+    """
+    bus.publish(constants.INVALIDATION_SCOPE_ORDER_DETAIL)
@@ -0,0 +1,117 @@
+"""
+Запись событий в журнал заказов (OrderEvent).
+
+События создания и изменения содержат состояние заказа после события (номер стола, статус,
+дату создания и позиции с зафиксированными ценами; для позиций без зафиксированной цены — с текущей
+ценой блюда), поэтому проекции строятся только по журналу, без обращения к таблицам заказов. Событие
+изменения дополнительно содержит список измененных полей (changes) и их прежние значения (previous),
+событие удаления оплаченного заказа — его выручку (revenue).
+
+События записываются в той же транзакции, что и изменение заказа: в представлениях,
+OrderSerializer, Order.delete, при порционном удалении и переносе в архив. Вместе с событиями
+создания и изменения обновляется очередь кухни (cafe_orders.kitchen).
+"""
+
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+
+from . import constants
+from .kitchen import apply_order_change
+from .models import Order, OrderEvent
+
+
+def snapshot_order(order: Order) -> Dict[str, Any]:
+    """
+    Возвращает состояние заказа для записи в журнал.
+
+    Args:
+        order: Заказ.
+
+    Returns:
+        Dict[str, Any]: Номер стола, статус, дата создания и позиции заказа.
+    """
+    items: List[Dict[str, Any]] = [
+        {'dish_id': item.dish_id, 'dish': item.dish.name, 'quantity': item.quantity,
+         'unit_price': str(item.unit_price if item.unit_price is not None else item.dish.price)}
+        for item in order.items.select_related('dish').order_by('id')
+    ]
+    return {
+        'table_number': order.table_number,
+        'status': order.status,
+        'created_at': order.created_at.isoformat(),
+        'items': items,
+    }
+
+
+def snapshot_locked_order(order_id: int) -> Dict[str, Any]:
+    """
+    Блокирует строку заказа до конца текущей транзакции и возвращает его состояние до изменения.
+
+    Вызывается внутри transaction.atomic() перед изменением заказа: параллельное изменение того же
+    заказа ждет фиксации транзакции, поэтому разница «до/после» для очереди кухни и журнала
+    считается от тех данных, к которым применяется изменение.
+
+    Args:
+        order_id: Идентификатор заказа.
+
+    Returns:
+        Dict[str, Any]: Состояние заказа (результат snapshot_order).
+    """
+    return snapshot_order(Order.objects.select_for_update().get(pk=order_id))
+
+
+def append_order_created(order: Order) -> OrderEvent:
+    """
+    Записывает событие создания заказа (после сохранения его позиций).
+
+    Args:
+        order: Созданный заказ.
+
+    Returns:
+        OrderEvent: Записанное событие.
+    """
+    snapshot: Dict[str, Any] = snapshot_order(order)
+    apply_order_change(None, snapshot)
+    return OrderEvent.record(order.pk, constants.ORDER_EVENT_CREATED, snapshot)
+
+
+def append_order_updated(order: Order, before: Dict[str, Any]) -> Optional[OrderEvent]:
+    """
+    Записывает событие изменения заказа, если его состояние изменилось.
+
+    Args:
+        order: Измененный заказ.
+        before: Состояние заказа до изменения (результат snapshot_locked_order).
+
+    Returns:
+        Optional[OrderEvent]: Записанное событие или None, если состояние не изменилось.
+    """
+    after: Dict[str, Any] = snapshot_order(order)
+    changes: List[str] = [name for name in constants.ORDER_EVENT_TRACKED_FIELDS if before[name] != after[name]]
+    if not changes:
+        return None
+    apply_order_change(before, after)
+    after['changes'] = changes
+    after['previous'] = {name: before[name] for name in changes}
+    return OrderEvent.record(order.pk, constants.ORDER_EVENT_UPDATED, after)
+
+
+def seed_order_events() -> int:
+    """
+    Записывает события создания для заказов, у которых еще нет событий в журнале.
+
+    Используется один раз после появления журнала, чтобы проекции учитывали заказы,
+    созданные до него.
+
+    Returns:
+        int: Количество записанных событий.
+    """
+    order_ids: List[int] = list(Order.objects.exclude(id__in=OrderEvent.objects.values('order_id'))
+                                .order_by('id').values_list('id', flat=True))
+    batch_size: int = constants.PROJECTION_BATCH_SIZE
+    for start in range(0, len(order_ids), batch_size):
+        with transaction.atomic():
+            for order in Order.objects.filter(id__in=order_ids[start:start + batch_size]).order_by('id'):
+                append_order_created(order)
+    return len(order_ids)
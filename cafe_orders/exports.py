@@ -0,0 +1,289 @@
+"""
+Выгрузка заказов для бухгалтерии в форматах CSV и NDJSON.
+
+Заказы читаются порциями по первичному ключу (keyset-пагинация), поэтому объем
+используемой памяти ограничен размером одной порции независимо от общего числа
+строк в выгрузке. Оплаченные заказы, перенесенные в архив, выгружаются вместе с рабочими.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from django.db.models import Prefetch, QuerySet
+from django.utils import timezone
+
+from . import constants
+from .models import Order, OrderItem, ArchivedOrder, ArchivedOrderItem
+
+
+def parse_export_date(value: str) -> date:
+    """
+    Преобразует строку вида ГГГГ-ММ-ДД в дату.
+
+    Args:
+        value: Строковое представление даты.
+
+    Returns:
+        date: Распознанная дата.
+
+    Raises:
+        ValueError: Если строка не соответствует формату.
+    """
+    try:
+        return datetime.strptime(value, constants.EXPORT_DATE_FORMAT).date()
+    except ValueError:
+        raise ValueError(constants.MESSAGES['export_date_invalid'].format(value=value))
+
+
+def parse_export_params(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Разбирает и валидирует параметры выгрузки (формат, статус, период).
+
+    Статус принимается как во внутреннем виде ('paid'), так и в русском ('оплачено').
+
+    Args:
+        params: Словарь параметров (GET-параметры запроса или опции команды).
+
+    Returns:
+        Dict[str, Any]: Словарь с ключами 'file_format', 'status', 'date_from', 'date_to'.
+
+    Raises:
+        ValueError: Если какой-либо из параметров некорректен.
+    """
+    file_format: str = (params.get('file_format') or constants.EXPORT_FORMAT_CSV).strip().lower()
+    if file_format not in constants.EXPORT_FORMATS:
+        raise ValueError(constants.MESSAGES['export_format_invalid'].format(
+            value=file_format, choices=', '.join(constants.EXPORT_FORMATS)))
+
+    status_value: Optional[str] = (params.get('status') or '').strip().lower() or None
+    if status_value is not None:
+        status_value = constants.ORDER_STATUS_MAP.get(status_value, status_value)
+        if status_value not in dict(constants.ORDER_STATUS_CHOICES):
+            raise ValueError(constants.MESSAGES['status_invalid'])
+
+    date_from_raw: str = (params.get('date_from') or '').strip()
+    date_to_raw: str = (params.get('date_to') or '').strip()
+    date_from: Optional[date] = parse_export_date(date_from_raw) if date_from_raw else None
+    date_to: Optional[date] = parse_export_date(date_to_raw) if date_to_raw else None
+    if date_from and date_to and date_from > date_to:
+        raise ValueError(constants.MESSAGES['export_date_range_invalid'])
+
+    return {
+        'file_format': file_format,
+        'status': status_value,
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+
+
+def get_export_queryset(status: Optional[str] = None, date_from: Optional[date] = None,
+                        date_to: Optional[date] = None, model: type = Order) -> QuerySet:
+    """
+    Возвращает queryset заказов (рабочих или архивных) для выгрузки.
+
+    Границы периода переводятся в моменты времени текущего часового пояса, чтобы
+    фильтр по created_at мог использовать индекс, а не вычислять дату для каждой строки.
+
+    Args:
+        status: Внутреннее значение статуса заказа (опционально).
+        date_from: Первый день периода включительно (опционально).
+        date_to: Последний день периода включительно (опционально).
+        model: Модель заказа: Order или ArchivedOrder.
+
+    Returns:
+        QuerySet: Отфильтрованный queryset заказов.
+    """
+    queryset: QuerySet = model.objects.all()
+    if status:
+        queryset = queryset.filter(status=status)
+    if date_from:
+        queryset = queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        next_day: date = date_to + timedelta(days=1)
+        queryset = queryset.filter(created_at__lt=timezone.make_aware(datetime.combine(next_day, time.min)))
+    return queryset
+
+
+def get_export_querysets(status: Optional[str] = None, date_from: Optional[date] = None,
+                         date_to: Optional[date] = None) -> List[QuerySet]:
+    """
+    Возвращает querysets рабочих и, если статус это допускает, архивных заказов для выгрузки.
+
+    Args:
+        status: Внутреннее значение статуса заказа (опционально).
+        date_from: Первый день периода включительно (опционально).
+        date_to: Последний день периода включительно (опционально).
+
+    Returns:
+        List[QuerySet]: Querysets в порядке выгрузки.
+    """
+    querysets: List[QuerySet] = [get_export_queryset(status, date_from, date_to)]
+    if status in (None, constants.ARCHIVE_STATUS):
+        querysets.append(get_export_queryset(status, date_from, date_to, model=ArchivedOrder))
+    return querysets
+
+
+def iter_order_chunks(queryset: QuerySet,
+                      chunk_size: int = constants.EXPORT_CHUNK_SIZE) -> Iterator[List[Union[Order, ArchivedOrder]]]:
+    """
+    Итерирует заказы порциями фиксированного размера в порядке возрастания id.
+
+    Каждая порция загружается отдельным запросом вида "id > последний_id LIMIT n"
+    вместе с позициями и блюдами, поэтому в памяти одновременно находится только одна порция.
+
+    Args:
+        queryset: Исходный queryset заказов.
+        chunk_size: Количество заказов в одной порции.
+
+    Yields:
+        List[Union[Order, ArchivedOrder]]: Очередная порция заказов с предзагруженными позициями.
+    """
+    if queryset.model is ArchivedOrder:
+        items_prefetch: Prefetch = Prefetch('items', queryset=ArchivedOrderItem.objects.order_by('id'))
+    else:
+        items_prefetch = Prefetch('items', queryset=OrderItem.objects.select_related('dish').order_by('id'))
+    last_id: int = 0
+    while True:
+        chunk: List[Union[Order, ArchivedOrder]] = list(
+            queryset.filter(id__gt=last_id).order_by('id').prefetch_related(items_prefetch)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
+def iter_querysets_chunks(querysets: Iterable[QuerySet],
+                          chunk_size: int = constants.EXPORT_CHUNK_SIZE) -> Iterator[List[Union[Order, ArchivedOrder]]]:
+    """
+    Последовательно итерирует порции заказов из нескольких querysets.
+
+    Args:
+        querysets: Querysets заказов (например, рабочих и архивных).
+        chunk_size: Количество заказов в одной порции.
+
+    Yields:
+        List[Union[Order, ArchivedOrder]]: Очередная порция заказов.
+    """
+    for queryset in querysets:
+        yield from iter_order_chunks(queryset, chunk_size)
+
+
+def get_item_name_and_unit_price(item: Union[OrderItem, ArchivedOrderItem]) -> Tuple[str, Decimal]:
+    """
+    Возвращает название блюда и цену за единицу для рабочей или архивной позиции.
+
+    Args:
+        item: Позиция заказа.
+
+    Returns:
+        Tuple[str, Decimal]: Название блюда и цена за единицу.
+    """
+    if isinstance(item, ArchivedOrderItem):
+        return item.dish_name, item.unit_price
+    return item.dish.name, item.unit_price if item.unit_price is not None else item.dish.price
+
+
+def serialize_order(order: Union[Order, ArchivedOrder]) -> Dict[str, Any]:
+    """
+    Преобразует заказ с позициями в словарь для выгрузки.
+
+    Args:
+        order: Рабочий или архивный заказ с предзагруженными позициями.
+
+    Returns:
+        Dict[str, Any]: Данные заказа, его позиции и итоговая сумма.
+    """
+    items: List[Dict[str, Any]] = []
+    total: Decimal = Decimal('0')
+    for item in order.items.all():
+        dish_name, unit_price = get_item_name_and_unit_price(item)
+        item_total: Decimal = item.price
+        total += item_total
+        items.append({
+            'dish': dish_name,
+            'quantity': item.quantity,
+            'unit_price': str(unit_price),
+            'item_total': str(item_total),
+        })
+    return {
+        'id': order.id,
+        'table_number': order.table_number,
+        'status': order.status,
+        'created_at': order.created_at.isoformat(),
+        'updated_at': order.updated_at.isoformat(),
+        'items': items,
+        'total_price': str(total),
+    }
+
+
+def iter_csv(querysets: Iterable[QuerySet], chunk_size: int = constants.EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Формирует выгрузку в формате CSV: одна строка на позицию заказа.
+
+    Заказ без позиций выгружается одной строкой с пустыми полями позиции.
+
+    Args:
+        querysets: Querysets заказов для выгрузки.
+        chunk_size: Количество заказов в одной порции.
+
+    Yields:
+        str: Заголовок, затем строки CSV по одной порции заказов за раз.
+    """
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(constants.EXPORT_CSV_HEADER)
+    yield buffer.getvalue()
+
+    for chunk in iter_querysets_chunks(querysets, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        for order in chunk:
+            data: Dict[str, Any] = serialize_order(order)
+            order_columns: List[Any] = [
+                data['id'], data['table_number'], data['status'], data['created_at'], data['updated_at'],
+            ]
+            if not data['items']:
+                writer.writerow(order_columns + ['', '', '', '', data['total_price']])
+            for item in data['items']:
+                writer.writerow(order_columns + [
+                    item['dish'], item['quantity'], item['unit_price'], item['item_total'], data['total_price'],
+                ])
+        yield buffer.getvalue()
+
+
+def iter_ndjson(querysets: Iterable[QuerySet], chunk_size: int = constants.EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Формирует выгрузку в формате NDJSON: один JSON-объект заказа на строку.
+
+    Args:
+        querysets: Querysets заказов для выгрузки.
+        chunk_size: Количество заказов в одной порции.
+
+    Yields:
+        str: Строки NDJSON по одной порции заказов за раз.
+    """
+    for chunk in iter_querysets_chunks(querysets, chunk_size):
+        yield ''.join(json.dumps(serialize_order(order), ensure_ascii=False) + '\n' for order in chunk)
+
+
+def iter_export(file_format: str, querysets: Iterable[QuerySet],
+                chunk_size: int = constants.EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Возвращает генератор выгрузки в указанном формате.
+
+    Args:
+        file_format: Формат выгрузки ('csv' или 'ndjson').
+        querysets: Querysets заказов для выгрузки.
+        chunk_size: Количество заказов в одной порции.
+
+    Returns:
+        Iterator[str]: Генератор фрагментов выгрузки.
+    """
+    if file_format == constants.EXPORT_FORMAT_NDJSON:
+        return iter_ndjson(querysets, chunk_size)
+    return iter_csv(querysets, chunk_size)
@@ -0,0 +1,142 @@
+"""
+Выбор полей ответа API заказов (sparse fieldsets).
+
+GET-параметр fields задает поля заказа, include — позиции заказа и их поля:
+    ?fields=id,table_number,status&include=items.dish
+
+По выбранным полям сужается и запрос к базе данных: загружаются только нужные столбцы,
+позиции предзагружаются только если они (или итоговая сумма) запрошены, а блюда
+присоединяются только если нужны их название или цена.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from django.db.models import Prefetch, QuerySet
+
+from . import constants
+from .models import OrderItem
+
+
+def split_param(value: str) -> List[str]:
+    """
+    Разбивает значение GET-параметра по запятым.
+
+    Args:
+        value: Значение параметра.
+
+    Returns:
+        List[str]: Непустые элементы без пробелов.
+    """
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def parse_field_selection(params: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Разбирает GET-параметры fields и include.
+
+    Args:
+        params: GET-параметры запроса.
+
+    Returns:
+        Optional[Dict[str, Any]]: None, если параметры не переданы (все поля), иначе поля заказа
+        ('order_fields') и поля позиций ('item_fields', None — позиции не выводятся).
+
+    Raises:
+        ValueError: Если указаны неизвестные поля.
+    """
+    fields: List[str] = split_param(params.get('fields', ''))
+    include: List[str] = split_param(params.get('include', ''))
+    if not fields and not include:
+        return None
+
+    order_fields: List[str] = fields or [name for name in constants.ORDER_FIELDS if name != 'items']
+    item_fields: Optional[List[str]] = list(constants.ORDER_ITEM_FIELDS) if 'items' in order_fields else None
+    unknown: List[str] = [name for name in order_fields if name not in constants.ORDER_FIELDS]
+    for name in include:
+        relation, _, item_field = name.partition('.')
+        if relation != 'items' or (item_field and item_field not in constants.ORDER_ITEM_FIELDS):
+            unknown.append(name)
+        elif not item_field:
+            item_fields = list(constants.ORDER_ITEM_FIELDS)
+        elif item_fields is None:
+            item_fields = [item_field]
+        elif item_field not in item_fields:
+            item_fields.append(item_field)
+    if unknown:
+        raise ValueError(constants.MESSAGES['fields_invalid'].format(
+            fields=', '.join(unknown),
+            order_fields=', '.join(constants.ORDER_FIELDS),
+            item_fields=', '.join(constants.ORDER_ITEM_FIELDS),
+        ))
+
+    order_fields = [name for name in order_fields if name != 'items']
+    if item_fields is not None:
+        order_fields.append('items')
+    return {'order_fields': order_fields, 'item_fields': item_fields}
+
+
+def get_items_prefetch(item_fields: List[str]) -> Prefetch:
+    """
+    Формирует предзагрузку позиций, загружающую только столбцы, нужные для указанных полей.
+
+    Args:
+        item_fields: Поля позиций.
+
+    Returns:
+        Prefetch: Предзагрузка позиций заказа.
+    """
+    columns: Set[str] = {'id', 'order'}
+    for name in item_fields:
+        columns.update(constants.ORDER_ITEM_FIELD_COLUMNS[name])
+    queryset: QuerySet[OrderItem] = OrderItem.objects.all()
+    if any(column.startswith('dish__') for column in columns):
+        queryset = queryset.select_related('dish')
+    return Prefetch('items', queryset=queryset.only(*columns))
+
+
+def apply_field_selection(queryset: QuerySet, selection: Optional[Dict[str, Any]]) -> QuerySet:
+    """
+    Сужает queryset заказов до полей, нужных для ответа.
+
+    Args:
+        queryset: Queryset заказов.
+        selection: Результат parse_field_selection (None — все поля).
+
+    Returns:
+        QuerySet: Queryset с ограниченным набором столбцов и предзагрузкой только нужных позиций.
+    """
+    if selection is None:
+        return queryset.prefetch_related(get_items_prefetch(constants.ORDER_ITEM_FIELDS))
+
+    order_fields: List[str] = selection['order_fields']
+    columns: Set[str] = {'id'}
+    for name in order_fields:
+        columns.update(constants.ORDER_FIELD_COLUMNS[name])
+    item_fields: List[str] = list(selection['item_fields'] or [])
+    if 'total_price' in order_fields:
+        item_fields.extend(constants.ORDER_TOTAL_PRICE_ITEM_FIELDS)
+    queryset = queryset.only(*columns)
+    if item_fields:
+        queryset = queryset.prefetch_related(get_items_prefetch(item_fields))
+    return queryset
+
+
+def parse_ids(params: Mapping[str, str]) -> Optional[List[int]]:
+    """
+    Разбирает GET-параметр ids для пакетного получения заказов.
+
+    Args:
+        params: GET-параметры запроса.
+
+    Returns:
+        Optional[List[int]]: Список id или None, если параметр не передан.
+
+    Raises:
+        ValueError: Если id не числовые или их больше ORDER_MULTI_GET_MAX_IDS.
+    """
+    values: List[str] = split_param(params.get('ids', ''))
+    if not values:
+        return None
+    if len(values) > constants.ORDER_MULTI_GET_MAX_IDS or not all(value.isdigit() for value in values):
+        raise ValueError(constants.MESSAGES['ids_invalid'].format(max_ids=constants.ORDER_MULTI_GET_MAX_IDS))
+    return [int(value) for value in values]
@@ -1,7 +1,8 @@
 from django import forms
+from django.db.models import Q
 
 from .constants import TABLE_NUMBERS, ORDER_STATUS_MAP, FORM_CONTROL_CLASS, MESSAGES, DEFAULT_QUANTITY
-from .models import Order, OrderItem
+from .models import Order, OrderItem, Dish
 from django.forms import inlineformset_factory
 from typing import List, Optional, Any, Tuple
 
@@ -65,7 +66,25 @@ class OrderForm(forms.ModelForm):
 class OrderItemForm(forms.ModelForm):
     """
     Форма для создания и редактирования позиций заказа.
+
+    В списке блюд доступны только блюда актуального меню; для существующей позиции
+    дополнительно сохраняется ее текущее блюдо, даже если оно уже перенесено в архив.
     """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Инициализирует форму позиции заказа.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+        """
+        super().__init__(*args, **kwargs)
+        if self.instance.pk and self.instance.dish_id:
+            self.fields['dish'].queryset = Dish.objects.filter(Q(is_archived=False) | Q(pk=self.instance.dish_id))
+        else:
+            self.fields['dish'].queryset = Dish.active.all()
+
     class Meta:
         """
         Метаданные формы.
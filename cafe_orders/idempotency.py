@@ -0,0 +1,242 @@
+"""
+Идемпотентность запросов API заказов по заголовку Idempotency-Key.
+
+Клиент (планшет) передает в заголовке Idempotency-Key уникальное значение для каждой операции
+и повторяет запрос с тем же значением при сбое сети. Ключи действуют в пределах клиента
+(пользователя или IP-адреса), поэтому одинаковые ключи разных клиентов не смешиваются. Первый
+ответ сохраняется на IDEMPOTENCY_KEY_TTL_HOURS часов; повторные запросы получают его из таблицы
+IdempotencyKey, не затрагивая таблицы заказов:
+    - тот же ключ и тот же запрос — сохраненный ответ с заголовком Idempotent-Replayed: true;
+    - тот же ключ, исходный запрос еще выполняется — 409;
+    - тот же ключ, другой метод, путь или тело — 422.
+Ответы с ошибкой сервера (5xx) не сохраняются, чтобы запрос можно было повторить. Резервирование без ответа
+старше IDEMPOTENCY_CLAIM_LEASE_SECONDS секунд (процесс исходного запроса завершился аварийно) перехватывается
+повторным запросом. Для операций над одним заказом ответ сохраняется в той же транзакции, что и изменения
+заказа, поэтому перехваченный запрос не повторяет уже зафиксированную операцию.
+"""
+
+import functools
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from django.db import IntegrityError, transaction
+from django.http import QueryDict
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import constants
+from .models import IdempotencyKey
+
+
+def get_request_hash(request: Request) -> str:
+    """
+    Вычисляет хэш запроса для сравнения повторов с исходным запросом.
+
+    Args:
+        request: Объект запроса DRF.
+
+    Returns:
+        str: SHA-256 метода, пути и тела запроса.
+    """
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b'\n')
+    digest.update(request.path.encode())
+    digest.update(b'\n')
+    try:
+        digest.update(request.body)
+    except RawPostDataException:
+        # Тело формы уже прочитано (проверкой CSRF при сессионной аутентификации) — хэшируются разобранные данные.
+        data: Any = request.data
+        if isinstance(data, QueryDict):
+            data = {field: data.getlist(field) for field in data}
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def get_lease_cutoff() -> datetime:
+    """
+    Возвращает момент, раньше которого резервирование без ответа считается брошенным.
+
+    Returns:
+        datetime: Текущее время минус IDEMPOTENCY_CLAIM_LEASE_SECONDS секунд.
+    """
+    return timezone.now() - timedelta(seconds=constants.IDEMPOTENCY_CLAIM_LEASE_SECONDS)
+
+
+def get_expiry_cutoff() -> datetime:
+    """
+    Возвращает момент, раньше которого сохраненные ключи считаются устаревшими.
+
+    Returns:
+        datetime: Текущее время минус IDEMPOTENCY_KEY_TTL_HOURS часов.
+    """
+    return timezone.now() - timedelta(hours=constants.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def get_client_id(request: Request) -> str:
+    """
+    Определяет клиента, в пределах которого действуют ключи идемпотентности.
+
+    Args:
+        request: Объект запроса DRF.
+
+    Returns:
+        str: "user:<id>" для аутентифицированных запросов, иначе "ip:<адрес>".
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"[:constants.IDEMPOTENCY_CLIENT_MAX_LENGTH]
+
+
+def claim_key(client: str, key: str, request_hash: str) -> Optional[IdempotencyKey]:
+    """
+    Резервирует ключ клиента за текущим запросом.
+
+    Устаревшая запись с тем же ключом удаляется, и ключ резервируется заново. Запись того же запроса
+    без ответа, зарезервированная раньше get_lease_cutoff(), перехватывается текущим запросом. Если запись,
+    помешавшая резервированию, удалена до ее чтения (исходный запрос завершился ошибкой),
+    резервирование повторяется до IDEMPOTENCY_CLAIM_ATTEMPTS раз; после этого запрос считается
+    конкурирующим с выполняющимся.
+
+    Args:
+        client: Клиент (результат get_client_id).
+        key: Значение заголовка Idempotency-Key.
+        request_hash: Хэш текущего запроса.
+
+    Returns:
+        Optional[IdempotencyKey]: None, если ключ зарезервирован текущим запросом, иначе существующая запись
+        (несохраненная запись без ответа, если ключ так и не удалось ни зарезервировать, ни прочитать).
+    """
+    IdempotencyKey.objects.filter(client=client, key=key, created_at__lt=get_expiry_cutoff()).delete()
+    for _ in range(constants.IDEMPOTENCY_CLAIM_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(client=client, key=key, request_hash=request_hash)
+        except IntegrityError:
+            existing: Optional[IdempotencyKey] = IdempotencyKey.objects.filter(client=client, key=key).first()
+            if existing is None:
+                continue
+            if (not existing.completed and existing.request_hash == request_hash
+                    and existing.claimed_at < get_lease_cutoff()):
+                # Условное обновление: брошенное резервирование перехватывает только один из повторов.
+                taken_over: int = IdempotencyKey.objects.filter(
+                    pk=existing.pk, completed=False, claimed_at=existing.claimed_at,
+                ).update(claimed_at=timezone.now())
+                if taken_over:
+                    return None
+                continue
+            return existing
+        return None
+    return IdempotencyKey(client=client, key=key, request_hash=request_hash, completed=False)
+
+
+def replay(record: IdempotencyKey, request_hash: str) -> Response:
+    """
+    Формирует ответ на повторный запрос по существующей записи.
+
+    Args:
+        record: Запись с тем же ключом.
+        request_hash: Хэш текущего запроса.
+
+    Returns:
+        Response: Сохраненный ответ, 422 при несовпадении запроса или 409, если исходный запрос еще выполняется.
+    """
+    if record.request_hash != request_hash:
+        return Response({'status': constants.MESSAGES['idempotency_key_mismatch']},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    if not record.completed:
+        return Response({'status': constants.MESSAGES['idempotency_key_in_progress']},
+                        status=status.HTTP_409_CONFLICT)
+    response: Response = Response(record.response_data, status=record.status_code)
+    response[constants.IDEMPOTENCY_REPLAYED_HEADER] = 'true'
+    return response
+
+
+def save_response(client: str, key: str, response: Response) -> None:
+    """
+    Сохраняет ответ в зарезервированную запись ключа.
+
+    Args:
+        client: Клиент (результат get_client_id).
+        key: Значение заголовка Idempotency-Key.
+        response: Ответ исходного запроса.
+    """
+    IdempotencyKey.objects.filter(client=client, key=key).update(
+        completed=True, status_code=response.status_code,
+        # Данные сохраняются в том виде, в котором их отдает JSONRenderer, чтобы повтор совпадал с ответом.
+        response_data=json.loads(json.dumps(response.data, cls=JSONEncoder)),
+    )
+
+
+def idempotent(view_method: Optional[Callable[..., Response]] = None, *,
+               atomic: bool = True) -> Callable[..., Any]:
+    """
+    Декоратор метода ViewSet, выполняющий запрос не более одного раза на Idempotency-Key.
+
+    Запросы без заголовка выполняются как обычно. Применяется как @idempotent или @idempotent(atomic=False).
+
+    Args:
+        view_method: Метод ViewSet (create, update, action).
+        atomic: Выполнять метод и сохранение ответа в одной транзакции. False — для порционных действий
+            (delete_all, archive), которые фиксируют изменения несколькими транзакциями: брошенное
+            резервирование такого действия после перехвата выполняется повторно.
+
+    Returns:
+        Callable[..., Any]: Обернутый метод (или декоратор, если метод не передан).
+    """
+    if view_method is None:
+        return functools.partial(idempotent, atomic=atomic)
+
+    @functools.wraps(view_method)
+    def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+        key: Optional[str] = request.META.get(constants.IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > constants.IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response({'status': constants.MESSAGES['idempotency_key_invalid'].format(
+                max_length=constants.IDEMPOTENCY_KEY_MAX_LENGTH)}, status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash: str = get_request_hash(request)
+        client: str = get_client_id(request)
+        existing: Optional[IdempotencyKey] = claim_key(client, key, request_hash)
+        if existing is not None:
+            return replay(existing, request_hash)
+
+        try:
+            if atomic:
+                with transaction.atomic():
+                    response: Response = view_method(self, request, *args, **kwargs)
+                    if response.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                        save_response(client, key, response)
+            else:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    save_response(client, key, response)
+        except Exception:
+            IdempotencyKey.objects.filter(client=client, key=key).delete()
+            raise
+        if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            IdempotencyKey.objects.filter(client=client, key=key).delete()
+        return response
+
+    return wrapper
+
+
+def purge_idempotency_keys() -> int:
+    """
+    Удаляет ключи идемпотентности старше IDEMPOTENCY_KEY_TTL_HOURS часов.
+
+    Returns:
+        int: Количество удаленных ключей.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=get_expiry_cutoff()).delete()
+    return deleted
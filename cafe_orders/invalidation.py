@@ -0,0 +1,201 @@
+"""
+Шина сброса локальных кэшей рабочих процессов.
+
+Кэши приложения (например, детали заказов) хранятся в памяти процесса, поэтому изменение,
+сделанное в одном рабочем процессе, не видно остальным. Код, изменяющий данные, публикует
+сброс в таблицу CacheInvalidation в той же транзакции, что и само изменение; после фиксации
+транзакции сброс сразу применяется в текущем процессе. Перед чтением локального кэша
+процесс вызывает bus.poll(): не чаще раза в INVALIDATION_POLL_INTERVAL секунд новые записи
+журнала читаются одним запросом по первичному ключу и передаются обработчикам кэшей. Внешний
+брокер сообщений не нужен: журнал хранится в общей базе данных.
+
+Процесс, отставший от журнала больше чем на INVALIDATION_POLL_BATCH записей или не читавший
+его дольше срока хранения записей, сбрасывает свои кэши целиком.
+"""
+
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import constants
+from .metrics import registry
+
+Handler = Callable[[Optional[List[str]]], None]
+
+
+def get_poll_interval() -> float:
+    """
+    Возвращает минимальный интервал между чтениями журнала сброса кэшей.
+
+    Returns:
+        float: Интервал в секундах (0 — журнал читается при каждом запросе).
+    """
+    return float(getattr(settings, 'INVALIDATION_POLL_INTERVAL', 1.0))
+
+
+def get_log_model() -> Type[models.Model]:
+    """
+    Возвращает модель журнала сброса кэшей.
+
+    Модель загружается через реестр приложений, так как модули кэшей, использующие шину,
+    импортируются из models.py.
+
+    Returns:
+        Type[models.Model]: Модель CacheInvalidation.
+    """
+    return apps.get_model('cafe_orders', 'CacheInvalidation')
+
+
+class InvalidationBus:
+    """
+    Публикует сбросы кэшей и применяет сбросы, опубликованные другими процессами.
+
+    Обработчик области вызывается со списком сброшенных ключей или с None, если сбрасывается
+    вся область. Обработчики должны быть идемпотентными: один и тот же сброс может быть
+    применен повторно.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует шину без обработчиков; позиция в журнале определяется при первом чтении.
+        """
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.lock: threading.Lock = threading.Lock()
+        self.last_id: Optional[int] = None
+        self.last_poll: float = 0.0
+        self.own_ids: Set[int] = set()
+
+    def subscribe(self, scope: str, handler: Handler) -> None:
+        """
+        Регистрирует обработчик сбросов области.
+
+        Args:
+            scope: Область кэша.
+            handler: Функция, сбрасывающая данные кэша по списку ключей (None — вся область).
+        """
+        self.handlers.setdefault(scope, []).append(handler)
+
+    def dispatch(self, scope: str, keys: Optional[List[str]], source: str) -> None:
+        """
+        Вызывает обработчики области.
+
+        Args:
+            scope: Область кэша.
+            keys: Сброшенные ключи или None (вся область).
+            source: Источник сброса для метрик ('local' или 'bus').
+        """
+        for handler in self.handlers.get(scope, []):
+            handler(keys)
+        registry.inc('cafe_cache_invalidations_total', {'scope': scope, 'source': source})
+
+    def publish(self, scope: str, keys: Optional[Iterable[Any]] = None) -> None:
+        """
+        Записывает сброс в журнал в текущей транзакции и применяет его в процессе после фиксации.
+
+        Если ключей больше INVALIDATION_MAX_KEYS, записывается сброс всей области.
+
+        Args:
+            scope: Область кэша.
+            keys: Сбрасываемые ключи (None — вся область).
+        """
+        key_list: Optional[List[str]] = None if keys is None else list(dict.fromkeys(str(key) for key in keys))
+        if key_list == []:
+            return
+        if key_list is not None and len(key_list) > constants.INVALIDATION_MAX_KEYS:
+            key_list = None
+        model: Type[models.Model] = get_log_model()
+        rows: List[models.Model] = model.objects.bulk_create(
+            [model(scope=scope, key=key) for key in key_list or ['']])
+        ids: List[int] = [row.pk for row in rows if row.pk is not None]
+
+        def apply() -> None:
+            with self.lock:
+                self.own_ids.update(ids)
+            self.dispatch(scope, key_list, 'local')
+
+        transaction.on_commit(apply)
+
+    def reset(self) -> None:
+        """
+        Сбрасывает все области, для которых зарегистрированы обработчики.
+        """
+        for scope in list(self.handlers):
+            self.dispatch(scope, None, 'bus')
+
+    def poll(self, force: bool = False) -> int:
+        """
+        Читает новые записи журнала и применяет сбросы, опубликованные другими процессами.
+
+        Args:
+            force: Читать журнал, даже если интервал чтения еще не прошел.
+
+        Returns:
+            int: Количество прочитанных записей журнала.
+        """
+        now: float = time.monotonic()
+        if not force and now - self.last_poll < get_poll_interval():
+            return 0
+        if not self.lock.acquire(blocking=force):
+            return 0
+        try:
+            idle: float = now - self.last_poll
+            self.last_poll = now
+            model: Type[models.Model] = get_log_model()
+            if self.last_id is None or idle > constants.INVALIDATION_RETENTION_SECONDS:
+                if self.last_id is not None:
+                    self.reset()
+                self.last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+                self.own_ids.clear()
+                return 0
+
+            rows: List[Tuple[int, str, str]] = list(
+                model.objects.filter(id__gt=self.last_id).order_by('id')
+                .values_list('id', 'scope', 'key')[:constants.INVALIDATION_POLL_BATCH]
+            )
+            if len(rows) == constants.INVALIDATION_POLL_BATCH:
+                self.reset()
+                self.last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+                self.own_ids.clear()
+                return len(rows)
+
+            changes: Dict[str, Optional[Set[str]]] = {}
+            for row_id, scope, key in rows:
+                if row_id in self.own_ids:
+                    continue
+                if not key:
+                    changes[scope] = None
+                elif changes.get(scope, set()) is not None:
+                    changes.setdefault(scope, set()).add(key)
+            if rows:
+                self.last_id = rows[-1][0]
+                self.own_ids = {row_id for row_id in self.own_ids if row_id > self.last_id}
+            for scope, keys in changes.items():
+                self.dispatch(scope, None if keys is None else sorted(keys), 'bus')
+            return len(rows)
+        finally:
+            self.lock.release()
+
+
+bus: InvalidationBus = InvalidationBus()
+
+
+def purge_invalidations(max_age: int = constants.INVALIDATION_RETENTION_SECONDS) -> int:
+    """
+    Удаляет записи журнала сброса кэшей, прочитанные всеми работающими процессами.
+
+    Args:
+        max_age: Возраст записи в секундах, после которого она удаляется.
+
+    Returns:
+        int: Количество удаленных записей.
+    """
+    deleted, _ = get_log_model().objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=max_age)).delete()
+    return deleted
@@ -0,0 +1,343 @@
+"""
+Фоновые задания отчетов и выгрузок.
+
+Запрос к API только проверяет параметры и ставит задание в таблицу ReportJob, поэтому
+время ответа не зависит от объема отчета. Задания выполняет ограниченный пул потоков
+процесса (REPORT_JOB_WORKERS потоков) и/или отдельный процесс команды run_jobs. Задание
+захватывается условным UPDATE (queued -> running), поэтому одно задание не выполняется
+дважды, даже если его одновременно видят пул и команда. Пул при запуске возвращает в очередь
+задания, прерванные перезапуском процесса, и выполняет ожидающие задания. Файлы выгрузок
+записываются в REPORT_JOBS_DIR, результаты остальных заданий хранятся в таблице; завершенные
+задания вместе с файлами удаляет purge_report_jobs.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import constants
+from .analytics import build_analytics, parse_analytics_params
+from .exports import get_export_querysets, iter_export, parse_export_params
+from .models import ReportJob
+from .reports import get_paid_revenue
+
+logger: logging.Logger = logging.getLogger(constants.REPORT_JOB_LOGGER_NAME)
+
+executor_lock: threading.Lock = threading.Lock()
+executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_worker_count() -> int:
+    """
+    Возвращает количество потоков процесса для фоновых заданий.
+
+    Returns:
+        int: Количество потоков (0 — задания выполняет только команда run_jobs).
+    """
+    return int(getattr(settings, 'REPORT_JOB_WORKERS', 0) or 0)
+
+
+def get_jobs_dir() -> str:
+    """
+    Возвращает каталог файлов результатов заданий.
+
+    Returns:
+        str: Путь к каталогу.
+    """
+    return getattr(settings, 'REPORT_JOBS_DIR', '')
+
+
+def get_result_path(job: ReportJob) -> str:
+    """
+    Возвращает путь к файлу результата задания.
+
+    Args:
+        job: Задание с результатом-файлом.
+
+    Returns:
+        str: Путь к файлу.
+    """
+    return os.path.join(get_jobs_dir(), job.result['file'])
+
+
+def parse_job_params(kind: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Проверяет параметры задания и приводит их к виду, сохраняемому в таблице.
+
+    Args:
+        kind: Тип задания.
+        params: Параметры запроса.
+
+    Returns:
+        Dict[str, Any]: Проверенные параметры (даты в формате ГГГГ-ММ-ДД).
+
+    Raises:
+        ValueError: Если тип задания неизвестен или параметры некорректны.
+    """
+    if not isinstance(params, Mapping):
+        raise ValueError(constants.MESSAGES['report_job_params_invalid'])
+    if kind == constants.REPORT_JOB_KIND_EXPORT:
+        parsed: Dict[str, Any] = parse_export_params(params)
+    elif kind == constants.REPORT_JOB_KIND_ANALYTICS:
+        parsed = parse_analytics_params(params)
+    elif kind == constants.REPORT_JOB_KIND_REVENUE:
+        parsed = {}
+    else:
+        raise ValueError(constants.MESSAGES['report_job_kind_invalid'].format(
+            kind=kind, choices=', '.join(dict(constants.REPORT_JOB_KIND_CHOICES))))
+    return {name: value.isoformat() if isinstance(value, date) else value for name, value in parsed.items()}
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """
+    Преобразует сохраненную дату параметров задания.
+
+    Args:
+        value: Дата в формате ГГГГ-ММ-ДД или None.
+
+    Returns:
+        Optional[date]: Дата или None.
+    """
+    return date.fromisoformat(value) if value else None
+
+
+def run_export_job(job: ReportJob) -> Dict[str, Any]:
+    """
+    Записывает выгрузку заказов в файл результата.
+
+    Args:
+        job: Задание выгрузки.
+
+    Returns:
+        Dict[str, Any]: Имя файла ('file'), тип содержимого ('content_type') и размер в байтах ('size').
+    """
+    params: Dict[str, Any] = job.params
+    querysets = get_export_querysets(params['status'], parse_date(params['date_from']), parse_date(params['date_to']))
+    filename: str = constants.REPORT_JOB_FILE_FORMAT.format(id=job.id, extension=params['file_format'])
+    os.makedirs(get_jobs_dir(), exist_ok=True)
+    path: str = os.path.join(get_jobs_dir(), filename)
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        for chunk in iter_export(params['file_format'], querysets):
+            output.write(chunk)
+    return {'file': filename, 'content_type': constants.EXPORT_CONTENT_TYPES[params['file_format']],
+            'size': os.path.getsize(path)}
+
+
+def run_analytics_job(job: ReportJob) -> Dict[str, Any]:
+    """
+    Строит аналитику меню за период.
+
+    Args:
+        job: Задание аналитики.
+
+    Returns:
+        Dict[str, Any]: Аналитика (см. analytics.build_analytics).
+    """
+    return build_analytics(parse_date(job.params['date_from']), parse_date(job.params['date_to']), job.params['top'])
+
+
+def run_revenue_job(job: ReportJob) -> Dict[str, Any]:
+    """
+    Вычисляет выручку от оплаченных заказов с учетом архива.
+
+    Args:
+        job: Задание выручки.
+
+    Returns:
+        Dict[str, Any]: Выручка ('revenue').
+    """
+    return {'revenue': str(get_paid_revenue())}
+
+
+JOB_HANDLERS: Dict[str, Callable[[ReportJob], Dict[str, Any]]] = {
+    constants.REPORT_JOB_KIND_EXPORT: run_export_job,
+    constants.REPORT_JOB_KIND_ANALYTICS: run_analytics_job,
+    constants.REPORT_JOB_KIND_REVENUE: run_revenue_job,
+}
+
+
+def is_queue_full() -> bool:
+    """
+    Проверяет, достигнуто ли максимальное количество заданий в очереди.
+
+    Returns:
+        bool: True, если новые задания не принимаются.
+    """
+    return ReportJob.objects.filter(status=constants.REPORT_JOB_QUEUED).count() >= constants.REPORT_JOB_MAX_QUEUED
+
+
+def recover_jobs() -> List[int]:
+    """
+    Возвращает в очередь зависшие задания и находит задания, ожидающие выполнения.
+
+    Вызывается при запуске пула потоков процесса: задания, переданные пулу до перезапуска
+    процесса, иначе остались бы в очереди или в выполнении.
+
+    Returns:
+        List[int]: Идентификаторы заданий в очереди в порядке постановки.
+    """
+    requeued: int = requeue_stale_jobs()
+    if requeued:
+        logger.warning(constants.MESSAGES['report_jobs_requeued'].format(count=requeued))
+    return list(ReportJob.objects.filter(status=constants.REPORT_JOB_QUEUED)
+                .order_by('id').values_list('id', flat=True))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков процесса, создавая его при первом обращении.
+
+    Созданному пулу передаются задания, ожидающие выполнения (см. recover_jobs).
+
+    Returns:
+        ThreadPoolExecutor: Пул из REPORT_JOB_WORKERS потоков.
+    """
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=get_worker_count(), thread_name_prefix='report-job')
+            for job_id in recover_jobs():
+                executor.submit(run_job_in_worker, job_id)
+        return executor
+
+
+def submit_job(kind: str, params: Mapping[str, Any]) -> ReportJob:
+    """
+    Ставит задание в очередь и, если пул потоков процесса включен, передает его пулу после фиксации транзакции.
+
+    Args:
+        kind: Тип задания.
+        params: Параметры запроса.
+
+    Returns:
+        ReportJob: Созданное задание.
+
+    Raises:
+        ValueError: Если тип задания неизвестен или параметры некорректны.
+    """
+    job: ReportJob = ReportJob.objects.create(kind=kind, params=parse_job_params(kind, params))
+    if get_worker_count() > 0:
+        transaction.on_commit(lambda: get_executor().submit(run_job_in_worker, job.id))
+    return job
+
+
+def claim_job(job_id: int) -> bool:
+    """
+    Переводит задание из очереди в выполнение.
+
+    Args:
+        job_id: Идентификатор задания.
+
+    Returns:
+        bool: True, если задание захвачено этим вызовом.
+    """
+    return bool(ReportJob.objects.filter(id=job_id, status=constants.REPORT_JOB_QUEUED)
+                .update(status=constants.REPORT_JOB_RUNNING, started_at=timezone.now()))
+
+
+def run_job(job_id: int) -> Optional[str]:
+    """
+    Захватывает и выполняет задание, сохраняя результат или текст ошибки.
+
+    Args:
+        job_id: Идентификатор задания.
+
+    Returns:
+        Optional[str]: Итоговое состояние задания или None, если задание уже захвачено другим исполнителем.
+    """
+    if not claim_job(job_id):
+        return None
+    job: ReportJob = ReportJob.objects.get(id=job_id)
+    try:
+        result: Dict[str, Any] = JOB_HANDLERS[job.kind](job)
+    except Exception as e:
+        logger.exception("Задание %s завершилось с ошибкой", job_id)
+        ReportJob.objects.filter(id=job_id).update(
+            status=constants.REPORT_JOB_FAILED, error=str(e), finished_at=timezone.now())
+        return constants.REPORT_JOB_FAILED
+    ReportJob.objects.filter(id=job_id).update(
+        status=constants.REPORT_JOB_DONE, result=result, finished_at=timezone.now())
+    return constants.REPORT_JOB_DONE
+
+
+def run_job_in_worker(job_id: int) -> Optional[str]:
+    """
+    Выполняет задание в потоке пула и закрывает соединения с базой данных этого потока.
+
+    Args:
+        job_id: Идентификатор задания.
+
+    Returns:
+        Optional[str]: Итоговое состояние задания (см. run_job).
+    """
+    try:
+        return run_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def requeue_stale_jobs(max_age: int = constants.REPORT_JOB_STALE_SECONDS) -> int:
+    """
+    Возвращает в очередь задания, выполнение которых прервалось (например, при перезапуске процесса).
+
+    Args:
+        max_age: Время выполнения в секундах, после которого задание считается зависшим.
+
+    Returns:
+        int: Количество возвращенных в очередь заданий.
+    """
+    return ReportJob.objects.filter(
+        status=constants.REPORT_JOB_RUNNING, started_at__lt=timezone.now() - timedelta(seconds=max_age),
+    ).update(status=constants.REPORT_JOB_QUEUED, started_at=None)
+
+
+def purge_report_jobs(max_age: int = constants.REPORT_JOB_RETENTION_SECONDS) -> int:
+    """
+    Удаляет завершенные задания и файлы их результатов.
+
+    Args:
+        max_age: Время после завершения задания в секундах, после которого оно удаляется.
+
+    Returns:
+        int: Количество удаленных заданий.
+    """
+    finished: QuerySet = ReportJob.objects.filter(
+        status__in=[constants.REPORT_JOB_DONE, constants.REPORT_JOB_FAILED],
+        finished_at__lt=timezone.now() - timedelta(seconds=max_age),
+    )
+    for job in finished.filter(kind=constants.REPORT_JOB_KIND_EXPORT, status=constants.REPORT_JOB_DONE).iterator():
+        try:
+            os.remove(get_result_path(job))
+        except FileNotFoundError:
+            pass
+    deleted, _ = finished.delete()
+    return deleted
+
+
+def run_pending_jobs(workers: int = 1, limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Выполняет задания, находящиеся в очереди, в порядке постановки.
+
+    Args:
+        workers: Количество потоков (1 — задания выполняются в текущем потоке).
+        limit: Максимальное количество заданий (по умолчанию все).
+
+    Returns:
+        Dict[str, int]: Количество выполненных ('done') и завершившихся с ошибкой ('failed') заданий.
+    """
+    job_ids: List[int] = list(ReportJob.objects.filter(status=constants.REPORT_JOB_QUEUED)
+                              .order_by('id').values_list('id', flat=True)[:limit])
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-job') as pool:
+            statuses: List[Optional[str]] = list(pool.map(run_job_in_worker, job_ids))
+    else:
+        statuses = [run_job(job_id) for job_id in job_ids]
+    return {'done': statuses.count(constants.REPORT_JOB_DONE), 'failed': statuses.count(constants.REPORT_JOB_FAILED)}
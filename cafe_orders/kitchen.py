@@ -0,0 +1,77 @@
+"""
+Очередь кухни: сколько порций каждого блюда осталось приготовить.
+
+Модель чтения KitchenQueueEntry обновляется приращениями при записи событий журнала заказов
+(создание заказа, изменение позиций, смена статуса) и при удалении заказов, поэтому очередь
+читается одним запросом. После загрузки данных в обход журнала (генератор данных, ручные
+правки) очередь пересчитывается по таблицам заказов функцией rebuild_kitchen_queue.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Sum
+
+from . import constants
+from .models import KitchenQueueEntry, OrderItem
+
+
+def get_pending_quantities(snapshot: Optional[Dict[str, Any]]) -> Counter:
+    """
+    Возвращает количество порций блюд заказа, которые нужно приготовить.
+
+    Args:
+        snapshot: Состояние заказа (результат events.snapshot_order) или None.
+
+    Returns:
+        Counter: Количество порций по идентификаторам блюд (пусто, если заказ не в ожидании).
+    """
+    quantities: Counter = Counter()
+    if snapshot is not None and snapshot['status'] == constants.DEFAULT_ORDER_STATUS:
+        for item in snapshot['items']:
+            quantities[item['dish_id']] += item['quantity']
+    return quantities
+
+
+def apply_order_change(before: Optional[Dict[str, Any]], after: Dict[str, Any]) -> None:
+    """
+    Обновляет очередь кухни по изменению состояния заказа.
+
+    Args:
+        before: Состояние заказа до изменения (None — заказ создан).
+        after: Состояние заказа после изменения.
+    """
+    old: Counter = get_pending_quantities(before)
+    new: Counter = get_pending_quantities(after)
+    KitchenQueueEntry.add({dish_id: new[dish_id] - old[dish_id] for dish_id in old.keys() | new.keys()})
+
+
+def get_kitchen_queue() -> List[Dict[str, Any]]:
+    """
+    Возвращает очередь кухни одним запросом.
+
+    Returns:
+        List[Dict[str, Any]]: Блюда ('dish_id', 'dish') и количество порций ('quantity'), по названию блюда.
+    """
+    return [
+        {'dish_id': row['dish_id'], 'dish': row['dish__name'], 'quantity': row['quantity']}
+        for row in KitchenQueueEntry.objects.filter(quantity__gt=0).order_by('dish__name')
+        .values('dish_id', 'dish__name', 'quantity')
+    ]
+
+
+def rebuild_kitchen_queue() -> int:
+    """
+    Пересчитывает очередь кухни по позициям заказов в ожидании.
+
+    Returns:
+        int: Количество блюд в очереди.
+    """
+    rows = (OrderItem.objects.filter(order__status=constants.DEFAULT_ORDER_STATUS)
+            .values('dish_id').annotate(total=Sum('quantity')))
+    with transaction.atomic():
+        KitchenQueueEntry.objects.all().delete()
+        entries: List[KitchenQueueEntry] = KitchenQueueEntry.objects.bulk_create(
+            KitchenQueueEntry(dish_id=row['dish_id'], quantity=row['total']) for row in rows)
+    return len(entries)
@@ -0,0 +1,416 @@
+"""
+Замкнутый нагрузочный генератор, имитирующий смену в кафе.
+
+Каждый участник (официант, кухонный экран, менеджер) выполняется в отдельном потоке и
+отправляет следующий запрос только после получения ответа на предыдущий (closed loop).
+Официанты проходят полный жизненный цикл заказа через OrderViewSet: создание, изменение
+состава, ожидание готовности и оплата. Кухонные экраны забирают заказы в ожидании и
+отмечают их готовыми, менеджер периодически открывает страницу выручки.
+
+Запросы выполняются либо в процессе через тестовый клиент Django, либо по HTTP к
+запущенному серверу.
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from . import constants
+from .benchmarks import percentile
+
+
+class LoadStats:
+    """
+    Потокобезопасный сборщик статистики по эндпоинтам.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует пустую статистику.
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._lock_errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, elapsed_ms: float, ok: bool, lock_error: bool = False) -> None:
+        """
+        Регистрирует результат одного запроса.
+
+        Args:
+            endpoint: Имя эндпоинта.
+            elapsed_ms: Время выполнения запроса в миллисекундах.
+            ok: Признак успешного ответа.
+            lock_error: Признак ошибки блокировки базы данных.
+        """
+        with self._lock:
+            self._latencies[endpoint].append(elapsed_ms)
+            if not ok:
+                self._errors[endpoint] += 1
+            if lock_error:
+                self._lock_errors[endpoint] += 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Формирует сводку по эндпоинтам.
+
+        Args:
+            duration: Фактическая длительность прогона в секундах.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Для каждого эндпоинта: число запросов, пропускная способность (запросов/с),
+            p50/p99 задержки в миллисекундах, число ошибок и ошибок блокировки.
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': len(latencies),
+                    'throughput': round(len(latencies) / duration, 2) if duration else 0.0,
+                    'p50_ms': round(percentile(latencies, 50), 3),
+                    'p99_ms': round(percentile(latencies, 99), 3),
+                    'errors': self._errors[endpoint],
+                    'lock_errors': self._lock_errors[endpoint],
+                }
+                for endpoint, latencies in sorted(self._latencies.items())
+            }
+
+
+def is_lock_error(text: str) -> bool:
+    """
+    Определяет, вызвана ли ошибка блокировкой базы данных.
+
+    Args:
+        text: Текст ответа или исключения.
+
+    Returns:
+        bool: True, если текст указывает на блокировку.
+    """
+    lowered: str = text.lower()
+    return any(marker in lowered for marker in constants.LOADGEN_LOCK_ERROR_MARKERS)
+
+
+class ClientTransport:
+    """
+    Выполняет запросы в текущем процессе через тестовый клиент Django.
+    """
+
+    def __init__(self) -> None:
+        """
+        Создает отдельный клиент для потока участника.
+        """
+        self.client: Client = Client()
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> Tuple[int, Any, str]:
+        """
+        Выполняет запрос.
+
+        Args:
+            method: HTTP-метод в нижнем регистре.
+            path: Путь запроса.
+            data: Тело запроса в виде JSON-совместимого словаря.
+
+        Returns:
+            Tuple[int, Any, str]: Код ответа, разобранное JSON-тело (или None) и текст ответа.
+        """
+        if method == 'get':
+            response = self.client.get(path)
+        else:
+            response = getattr(self.client, method)(path, data=json.dumps(data or {}),
+                                                    content_type='application/json')
+        text: str = response.content.decode('utf-8', errors='replace')
+        body: Any = response.json() if 'json' in response.get('Content-Type', '') and text else None
+        return response.status_code, body, text
+
+    def close(self) -> None:
+        """
+        Закрывает соединения с базой данных, открытые потоком.
+        """
+        connections.close_all()
+
+
+class HttpTransport:
+    """
+    Выполняет запросы по HTTP к запущенному серверу.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        """
+        Инициализирует транспорт.
+
+        Args:
+            base_url: Базовый URL сервера, например http://127.0.0.1:8000.
+        """
+        self.base_url: str = base_url.rstrip('/')
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> Tuple[int, Any, str]:
+        """
+        Выполняет запрос.
+
+        Args:
+            method: HTTP-метод в нижнем регистре.
+            path: Путь запроса.
+            data: Тело запроса в виде JSON-совместимого словаря.
+
+        Returns:
+            Tuple[int, Any, str]: Код ответа, разобранное JSON-тело (или None) и текст ответа.
+        """
+        payload: Optional[bytes] = json.dumps(data).encode('utf-8') if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=payload, method=method.upper(),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=constants.LOADGEN_REQUEST_TIMEOUT) as response:
+                status_code: int = response.status
+                content_type: str = response.headers.get('Content-Type', '')
+                text: str = response.read().decode('utf-8', errors='replace')
+        except urllib.error.HTTPError as e:
+            status_code = e.code
+            content_type = e.headers.get('Content-Type', '')
+            text = e.read().decode('utf-8', errors='replace')
+        body: Any = json.loads(text) if 'json' in content_type and text else None
+        return status_code, body, text
+
+    def close(self) -> None:
+        """
+        HTTP-транспорт не удерживает ресурсов.
+        """
+
+
+class Actor:
+    """
+    Базовый участник смены: выполняет запросы и учитывает их в статистике.
+    """
+
+    def __init__(self, transport: Any, stats: LoadStats, deadline: float, rng: random.Random,
+                 think_time: float) -> None:
+        """
+        Инициализирует участника.
+
+        Args:
+            transport: Транспорт для выполнения запросов.
+            stats: Общий сборщик статистики.
+            deadline: Момент окончания смены по time.monotonic().
+            rng: Генератор случайных чисел участника.
+            think_time: Пауза между действиями в секундах.
+        """
+        self.transport = transport
+        self.stats = stats
+        self.deadline = deadline
+        self.rng = rng
+        self.think_time = think_time
+
+    def active(self) -> bool:
+        """
+        Проверяет, продолжается ли смена.
+
+        Returns:
+            bool: True, если время смены не истекло.
+        """
+        return time.monotonic() < self.deadline
+
+    def pause(self, seconds: float) -> None:
+        """
+        Делает паузу, если она ненулевая.
+
+        Args:
+            seconds: Длительность паузы в секундах.
+        """
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def call(self, endpoint: str, method: str, path: str,
+             data: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        """
+        Выполняет запрос и регистрирует задержку, ошибки и ошибки блокировки.
+
+        Args:
+            endpoint: Имя эндпоинта для статистики.
+            method: HTTP-метод в нижнем регистре.
+            path: Путь запроса.
+            data: Тело запроса.
+
+        Returns:
+            Tuple[int, Any]: Код ответа (0 при исключении) и разобранное JSON-тело.
+        """
+        started: float = time.perf_counter()
+        try:
+            status_code, body, text = self.transport.request(method, path, data)
+        except Exception as e:
+            self.stats.record(endpoint, (time.perf_counter() - started) * 1000, ok=False,
+                              lock_error=is_lock_error(str(e)))
+            return 0, None
+        ok: bool = status_code < 400
+        self.stats.record(endpoint, (time.perf_counter() - started) * 1000, ok=ok,
+                          lock_error=not ok and is_lock_error(text))
+        return status_code, body
+
+    def run(self) -> None:
+        """
+        Выполняет действия участника до окончания смены.
+        """
+        raise NotImplementedError
+
+
+class Waiter(Actor):
+    """
+    Официант: создает заказ, меняет его состав, ждет готовности и проводит оплату.
+    """
+
+    def __init__(self, *args: Any, dish_names: List[str], **kwargs: Any) -> None:
+        """
+        Инициализирует официанта.
+
+        Args:
+            *args: Аргументы Actor.
+            dish_names: Названия блюд, доступных для заказа.
+            **kwargs: Именованные аргументы Actor.
+        """
+        super().__init__(*args, **kwargs)
+        self.dish_names = dish_names
+
+    def random_items(self) -> List[Dict[str, Any]]:
+        """
+        Формирует случайный состав заказа.
+
+        Returns:
+            List[Dict[str, Any]]: Позиции заказа для API.
+        """
+        count: int = self.rng.randint(1, min(constants.LOADGEN_MAX_ITEMS, len(self.dish_names)))
+        return [{'dish': name, 'quantity': self.rng.randint(1, 3)} for name in self.rng.sample(self.dish_names, count)]
+
+    def run(self) -> None:
+        """
+        Повторяет жизненный цикл заказа до окончания смены.
+        """
+        list_path: str = reverse('order-list')
+        while self.active():
+            status_code, order = self.call('api_create', 'post', list_path, {
+                'table_number': self.rng.choice(list(constants.TABLE_NUMBERS)),
+                'status': constants.DEFAULT_ORDER_STATUS,
+                'items': self.random_items(),
+            })
+            if status_code != 201:
+                self.pause(constants.LOADGEN_POLL_INTERVAL)
+                continue
+            detail_path: str = reverse('order-detail', args=[order['id']])
+            self.pause(self.think_time)
+            self.call('api_edit_items', 'patch', detail_path, {'items': self.random_items()})
+
+            ready: bool = False
+            while self.active() and not ready:
+                self.pause(max(self.think_time, constants.LOADGEN_POLL_INTERVAL))
+                status_code, data = self.call('api_retrieve', 'get', detail_path)
+                ready = status_code == 200 and data['status'] == 'ready'
+            if ready:
+                self.call('api_pay', 'patch', detail_path, {'status': 'paid'})
+            self.pause(self.think_time)
+
+
+class KitchenScreen(Actor):
+    """
+    Кухонный экран: получает заказы в ожидании и отмечает самый старый готовым.
+    """
+
+    def run(self) -> None:
+        """
+        Обрабатывает очередь кухни до окончания смены.
+        """
+        queue_path: str = reverse('order-list') + '?status=' + quote(constants.ORDER_STATUS_CHOICES[0][1])
+        while self.active():
+            status_code, orders = self.call('kitchen_queue', 'get', queue_path)
+            if status_code != 200 or not orders:
+                self.pause(max(self.think_time, constants.LOADGEN_POLL_INTERVAL))
+                continue
+            oldest: Dict[str, Any] = min(orders, key=lambda order: order['id'])
+            self.call('kitchen_ready', 'patch', reverse('order-detail', args=[oldest['id']]), {'status': 'ready'})
+            self.pause(self.think_time)
+
+
+class Manager(Actor):
+    """
+    Менеджер смены: периодически проверяет выручку.
+    """
+
+    def run(self) -> None:
+        """
+        Открывает страницу выручки до окончания смены.
+        """
+        revenue_path: str = reverse('calculate_revenue')
+        while self.active():
+            self.call('revenue', 'get', revenue_path)
+            self.pause(max(self.think_time, constants.LOADGEN_POLL_INTERVAL))
+
+
+def run_simulation(transport_factory: Callable[[], Any], dish_names: List[str],
+                   waiters: int = constants.LOADGEN_WAITERS, kitchens: int = constants.LOADGEN_KITCHENS,
+                   managers: int = constants.LOADGEN_MANAGERS, duration: float = constants.LOADGEN_DURATION,
+                   think_time: float = constants.LOADGEN_THINK_TIME,
+                   seed: int = constants.BENCHMARK_SEED) -> Dict[str, Any]:
+    """
+    Запускает участников смены в отдельных потоках и собирает статистику.
+
+    Args:
+        transport_factory: Функция, создающая транспорт для каждого участника.
+        dish_names: Названия блюд, доступных для заказа.
+        waiters: Количество официантов.
+        kitchens: Количество кухонных экранов.
+        managers: Количество менеджеров.
+        duration: Длительность смены в секундах.
+        think_time: Пауза между действиями участника в секундах.
+        seed: Начальное значение генераторов случайных чисел участников.
+
+    Returns:
+        Dict[str, Any]: Фактическая длительность ('duration'), сводка по эндпоинтам ('endpoints')
+        и общие итоги ('total').
+
+    Raises:
+        ValueError: Если список блюд пуст.
+    """
+    if not dish_names:
+        raise ValueError("Для симуляции нужно хотя бы одно блюдо.")
+    stats: LoadStats = LoadStats()
+    deadline: float = time.monotonic() + duration
+    roles: List[Tuple[type, int]] = [(Waiter, waiters), (KitchenScreen, kitchens), (Manager, managers)]
+
+    def worker(actor_class: type, index: int) -> None:
+        transport: Any = transport_factory()
+        try:
+            kwargs: Dict[str, Any] = {'dish_names': dish_names} if actor_class is Waiter else {}
+            actor: Actor = actor_class(transport, stats, deadline, random.Random(f'{seed}-{actor_class.__name__}-{index}'),
+                                       think_time, **kwargs)
+            actor.run()
+        finally:
+            transport.close()
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=worker, args=(actor_class, index), daemon=True)
+        for actor_class, count in roles for index in range(count)
+    ]
+    started: float = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed: float = time.monotonic() - started
+
+    endpoints: Dict[str, Dict[str, Any]] = stats.summary(elapsed)
+    total_requests: int = sum(endpoint['requests'] for endpoint in endpoints.values())
+    return {
+        'duration': round(elapsed, 3),
+        'endpoints': endpoints,
+        'total': {
+            'requests': total_requests,
+            'throughput': round(total_requests / elapsed, 2) if elapsed else 0.0,
+            'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+            'lock_errors': sum(endpoint['lock_errors'] for endpoint in endpoints.values()),
+        },
+    }
@@ -0,0 +1,55 @@
+"""
+Management-команда для массового изменения цен меню.
+
+Примеры:
+    python manage.py adjust_prices --percent 10 --dry-run
+    python manage.py adjust_prices --prices spring_prices.csv
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders.menu import adjust_prices, format_menu_changes, parse_menu, parse_menu_format, parse_percent
+
+
+class Command(BaseCommand):
+    """
+    Изменяет цены всех блюд актуального меню на процент или устанавливает цены из файла
+    одной транзакцией и выводит список изменений.
+    """
+    help: str = "Изменяет цены меню на процент или по таблице цен из файла CSV или JSON."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--percent', help="Процент изменения цен (например, 10 или -5).")
+        source.add_argument('--prices', help="Файл таблицы цен (столбцы/поля name и price).")
+        parser.add_argument('--format', dest='file_format', default=None,
+                            help="Формат файла таблицы цен (csv, json); по умолчанию определяется по расширению.")
+        parser.add_argument('--dry-run', action='store_true', help="Только вывести изменения, не сохраняя их.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет изменение цен и выводит список изменений.
+
+        Raises:
+            CommandError: Если параметры или файл некорректны.
+        """
+        try:
+            percent: Optional[Decimal] = parse_percent(options['percent']) if options['percent'] is not None else None
+            prices: Optional[Dict[str, Decimal]] = None
+            if options['prices'] is not None:
+                file_format: str = parse_menu_format(options['file_format'] or options['prices'])
+                with open(options['prices'], encoding='utf-8-sig') as prices_file:
+                    prices = parse_menu(prices_file.read(), file_format)
+            changes: Dict[str, Any] = adjust_prices(percent, prices, dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write('\n'.join(format_menu_changes(changes)))
@@ -0,0 +1,53 @@
+"""
+Management-команда для переноса старых оплаченных заказов в архив.
+
+Пример (подходит для cron):
+    python manage.py archive_orders --days 30
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.archive import get_archive_cutoff, archive_paid_orders
+
+
+class Command(BaseCommand):
+    """
+    Переносит оплаченные заказы старше заданного количества дней в архивные таблицы.
+    """
+    help: str = "Переносит оплаченные заказы старше заданного количества дней в архив порциями."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--days', type=int, default=constants.ARCHIVE_AFTER_DAYS,
+                            help="Сколько дней оплаченный заказ остается в рабочих таблицах.")
+        parser.add_argument('--chunk-size', type=int, default=constants.ARCHIVE_CHUNK_SIZE,
+                            help="Количество заказов, переносимых в одной транзакции.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет архивацию и выводит прогресс.
+
+        Raises:
+            CommandError: Если параметры команды некорректны.
+        """
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size должен быть положительным числом.")
+        try:
+            cutoff = get_archive_cutoff(options['days'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        archived: int = archive_paid_orders(
+            cutoff,
+            chunk_size=options['chunk_size'],
+            progress=lambda count: self.stdout.write(f"Перенесено заказов: {count}"),
+        )
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['orders_archived_success'].format(count=archived)))
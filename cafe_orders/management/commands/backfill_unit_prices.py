@@ -0,0 +1,45 @@
+"""
+Management-команда для фиксации цен в позициях заказов, созданных до появления поля unit_price.
+
+Пример:
+    python manage.py backfill_unit_prices --chunk-size 1000
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.price_snapshots import backfill_unit_prices
+
+
+class Command(BaseCommand):
+    """
+    Заполняет поле unit_price текущей ценой блюда во всех позициях, где оно пустое.
+    """
+    help: str = "Фиксирует текущую цену блюда в позициях заказов без зафиксированной цены."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--chunk-size', type=int, default=constants.BACKFILL_CHUNK_SIZE,
+                            help="Количество позиций, обновляемых в одной транзакции.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет заполнение и выводит прогресс.
+
+        Raises:
+            CommandError: Если параметры команды некорректны.
+        """
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size должен быть положительным числом.")
+        updated: int = backfill_unit_prices(
+            options['chunk_size'],
+            progress=lambda count: self.stdout.write(f"Обновлено позиций: {count}"),
+        )
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['unit_prices_backfilled'].format(count=updated)))
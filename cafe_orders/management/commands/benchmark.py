@@ -0,0 +1,104 @@
+"""
+Management-команда для запуска бенчмарков представлений и API на отдельной тестовой базе данных.
+
+Примеры:
+    python manage.py benchmark --sizes small,medium --save-baseline benchmarks/baseline.json
+    python manage.py benchmark --sizes small,medium --baseline benchmarks/baseline.json
+"""
+
+from typing import Any, Dict, List, Optional
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from cafe_orders import constants
+from cafe_orders.benchmarks import run_benchmarks, compare_with_baseline, load_results, save_results
+
+
+class Command(BaseCommand):
+    """
+    Заполняет временную тестовую базу детерминированными данными нескольких размеров,
+    измеряет задержки и число SQL-запросов по всем сценариям и сравнивает их с эталоном.
+    """
+    help: str = "Запускает бенчмарки представлений и API заказов на временной тестовой базе."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--sizes', default='small',
+                            help=f"Размеры данных через запятую: {', '.join(constants.BENCHMARK_SIZES)}.")
+        parser.add_argument('--repeat', type=int, default=constants.BENCHMARK_REPEAT,
+                            help="Количество повторов каждого сценария.")
+        parser.add_argument('--seed', type=int, default=constants.BENCHMARK_SEED,
+                            help="Начальное значение генератора данных.")
+        parser.add_argument('--cases', default='', help="Имена сценариев через запятую (по умолчанию все).")
+        parser.add_argument('--baseline', default='', help="Путь к эталонным результатам для сравнения.")
+        parser.add_argument('--save-baseline', default='', help="Путь для сохранения результатов как эталона.")
+        parser.add_argument('--tolerance', type=float, default=constants.BENCHMARK_TOLERANCE,
+                            help="Допустимый относительный рост медианы задержки.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет бенчмарки и выводит результаты.
+
+        Raises:
+            CommandError: Если параметры некорректны или обнаружены регрессии относительно эталона.
+        """
+        size_names: List[str] = [name.strip() for name in options['sizes'].split(',') if name.strip()]
+        unknown: List[str] = [name for name in size_names if name not in constants.BENCHMARK_SIZES]
+        if unknown or not size_names:
+            raise CommandError(f"Неизвестные размеры данных: {', '.join(unknown)}.")
+        if options['repeat'] < 1:
+            raise CommandError("--repeat должен быть положительным числом.")
+        sizes: Dict[str, Dict[str, int]] = {name: constants.BENCHMARK_SIZES[name] for name in size_names}
+        case_names: Optional[List[str]] = (
+            [name.strip() for name in options['cases'].split(',') if name.strip()] or None
+        )
+
+        setup_test_environment()
+        old_name: str = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results: Dict[str, Any] = run_benchmarks(
+                sizes,
+                repeat=options['repeat'],
+                seed=options['seed'],
+                case_names=case_names,
+                reset=lambda: call_command('flush', interactive=False, verbosity=0),
+                progress=self._report,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['save_baseline']:
+            save_results(results, options['save_baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Эталон сохранен: {options['save_baseline']}"))
+        if options['baseline']:
+            regressions: List[str] = compare_with_baseline(results, load_results(options['baseline']),
+                                                           options['tolerance'])
+            if regressions:
+                raise CommandError("Обнаружены регрессии:\n" + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS("Регрессий относительно эталона не обнаружено."))
+
+    def _report(self, size_name: str, case_name: str, result: Dict[str, Any]) -> None:
+        """
+        Выводит строку результата одного сценария.
+
+        Args:
+            size_name: Имя размера данных.
+            case_name: Имя сценария.
+            result: Статистика сценария.
+        """
+        percentiles: str = ' '.join(
+            f"p{rank}={result[f'p{rank}_ms']:.2f}мс" for rank in constants.BENCHMARK_PERCENTILES
+        )
+        self.stdout.write(f"{size_name:<8} {case_name:<22} {percentiles} "
+                          f"запросов={result['queries']} статусы={result['status_codes']}")
@@ -0,0 +1,46 @@
+"""
+Management-команда для сброса сохраненной статистики аналитики меню.
+
+Пример:
+    python manage.py clear_analytics_cache --date-from 2025-03-01 --date-to 2025-03-31
+"""
+
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.analytics import clear_analytics_cache
+from cafe_orders.exports import parse_export_params
+
+
+class Command(BaseCommand):
+    """
+    Удаляет сохраненную статистику закрытых дней, чтобы она была вычислена заново при следующем запросе.
+    Нужна после загрузки или правки заказов за прошедшие дни в обход приложения.
+    """
+    help: str = "Сбрасывает сохраненную статистику аналитики меню за период (по умолчанию за все дни)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--date-from', default='', help="Начало периода включительно (ГГГГ-ММ-ДД).")
+        parser.add_argument('--date-to', default='', help="Конец периода включительно (ГГГГ-ММ-ДД).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет сброс и выводит количество удаленных дней.
+
+        Raises:
+            CommandError: Если период задан некорректно.
+        """
+        try:
+            params: Dict[str, Any] = parse_export_params(options)
+        except ValueError as e:
+            raise CommandError(str(e))
+        count: int = clear_analytics_cache(params['date_from'], params['date_to'])
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['analytics_cache_cleared'].format(count=count)))
@@ -0,0 +1,53 @@
+"""
+Management-команда для порционного удаления всех заказов.
+
+Пример:
+    python manage.py delete_all_orders --chunk-size 1000 --noinput
+"""
+
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.deletion import delete_all_orders_chunked
+
+
+class Command(BaseCommand):
+    """
+    Удаляет все заказы и их позиции диапазонами id в коротких транзакциях с выводом прогресса.
+    """
+    help: str = "Удаляет все заказы порциями с выводом прогресса."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--chunk-size', type=int, default=constants.DELETE_CHUNK_SIZE,
+                            help="Количество заказов, удаляемых в одной транзакции.")
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help="Не запрашивать подтверждение.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запрашивает подтверждение и выполняет удаление.
+
+        Raises:
+            CommandError: Если параметры команды некорректны.
+        """
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size должен быть положительным числом.")
+        if options['interactive']:
+            answer: str = input("Все заказы будут удалены без возможности восстановления. Продолжить? [yes/no]: ")
+            if answer.strip().lower() != 'yes':
+                self.stdout.write("Удаление отменено.")
+                return
+
+        def report(totals: Dict[str, int]) -> None:
+            self.stdout.write(constants.MESSAGES['orders_deleted_progress'].format(**totals))
+
+        deleted: Dict[str, int] = delete_all_orders_chunked(options['chunk_size'], progress=report)
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['orders_deleted_progress'].format(**deleted)))
@@ -0,0 +1,61 @@
+"""
+Management-команда для выгрузки заказов в CSV или NDJSON.
+
+Пример:
+    python manage.py export_orders --format csv --status paid --date-from 2025-03-01 --date-to 2025-03-31 -o march.csv
+"""
+
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.exports import parse_export_params, get_export_querysets, iter_export
+
+
+class Command(BaseCommand):
+    """
+    Выгружает заказы с позициями и итоговыми суммами порциями ограниченного размера.
+    """
+    help: str = "Выгружает заказы с позициями в CSV или NDJSON с фильтрацией по статусу и периоду."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--format', dest='file_format', default=constants.EXPORT_FORMAT_CSV,
+                            choices=constants.EXPORT_FORMATS, help="Формат выгрузки.")
+        parser.add_argument('--status', default='', help="Статус заказа (pending, ready, paid).")
+        parser.add_argument('--date-from', default='', help="Начало периода включительно (ГГГГ-ММ-ДД).")
+        parser.add_argument('--date-to', default='', help="Конец периода включительно (ГГГГ-ММ-ДД).")
+        parser.add_argument('--chunk-size', type=int, default=constants.EXPORT_CHUNK_SIZE,
+                            help="Количество заказов, загружаемых за один запрос.")
+        parser.add_argument('-o', '--output', default='', help="Путь к файлу (по умолчанию stdout).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет выгрузку.
+
+        Raises:
+            CommandError: Если параметры выгрузки некорректны.
+        """
+        try:
+            params: Dict[str, Any] = parse_export_params(options)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size должен быть положительным числом.")
+
+        querysets = get_export_querysets(params['status'], params['date_from'], params['date_to'])
+        chunks = iter_export(params['file_format'], querysets, options['chunk_size'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,49 @@
+"""
+Management-команда для импорта меню из файла CSV или JSON.
+
+Примеры:
+    python manage.py import_menu menu.csv --dry-run
+    python manage.py import_menu menu.json
+"""
+
+from decimal import Decimal
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders.menu import format_menu_changes, import_menu, parse_menu, parse_menu_format
+
+
+class Command(BaseCommand):
+    """
+    Добавляет и обновляет блюда меню по названию одной транзакцией и выводит список изменений.
+    """
+    help: str = "Импортирует меню из файла CSV или JSON (столбцы/поля name и price)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('path', help="Путь к файлу меню.")
+        parser.add_argument('--format', dest='file_format', default=None,
+                            help="Формат файла (csv, json); по умолчанию определяется по расширению.")
+        parser.add_argument('--dry-run', action='store_true', help="Только вывести изменения, не сохраняя их.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет импорт и выводит список изменений.
+
+        Raises:
+            CommandError: Если файл не удалось прочитать или он некорректен.
+        """
+        try:
+            file_format: str = parse_menu_format(options['file_format'] or options['path'])
+            with open(options['path'], encoding='utf-8-sig') as menu_file:
+                prices: Dict[str, Decimal] = parse_menu(menu_file.read(), file_format)
+            changes: Dict[str, Any] = import_menu(prices, dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write('\n'.join(format_menu_changes(changes)))
@@ -0,0 +1,62 @@
+"""
+Management-команда для обновления проекций журнала заказов.
+
+Примеры:
+    python manage.py order_projections
+    python manage.py order_projections revenue --rebuild
+    python manage.py order_projections --seed
+"""
+
+import json
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.events import seed_order_events
+from cafe_orders.projections import PROJECTIONS, Projection, advance_projection, get_projection, rebuild_projection
+
+
+class Command(BaseCommand):
+    """
+    Продвигает проекции журнала заказов с сохраненной позиции или строит их заново.
+    Подходит для периодического запуска (cron, планировщик задач).
+    """
+    help: str = "Обновляет проекции журнала заказов."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('names', nargs='*', help="Имена проекций (по умолчанию все).")
+        parser.add_argument('--rebuild', action='store_true', help="Построить проекции заново с начала журнала.")
+        parser.add_argument('--seed', action='store_true',
+                            help="Предварительно записать события создания для заказов без истории.")
+        parser.add_argument('--show', action='store_true', help="Вывести состояние проекций в формате JSON.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Обновляет выбранные проекции и выводит количество обработанных событий.
+
+        Raises:
+            CommandError: Если указана неизвестная проекция.
+        """
+        try:
+            projections: List[Projection] = [get_projection(name) for name in options['names'] or PROJECTIONS]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['seed']:
+            count: int = seed_order_events()
+            self.stdout.write(self.style.SUCCESS(constants.MESSAGES['order_events_seeded'].format(count=count)))
+
+        for projection in projections:
+            result: Dict[str, Any] = (rebuild_projection(projection) if options['rebuild']
+                                      else advance_projection(projection))
+            self.stdout.write(self.style.SUCCESS(constants.MESSAGES['projection_advanced'].format(
+                name=projection.name, count=result['applied'], position=result['position'])))
+            if options['show']:
+                self.stdout.write(json.dumps(result['state'], ensure_ascii=False, indent=2))
@@ -0,0 +1,93 @@
+"""
+Management-команда для просмотра профилей запросов.
+
+Примеры:
+    python manage.py profiles
+    python manage.py profiles --summary --route add_order --sort tottime --top 30
+    python manage.py profiles --summary 20250301T120000000000_add_order_POST_850ms.prof
+    python manage.py profiles --prune
+    python manage.py profiles --prune --max-files 50 --max-age-hours 24
+"""
+
+import os
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.profiling import get_max_age_hours, get_max_files, get_profiling_dir, list_profiles, \
+    prune_profiles, summarize_profiles
+
+
+class Command(BaseCommand):
+    """
+    Выводит список сохраненных профилей запросов или сводку самых затратных функций
+    по выбранным профилям; с --prune удаляет старые профили.
+    """
+    help: str = "Выводит список профилей запросов и самые затратные функции."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('names', nargs='*', help="Имена файлов профилей (по умолчанию все).")
+        parser.add_argument('--summary', action='store_true', help="Вывести сводку по самым затратным функциям.")
+        parser.add_argument('--route', default='', help="Учитывать только профили указанного маршрута.")
+        parser.add_argument('--sort', default=constants.PROFILE_SORT_KEYS[0], choices=constants.PROFILE_SORT_KEYS,
+                            help="Ключ сортировки функций.")
+        parser.add_argument('--top', type=int, default=constants.PROFILE_TOP_FUNCTIONS,
+                            help="Количество функций в сводке.")
+        parser.add_argument('--dir', default='', help="Каталог профилей (по умолчанию PROFILING_DIR).")
+        parser.add_argument('--prune', action='store_true',
+                            help="Удалить профили сверх --max-files и старше --max-age-hours.")
+        parser.add_argument('--max-files', type=int, default=None,
+                            help="Количество хранимых профилей (по умолчанию PROFILING_MAX_FILES).")
+        parser.add_argument('--max-age-hours', type=float, default=None,
+                            help="Срок хранения профилей в часах (по умолчанию PROFILING_MAX_AGE_HOURS).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выводит список профилей или сводку либо удаляет старые профили.
+
+        Raises:
+            CommandError: Если каталог не задан, профили не найдены или параметры очистки отрицательны.
+        """
+        directory: str = options['dir'] or get_profiling_dir()
+        if not directory:
+            raise CommandError("Не задан каталог профилей: укажите --dir или PROFILING_DIR.")
+        if options['prune']:
+            max_files: int = get_max_files() if options['max_files'] is None else options['max_files']
+            max_age_hours: float = (get_max_age_hours() if options['max_age_hours'] is None
+                                    else options['max_age_hours'])
+            if max_files < 0 or max_age_hours < 0:
+                raise CommandError("--max-files и --max-age-hours не могут быть отрицательными.")
+            removed: int = prune_profiles(directory, max_files, max_age_hours)
+            self.stdout.write(f"Удалено профилей: {removed}")
+            return
+        profiles: List[Dict[str, Any]] = list_profiles(directory)
+        if options['names']:
+            profiles = [profile for profile in profiles if profile['name'] in options['names']]
+        if options['route']:
+            profiles = [profile for profile in profiles if profile['route'] == options['route']]
+
+        if not options['summary']:
+            for profile in profiles:
+                self.stdout.write(f"{profile['name']:<70} {profile['size']:>10} Б  "
+                                  f"{profile['modified']:%Y-%m-%d %H:%M:%S}")
+            self.stdout.write(f"Всего профилей: {len(profiles)}")
+            return
+
+        try:
+            rows: List[Dict[str, Any]] = summarize_profiles(
+                [os.path.join(directory, profile['name']) for profile in profiles],
+                sort=options['sort'], limit=options['top'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"Профилей в сводке: {len(profiles)}")
+        self.stdout.write(f"{'вызовов':>10} {'собств., с':>12} {'накоп., с':>12}  функция")
+        for row in rows:
+            self.stdout.write(f"{row['ncalls']:>10} {row['tottime']:>12.4f} {row['cumulative']:>12.4f}  "
+                              f"{row['function']}")
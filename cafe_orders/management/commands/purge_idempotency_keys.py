@@ -0,0 +1,29 @@
+"""
+Management-команда для удаления устаревших ключей идемпотентности.
+
+Пример:
+    python manage.py purge_idempotency_keys
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cafe_orders import constants
+from cafe_orders.idempotency import purge_idempotency_keys
+
+
+class Command(BaseCommand):
+    """
+    Удаляет ключи идемпотентности старше IDEMPOTENCY_KEY_TTL_HOURS часов.
+    Подходит для периодического запуска (cron, планировщик задач).
+    """
+    help: str = "Удаляет ключи идемпотентности старше срока хранения."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет очистку и выводит количество удаленных ключей.
+        """
+        count: int = purge_idempotency_keys()
+        self.stdout.write(self.style.SUCCESS(
+            constants.MESSAGES['idempotency_keys_purged_success'].format(count=count)))
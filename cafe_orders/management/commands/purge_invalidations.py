@@ -0,0 +1,28 @@
+"""
+Management-команда для удаления старых записей журнала сброса кэшей.
+
+Пример:
+    python manage.py purge_invalidations
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cafe_orders import constants
+from cafe_orders.invalidation import purge_invalidations
+
+
+class Command(BaseCommand):
+    """
+    Удаляет записи журнала сброса кэшей старше INVALIDATION_RETENTION_SECONDS секунд.
+    Подходит для периодического запуска (cron, планировщик задач).
+    """
+    help: str = "Удаляет записи журнала сброса кэшей старше срока хранения."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет очистку и выводит количество удаленных записей.
+        """
+        count: int = purge_invalidations()
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['cache_invalidations_purged'].format(count=count)))
@@ -0,0 +1,28 @@
+"""
+Management-команда для удаления завершенных фоновых заданий и файлов их результатов.
+
+Пример:
+    python manage.py purge_report_jobs
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cafe_orders import constants
+from cafe_orders.jobs import purge_report_jobs
+
+
+class Command(BaseCommand):
+    """
+    Удаляет задания, завершенные более REPORT_JOB_RETENTION_SECONDS секунд назад, вместе с файлами выгрузок.
+    Подходит для периодического запуска (cron, планировщик задач).
+    """
+    help: str = "Удаляет завершенные фоновые задания и файлы их результатов старше срока хранения."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет очистку и выводит количество удаленных заданий.
+        """
+        count: int = purge_report_jobs()
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['report_jobs_purged'].format(count=count)))
@@ -0,0 +1,28 @@
+"""
+Management-команда для удаления устаревших отметок об удаленных заказах.
+
+Пример:
+    python manage.py purge_tombstones
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cafe_orders import constants
+from cafe_orders.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Удаляет отметки об удаленных заказах старше TOMBSTONE_RETENTION_DAYS дней.
+    Подходит для периодического запуска (cron, планировщик задач).
+    """
+    help: str = "Удаляет отметки об удаленных заказах старше срока хранения."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет очистку и выводит количество удаленных отметок.
+        """
+        count: int = purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['tombstones_purged_success'].format(count=count)))
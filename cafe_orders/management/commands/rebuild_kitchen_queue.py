@@ -0,0 +1,28 @@
+"""
+Management-команда для пересчета очереди кухни по таблицам заказов.
+
+Пример:
+    python manage.py rebuild_kitchen_queue
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cafe_orders import constants
+from cafe_orders.kitchen import rebuild_kitchen_queue
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает очередь кухни по позициям заказов в ожидании.
+    Нужна после загрузки или правки заказов в обход приложения.
+    """
+    help: str = "Пересчитывает очередь кухни по заказам в ожидании."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет пересчет и выводит количество блюд в очереди.
+        """
+        count: int = rebuild_kitchen_queue()
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['kitchen_queue_rebuilt'].format(count=count)))
@@ -0,0 +1,60 @@
+"""
+Management-команда для выполнения фоновых заданий отчетов и выгрузок.
+
+Примеры:
+    python manage.py run_jobs
+    python manage.py run_jobs --workers 4 --loop
+"""
+
+import time
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.jobs import requeue_stale_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    """
+    Выполняет задания из очереди ограниченным пулом потоков отдельно от веб-процессов.
+    Подходит для периодического запуска (cron) или постоянной работы с параметром --loop.
+    """
+    help: str = "Выполняет фоновые задания отчетов и выгрузок из очереди."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--workers', type=int, default=1, help="Количество потоков выполнения заданий.")
+        parser.add_argument('--limit', type=int, default=None, help="Максимальное количество заданий за проход.")
+        parser.add_argument('--loop', action='store_true', help="Не завершаться, а опрашивать очередь.")
+        parser.add_argument('--interval', type=float, default=constants.REPORT_JOB_POLL_INTERVAL,
+                            help="Интервал опроса очереди в секундах (с параметром --loop).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Возвращает в очередь зависшие задания и выполняет задания из очереди.
+
+        Raises:
+            CommandError: Если количество потоков некорректно.
+        """
+        if options['workers'] < 1:
+            raise CommandError("--workers должен быть положительным числом.")
+        requeued: int = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(constants.MESSAGES['report_jobs_requeued'].format(count=requeued))
+
+        while True:
+            counts: Dict[str, int] = run_pending_jobs(options['workers'], options['limit'])
+            processed: int = counts['done'] + counts['failed']
+            if processed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(constants.MESSAGES['report_jobs_processed'].format(
+                    count=processed, **counts)))
+            if not options['loop']:
+                return
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,112 @@
+"""
+Management-команда для нагрузочного тестирования: имитация смены в кафе.
+
+Примеры:
+    python manage.py simulate_shift --duration 60 --waiters 40 --kitchens 5
+    python manage.py simulate_shift --url http://127.0.0.1:8000 --dish "Кофе" --dish "Чай"
+"""
+
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from cafe_orders import constants
+from cafe_orders.datagen import generate_dataset
+from cafe_orders.loadgen import ClientTransport, HttpTransport, run_simulation
+from cafe_orders.models import Dish
+
+
+class Command(BaseCommand):
+    """
+    Запускает официантов, кухонные экраны и менеджеров в отдельных потоках и выводит
+    пропускную способность, p50/p99 задержки и ошибки блокировки по каждому эндпоинту.
+
+    Без --url запросы выполняются тестовым клиентом Django на временной тестовой базе,
+    заполненной историей заказов; с --url — по HTTP к запущенному серверу.
+    """
+    help: str = "Имитирует смену в кафе с параллельными участниками и выводит статистику нагрузки."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--duration', type=float, default=constants.LOADGEN_DURATION,
+                            help="Длительность смены в секундах.")
+        parser.add_argument('--waiters', type=int, default=constants.LOADGEN_WAITERS, help="Количество официантов.")
+        parser.add_argument('--kitchens', type=int, default=constants.LOADGEN_KITCHENS,
+                            help="Количество кухонных экранов.")
+        parser.add_argument('--managers', type=int, default=constants.LOADGEN_MANAGERS,
+                            help="Количество менеджеров, проверяющих выручку.")
+        parser.add_argument('--think-time', type=float, default=constants.LOADGEN_THINK_TIME,
+                            help="Пауза между действиями участника в секундах.")
+        parser.add_argument('--seed', type=int, default=constants.BENCHMARK_SEED,
+                            help="Начальное значение генераторов случайных чисел.")
+        parser.add_argument('--history', type=int, default=constants.LOADGEN_HISTORY_ORDERS,
+                            help="Количество заказов в истории временной базы.")
+        parser.add_argument('--url', default='', help="Базовый URL запущенного сервера.")
+        parser.add_argument('--dish', action='append', default=[],
+                            help="Название блюда из меню сервера (для --url, можно указать несколько раз).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет имитацию смены и выводит результаты.
+
+        Raises:
+            CommandError: Если параметры некорректны.
+        """
+        if options['duration'] <= 0 or options['think_time'] < 0:
+            raise CommandError("--duration должен быть положительным, --think-time — неотрицательным.")
+        if min(options['waiters'], options['kitchens'], options['managers']) < 0:
+            raise CommandError("Количество участников не может быть отрицательным.")
+        simulation_options: Dict[str, Any] = {
+            'waiters': options['waiters'],
+            'kitchens': options['kitchens'],
+            'managers': options['managers'],
+            'duration': options['duration'],
+            'think_time': options['think_time'],
+            'seed': options['seed'],
+        }
+
+        if options['url']:
+            if not options['dish']:
+                raise CommandError("Для --url укажите хотя бы одно блюдо через --dish.")
+            transport_factory: Callable[[], Any] = lambda: HttpTransport(options['url'])
+            result: Dict[str, Any] = run_simulation(transport_factory, options['dish'], **simulation_options)
+        else:
+            setup_test_environment()
+            old_name: str = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                size: Dict[str, int] = constants.BENCHMARK_SIZES['small']
+                generate_dataset(size['dishes'], size['tables'], options['history'], size['items_per_order'],
+                                 seed=options['seed'])
+                dish_names: List[str] = list(Dish.active.values_list('name', flat=True))
+                result = run_simulation(ClientTransport, dish_names, **simulation_options)
+            except ValueError as e:
+                raise CommandError(str(e))
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        self._report(result)
+
+    def _report(self, result: Dict[str, Any]) -> None:
+        """
+        Выводит статистику по эндпоинтам и общие итоги.
+
+        Args:
+            result: Результат run_simulation.
+        """
+        for endpoint, stats in result['endpoints'].items():
+            self.stdout.write(f"{endpoint:<16} запросов={stats['requests']:<7} {stats['throughput']:>8.2f} з/с "
+                              f"p50={stats['p50_ms']:.2f}мс p99={stats['p99_ms']:.2f}мс "
+                              f"ошибок={stats['errors']} блокировок={stats['lock_errors']}")
+        total: Dict[str, Any] = result['total']
+        style = self.style.SUCCESS if not total['errors'] else self.style.WARNING
+        self.stdout.write(style(f"Итого за {result['duration']:.1f} с: запросов={total['requests']} "
+                                f"({total['throughput']:.2f} з/с), ошибок={total['errors']}, "
+                                f"блокировок={total['lock_errors']}"))
@@ -0,0 +1,63 @@
+"""
+Management-команда для просмотра журнала медленных SQL-запросов.
+
+Примеры:
+    python manage.py slow_queries --limit 10
+    python manage.py slow_queries --clear
+"""
+
+import os
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.slow_queries import get_log_file, read_log_file
+
+
+class Command(BaseCommand):
+    """
+    Выводит последние медленные SQL-запросы из файла SLOW_QUERY_LOG_FILE вместе с маршрутом,
+    GET-параметрами и планом выполнения.
+    """
+    help: str = "Выводит последние медленные SQL-запросы с планами выполнения."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('--limit', type=int, default=constants.SLOW_QUERY_COMMAND_LIMIT,
+                            help="Количество выводимых записей.")
+        parser.add_argument('--clear', action='store_true', help="Очистить журнал.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выводит записи журнала или очищает его.
+
+        Raises:
+            CommandError: Если файл журнала не задан в настройках.
+        """
+        log_file: str = get_log_file()
+        if not log_file:
+            raise CommandError("Не задан SLOW_QUERY_LOG_FILE: записи хранятся только в памяти рабочих процессов "
+                               "и доступны через /api/slow-queries/.")
+        if options['clear']:
+            if os.path.exists(log_file):
+                os.remove(log_file)
+            self.stdout.write(self.style.SUCCESS("Журнал медленных запросов очищен."))
+            return
+
+        entries: List[Dict[str, Any]] = read_log_file(log_file, options['limit'])
+        if not entries:
+            self.stdout.write("Медленных запросов не найдено.")
+        for entry in entries:
+            self.stdout.write(self.style.WARNING(
+                f"{entry['time']} {entry['duration_ms']:.1f}мс {entry['method']} {entry['path']} "
+                f"маршрут={entry['route']} параметры={entry['query_params']}"))
+            self.stdout.write(f"  {entry['sql']}")
+            self.stdout.write(f"  значения: {entry['params']}")
+            for line in entry['plan']:
+                self.stdout.write(f"  план: {line}")
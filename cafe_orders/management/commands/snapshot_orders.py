@@ -0,0 +1,63 @@
+"""
+Management-команда для записи и чтения колоночного снимка истории заказов.
+
+Примеры:
+    python manage.py snapshot_orders snapshots/2025-03-31
+    python manage.py snapshot_orders snapshots/2025-03-31 --read
+"""
+
+import json
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from cafe_orders import constants
+from cafe_orders.snapshot import ColumnarSnapshot, snapshot_dish_totals, snapshot_paid_revenue, write_snapshot
+
+
+class Command(BaseCommand):
+    """
+    Записывает рабочие и архивные заказы в колоночный снимок для офлайн-анализа
+    или выводит выручку и итоги по блюдам из уже записанного снимка.
+    """
+    help: str = "Записывает колоночный снимок истории заказов или выводит итоги по снимку."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Описывает аргументы команды.
+
+        Args:
+            parser: Парсер аргументов командной строки.
+        """
+        parser.add_argument('directory', help="Каталог снимка.")
+        parser.add_argument('--read', action='store_true',
+                            help="Не записывать снимок, а вывести выручку и итоги по блюдам в формате JSON.")
+        parser.add_argument('--chunk-size', type=int, default=constants.SNAPSHOT_CHUNK_SIZE,
+                            help="Количество строк, загружаемых за один запрос.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Выполняет запись снимка или выводит итоги по нему.
+
+        Raises:
+            CommandError: Если размер порции некорректен или снимок не удалось открыть.
+        """
+        if options['read']:
+            try:
+                snapshot: ColumnarSnapshot = ColumnarSnapshot(options['directory'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            with snapshot:
+                summary: Dict[str, Any] = {
+                    'revenue': str(snapshot_paid_revenue(snapshot)),
+                    'dishes': [dict(dish, revenue=str(dish['revenue'])) for dish in snapshot_dish_totals(snapshot)],
+                }
+            self.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2))
+            return
+
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size должен быть положительным числом.")
+        manifest: Dict[str, Any] = write_snapshot(options['directory'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(constants.MESSAGES['snapshot_written'].format(
+            path=options['directory'], orders=manifest['columns']['orders.id']['length'],
+            items=manifest['columns']['items.order_id']['length'])))
@@ -0,0 +1,364 @@
+"""
+Массовое обновление меню: импорт блюд из CSV/JSON и изменение цен.
+
+Импорт сопоставляет блюда по названию: новые блюда добавляются, у существующих меняется цена,
+блюда из архива возвращаются в меню. Изменение цен применяется ко всему актуальному меню
+(на заданный процент) или к блюдам из таблицы цен. Все изменения выполняются в одной
+транзакции несколькими пакетными запросами (bulk_create, bulk_update), после чего один раз
+увеличивается версия меню (кэши строк и деталей заказов во всех процессах); сами заказы не
+изменяются. В режиме пробного запуска возвращается только список изменений.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import transaction
+
+from . import constants
+from .detail_cache import invalidate_all_order_details
+from .models import Dish
+
+PRICE_QUANT: Decimal = Decimal(1).scaleb(-constants.DISH_PRICE_DECIMAL_PLACES)
+PRICE_LIMIT: Decimal = Decimal(10) ** (constants.DISH_PRICE_MAX_DIGITS - constants.DISH_PRICE_DECIMAL_PLACES)
+
+
+def parse_flag(value: Any) -> bool:
+    """
+    Преобразует параметр запроса в логическое значение.
+
+    Args:
+        value: Значение параметра (логическое или строковое).
+
+    Returns:
+        bool: True для true, 1, yes, on.
+    """
+    return value is True or str(value).strip().lower() in constants.MENU_FLAG_TRUE_VALUES
+
+
+def parse_menu_format(value: str) -> str:
+    """
+    Определяет формат файла меню по названию формата или по расширению имени файла.
+
+    Args:
+        value: Формат (csv, json) или имя файла.
+
+    Returns:
+        str: Формат файла.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+    """
+    file_format: str = value.strip().lower().rsplit('.', 1)[-1]
+    if file_format not in constants.MENU_FORMATS:
+        raise ValueError(constants.MESSAGES['menu_format_invalid'].format(
+            value=value, choices=', '.join(constants.MENU_FORMATS)))
+    return file_format
+
+
+def check_price(price: Decimal, value: Any) -> Decimal:
+    """
+    Проверяет, что цена помещается в поле цены блюда.
+
+    Args:
+        price: Цена.
+        value: Исходное значение для сообщения об ошибке.
+
+    Returns:
+        Decimal: Цена с двумя знаками после запятой.
+
+    Raises:
+        ValueError: Если цена отрицательна, слишком велика или содержит больше двух знаков после запятой.
+    """
+    if not price.is_finite() or price < Decimal(constants.DISH_PRICE_MIN_VALUE) or price >= PRICE_LIMIT \
+            or price != price.quantize(PRICE_QUANT):
+        raise ValueError(constants.MESSAGES['menu_price_invalid'].format(value=value, max_value=PRICE_LIMIT))
+    return price.quantize(PRICE_QUANT)
+
+
+def parse_price(value: Any) -> Decimal:
+    """
+    Преобразует цену из файла меню.
+
+    Args:
+        value: Цена (строка или число).
+
+    Returns:
+        Decimal: Цена с двумя знаками после запятой.
+
+    Raises:
+        ValueError: Если цена некорректна.
+    """
+    try:
+        price: Decimal = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(constants.MESSAGES['menu_price_invalid'].format(value=value, max_value=PRICE_LIMIT))
+    return check_price(price, value)
+
+
+def parse_percent(value: Any) -> Decimal:
+    """
+    Преобразует процент изменения цен.
+
+    Args:
+        value: Процент (например, 10 или -5.5).
+
+    Returns:
+        Decimal: Процент.
+
+    Raises:
+        ValueError: Если значение не является числом больше -100.
+    """
+    try:
+        percent: Decimal = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(constants.MESSAGES['menu_percent_invalid'].format(value=value))
+    if not percent.is_finite() or percent <= -100:
+        raise ValueError(constants.MESSAGES['menu_percent_invalid'].format(value=value))
+    return percent
+
+
+def iter_json_rows(data: Any) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    Перебирает блюда меню в формате JSON (список объектов с полями name и price).
+
+    Args:
+        data: Разобранный JSON.
+
+    Yields:
+        Tuple[int, Any, Any]: Номер элемента списка, название и цена.
+
+    Raises:
+        ValueError: Если данные не являются списком объектов.
+    """
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError(constants.MESSAGES['menu_json_invalid'])
+    for number, row in enumerate(data, start=1):
+        yield number, row.get('name'), row.get('price')
+
+
+def iter_menu_rows(content: str, file_format: str) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    Перебирает строки файла меню.
+
+    CSV-файл содержит заголовок со столбцами name и price, JSON-файл — список объектов
+    с полями name и price.
+
+    Args:
+        content: Содержимое файла.
+        file_format: Формат файла (csv или json).
+
+    Yields:
+        Tuple[int, Any, Any]: Номер строки (для JSON — номер элемента списка), название и цена.
+
+    Raises:
+        ValueError: Если структура файла некорректна.
+    """
+    if file_format == constants.MENU_FORMAT_CSV:
+        reader: csv.DictReader = csv.DictReader(io.StringIO(content))
+        if not set(constants.MENU_CSV_COLUMNS).issubset(reader.fieldnames or []):
+            raise ValueError(constants.MESSAGES['menu_columns_invalid'].format(
+                columns=', '.join(constants.MENU_CSV_COLUMNS)))
+        for row in reader:
+            yield reader.line_num, row['name'], row['price']
+        return
+
+    try:
+        data: Any = json.loads(content)
+    except ValueError:
+        raise ValueError(constants.MESSAGES['menu_json_invalid'])
+    yield from iter_json_rows(data)
+
+
+def parse_menu_rows(rows: Iterable[Tuple[int, Any, Any]]) -> Dict[str, Decimal]:
+    """
+    Проверяет блюда меню.
+
+    Args:
+        rows: Номера строк, названия и цены (см. iter_menu_rows).
+
+    Returns:
+        Dict[str, Decimal]: Цены по названиям блюд в порядке следования.
+
+    Raises:
+        ValueError: Если блюд нет или строка некорректна (с указанием ее номера).
+    """
+    prices: Dict[str, Decimal] = {}
+    for line, name, price in rows:
+        name = name.strip() if isinstance(name, str) else ''
+        try:
+            if not name or len(name) > constants.DISH_NAME_MAX_LENGTH:
+                raise ValueError(constants.MESSAGES['menu_name_invalid'].format(
+                    max_length=constants.DISH_NAME_MAX_LENGTH))
+            if name in prices:
+                raise ValueError(constants.MESSAGES['menu_name_duplicate'].format(name=name))
+            prices[name] = parse_price(price)
+        except ValueError as e:
+            raise ValueError(constants.MESSAGES['menu_row_invalid'].format(line=line, error=e))
+    if not prices:
+        raise ValueError(constants.MESSAGES['menu_empty'])
+    return prices
+
+
+def parse_menu(content: str, file_format: str) -> Dict[str, Decimal]:
+    """
+    Разбирает и проверяет файл меню.
+
+    Args:
+        content: Содержимое файла.
+        file_format: Формат файла (csv или json).
+
+    Returns:
+        Dict[str, Decimal]: Цены по названиям блюд в порядке следования в файле.
+
+    Raises:
+        ValueError: Если файл некорректен.
+    """
+    return parse_menu_rows(iter_menu_rows(content, file_format))
+
+
+def plan_menu_changes(prices: Dict[str, Decimal], create: bool) -> Tuple[Dict[str, Any], List[Dish], List[Dish]]:
+    """
+    Сравнивает новые цены с текущим меню.
+
+    Args:
+        prices: Цены по названиям блюд.
+        create: Добавлять отсутствующие блюда и возвращать блюда из архива в меню (импорт меню);
+            иначе все блюда должны существовать (таблица цен).
+
+    Returns:
+        Tuple[Dict[str, Any], List[Dish], List[Dish]]: Список изменений (ключи created, updated, unchanged),
+            новые блюда и измененные блюда.
+
+    Raises:
+        ValueError: Если без добавления блюд указаны несуществующие блюда.
+    """
+    existing: Dict[str, Dish] = {dish.name: dish for dish in Dish.objects.filter(name__in=list(prices))}
+    unknown: List[str] = [name for name in prices if name not in existing]
+    if unknown and not create:
+        raise ValueError(constants.MESSAGES['menu_dishes_unknown'].format(names=', '.join(unknown)))
+
+    changes: Dict[str, Any] = {'created': [], 'updated': [], 'unchanged': 0}
+    new_dishes: List[Dish] = []
+    changed_dishes: List[Dish] = []
+    for name, price in prices.items():
+        dish: Optional[Dish] = existing.get(name)
+        if dish is None:
+            new_dishes.append(Dish(name=name, price=price))
+            changes['created'].append({'name': name, 'price': str(price)})
+            continue
+        restored: bool = create and dish.is_archived
+        if dish.price == price and not restored:
+            changes['unchanged'] += 1
+            continue
+        changes['updated'].append({'id': dish.id, 'name': name, 'old_price': str(dish.price), 'price': str(price),
+                                   'restored': restored})
+        dish.price = price
+        dish.is_archived = dish.is_archived and not restored
+        changed_dishes.append(dish)
+    return changes, new_dishes, changed_dishes
+
+
+def write_menu_changes(new_dishes: List[Dish], changed_dishes: List[Dish]) -> None:
+    """
+    Сохраняет изменения меню пакетными запросами и один раз увеличивает версию меню.
+
+    Args:
+        new_dishes: Новые блюда.
+        changed_dishes: Измененные блюда.
+    """
+    Dish.objects.bulk_create(new_dishes, batch_size=constants.MENU_BULK_BATCH_SIZE)
+    if not changed_dishes:
+        return
+    Dish.objects.bulk_update(changed_dishes, ['price', 'is_archived'], batch_size=constants.MENU_BULK_BATCH_SIZE)
+    invalidate_all_order_details()
+
+
+def apply_menu_changes(prices: Dict[str, Decimal], create: bool, dry_run: bool) -> Dict[str, Any]:
+    """
+    Сравнивает новые цены с меню и, если это не пробный запуск, сохраняет изменения в одной транзакции.
+
+    Args:
+        prices: Цены по названиям блюд.
+        create: Добавлять отсутствующие блюда (см. plan_menu_changes).
+        dry_run: Только вернуть список изменений.
+
+    Returns:
+        Dict[str, Any]: Список изменений и признак пробного запуска (dry_run).
+
+    Raises:
+        ValueError: Если указаны несуществующие блюда (без добавления блюд).
+    """
+    with transaction.atomic():
+        changes, new_dishes, changed_dishes = plan_menu_changes(prices, create)
+        if not dry_run:
+            write_menu_changes(new_dishes, changed_dishes)
+    changes['dry_run'] = dry_run
+    return changes
+
+
+def import_menu(prices: Dict[str, Decimal], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Добавляет и обновляет блюда меню по названию.
+
+    Args:
+        prices: Цены по названиям блюд (см. parse_menu).
+        dry_run: Только вернуть список изменений.
+
+    Returns:
+        Dict[str, Any]: Список изменений (см. apply_menu_changes).
+    """
+    return apply_menu_changes(prices, True, dry_run)
+
+
+def adjust_prices(percent: Optional[Decimal] = None, prices: Optional[Dict[str, Decimal]] = None,
+                  dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Изменяет цены актуального меню на процент или устанавливает цены из таблицы.
+
+    Новые цены округляются до копеек по правилам математического округления.
+
+    Args:
+        percent: Процент изменения цен всех блюд актуального меню.
+        prices: Цены по названиям существующих блюд.
+        dry_run: Только вернуть список изменений.
+
+    Returns:
+        Dict[str, Any]: Список изменений (см. apply_menu_changes).
+
+    Raises:
+        ValueError: Если не указан или указаны одновременно процент и таблица цен, новая цена
+            не помещается в поле цены или в таблице есть несуществующие блюда.
+    """
+    if (percent is None) == (prices is None):
+        raise ValueError(constants.MESSAGES['menu_adjustment_invalid'])
+    with transaction.atomic():
+        if percent is not None:
+            factor: Decimal = 1 + percent / 100
+            prices = {}
+            for dish in Dish.active.order_by('name'):
+                price: Decimal = (dish.price * factor).quantize(PRICE_QUANT, rounding=ROUND_HALF_UP)
+                prices[dish.name] = check_price(price, price)
+        return apply_menu_changes(prices, False, dry_run)
+
+
+def format_menu_changes(changes: Dict[str, Any]) -> List[str]:
+    """
+    Формирует текстовый список изменений меню для вывода командами.
+
+    Args:
+        changes: Список изменений (см. apply_menu_changes).
+
+    Returns:
+        List[str]: Строки вида "+ название: цена" (новое блюдо) и "~ название: старая -> новая".
+    """
+    lines: List[str] = [f"+ {dish['name']}: {dish['price']}" for dish in changes['created']]
+    lines += [f"~ {dish['name']}: {dish['old_price']} -> {dish['price']}" + (" (из архива)" if dish['restored'] else '')
+              for dish in changes['updated']]
+    lines.append(constants.MESSAGES['menu_import_summary'].format(
+        created=len(changes['created']), updated=len(changes['updated']), unchanged=changes['unchanged']))
+    if changes['dry_run']:
+        lines.append(constants.MESSAGES['menu_dry_run'])
+    return lines
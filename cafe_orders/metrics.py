@@ -0,0 +1,369 @@
+"""
+Встроенные метрики приложения в текстовом формате экспозиции (Prometheus text format).
+
+Метрики процесса хранятся в реестре MetricsRegistry, изменения которого защищены блокировкой.
+Для агрегации между рабочими процессами (например, gunicorn с несколькими воркерами) задается
+каталог METRICS_MULTIPROCESS_DIR: каждый процесс периодически сохраняет в него снимок своих
+метрик в отдельный файл, а при запросе /metrics снимки всех процессов суммируются. Счетчики и
+гистограммы завершившихся процессов сохраняются, показатели (gauge) учитываются только для
+работающих процессов.
+"""
+
+import hmac
+import json
+import os
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from . import constants
+
+LabelKey = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, LabelKey]
+
+
+def make_label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    """
+    Приводит метки к хешируемому отсортированному виду.
+
+    Args:
+        labels: Метки метрики.
+
+    Returns:
+        LabelKey: Отсортированные пары (имя, значение).
+    """
+    return tuple(sorted((name, str(value)) for name, value in (labels or {}).items()))
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный реестр счетчиков, показателей и гистограмм одного процесса.
+    """
+
+    def __init__(self, buckets: Iterable[float] = constants.METRICS_LATENCY_BUCKETS) -> None:
+        """
+        Инициализирует пустой реестр.
+
+        Args:
+            buckets: Верхние границы интервалов гистограмм в секундах.
+        """
+        self.buckets: List[float] = list(buckets)
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._histograms: Dict[MetricKey, List[Any]] = {}
+        self._last_flush: float = 0.0
+
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name: Имя метрики.
+            labels: Метки метрики.
+            value: Величина увеличения.
+        """
+        key: MetricKey = (name, make_label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_gauge(self, name: str, delta: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Изменяет показатель на заданную величину.
+
+        Args:
+            name: Имя метрики.
+            delta: Величина изменения (может быть отрицательной).
+            labels: Метки метрики.
+        """
+        key: MetricKey = (name, make_label_key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Добавляет наблюдение в гистограмму.
+
+        Args:
+            name: Имя метрики.
+            value: Наблюдаемое значение.
+            labels: Метки метрики.
+        """
+        key: MetricKey = (name, make_label_key(labels))
+        with self._lock:
+            histogram: Optional[List[Any]] = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index: int = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def get_value(self, name: str, labels: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Возвращает текущее значение счетчика или показателя этого процесса.
+
+        Args:
+            name: Имя метрики.
+            labels: Метки метрики.
+
+        Returns:
+            float: Значение метрики (0, если метрика еще не изменялась).
+        """
+        key: MetricKey = (name, make_label_key(labels))
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает сериализуемый в JSON снимок метрик процесса.
+
+        Returns:
+            Dict[str, Any]: Снимок с ключами 'pid', 'buckets', 'counters', 'gauges', 'histograms'.
+        """
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'buckets': self.buckets,
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, list(labels), list(data[0]), data[1], data[2]]
+                               for (name, labels), data in self._histograms.items()],
+            }
+
+    def flush(self, directory: str, force: bool = False) -> None:
+        """
+        Сохраняет снимок метрик процесса в каталог (не чаще METRICS_FLUSH_INTERVAL секунд).
+
+        Args:
+            directory: Каталог снимков процессов.
+            force: Сохранить снимок независимо от интервала.
+        """
+        now: float = time.monotonic()
+        if not force and now - self._last_flush < constants.METRICS_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        path: str = os.path.join(directory, constants.METRICS_FILE_FORMAT.format(pid=os.getpid()))
+        temp_path: str = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.snapshot(), file)
+        os.replace(temp_path, path)
+
+
+def is_process_alive(pid: int) -> bool:
+    """
+    Проверяет, работает ли процесс с указанным pid.
+
+    Args:
+        pid: Идентификатор процесса.
+
+    Returns:
+        bool: True, если процесс существует.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def load_snapshots(directory: str) -> List[Dict[str, Any]]:
+    """
+    Загружает снимки метрик других процессов из каталога.
+
+    Args:
+        directory: Каталог снимков процессов.
+
+    Returns:
+        List[Dict[str, Any]]: Снимки всех процессов, кроме текущего.
+    """
+    snapshots: List[Dict[str, Any]] = []
+    prefix, suffix = constants.METRICS_FILE_FORMAT.split('{pid}')
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith(prefix) and filename.endswith(suffix)):
+            continue
+        try:
+            with open(os.path.join(directory, filename), encoding='utf-8') as file:
+                snapshot: Dict[str, Any] = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if snapshot.get('pid') != os.getpid():
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Суммирует снимки метрик нескольких процессов.
+
+    Показатели завершившихся процессов не учитываются.
+
+    Args:
+        snapshots: Снимки процессов.
+
+    Returns:
+        Dict[str, Any]: Объединенные метрики: 'buckets', 'counters', 'gauges' ({(имя, метки): значение})
+        и 'histograms' ({(имя, метки): [интервалы, сумма, количество]}).
+    """
+    merged: Dict[str, Any] = {'buckets': constants.METRICS_LATENCY_BUCKETS, 'counters': {}, 'gauges': {},
+                              'histograms': {}}
+    for snapshot in snapshots:
+        merged['buckets'] = snapshot['buckets']
+        for name, labels, value in snapshot['counters']:
+            key: MetricKey = (name, tuple(tuple(pair) for pair in labels))
+            merged['counters'][key] = merged['counters'].get(key, 0) + value
+        if snapshot['pid'] == os.getpid() or is_process_alive(snapshot['pid']):
+            for name, labels, value in snapshot['gauges']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged['gauges'][key] = merged['gauges'].get(key, 0) + value
+        for name, labels, bucket_counts, total, count in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            histogram: List[Any] = merged['histograms'].setdefault(key, [[0] * len(bucket_counts), 0.0, 0])
+            histogram[0] = [a + b for a, b in zip(histogram[0], bucket_counts)]
+            histogram[1] += total
+            histogram[2] += count
+    return merged
+
+
+def format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """
+    Форматирует метки для текстового формата экспозиции.
+
+    Args:
+        labels: Метки метрики.
+        extra: Дополнительная метка (например, le для интервалов гистограммы).
+
+    Returns:
+        str: Строка вида '{route="order-list",method="GET"}' или пустая строка.
+    """
+    pairs: List[Tuple[str, str]] = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def format_value(value: float) -> str:
+    """
+    Форматирует значение метрики.
+
+    Args:
+        value: Значение.
+
+    Returns:
+        str: Целые значения без дробной части, остальные — в формате repr.
+    """
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics(merged: Dict[str, Any]) -> str:
+    """
+    Формирует текст метрик в формате экспозиции.
+
+    Args:
+        merged: Объединенные метрики (результат merge_snapshots).
+
+    Returns:
+        str: Текст с блоками HELP/TYPE и значениями метрик.
+    """
+    samples: Dict[str, List[str]] = {}
+    for kind in ('counters', 'gauges'):
+        for (name, labels), value in sorted(merged[kind].items()):
+            samples.setdefault(name, []).append(f'{name}{format_labels(labels)} {format_value(value)}')
+    for (name, labels), (bucket_counts, total, count) in sorted(merged['histograms'].items()):
+        lines: List[str] = samples.setdefault(name, [])
+        cumulative: int = 0
+        for bound, bucket_count in zip(list(merged['buckets']) + ['+Inf'], bucket_counts):
+            cumulative += bucket_count
+            le: str = bound if isinstance(bound, str) else format_value(bound)
+            lines.append(f'{name}_bucket{format_labels(labels, ("le", le))} {cumulative}')
+        lines.append(f'{name}_sum{format_labels(labels)} {format_value(total)}')
+        lines.append(f'{name}_count{format_labels(labels)} {count}')
+
+    output: List[str] = []
+    for name, (metric_type, description) in constants.METRICS_DEFINITIONS.items():
+        output.append(f'# HELP {name} {description}')
+        output.append(f'# TYPE {name} {metric_type}')
+        output.extend(samples.get(name, []))
+    return '\n'.join(output) + '\n'
+
+
+registry: MetricsRegistry = MetricsRegistry()
+"""Реестр метрик текущего процесса."""
+
+
+def get_multiprocess_dir() -> str:
+    """
+    Возвращает каталог снимков метрик процессов.
+
+    Returns:
+        str: Путь к каталогу или пустая строка, если агрегация между процессами выключена.
+    """
+    return getattr(settings, 'METRICS_MULTIPROCESS_DIR', '')
+
+
+def is_metrics_access_allowed(request: Any) -> bool:
+    """
+    Проверяет доступ к эндпоинту /metrics.
+
+    Метрики раскрывают маршруты, нагрузку и выручку, поэтому доступны только администраторам
+    и сборщику метрик, передающему заголовок "Authorization: Bearer <METRICS_TOKEN>".
+
+    Args:
+        request: HTTP-запрос.
+
+    Returns:
+        bool: True, если запрос от администратора или с верным токеном.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    token: str = getattr(settings, 'METRICS_TOKEN', '')
+    scheme, _, credentials = request.META.get(constants.METRICS_AUTH_HEADER, '').partition(' ')
+    return bool(token) and scheme == constants.METRICS_AUTH_SCHEME and hmac.compare_digest(credentials.strip(), token)
+
+
+def collect_metrics() -> str:
+    """
+    Собирает метрики текущего процесса и (при заданном каталоге) остальных процессов.
+
+    Returns:
+        str: Текст метрик в формате экспозиции.
+    """
+    snapshots: List[Dict[str, Any]] = [registry.snapshot()]
+    directory: str = get_multiprocess_dir()
+    if directory:
+        registry.flush(directory, force=True)
+        snapshots.extend(load_snapshots(directory))
+    return render_metrics(merge_snapshots(snapshots))
+
+
+def record_order_created(source: str) -> None:
+    """
+    Учитывает создание заказа.
+
+    Args:
+        source: Источник заказа ('html' или 'api').
+    """
+    registry.inc('cafe_orders_created_total', {'source': source})
+
+
+def record_status_transition(order: Any, old_status: str) -> None:
+    """
+    Учитывает смену статуса заказа; при переводе в статус "оплачено" добавляет сумму заказа к выручке.
+
+    Args:
+        order: Заказ после сохранения.
+        old_status: Статус заказа до изменения.
+    """
+    if order.status == old_status:
+        return
+    registry.inc('cafe_order_status_transitions_total', {'from': old_status, 'to': order.status})
+    if order.status == constants.REVENUE_CALCULATION_STATUS:
+        total: Decimal = order.total_price
+        registry.inc('cafe_revenue_paid_total', value=float(total))
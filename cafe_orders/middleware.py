@@ -0,0 +1,375 @@
+"""
+Middleware приложения cafe_orders.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from . import constants
+from .admission import create_slots
+from .metrics import get_multiprocess_dir, registry
+from .profiling import get_profiling_dir, profile_request, should_profile
+from .slow_queries import SlowQueryRecorder, get_log_file, get_threshold_ms
+from .timing import RequestTimings, current_timings, format_server_timing
+
+logger: logging.Logger = logging.getLogger(constants.TIMING_LOGGER_NAME)
+
+
+class AdmissionControlMiddleware:
+    """
+    Ограничивает количество одновременно обрабатываемых запросов.
+
+    Включается настройкой ADMISSION_MAX_IN_FLIGHT (общий лимит) и/или ADMISSION_API_MAX_IN_FLIGHT
+    (лимит запросов к API, оставляющий часть слотов для веб-интерфейса официантов). Запрос, не
+    получивший слот за ADMISSION_QUEUE_TIMEOUT секунд, сразу получает ответ 503 с заголовком
+    Retry-After, не обращаясь к базе данных.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response: Следующий обработчик в цепочке.
+
+        Raises:
+            MiddlewareNotUsed: Если оба лимита выключены в настройках.
+        """
+        self.slots: Optional[threading.BoundedSemaphore] = create_slots(
+            getattr(settings, 'ADMISSION_MAX_IN_FLIGHT', 0))
+        self.api_slots: Optional[threading.BoundedSemaphore] = create_slots(
+            getattr(settings, 'ADMISSION_API_MAX_IN_FLIGHT', 0))
+        if self.slots is None and self.api_slots is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос, если для него есть свободный слот.
+
+        Args:
+            request: HTTP-запрос.
+
+        Returns:
+            HttpResponse: Ответ следующего обработчика или 503 при перегрузке.
+        """
+        if request.path in constants.ADMISSION_EXEMPT_PATHS:
+            return self.get_response(request)
+        semaphores: List[threading.BoundedSemaphore] = [] if self.slots is None else [self.slots]
+        if self.api_slots is not None and request.path.startswith(constants.API_PATH_PREFIX):
+            semaphores.insert(0, self.api_slots)
+        acquired: List[threading.BoundedSemaphore] = []
+        try:
+            for semaphore in semaphores:
+                if not semaphore.acquire(timeout=constants.ADMISSION_QUEUE_TIMEOUT):
+                    registry.inc('cafe_requests_rejected_total', {'reason': 'overloaded', 'scope': 'all'})
+                    response: HttpResponse = JsonResponse({'status': constants.MESSAGES['server_overloaded']},
+                                                          status=503)
+                    response['Retry-After'] = str(constants.ADMISSION_RETRY_AFTER)
+                    return response
+                acquired.append(semaphore)
+            return self.get_response(request)
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+
+
+class RequestTimingMiddleware:
+    """
+    Замеряет для каждого запроса количество и время SQL-запросов, время представления и
+    рендеринга, добавляет их в заголовок Server-Timing и пишет структурированную строку в лог.
+
+    Включается настройкой REQUEST_TIMING_ENABLED. Запросы, превысившие бюджет
+    REQUEST_TIMING_QUERY_BUDGET по количеству SQL-запросов, логируются с уровнем WARNING.
+    Время рендеринга HTML-шаблонов учитывается при использовании бэкенда
+    cafe_orders.timing.TimedDjangoTemplates.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response: Следующий обработчик в цепочке.
+
+        Raises:
+            MiddlewareNotUsed: Если замеры выключены в настройках.
+        """
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget: int = getattr(settings, 'REQUEST_TIMING_QUERY_BUDGET', constants.TIMING_QUERY_BUDGET)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос с замерами.
+
+        Args:
+            request: HTTP-запрос.
+
+        Returns:
+            HttpResponse: Ответ с заголовком Server-Timing.
+        """
+        timings: RequestTimings = RequestTimings()
+        token = current_timings.set(timings)
+        started: float = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+                response: HttpResponse = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total_time: float = time.perf_counter() - started
+
+        view_time, render_time = self._split_view_and_render(request, timings, started + total_time)
+        over_budget: bool = timings.queries > self.query_budget
+        metrics: Dict[str, Tuple[float, str]] = {
+            'sql': (timings.sql_time * 1000, f'{timings.queries} queries'),
+            'view': (view_time * 1000, ''),
+            'render': (render_time * 1000, ''),
+            'total': (total_time * 1000, ''),
+        }
+        if over_budget:
+            metrics['budget'] = (0.0, f'exceeded {self.query_budget} queries')
+        response[constants.TIMING_HEADER] = format_server_timing(metrics)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        record: Dict[str, Any] = {
+            'route': resolver_match.view_name if resolver_match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'sql_ms': round(timings.sql_time * 1000, 3),
+            'view_ms': round(view_time * 1000, 3),
+            'render_ms': round(render_time * 1000, 3),
+            'total_ms': round(total_time * 1000, 3),
+            'over_budget': over_budget,
+        }
+        logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps(record, ensure_ascii=False))
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any,
+                     view_kwargs: Any) -> None:
+        """
+        Запоминает момент начала выполнения представления.
+
+        Args:
+            request: HTTP-запрос.
+            view_func: Функция представления.
+            view_args: Позиционные аргументы представления.
+            view_kwargs: Именованные аргументы представления.
+        """
+        request._timing_view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """
+        Запоминает момент окончания представления для ответов с отложенным рендерингом (DRF, TemplateResponse).
+
+        Args:
+            request: HTTP-запрос.
+            response: Ответ представления (еще не отрендеренный).
+
+        Returns:
+            HttpResponse: Тот же ответ.
+        """
+        timings: Optional[RequestTimings] = current_timings.get()
+        request._timing_view_finished = time.perf_counter()
+        request._timing_render_in_view = timings.render_time if timings else 0.0
+        return response
+
+    @staticmethod
+    def _split_view_and_render(request: HttpRequest, timings: RequestTimings,
+                               finished: float) -> Tuple[float, float]:
+        """
+        Разделяет время выполнения представления и время рендеринга.
+
+        Рендеринг шаблонов внутри представления (render()) вычитается из времени представления;
+        отложенный рендеринг ответа (DRF, TemplateResponse) считается от окончания представления
+        до окончания обработки запроса. Время SQL входит во время представления.
+
+        Args:
+            request: HTTP-запрос.
+            timings: Замеры запроса.
+            finished: Момент окончания обработки запроса.
+
+        Returns:
+            Tuple[float, float]: Время представления и время рендеринга в секундах.
+        """
+        view_started: Optional[float] = getattr(request, '_timing_view_started', None)
+        if view_started is None:
+            return 0.0, timings.render_time
+        view_finished: Optional[float] = getattr(request, '_timing_view_finished', None)
+        if view_finished is None:
+            return max(finished - view_started - timings.render_time, 0.0), timings.render_time
+        render_in_view: float = request._timing_render_in_view
+        return (max(view_finished - view_started - render_in_view, 0.0),
+                render_in_view + finished - view_finished)
+
+
+class MetricsMiddleware:
+    """
+    Обновляет метрики HTTP-запросов: гистограмму времени обработки по маршруту, счетчик запросов,
+    количество обрабатываемых запросов, количество и время SQL-запросов.
+
+    Выключается настройкой METRICS_ENABLED. При заданном METRICS_MULTIPROCESS_DIR периодически
+    сохраняет снимок метрик процесса для агрегации между рабочими процессами.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response: Следующий обработчик в цепочке.
+
+        Raises:
+            MiddlewareNotUsed: Если метрики выключены в настройках.
+        """
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос и обновляет метрики.
+
+        Args:
+            request: HTTP-запрос.
+
+        Returns:
+            HttpResponse: Ответ следующего обработчика.
+        """
+        timings: RequestTimings = RequestTimings()
+        registry.add_gauge('cafe_http_requests_in_flight', 1)
+        started: float = time.perf_counter()
+        status_code: int = 500
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+                response: HttpResponse = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            elapsed: float = time.perf_counter() - started
+            registry.add_gauge('cafe_http_requests_in_flight', -1)
+            resolver_match = getattr(request, 'resolver_match', None)
+            route: str = resolver_match.view_name if resolver_match else constants.METRICS_UNMATCHED_ROUTE
+            registry.observe('cafe_http_request_duration_seconds', elapsed, {'route': route})
+            registry.inc('cafe_http_requests_total', {'route': route, 'method': request.method,
+                                                      'status': status_code})
+            registry.inc('cafe_db_queries_total', {'route': route}, timings.queries)
+            registry.inc('cafe_db_time_seconds_total', {'route': route}, timings.sql_time)
+            directory: str = get_multiprocess_dir()
+            if directory:
+                registry.flush(directory)
+
+
+class SlowQueryMiddleware:
+    """
+    Записывает SQL-запросы, выполнявшиеся дольше SLOW_QUERY_THRESHOLD_MS, вместе с планом
+    выполнения, маршрутом и GET-параметрами запроса в журнал медленных запросов.
+
+    Включается ненулевым значением SLOW_QUERY_THRESHOLD_MS.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response: Следующий обработчик в цепочке.
+
+        Raises:
+            MiddlewareNotUsed: Если порог медленного запроса не задан.
+        """
+        if get_threshold_ms() <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос с записью медленных SQL-запросов.
+
+        Args:
+            request: HTTP-запрос.
+
+        Returns:
+            HttpResponse: Ответ следующего обработчика.
+        """
+        origin: Dict[str, Any] = {'route': None, 'method': request.method, 'path': request.path,
+                                  'query_params': request.GET.dict()}
+        request._slow_query_origin = origin
+        threshold_ms: float = get_threshold_ms()
+        log_file: str = get_log_file()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(
+                    SlowQueryRecorder(connection, threshold_ms, origin, log_file=log_file)))
+            return self.get_response(request)
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any,
+                     view_kwargs: Any) -> None:
+        """
+        Дополняет сведения об источнике запросов именем маршрута.
+
+        Args:
+            request: HTTP-запрос.
+            view_func: Функция представления.
+            view_args: Позиционные аргументы представления.
+            view_kwargs: Именованные аргументы представления.
+        """
+        request._slow_query_origin['route'] = request.resolver_match.view_name
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует отдельные запросы под cProfile и сохраняет профили в каталог PROFILING_DIR.
+
+    Запрос профилируется при заголовке X-Profile с токеном PROFILING_TOKEN или при попадании в
+    случайную выборку с долей PROFILING_SAMPLE_RATE. Имя сохраненного профиля возвращается в
+    заголовке ответа X-Profile-Id. Включается заданием PROFILING_DIR.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response: Следующий обработчик в цепочке.
+
+        Raises:
+            MiddlewareNotUsed: Если каталог профилей не задан.
+        """
+        if not get_profiling_dir():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос, при необходимости под профилировщиком.
+
+        Args:
+            request: HTTP-запрос.
+
+        Returns:
+            HttpResponse: Ответ следующего обработчика.
+        """
+        if should_profile(request):
+            response: Optional[HttpResponse] = profile_request(self.get_response, request)
+            if response is not None:
+                return response
+        return self.get_response(request)
@@ -1,20 +1,52 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+from contextlib import contextmanager
 from decimal import Decimal
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import threading
 
 from cafe_orders.constants import DISH_PRICE_MAX_DIGITS, DISH_PRICE_DECIMAL_PLACES, DISH_PRICE_MIN_VALUE, \
     DISH_NAME_MAX_LENGTH, DISH_STR_FORMAT, ORDER_TABLE_NUMBER_MIN_VALUE, ORDER_STATUS_CHOICES, DEFAULT_ORDER_STATUS, \
-    ORDER_STR_FORMAT, DEFAULT_QUANTITY, ORDER_ITEM_QUANTITY_MIN_VALUE, ORDER_ITEM_STR_FORMAT
+    ORDER_STR_FORMAT, DEFAULT_QUANTITY, ORDER_ITEM_QUANTITY_MIN_VALUE, ORDER_ITEM_STR_FORMAT, \
+    ARCHIVED_ORDER_STR_FORMAT, DISH_ACTIVE_INDEX_NAME, TOMBSTONE_REASON_CHOICES, TOMBSTONE_REASON_DELETED, \
+    IDEMPOTENCY_KEY_MAX_LENGTH, IDEMPOTENCY_CLIENT_MAX_LENGTH, IDEMPOTENCY_KEY_UNIQUE_NAME, ORDER_EVENT_TYPE_CHOICES, ORDER_EVENT_DELETED, REPORT_JOB_KIND_CHOICES, \
+    REPORT_JOB_STATUS_CHOICES, REPORT_JOB_QUEUED, INVALIDATION_SCOPE_MAX_LENGTH, INVALIDATION_KEY_MAX_LENGTH, \
+    REVENUE_CALCULATION_STATUS
+from cafe_orders.detail_cache import invalidate_all_order_details, invalidate_order_details
+
+_deferred_touch: threading.local = threading.local()
+
+
+class ActiveDishManager(models.Manager):
+    """
+    Менеджер, возвращающий только блюда, не перенесенные в архив (актуальное меню).
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        """
+        Возвращает queryset актуальных блюд.
+
+        Returns:
+            QuerySet: Блюда с is_archived=False.
+        """
+        return super().get_queryset().filter(is_archived=False)
 
 
 class Dish(models.Model):
     """
     Модель блюда.
 
+    Блюда не удаляются физически: удаление переводит блюдо в архив, чтобы не затрагивать историю заказов.
+
     Attributes:
         name (CharField): Название блюда (максимальная длина 100 символов, уникальное).
         price (DecimalField): Цена блюда (максимально 7 знаков, 2 знака после запятой, минимальное значение 0.00).
+        is_archived (BooleanField): Признак того, что блюдо убрано из меню.
+        objects (Manager): Менеджер всех блюд, включая архивные.
+        active (ActiveDishManager): Менеджер блюд актуального меню.
     """
     name = models.CharField("Название блюда", max_length=DISH_NAME_MAX_LENGTH, unique=True)
     price = models.DecimalField(
@@ -23,6 +55,40 @@ class Dish(models.Model):
         decimal_places=DISH_PRICE_DECIMAL_PLACES,
         validators=[MinValueValidator(Decimal(DISH_PRICE_MIN_VALUE))]
     )
+    is_archived = models.BooleanField("В архиве", default=False)
+
+    objects = models.Manager()
+    active = ActiveDishManager()
+
+    class Meta:
+        """
+        Метаданные модели.
+        """
+        indexes: List[models.Index] = [
+            models.Index(fields=['name'], condition=Q(is_archived=False), name=DISH_ACTIVE_INDEX_NAME),
+        ]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Сохраняет блюдо; при изменении существующего блюда увеличивает версию меню, чтобы строки
+        списка заказов и детали заказов с ним были отрисованы заново. Сами заказы не изменяются:
+        цены позиций зафиксированы в unit_price.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+        """
+        adding: bool = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            invalidate_all_order_details()
+
+    def archive(self) -> None:
+        """
+        Переводит блюдо в архив одним UPDATE-запросом без каскадных изменений в заказах.
+        """
+        Dish.objects.filter(pk=self.pk).update(is_archived=True)
+        self.is_archived = True
 
     def __str__(self) -> str:
         """
@@ -43,7 +109,8 @@ class Order(models.Model):
         table_number (PositiveIntegerField): Номер стола (минимальное значение 1).
         status (CharField): Статус заказа (один из вариантов из STATUS_CHOICES, по умолчанию 'pending').
         created_at (DateTimeField): Дата и время создания заказа (автоматически устанавливается при создании).
-        updated_at (DateTimeField): Дата и время обновления заказа (автоматически обновляется при каждом сохранении).
+        updated_at (DateTimeField): Дата и время обновления заказа (автоматически обновляется при каждом сохранении
+            заказа и при изменении его позиций; индексируется для выборки изменений).
     """
     STATUS_CHOICES: List[Tuple[str, str]] = ORDER_STATUS_CHOICES
 
@@ -58,7 +125,82 @@ class Order(models.Model):
         default=DEFAULT_ORDER_STATUS,
     )
     created_at = models.DateTimeField("Создано", auto_now_add=True)
-    updated_at = models.DateTimeField("Обновлено", auto_now=True)
+    updated_at = models.DateTimeField("Обновлено", auto_now=True, db_index=True)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, dict]:
+        """
+        Удаляет заказ и в той же транзакции записывает отметку об удалении для синхронизации клиентов
+        и событие удаления в журнал заказов, убирает позиции заказа из очереди кухни и сбрасывает
+        сохраненную аналитику за день заказа.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+
+        Returns:
+            Tuple[int, dict]: Количество удаленных объектов и их распределение по моделям.
+        """
+        with transaction.atomic():
+            OrderTombstone.record([self.pk])
+            OrderEvent.record_deleted([self.pk])
+            KitchenQueueEntry.remove_orders([self.pk])
+            invalidate_order_details([self.pk])
+            day = timezone.localdate(self.created_at)
+            if day < timezone.localdate():
+                DailyAnalytics.objects.filter(day=day).delete()
+            return super().delete(*args, **kwargs)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Сохраняет заказ и сбрасывает кэш его деталей после фиксации транзакции.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+        """
+        super().save(*args, **kwargs)
+        invalidate_order_details([self.pk])
+
+    @classmethod
+    def touch(cls, *order_ids: int) -> None:
+        """
+        Обновляет дату изменения заказов одним UPDATE-запросом без загрузки объектов.
+
+        Вызывается при изменении позиций заказа, чтобы updated_at отражал любое изменение заказа;
+        кэш деталей этих заказов сбрасывается. Внутри блока deferred_touch заказы только запоминаются.
+
+        Args:
+            *order_ids: Идентификаторы заказов.
+        """
+        pending: Optional[Set[int]] = getattr(_deferred_touch, 'order_ids', None)
+        if pending is not None:
+            pending.update(order_ids)
+            return
+        cls.objects.filter(pk__in=order_ids).update(updated_at=timezone.now())
+        invalidate_order_details(order_ids)
+
+    @classmethod
+    @contextmanager
+    def deferred_touch(cls) -> Iterator[None]:
+        """
+        Откладывает touch позиций заказа до конца блока.
+
+        При сохранении нескольких позиций каждый затронутый заказ обновляется одним UPDATE-запросом
+        и одним сбросом кэша после цикла, а не после каждой позиции. Блок следует открывать внутри
+        транзакции изменения, чтобы touch выполнился в ней же. Если блок завершился исключением,
+        touch не выполняется. Вложенные блоки присоединяются к внешнему.
+        """
+        if getattr(_deferred_touch, 'order_ids', None) is not None:
+            yield
+            return
+        _deferred_touch.order_ids = set()
+        try:
+            yield
+            order_ids: Set[int] = _deferred_touch.order_ids
+        finally:
+            _deferred_touch.order_ids = None
+        if order_ids:
+            cls.touch(*order_ids)
 
     @property
     def total_price(self) -> Decimal:
@@ -85,28 +227,95 @@ class OrderItem(models.Model):
     """
     Модель позиции заказа.
 
+    Цена блюда фиксируется в позиции в момент ее создания (или смены блюда), поэтому
+    последующее изменение цены в меню не меняет стоимость уже оформленных заказов и выручку.
+
     Attributes:
         order (ForeignKey): Заказ, к которому относится позиция.
         dish (ForeignKey): Блюдо, входящее в позицию заказа.
         quantity (PositiveIntegerField): Количество блюд в позиции (минимальное значение 1, по умолчанию 1).
+        unit_price (DecimalField): Цена блюда за единицу на момент оформления позиции.
     """
     order = models.ForeignKey(Order, related_name='items', on_delete=models.CASCADE)
-    dish = models.ForeignKey(Dish, default=1, on_delete=models.CASCADE, verbose_name="Блюдо")
+    dish = models.ForeignKey(Dish, default=1, on_delete=models.PROTECT, verbose_name="Блюдо")
     quantity = models.PositiveIntegerField(
         "Количество",
         default=DEFAULT_QUANTITY,
         validators=[MinValueValidator(ORDER_ITEM_QUANTITY_MIN_VALUE)]
     )
+    unit_price = models.DecimalField(
+        "Цена за единицу",
+        max_digits=DISH_PRICE_MAX_DIGITS,
+        decimal_places=DISH_PRICE_DECIMAL_PLACES,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    @classmethod
+    def from_db(cls, db: str, field_names: List[str], values: List[Any]) -> 'OrderItem':
+        """
+        Создает объект из строки базы данных и запоминает блюдо, для которого зафиксирована цена.
+
+        Args:
+            db: Псевдоним базы данных.
+            field_names: Имена загруженных полей.
+            values: Значения загруженных полей.
+
+        Returns:
+            OrderItem: Загруженный объект позиции заказа.
+        """
+        instance: OrderItem = super().from_db(db, field_names, values)
+        instance._priced_dish_id = instance.__dict__.get('dish_id')
+        return instance
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Сохраняет позицию, фиксируя цену блюда для новой позиции или при смене блюда.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+        """
+        priced_dish_id: Optional[int] = getattr(self, '_priced_dish_id', None)
+        if self.unit_price is None or (priced_dish_id is not None and priced_dish_id != self.dish_id):
+            self.unit_price = self.dish.price
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'unit_price' not in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['unit_price']
+        super().save(*args, **kwargs)
+        self._priced_dish_id = self.dish_id
+        Order.touch(self.order_id)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, dict]:
+        """
+        Удаляет позицию и обновляет дату изменения заказа.
+
+        Args:
+            *args: Произвольные аргументы.
+            **kwargs: Произвольные именованные аргументы.
+
+        Returns:
+            Tuple[int, dict]: Количество удаленных объектов и их распределение по моделям.
+        """
+        order_id: int = self.order_id
+        result: Tuple[int, dict] = super().delete(*args, **kwargs)
+        Order.touch(order_id)
+        return result
 
     @property
     def price(self) -> Decimal:
         """
-        Вычисляет стоимость позиции заказа.
+        Вычисляет стоимость позиции заказа по зафиксированной цене.
+
+        Для позиций, цена которых еще не зафиксирована (до запуска backfill_unit_prices),
+        используется текущая цена блюда.
 
         Returns:
             Decimal: Стоимость позиции заказа.
         """
-        return self.dish.price * self.quantity
+        unit_price: Decimal = self.unit_price if self.unit_price is not None else self.dish.price
+        return unit_price * self.quantity
 
     def __str__(self) -> str:
         """
@@ -119,4 +328,441 @@ class OrderItem(models.Model):
             dish_name=self.dish.name,
             quantity=self.quantity,
             price=self.price,
-        )
\ No newline at end of file
+        )
+
+
+class ArchivedOrder(models.Model):
+    """
+    Архивная копия оплаченного заказа.
+
+    Хранится отдельно от рабочих таблиц, чтобы накопленная история не замедляла
+    запросы к актуальным заказам. Первичный ключ совпадает с id исходного заказа.
+
+    Attributes:
+        id (BigIntegerField): Идентификатор исходного заказа.
+        table_number (PositiveIntegerField): Номер стола.
+        status (CharField): Статус заказа на момент архивации.
+        created_at (DateTimeField): Дата и время создания исходного заказа.
+        updated_at (DateTimeField): Дата и время последнего изменения исходного заказа.
+        archived_at (DateTimeField): Дата и время переноса в архив.
+        total_price (DecimalField): Общая стоимость заказа на момент архивации.
+    """
+    id = models.BigIntegerField("ID заказа", primary_key=True)
+    table_number = models.PositiveIntegerField("Номер стола")
+    status = models.CharField("Статус заказа", max_length=10, choices=ORDER_STATUS_CHOICES)
+    created_at = models.DateTimeField("Создано", db_index=True)
+    updated_at = models.DateTimeField("Обновлено")
+    archived_at = models.DateTimeField("Перенесено в архив", auto_now_add=True)
+    total_price = models.DecimalField(
+        "Итого",
+        max_digits=DISH_PRICE_MAX_DIGITS + 3,
+        decimal_places=DISH_PRICE_DECIMAL_PLACES,
+    )
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление архивного заказа.
+
+        Returns:
+            str: Строковое представление в формате "Архивный заказ id - Стол номер_стола".
+        """
+        return ARCHIVED_ORDER_STR_FORMAT.format(id=self.id, table_number=self.table_number)
+
+
+class ArchivedOrderItem(models.Model):
+    """
+    Архивная копия позиции заказа.
+
+    Название и цена блюда сохраняются на момент архивации, поэтому последующие
+    изменения меню не влияют на исторические данные.
+
+    Attributes:
+        order (ForeignKey): Архивный заказ, к которому относится позиция.
+        dish (ForeignKey): Блюдо (может отсутствовать, если блюдо было удалено).
+        dish_name (CharField): Название блюда на момент архивации.
+        quantity (PositiveIntegerField): Количество блюд в позиции.
+        unit_price (DecimalField): Цена за единицу на момент архивации.
+    """
+    order = models.ForeignKey(ArchivedOrder, related_name='items', on_delete=models.CASCADE)
+    dish = models.ForeignKey(Dish, null=True, blank=True, on_delete=models.SET_NULL, verbose_name="Блюдо")
+    dish_name = models.CharField("Название блюда", max_length=DISH_NAME_MAX_LENGTH)
+    quantity = models.PositiveIntegerField("Количество")
+    unit_price = models.DecimalField(
+        "Цена за единицу",
+        max_digits=DISH_PRICE_MAX_DIGITS,
+        decimal_places=DISH_PRICE_DECIMAL_PLACES,
+    )
+
+    @property
+    def price(self) -> Decimal:
+        """
+        Вычисляет стоимость архивной позиции заказа.
+
+        Returns:
+            Decimal: Стоимость позиции заказа.
+        """
+        return self.unit_price * self.quantity
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление архивной позиции заказа.
+
+        Returns:
+            str: Строковое представление в формате "Название_блюда x Количество - Цена₽".
+        """
+        return ORDER_ITEM_STR_FORMAT.format(
+            dish_name=self.dish_name,
+            quantity=self.quantity,
+            price=self.price,
+        )
+
+
+class OrderTombstone(models.Model):
+    """
+    Отметка об удаленном (или перенесенном в архив) заказе.
+
+    Используется для синхронизации клиентов по изменениям: клиент получает id заказов,
+    удаленных после его последней синхронизации, и удаляет их у себя.
+
+    Attributes:
+        order_id (BigIntegerField): Идентификатор удаленного заказа.
+        reason (CharField): Причина удаления (удален или перенесен в архив).
+        deleted_at (DateTimeField): Дата и время удаления.
+    """
+    order_id = models.BigIntegerField("ID заказа")
+    reason = models.CharField("Причина", max_length=10, choices=TOMBSTONE_REASON_CHOICES,
+                              default=TOMBSTONE_REASON_DELETED)
+    deleted_at = models.DateTimeField("Удалено", default=timezone.now, db_index=True)
+
+    @classmethod
+    def record(cls, order_ids: List[int], reason: str = TOMBSTONE_REASON_DELETED) -> None:
+        """
+        Записывает отметки об удалении заказов одним пакетным запросом.
+
+        Args:
+            order_ids: Идентификаторы удаленных заказов.
+            reason: Причина удаления.
+        """
+        deleted_at = timezone.now()
+        cls.objects.bulk_create([cls(order_id=order_id, reason=reason, deleted_at=deleted_at)
+                                 for order_id in order_ids])
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление отметки об удалении.
+
+        Returns:
+            str: Строковое представление в формате "id_заказа (причина)".
+        """
+        return f"{self.order_id} ({self.get_reason_display()})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Сохраненный результат запроса с заголовком Idempotency-Key.
+
+    Повторный запрос с тем же ключом получает сохраненный ответ, не затрагивая таблицы заказов.
+    Пока исходный запрос выполняется, запись существует без ответа (completed=False). Запись без ответа
+    старше IDEMPOTENCY_CLAIM_LEASE_SECONDS секунд (процесс исходного запроса завершился аварийно) перехватывается
+    повторным запросом. Ключи уникальны в пределах клиента, поэтому совпавшие ключи разных клиентов не пересекаются.
+
+    Attributes:
+        client (CharField): Клиент — пользователь или IP-адрес (см. idempotency.get_client_id).
+        key (CharField): Значение заголовка Idempotency-Key (уникальное для клиента).
+        request_hash (CharField): SHA-256 метода, пути и тела исходного запроса.
+        completed (BooleanField): Признак того, что ответ сохранен.
+        status_code (PositiveSmallIntegerField): HTTP-статус сохраненного ответа.
+        response_data (JSONField): Данные сохраненного ответа.
+        created_at (DateTimeField): Дата и время первого запроса (от нее отсчитывается срок хранения).
+        claimed_at (DateTimeField): Дата и время резервирования ключа запросом, выполняющим его.
+    """
+    client = models.CharField("Клиент", max_length=IDEMPOTENCY_CLIENT_MAX_LENGTH, default='')
+    key = models.CharField("Ключ", max_length=IDEMPOTENCY_KEY_MAX_LENGTH)
+    request_hash = models.CharField("Хэш запроса", max_length=64)
+    completed = models.BooleanField("Ответ сохранен", default=False)
+    status_code = models.PositiveSmallIntegerField("HTTP-статус", null=True, blank=True)
+    response_data = models.JSONField("Данные ответа", null=True, blank=True)
+    created_at = models.DateTimeField("Создано", default=timezone.now, db_index=True)
+    claimed_at = models.DateTimeField("Зарезервировано", default=timezone.now)
+
+    class Meta:
+        """
+        Метаданные модели.
+        """
+        constraints: List[models.UniqueConstraint] = [
+            models.UniqueConstraint(fields=['client', 'key'], name=IDEMPOTENCY_KEY_UNIQUE_NAME),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление ключа идемпотентности.
+
+        Returns:
+            str: Значение ключа.
+        """
+        return self.key
+
+
+class OrderEvent(models.Model):
+    """
+    Событие журнала заказов.
+
+    Журнал только пополняется: события не изменяются и не удаляются. Идентификатор события служит
+    его позицией в журнале, по которой проекции продолжают обработку с сохраненной позиции.
+
+    Attributes:
+        order_id (BigIntegerField): Идентификатор заказа.
+        event_type (CharField): Тип события (создан, изменен, удален, перенесен в архив).
+        payload (JSONField): Состояние заказа после события и измененные поля (см. cafe_orders.events).
+        created_at (DateTimeField): Дата и время события.
+    """
+    order_id = models.BigIntegerField("ID заказа", db_index=True)
+    event_type = models.CharField("Тип события", max_length=10, choices=ORDER_EVENT_TYPE_CHOICES)
+    payload = models.JSONField("Данные события", default=dict)
+    created_at = models.DateTimeField("Создано", default=timezone.now)
+
+    @classmethod
+    def record(cls, order_id: int, event_type: str, payload: Optional[dict] = None) -> 'OrderEvent':
+        """
+        Добавляет событие в журнал.
+
+        Args:
+            order_id: Идентификатор заказа.
+            event_type: Тип события.
+            payload: Данные события.
+
+        Returns:
+            OrderEvent: Добавленное событие.
+        """
+        return cls.objects.create(order_id=order_id, event_type=event_type, payload=payload or {})
+
+    @classmethod
+    def record_many(cls, order_ids: List[int], event_type: str) -> None:
+        """
+        Добавляет события без данных (перенос в архив) одним пакетным запросом.
+
+        Args:
+            order_ids: Идентификаторы заказов.
+            event_type: Тип события.
+        """
+        created_at = timezone.now()
+        cls.objects.bulk_create([cls(order_id=order_id, event_type=event_type, created_at=created_at)
+                                 for order_id in order_ids])
+
+    @classmethod
+    def record_deleted(cls, order_ids: List[int]) -> None:
+        """
+        Добавляет события удаления заказов одним пакетным запросом (до удаления позиций).
+
+        Событие удаления оплаченного заказа содержит его выручку (revenue), поэтому проекция выручки
+        вычитает ее, не храня суммы всех оплаченных заказов.
+
+        Args:
+            order_ids: Идентификаторы удаляемых заказов.
+        """
+        unit_price: Coalesce = Coalesce('unit_price', 'dish__price')
+        revenue: Dict[int, Decimal] = dict(
+            OrderItem.objects.filter(order_id__in=order_ids, order__status=REVENUE_CALCULATION_STATUS)
+            .values('order_id').order_by()
+            .annotate(total=Sum(ExpressionWrapper(unit_price * F('quantity'), output_field=DecimalField())))
+            .values_list('order_id', 'total')
+        )
+        created_at = timezone.now()
+        cls.objects.bulk_create([
+            cls(order_id=order_id, event_type=ORDER_EVENT_DELETED, created_at=created_at,
+                payload={'revenue': str(revenue[order_id])} if order_id in revenue else {})
+            for order_id in order_ids
+        ])
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Сохраняет новое событие.
+
+        Raises:
+            ValueError: При попытке изменить уже записанное событие.
+        """
+        if not self._state.adding:
+            raise ValueError("События журнала заказов не изменяются.")
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление события.
+
+        Returns:
+            str: Строковое представление в формате "позиция: id_заказа (тип)".
+        """
+        return f"{self.pk}: {self.order_id} ({self.get_event_type_display()})"
+
+
+class ProjectionCheckpoint(models.Model):
+    """
+    Состояние проекции журнала заказов.
+
+    Attributes:
+        name (CharField): Имя проекции.
+        position (BigIntegerField): Идентификатор последнего обработанного события.
+        state (JSONField): Модель чтения, построенная по событиям до position включительно.
+        updated_at (DateTimeField): Дата и время последнего обновления.
+    """
+    name = models.CharField("Проекция", max_length=50, unique=True)
+    position = models.BigIntegerField("Позиция", default=0)
+    state = models.JSONField("Состояние", default=dict)
+    updated_at = models.DateTimeField("Обновлено", auto_now=True)
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление проекции.
+
+        Returns:
+            str: Строковое представление в формате "имя @ позиция".
+        """
+        return f"{self.name} @ {self.position}"
+
+
+class KitchenQueueEntry(models.Model):
+    """
+    Количество порций блюда, которые осталось приготовить (позиции заказов в ожидании).
+
+    Обновляется приращениями в той же транзакции, что и изменение заказа (см. cafe_orders.kitchen),
+    поэтому очередь кухни читается одним запросом без загрузки заказов и позиций.
+
+    Attributes:
+        dish (OneToOneField): Блюдо.
+        quantity (IntegerField): Количество порций в заказах в ожидании.
+        updated_at (DateTimeField): Дата и время последнего изменения.
+    """
+    dish = models.OneToOneField(Dish, on_delete=models.CASCADE, related_name='kitchen_queue_entry',
+                                verbose_name="Блюдо")
+    quantity = models.IntegerField("Осталось приготовить", default=0)
+    updated_at = models.DateTimeField("Обновлено", auto_now=True)
+
+    @classmethod
+    def add(cls, quantities: Dict[int, int]) -> None:
+        """
+        Изменяет количество порций блюд на заданные приращения.
+
+        Args:
+            quantities: Приращения по идентификаторам блюд (отрицательные — уменьшение).
+        """
+        now = timezone.now()
+        for dish_id, delta in quantities.items():
+            if not delta:
+                continue
+            if cls.objects.filter(dish_id=dish_id).update(quantity=F('quantity') + delta, updated_at=now):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(dish_id=dish_id, quantity=delta)
+            except IntegrityError:
+                cls.objects.filter(dish_id=dish_id).update(quantity=F('quantity') + delta, updated_at=now)
+
+    @classmethod
+    def remove_orders(cls, order_ids: List[int]) -> None:
+        """
+        Убирает из очереди позиции удаляемых заказов в ожидании (вызывается до удаления).
+
+        Args:
+            order_ids: Идентификаторы заказов.
+        """
+        rows = (OrderItem.objects.filter(order_id__in=order_ids, order__status=DEFAULT_ORDER_STATUS)
+                .values('dish_id').annotate(total=Sum('quantity')))
+        cls.add({row['dish_id']: -row['total'] for row in rows})
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление позиции очереди кухни.
+
+        Returns:
+            str: Строковое представление в формате "блюдо x количество".
+        """
+        return f"{self.dish.name} x {self.quantity}"
+
+
+class DailyAnalytics(models.Model):
+    """
+    Сгруппированная статистика заказов за закрытый (прошедший) день.
+
+    Заполняется при первом запросе аналитики за этот день (см. cafe_orders.analytics) и
+    пересчитывается, только если заказы дня изменились или были удалены.
+
+    Attributes:
+        day (DateField): День в текущем часовом поясе.
+        data (JSONField): Заказы по часам, блюда и столы за день.
+        computed_at (DateTimeField): Дата и время вычисления.
+    """
+    day = models.DateField("День", unique=True)
+    data = models.JSONField("Статистика", default=dict)
+    computed_at = models.DateTimeField("Вычислено", auto_now=True)
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление статистики.
+
+        Returns:
+            str: Строковое представление в формате "ГГГГ-ММ-ДД".
+        """
+        return self.day.isoformat()
+
+
+class ReportJob(models.Model):
+    """
+    Фоновое задание на построение отчета или выгрузки.
+
+    Задание создается запросом к API и выполняется пулом потоков процесса или командой run_jobs;
+    клиент опрашивает состояние задания и забирает результат, когда оно выполнено.
+
+    Attributes:
+        kind (CharField): Тип задания (выгрузка, аналитика, выручка).
+        params (JSONField): Проверенные параметры задания.
+        status (CharField): Состояние задания.
+        result (JSONField): Результат задания (для выгрузки — имя, тип и размер файла).
+        error (TextField): Текст ошибки, если задание завершилось неудачно.
+        created_at (DateTimeField): Дата и время постановки в очередь.
+        started_at (DateTimeField): Дата и время начала выполнения.
+        finished_at (DateTimeField): Дата и время завершения.
+    """
+    kind = models.CharField("Тип задания", max_length=20, choices=REPORT_JOB_KIND_CHOICES)
+    params = models.JSONField("Параметры", default=dict)
+    status = models.CharField("Состояние", max_length=10, choices=REPORT_JOB_STATUS_CHOICES,
+                              default=REPORT_JOB_QUEUED, db_index=True)
+    result = models.JSONField("Результат", null=True, blank=True)
+    error = models.TextField("Ошибка", blank=True, default='')
+    created_at = models.DateTimeField("Создано", default=timezone.now)
+    started_at = models.DateTimeField("Начато", null=True, blank=True)
+    finished_at = models.DateTimeField("Завершено", null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление задания.
+
+        Returns:
+            str: Строковое представление в формате "id: тип (состояние)".
+        """
+        return f"{self.pk}: {self.get_kind_display()} ({self.get_status_display()})"
+
+
+class CacheInvalidation(models.Model):
+    """
+    Запись журнала сброса кэшей процессов.
+
+    Каждый рабочий процесс периодически читает новые записи журнала и сбрасывает
+    соответствующие данные своих локальных кэшей (см. invalidation).
+
+    Attributes:
+        scope (CharField): Область кэша (например, детали заказов).
+        key (CharField): Ключ в области или пустая строка, если сбрасывается вся область.
+        created_at (DateTimeField): Дата и время записи.
+    """
+    scope = models.CharField("Область", max_length=INVALIDATION_SCOPE_MAX_LENGTH)
+    key = models.CharField("Ключ", max_length=INVALIDATION_KEY_MAX_LENGTH, blank=True, default='')
+    created_at = models.DateTimeField("Создано", default=timezone.now, db_index=True)
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление записи.
+
+        Returns:
+            str: Строковое представление в формате "id: область:ключ".
+        """
+        return f"{self.pk}: {self.scope}:{self.key or '*'}"
@@ -0,0 +1,46 @@
+"""
+Заполнение зафиксированных цен в позициях заказов, созданных до появления поля unit_price.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from . import constants
+from .detail_cache import invalidate_order_details
+from .models import Dish, OrderItem
+
+
+def backfill_unit_prices(chunk_size: int = constants.BACKFILL_CHUNK_SIZE,
+                         progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Записывает текущую цену блюда в позиции заказов без зафиксированной цены.
+
+    Позиции обрабатываются порциями по возрастанию id, каждая порция — одним UPDATE
+    в отдельной транзакции. Повторный запуск обрабатывает только оставшиеся позиции.
+
+    Args:
+        chunk_size: Количество позиций, обновляемых одним запросом.
+        progress: Необязательная функция, вызываемая после каждой порции с общим числом обновленных позиций.
+
+    Returns:
+        int: Количество обновленных позиций.
+    """
+    dish_price: Subquery = Subquery(Dish.objects.filter(pk=OuterRef('dish_id')).values('price')[:1])
+    updated: int = 0
+    last_id: int = 0
+    while True:
+        with transaction.atomic():
+            rows: List[Tuple[int, int]] = list(
+                OrderItem.objects.filter(unit_price__isnull=True, id__gt=last_id)
+                .order_by('id').values_list('id', 'order_id')[:chunk_size]
+            )
+            if not rows:
+                return updated
+            ids: List[int] = [item_id for item_id, _ in rows]
+            updated += OrderItem.objects.filter(id__in=ids).update(unit_price=dish_price)
+            invalidate_order_details({order_id for _, order_id in rows})
+        last_id = ids[-1]
+        if progress is not None:
+            progress(updated)
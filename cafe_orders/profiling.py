@@ -0,0 +1,215 @@
+"""
+Профилирование отдельных запросов по требованию.
+
+Запрос профилируется, если он содержит заголовок X-Profile с токеном PROFILING_TOKEN или попал
+в случайную выборку с долей PROFILING_SAMPLE_RATE. Обработка такого запроса выполняется под
+cProfile, а результат сохраняется в каталог PROFILING_DIR в формате pstats. После сохранения
+профиля каталог очищается: остается не больше PROFILING_MAX_FILES самых новых профилей, не старше
+PROFILING_MAX_AGE_HOURS часов.
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.http import HttpRequest
+
+from . import constants
+
+
+def get_profiling_dir() -> str:
+    """
+    Возвращает каталог профилей из настроек.
+
+    Returns:
+        str: Путь к каталогу или пустая строка, если профилирование выключено.
+    """
+    return getattr(settings, 'PROFILING_DIR', '')
+
+
+def get_max_files() -> int:
+    """
+    Возвращает максимальное количество хранимых профилей.
+
+    Returns:
+        int: Количество профилей (0 — без ограничения).
+    """
+    return int(getattr(settings, 'PROFILING_MAX_FILES', constants.PROFILE_DEFAULT_MAX_FILES))
+
+
+def get_max_age_hours() -> float:
+    """
+    Возвращает срок хранения профилей.
+
+    Returns:
+        float: Срок в часах (0 — без ограничения).
+    """
+    return float(getattr(settings, 'PROFILING_MAX_AGE_HOURS', constants.PROFILE_DEFAULT_MAX_AGE_HOURS))
+
+
+def should_profile(request: HttpRequest) -> bool:
+    """
+    Определяет, нужно ли профилировать запрос.
+
+    Args:
+        request: HTTP-запрос.
+
+    Returns:
+        bool: True, если заголовок X-Profile совпадает с PROFILING_TOKEN или запрос попал в выборку.
+    """
+    token: str = getattr(settings, 'PROFILING_TOKEN', '')
+    header: str = request.META.get(constants.PROFILING_REQUEST_HEADER, '')
+    if token and header and hmac.compare_digest(header, token):
+        return True
+    sample_rate: float = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def save_profile(profiler: cProfile.Profile, directory: str, route: str, method: str,
+                 duration_ms: float) -> str:
+    """
+    Сохраняет результат профилирования в каталог.
+
+    Args:
+        profiler: Профилировщик с собранной статистикой.
+        directory: Каталог профилей.
+        route: Имя маршрута запроса.
+        method: HTTP-метод запроса.
+        duration_ms: Время обработки запроса в миллисекундах.
+
+    Returns:
+        str: Имя сохраненного файла.
+    """
+    os.makedirs(directory, exist_ok=True)
+    filename: str = constants.PROFILE_FILENAME_FORMAT.format(
+        timestamp=datetime.now().strftime(constants.PROFILE_TIMESTAMP_FORMAT),
+        route=re.sub(r'[^\w-]', '_', route),
+        method=method,
+        duration_ms=int(duration_ms),
+    )
+    profiler.dump_stats(os.path.join(directory, filename))
+    prune_profiles(directory, get_max_files(), get_max_age_hours())
+    return filename
+
+
+def prune_profiles(directory: str, max_files: int, max_age_hours: float) -> int:
+    """
+    Удаляет профили старше max_age_hours часов и самые старые профили сверх max_files.
+
+    Args:
+        directory: Каталог профилей.
+        max_files: Максимальное количество профилей (0 — без ограничения).
+        max_age_hours: Срок хранения в часах (0 — без ограничения).
+
+    Returns:
+        int: Количество удаленных профилей.
+    """
+    profiles: List[Dict[str, Any]] = list_profiles(directory)
+    expired: List[Dict[str, Any]] = profiles[max_files:] if max_files > 0 else []
+    if max_age_hours > 0:
+        cutoff: datetime = datetime.now() - timedelta(hours=max_age_hours)
+        expired.extend(profile for profile in profiles[:len(profiles) - len(expired)] if profile['modified'] < cutoff)
+    removed: int = 0
+    for profile in expired:
+        try:
+            os.remove(os.path.join(directory, profile['name']))
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
+
+
+def list_profiles(directory: str) -> List[Dict[str, Any]]:
+    """
+    Возвращает список сохраненных профилей, начиная с самых новых.
+
+    Args:
+        directory: Каталог профилей.
+
+    Returns:
+        List[Dict[str, Any]]: Имя файла ('name'), маршрут ('route'), размер в байтах ('size')
+        и время изменения ('modified').
+    """
+    if not os.path.isdir(directory):
+        return []
+    profiles: List[Dict[str, Any]] = []
+    for name in os.listdir(directory):
+        if name.endswith('.prof'):
+            stat = os.stat(os.path.join(directory, name))
+            match = re.match(constants.PROFILE_FILENAME_PATTERN, name)
+            profiles.append({'name': name, 'route': match.group('route') if match else '',
+                             'size': stat.st_size, 'modified': datetime.fromtimestamp(stat.st_mtime)})
+    return sorted(profiles, key=lambda profile: profile['name'], reverse=True)
+
+
+def summarize_profiles(paths: List[str], sort: str = constants.PROFILE_SORT_KEYS[0],
+                       limit: int = constants.PROFILE_TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+    """
+    Объединяет профили и возвращает самые затратные функции.
+
+    Args:
+        paths: Пути к файлам профилей.
+        sort: Ключ сортировки: 'cumulative' (с учетом вложенных вызовов), 'tottime' (собственное время)
+            или 'ncalls' (количество вызовов).
+        limit: Количество функций.
+
+    Returns:
+        List[Dict[str, Any]]: Функции ('function' в виде файл:строка(имя)) с количеством вызовов ('ncalls'),
+        собственным ('tottime') и накопленным ('cumulative') временем в секундах.
+
+    Raises:
+        ValueError: Если список профилей пуст или ключ сортировки неизвестен.
+    """
+    if not paths:
+        raise ValueError("Не найдено ни одного профиля.")
+    if sort not in constants.PROFILE_SORT_KEYS:
+        raise ValueError(f"Ключ сортировки должен быть одним из: {', '.join(constants.PROFILE_SORT_KEYS)}.")
+    stats: pstats.Stats = pstats.Stats(*paths)
+    rows: List[Dict[str, Any]] = [
+        {
+            'function': pstats.func_std_string(function),
+            'ncalls': total_calls,
+            'tottime': total_time,
+            'cumulative': cumulative_time,
+        }
+        for function, (_, total_calls, total_time, cumulative_time, _) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:limit]
+
+
+def profile_request(get_response: Any, request: HttpRequest) -> Optional[Any]:
+    """
+    Выполняет обработку запроса под профилировщиком и сохраняет профиль.
+
+    Args:
+        get_response: Следующий обработчик в цепочке.
+        request: HTTP-запрос.
+
+    Returns:
+        Optional[Any]: Ответ с заголовком X-Profile-Id или None, если профилировщик уже занят
+        в этом потоке.
+    """
+    profiler: cProfile.Profile = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    started: float = time.perf_counter()
+    try:
+        response: Any = get_response(request)
+    finally:
+        profiler.disable()
+    duration_ms: float = (time.perf_counter() - started) * 1000
+    resolver_match = getattr(request, 'resolver_match', None)
+    route: str = resolver_match.view_name if resolver_match else constants.METRICS_UNMATCHED_ROUTE
+    response[constants.PROFILING_RESPONSE_HEADER] = save_profile(
+        profiler, get_profiling_dir(), route, request.method, duration_ms)
+    return response
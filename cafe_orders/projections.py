@@ -0,0 +1,251 @@
+"""
+Проекции журнала заказов: модели чтения, построенные по событиям OrderEvent.
+
+Каждая проекция хранит состояние (JSON) и позицию последнего обработанного события в
+ProjectionCheckpoint. advance_projection продолжает обработку с сохраненной позиции,
+rebuild_projection строит состояние заново с начала журнала. Проекции не обращаются к таблицам
+заказов: события создания и изменения содержат состояние заказа (см. cafe_orders.events).
+
+Позиция — идентификатор события, поэтому события должны становиться видимыми в порядке
+идентификаторов; это выполняется для SQLite, где запись выполняется последовательно.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.utils import timezone
+
+from . import constants
+from .models import OrderEvent, ProjectionCheckpoint
+
+
+def get_items_total(items: List[Dict[str, Any]]) -> Decimal:
+    """
+    Вычисляет стоимость позиций из события по зафиксированным ценам.
+
+    Позиции без цены (в событиях, записанных до того, как в журнал стала попадать цена блюда для
+    позиций без зафиксированной цены) не учитываются.
+
+    Args:
+        items: Позиции заказа из события.
+
+    Returns:
+        Decimal: Стоимость позиций.
+    """
+    return sum((Decimal(item['unit_price']) * item['quantity'] for item in items
+                if item.get('unit_price') not in (None, 'None')), Decimal('0'))
+
+
+class Projection:
+    """
+    Базовый класс проекции.
+
+    Подклассы задают имя, начальное состояние и применение события к состоянию.
+    Состояние должно сериализоваться в JSON (ключи — строки).
+    """
+    name: str = ''
+
+    def initial_state(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние проекции до обработки событий.
+
+        Returns:
+            Dict[str, Any]: Начальное состояние.
+        """
+        return {}
+
+    def apply(self, state: Dict[str, Any], event: OrderEvent) -> None:
+        """
+        Применяет событие к состоянию (изменяет state на месте).
+
+        Args:
+            state: Состояние проекции.
+            event: Событие журнала.
+        """
+        raise NotImplementedError
+
+
+class RevenueProjection(Projection):
+    """
+    Выручка от оплаченных заказов.
+
+    Состояние содержит только общую сумму (total): каждое событие само несет изменение выручки.
+    Событие изменения содержит прежние статус и позиции (previous), событие удаления оплаченного
+    заказа — его выручку (revenue). Перенесенные в архив заказы остаются в общей сумме.
+    """
+    name: str = 'revenue'
+
+    def initial_state(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Нулевая выручка.
+        """
+        return {'total': '0'}
+
+    def apply(self, state: Dict[str, Any], event: OrderEvent) -> None:
+        """
+        Учитывает событие в выручке.
+
+        Args:
+            state: Состояние проекции.
+            event: Событие журнала.
+        """
+        payload: Dict[str, Any] = event.payload
+        delta: Decimal = Decimal('0')
+        if event.event_type == constants.ORDER_EVENT_DELETED:
+            delta -= Decimal(payload.get('revenue', '0'))
+        elif event.event_type in (constants.ORDER_EVENT_CREATED, constants.ORDER_EVENT_UPDATED):
+            previous: Dict[str, Any] = payload.get('previous', {})
+            if (event.event_type == constants.ORDER_EVENT_UPDATED
+                    and previous.get('status', payload['status']) == constants.REVENUE_CALCULATION_STATUS):
+                delta -= get_items_total(previous.get('items', payload['items']))
+            if payload['status'] == constants.REVENUE_CALCULATION_STATUS:
+                delta += get_items_total(payload['items'])
+        state['total'] = str(Decimal(state['total']) + delta)
+
+
+class KitchenQueueProjection(Projection):
+    """
+    Очередь кухни: заказы в ожидании с номером стола, датой создания и позициями.
+    """
+    name: str = 'kitchen_queue'
+
+    def initial_state(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Пустая очередь.
+        """
+        return {'orders': {}}
+
+    def apply(self, state: Dict[str, Any], event: OrderEvent) -> None:
+        """
+        Добавляет заказ в очередь, обновляет его или убирает из очереди.
+
+        Args:
+            state: Состояние проекции.
+            event: Событие журнала.
+        """
+        key: str = str(event.order_id)
+        payload: Dict[str, Any] = event.payload
+        if (event.event_type in (constants.ORDER_EVENT_CREATED, constants.ORDER_EVENT_UPDATED)
+                and payload['status'] == constants.DEFAULT_ORDER_STATUS):
+            state['orders'][key] = {
+                'table_number': payload['table_number'],
+                'created_at': payload['created_at'],
+                'items': [{'dish': item['dish'], 'quantity': item['quantity']} for item in payload['items']],
+            }
+        else:
+            state['orders'].pop(key, None)
+
+
+class TableStateProjection(Projection):
+    """
+    Состояние столов: активные (в ожидании или готовые) заказы каждого стола с их статусами.
+    """
+    name: str = 'tables'
+
+    def initial_state(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Все столы свободны.
+        """
+        return {'tables': {}, 'order_tables': {}}
+
+    def apply(self, state: Dict[str, Any], event: OrderEvent) -> None:
+        """
+        Обновляет активные заказы стола.
+
+        Args:
+            state: Состояние проекции.
+            event: Событие журнала.
+        """
+        key: str = str(event.order_id)
+        old_table: Optional[str] = state['order_tables'].pop(key, None)
+        if old_table is not None:
+            state['tables'][old_table].pop(key, None)
+            if not state['tables'][old_table]:
+                del state['tables'][old_table]
+        payload: Dict[str, Any] = event.payload
+        if (event.event_type in (constants.ORDER_EVENT_CREATED, constants.ORDER_EVENT_UPDATED)
+                and payload['status'] in constants.ACTIVE_ORDER_STATUSES):
+            table: str = str(payload['table_number'])
+            state['tables'].setdefault(table, {})[key] = payload['status']
+            state['order_tables'][key] = table
+
+
+PROJECTIONS: Dict[str, Projection] = {
+    projection.name: projection
+    for projection in (RevenueProjection(), KitchenQueueProjection(), TableStateProjection())
+}
+"""Зарегистрированные проекции по имени."""
+
+
+def get_projection(name: str) -> Projection:
+    """
+    Возвращает зарегистрированную проекцию.
+
+    Args:
+        name: Имя проекции.
+
+    Returns:
+        Projection: Проекция.
+
+    Raises:
+        ValueError: Если проекция не зарегистрирована.
+    """
+    if name not in PROJECTIONS:
+        raise ValueError(constants.MESSAGES['projection_unknown'].format(name=name, choices=', '.join(PROJECTIONS)))
+    return PROJECTIONS[name]
+
+
+def advance_projection(projection: Projection, batch_size: int = constants.PROJECTION_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Применяет к проекции события, записанные после ее сохраненной позиции.
+
+    События обрабатываются порциями; после каждой порции состояние и позиция сохраняются.
+    Сохранение выполняется только если позицию не продвинул параллельный вызов, поэтому
+    одновременные вызовы не откатывают проекцию назад.
+
+    Args:
+        projection: Проекция.
+        batch_size: Количество событий в порции.
+
+    Returns:
+        Dict[str, Any]: Состояние проекции ('state'), позиция ('position') и количество обработанных событий
+        ('applied').
+    """
+    checkpoint, _ = ProjectionCheckpoint.objects.get_or_create(
+        name=projection.name, defaults={'state': projection.initial_state()})
+    state: Dict[str, Any] = checkpoint.state
+    position: int = checkpoint.position
+    applied: int = 0
+    while True:
+        events: List[OrderEvent] = list(OrderEvent.objects.filter(id__gt=position).order_by('id')[:batch_size])
+        if not events:
+            break
+        for event in events:
+            projection.apply(state, event)
+        updated: int = ProjectionCheckpoint.objects.filter(name=projection.name, position=position).update(
+            position=events[-1].id, state=state, updated_at=timezone.now())
+        if not updated:
+            checkpoint.refresh_from_db()
+            return {'state': checkpoint.state, 'position': checkpoint.position, 'applied': applied}
+        position = events[-1].id
+        applied += len(events)
+    return {'state': state, 'position': position, 'applied': applied}
+
+
+def rebuild_projection(projection: Projection, batch_size: int = constants.PROJECTION_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Строит проекцию заново с начала журнала.
+
+    Args:
+        projection: Проекция.
+        batch_size: Количество событий в порции.
+
+    Returns:
+        Dict[str, Any]: Результат advance_projection.
+    """
+    ProjectionCheckpoint.objects.update_or_create(
+        name=projection.name, defaults={'position': 0, 'state': projection.initial_state()})
+    return advance_projection(projection, batch_size)
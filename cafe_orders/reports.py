@@ -0,0 +1,56 @@
+"""
+Отчетные запросы, охватывающие как рабочие, так и архивные таблицы заказов.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict
+
+from django.db.models import Sum, ExpressionWrapper, F, DecimalField
+from django.db.models.functions import Coalesce
+
+from . import constants
+from .models import OrderItem, ArchivedOrder
+
+
+def get_unit_price_expression() -> Coalesce:
+    """
+    Возвращает выражение цены позиции за единицу для агрегатов по рабочим позициям.
+
+    Используется цена, зафиксированная в позиции, а для позиций, созданных до появления
+    unit_price и еще не заполненных командой backfill_unit_prices, — текущая цена блюда
+    (так же, как в OrderItem.price).
+
+    Returns:
+        Coalesce: Выражение цены за единицу.
+    """
+    return Coalesce('unit_price', 'dish__price')
+
+
+def get_item_revenue_expression() -> ExpressionWrapper:
+    """
+    Возвращает выражение стоимости рабочей позиции (цена за единицу, умноженная на количество).
+
+    Returns:
+        ExpressionWrapper: Выражение стоимости позиции.
+    """
+    return ExpressionWrapper(get_unit_price_expression() * F('quantity'), output_field=DecimalField())
+
+
+def get_paid_revenue() -> Decimal:
+    """
+    Вычисляет выручку от оплаченных заказов с учетом архива.
+
+    Используются цены, зафиксированные в позициях, поэтому изменение меню не меняет исторические
+    суммы; для позиций без зафиксированной цены берется текущая цена блюда.
+
+    Returns:
+        Decimal: Сумма оплаченных заказов в рабочих и архивных таблицах.
+    """
+    hot_data: Dict[str, Any] = OrderItem.objects.filter(
+        order__status=constants.REVENUE_CALCULATION_STATUS).aggregate(
+        total_revenue=Sum(get_item_revenue_expression())
+    )
+    archived_data: Dict[str, Any] = ArchivedOrder.objects.filter(
+        status=constants.REVENUE_CALCULATION_STATUS).aggregate(total_revenue=Sum('total_price'))
+    return (Decimal(hot_data.get('total_revenue') or 0)
+            + Decimal(archived_data.get('total_revenue') or 0))
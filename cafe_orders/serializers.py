@@ -1,8 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from .constants import ORDER_ITEM_FIELDS, DISH_PRICE_DECIMAL_PLACES, DISH_PRICE_MAX_DIGITS, ORDER_FIELDS, \
-    ORDER_READ_ONLY_FIELDS
-from .models import Order, OrderItem, Dish
+    ORDER_READ_ONLY_FIELDS, REPORT_JOB_FIELDS, DEFAULT_QUANTITY
+from .events import append_order_created, append_order_updated, snapshot_locked_order
+from .models import Order, OrderItem, Dish, ReportJob
 from typing import List, Dict, Any, Optional
 
 
@@ -10,12 +12,17 @@ class OrderItemSerializer(serializers.ModelSerializer):
     """
     Сериализатор для модели OrderItem.
 
-    Позволяет задавать блюдо по его названию (slug_field).
-    Вычисляет поле 'price' (только для чтения).
+    Позволяет задавать блюдо по его названию (slug_field); принимаются только блюда актуального меню.
+    Поле 'unit_price' (цена, зафиксированная при оформлении) и вычисляемое поле 'price' доступны только для чтения.
     """
     dish = serializers.SlugRelatedField(
         slug_field='name',
-        queryset=Dish.objects.all()
+        queryset=Dish.active.all()
+    )
+    unit_price = serializers.DecimalField(
+        max_digits=DISH_PRICE_MAX_DIGITS,
+        decimal_places=DISH_PRICE_DECIMAL_PLACES,
+        read_only=True
     )
     price = serializers.DecimalField(
         max_digits=DISH_PRICE_MAX_DIGITS,
@@ -38,6 +45,7 @@ class OrderSerializer(serializers.ModelSerializer):
     Использует вложенную сериализацию для элементов заказа (OrderItemSerializer).
     При создании и обновлении ожидает массив данных по ключу "items".
     Поля 'id', 'created_at', 'updated_at', 'total_price' доступны только для чтения.
+    Набор выводимых полей можно сузить параметром selection.
     """
     items: OrderItemSerializer = OrderItemSerializer(many=True)
 
@@ -49,9 +57,30 @@ class OrderSerializer(serializers.ModelSerializer):
         fields: List[str] = ORDER_FIELDS
         read_only_fields: List[str] = ORDER_READ_ONLY_FIELDS
 
+    def __init__(self, *args: Any, selection: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        """
+        Инициализирует сериализатор, оставляя только выбранные поля заказа и позиций.
+
+        Args:
+            *args: Аргументы ModelSerializer.
+            selection: Выбранные поля ('order_fields', 'item_fields'; см. field_selection.parse_field_selection).
+                None — все поля.
+            **kwargs: Именованные аргументы ModelSerializer.
+        """
+        super().__init__(*args, **kwargs)
+        self.previous_state: Optional[Dict[str, Any]] = None
+        if selection is None:
+            return
+        for name in set(self.fields) - set(selection['order_fields']):
+            self.fields.pop(name)
+        if selection['item_fields'] is not None:
+            item_fields = self.fields['items'].child.fields
+            for name in set(item_fields) - set(selection['item_fields']):
+                item_fields.pop(name)
+
     def create(self, validated_data: Dict[str, Any]) -> Order:
         """
-        Создает новый заказ и связанные с ним элементы заказа.
+        Создает новый заказ и связанные с ним элементы заказа и записывает событие создания в журнал.
 
         Args:
             validated_data: Словарь с валидированными данными для создания заказа.
@@ -60,14 +89,24 @@ class OrderSerializer(serializers.ModelSerializer):
             Order: Созданный объект заказа.
         """
         items_data: List[Dict[str, Any]] = validated_data.pop('items', [])
-        order: Order = Order.objects.create(**validated_data)
-        for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
+        with transaction.atomic():
+            order: Order = Order.objects.create(**validated_data)
+            with Order.deferred_touch():
+                for item_data in items_data:
+                    OrderItem.objects.create(order=order, **item_data)
+            append_order_created(order)
         return order
 
     def update(self, instance: Order, validated_data: Dict[str, Any]) -> Order:
         """
-        Обновляет заказ.
+        Обновляет заказ и записывает событие изменения в журнал.
+
+        Переданные позиции сопоставляются с существующими по блюду: у сохраненных позиций меняется
+        только количество, поэтому зафиксированная цена (unit_price) не пересчитывается по текущему
+        меню. Позиции с новыми блюдами создаются, отсутствующие в запросе — удаляются.
+
+        Состояние заказа до изменения читается после блокировки строки заказа и сохраняется
+        в previous_state.
 
         Args:
             instance: Объект заказа, который нужно обновить.
@@ -77,11 +116,45 @@ class OrderSerializer(serializers.ModelSerializer):
             Order: Обновленный объект заказа.
         """
         items_data: Optional[List[Dict[str, Any]]] = validated_data.pop('items', None)
-        instance.table_number = validated_data.get('table_number', instance.table_number)
-        instance.status = validated_data.get('status', instance.status)
-        instance.save()
-        if items_data is not None:
-            instance.items.all().delete()
-            for item_data in items_data:
-                OrderItem.objects.create(order=instance, **item_data)
-        return instance
\ No newline at end of file
+        with transaction.atomic():
+            before: Dict[str, Any] = snapshot_locked_order(instance.pk)
+            self.previous_state = before
+            instance.table_number = validated_data.get('table_number', instance.table_number)
+            instance.status = validated_data.get('status', instance.status)
+            instance.save()
+            if items_data is not None:
+                existing: Dict[int, List[OrderItem]] = {}
+                for item in instance.items.order_by('id'):
+                    existing.setdefault(item.dish_id, []).append(item)
+                with Order.deferred_touch():
+                    for item_data in items_data:
+                        matches: List[OrderItem] = existing.get(item_data['dish'].id, [])
+                        if not matches:
+                            OrderItem.objects.create(order=instance, **item_data)
+                            continue
+                        item = matches.pop(0)
+                        quantity: int = item_data.get('quantity', DEFAULT_QUANTITY)
+                        if item.quantity != quantity:
+                            item.quantity = quantity
+                            item.save(update_fields=['quantity'])
+                removed: List[int] = [item.id for items in existing.values() for item in items]
+                if removed:
+                    instance.items.filter(id__in=removed).delete()
+            append_order_updated(instance, before)
+        return instance
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор для модели ReportJob (только для чтения).
+
+    Результат задания не входит в ответ: он отдается отдельным запросом, когда задание выполнено.
+    """
+
+    class Meta:
+        """
+        Метаданные сериализатора.
+        """
+        model = ReportJob
+        fields: List[str] = REPORT_JOB_FIELDS
+        read_only_fields: List[str] = REPORT_JOB_FIELDS
@@ -0,0 +1,219 @@
+"""
+Журнал медленных SQL-запросов.
+
+SQL-запросы, выполнявшиеся дольше порога SLOW_QUERY_THRESHOLD_MS, сохраняются вместе с планом
+выполнения (EXPLAIN QUERY PLAN для SQLite), параметрами, маршрутом и GET-параметрами запроса,
+из которого они были выполнены. Записи хранятся в ограниченном кольцевом буфере процесса и,
+если задан SLOW_QUERY_LOG_FILE, дописываются в JSONL-файл, доступный management-команде.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from . import constants
+
+
+class SlowQueryLog:
+    """
+    Потокобезопасный кольцевой буфер записей о медленных запросах.
+    """
+
+    def __init__(self, size: int = constants.SLOW_QUERY_BUFFER_SIZE) -> None:
+        """
+        Инициализирует пустой буфер.
+
+        Args:
+            size: Максимальное количество хранимых записей.
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+
+    def add(self, entry: Dict[str, Any], log_file: str = '') -> None:
+        """
+        Добавляет запись в буфер и, при необходимости, в JSONL-файл.
+
+        Args:
+            entry: Запись о медленном запросе.
+            log_file: Путь к JSONL-файлу (пустая строка — не сохранять в файл).
+        """
+        with self._lock:
+            self._entries.append(entry)
+            if log_file:
+                with open(log_file, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Возвращает записи, начиная с самых новых.
+
+        Args:
+            limit: Максимальное количество записей.
+
+        Returns:
+            List[Dict[str, Any]]: Записи о медленных запросах.
+        """
+        with self._lock:
+            entries: List[Dict[str, Any]] = list(reversed(self._entries))
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        """
+        Очищает буфер.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log: SlowQueryLog = SlowQueryLog()
+"""Журнал медленных запросов текущего процесса."""
+
+_explaining: threading.local = threading.local()
+
+
+def explain_query(connection: Any, sql: str, params: Any) -> List[str]:
+    """
+    Получает план выполнения SELECT-запроса.
+
+    Args:
+        connection: Соединение с базой данных.
+        sql: Текст SQL-запроса.
+        params: Параметры запроса.
+
+    Returns:
+        List[str]: Строки плана выполнения (пустой список для запросов, которые не объясняются).
+    """
+    prefix: Optional[str] = constants.SLOW_QUERY_EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().lower().startswith(constants.SLOW_QUERY_EXPLAINABLE):
+        return []
+    _explaining.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows: List[Any] = cursor.fetchall()
+    except DatabaseError as e:
+        return [f'EXPLAIN failed: {e}']
+    finally:
+        _explaining.active = False
+    if connection.vendor == 'sqlite':
+        return [str(row[-1]) for row in rows]
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+class SlowQueryRecorder:
+    """
+    Обертка выполнения SQL (connection.execute_wrapper), записывающая медленные запросы.
+    """
+
+    def __init__(self, connection: Any, threshold_ms: float, origin: Dict[str, Any],
+                 log: SlowQueryLog = slow_query_log, log_file: str = '') -> None:
+        """
+        Инициализирует обертку.
+
+        Args:
+            connection: Соединение, для которого установлена обертка.
+            threshold_ms: Порог длительности запроса в миллисекундах.
+            origin: Сведения об источнике запроса (маршрут, путь, метод, GET-параметры).
+            log: Журнал, в который добавляются записи.
+            log_file: Путь к JSONL-файлу.
+        """
+        self.connection = connection
+        self.threshold_ms = threshold_ms
+        self.origin = origin
+        self.log = log
+        self.log_file = log_file
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        """
+        Выполняет запрос и записывает его, если он оказался медленным.
+
+        Args:
+            execute: Следующая функция выполнения в цепочке.
+            sql: Текст SQL-запроса.
+            params: Параметры запроса.
+            many: Признак executemany.
+            context: Контекст выполнения.
+
+        Returns:
+            Any: Результат выполнения запроса.
+        """
+        if getattr(_explaining, 'active', False):
+            return execute(sql, params, many, context)
+        started: float = time.perf_counter()
+        result: Any = execute(sql, params, many, context)
+        duration_ms: float = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            self.log.add({
+                'time': timezone.now().isoformat(),
+                'duration_ms': round(duration_ms, 3),
+                'sql': sql,
+                'params': None if many else params if isinstance(params, dict) else list(params or []),
+                'plan': [] if many else explain_query(self.connection, sql, params),
+                'database': self.connection.alias,
+                **self.origin,
+            }, self.log_file)
+        return result
+
+
+def get_threshold_ms() -> float:
+    """
+    Возвращает порог медленного запроса из настроек.
+
+    Returns:
+        float: Порог в миллисекундах (0 — журнал выключен).
+    """
+    return float(getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0) or 0)
+
+
+def get_log_file() -> str:
+    """
+    Возвращает путь к JSONL-файлу журнала из настроек.
+
+    Returns:
+        str: Путь к файлу или пустая строка.
+    """
+    return getattr(settings, 'SLOW_QUERY_LOG_FILE', '')
+
+
+def read_log_file(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Читает записи журнала из JSONL-файла, начиная с самых новых.
+
+    Args:
+        path: Путь к файлу.
+        limit: Максимальное количество записей.
+
+    Returns:
+        List[Dict[str, Any]]: Записи о медленных запросах (пустой список, если файла нет).
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            lines: Deque[str] = deque((line for line in file if line.strip()), maxlen=limit)
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in reversed(lines)]
+
+
+def get_slow_queries(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Возвращает записи о медленных запросах, начиная с самых новых.
+
+    Если задан SLOW_QUERY_LOG_FILE, записи читаются из файла (в нем собраны записи всех процессов),
+    иначе — из буфера текущего процесса.
+
+    Args:
+        limit: Максимальное количество записей.
+
+    Returns:
+        List[Dict[str, Any]]: Записи о медленных запросах.
+    """
+    log_file: str = get_log_file()
+    if log_file:
+        return read_log_file(log_file, limit)
+    return slow_query_log.entries(limit)
@@ -0,0 +1,318 @@
+"""
+Колоночный снимок истории заказов для офлайн-анализа.
+
+Рабочие и архивные заказы выгружаются в каталог снимка: каждый столбец (id, время создания,
+номер стола, статус заказа; id заказа, id блюда, количество, цена в копейках и статус заказа
+для позиций) записывается в отдельный файл массивом фиксированной ширины модуля array, а
+описание столбцов (тип, порядок байтов, длина) — в manifest.json. Статус заказа продублирован
+в позициях, чтобы агрегаты по позициям считались без соединения с заказами.
+
+Файлы снимка отображаются в память (mmap) и читаются без загрузки целиком и без обращений
+к базе данных. Если установлен NumPy, столбцы открываются как numpy.memmap и агрегаты
+считаются векторными операциями; без NumPy используется построчный проход по memoryview.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import constants
+from .models import ArchivedOrder, ArchivedOrderItem, Dish, Order, OrderItem
+from .reports import get_unit_price_expression
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STATUS_CODES: Dict[str, int] = {value: code for code, (value, _) in enumerate(constants.ORDER_STATUS_CHOICES)}
+
+
+def get_dtype(typecode: str) -> str:
+    """
+    Возвращает тип элементов NumPy, соответствующий типу массива array на текущей платформе.
+
+    Args:
+        typecode: Код типа модуля array.
+
+    Returns:
+        str: Описание типа NumPy, например '<i8'.
+    """
+    return f"{'<' if sys.byteorder == 'little' else '>'}i{array(typecode).itemsize}"
+
+
+def to_cents(value: Decimal) -> int:
+    """
+    Переводит цену в целое число копеек.
+
+    Args:
+        value: Цена.
+
+    Returns:
+        int: Цена в копейках.
+    """
+    return int(value.scaleb(constants.DISH_PRICE_DECIMAL_PLACES))
+
+
+def iter_rows(queryset: QuerySet, fields: List[str], chunk_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Итерирует значения полей порциями по первичному ключу (первое поле — id).
+
+    Args:
+        queryset: Исходный queryset.
+        fields: Имена полей, начиная с 'id'.
+        chunk_size: Количество строк в одной порции.
+
+    Yields:
+        List[Tuple[Any, ...]]: Очередная порция строк.
+    """
+    last_id: int = 0
+    while True:
+        chunk: List[Tuple[Any, ...]] = list(
+            queryset.filter(id__gt=last_id).order_by('id').values_list(*fields)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+
+
+def convert_rows(table: str, rows: List[Tuple[Any, ...]]) -> List[List[int]]:
+    """
+    Переводит порцию строк в значения столбцов снимка.
+
+    Args:
+        table: Таблица снимка: 'orders' или 'items'.
+        rows: Строки в порядке полей, заданном в write_snapshot.
+
+    Returns:
+        List[List[int]]: Значения столбцов в порядке SNAPSHOT_COLUMNS[table].
+    """
+    if table == 'orders':
+        return [
+            [row[0] for row in rows],
+            [int(row[1].timestamp()) for row in rows],
+            [row[2] for row in rows],
+            [STATUS_CODES[row[3]] for row in rows],
+        ]
+    return [
+        [row[1] for row in rows],
+        [row[2] if row[2] is not None else -1 for row in rows],
+        [row[3] for row in rows],
+        [to_cents(row[4]) for row in rows],
+        [STATUS_CODES[row[5]] for row in rows],
+    ]
+
+
+def write_snapshot(directory: str, chunk_size: int = constants.SNAPSHOT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Записывает колоночный снимок рабочих и архивных заказов в каталог.
+
+    Данные читаются порциями внутри одной транзакции, поэтому снимок согласован, а объем
+    используемой памяти ограничен размером порции. Описание снимка записывается последним,
+    поэтому каталог без manifest.json считается незавершенным снимком.
+
+    Args:
+        directory: Каталог снимка (создается при необходимости, существующие файлы перезаписываются).
+        chunk_size: Количество строк, загружаемых за один запрос.
+
+    Returns:
+        Dict[str, Any]: Описание снимка (содержимое manifest.json).
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest_path: str = os.path.join(directory, constants.SNAPSHOT_MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    sources: Dict[str, List[Tuple[QuerySet, List[str]]]] = {
+        'orders': [
+            (Order.objects.all(), ['id', 'created_at', 'table_number', 'status']),
+            (ArchivedOrder.objects.all(), ['id', 'created_at', 'table_number', 'status']),
+        ],
+        'items': [
+            (OrderItem.objects.annotate(effective_unit_price=get_unit_price_expression()),
+             ['id', 'order_id', 'dish_id', 'quantity', 'effective_unit_price', 'order__status']),
+            (ArchivedOrderItem.objects.all(), ['id', 'order_id', 'dish_id', 'quantity', 'unit_price',
+                                               'order__status']),
+        ],
+    }
+    columns: Dict[str, Dict[str, Any]] = {}
+    with transaction.atomic():
+        for table, table_sources in sources.items():
+            names: List[str] = list(constants.SNAPSHOT_COLUMNS[table])
+            files = {name: open(os.path.join(directory, f'{table}.{name}.bin'), 'wb') for name in names}
+            length: int = 0
+            try:
+                for queryset, fields in table_sources:
+                    for rows in iter_rows(queryset, fields, chunk_size):
+                        values: List[List[int]] = convert_rows(table, rows)
+                        for name, column in zip(names, values):
+                            array(constants.SNAPSHOT_COLUMNS[table][name], column).tofile(files[name])
+                        length += len(rows)
+            finally:
+                for output in files.values():
+                    output.close()
+            for name, typecode in constants.SNAPSHOT_COLUMNS[table].items():
+                columns[f'{table}.{name}'] = {
+                    'file': f'{table}.{name}.bin', 'typecode': typecode, 'dtype': get_dtype(typecode), 'length': length}
+        dishes: Dict[str, str] = {str(dish_id): name for dish_id, name in Dish.objects.values_list('id', 'name')}
+
+    manifest: Dict[str, Any] = {
+        'version': constants.SNAPSHOT_FORMAT_VERSION,
+        'created_at': timezone.now().isoformat(),
+        'byteorder': sys.byteorder,
+        'statuses': [value for value, _ in constants.ORDER_STATUS_CHOICES],
+        'columns': columns,
+        'dishes': dishes,
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as output:
+        json.dump(manifest, output, ensure_ascii=False, indent=2)
+    return manifest
+
+
+class ColumnarSnapshot:
+    """
+    Снимок истории заказов, открытый для чтения.
+
+    Столбцы отображаются в память при первом обращении и остаются открытыми до вызова close()
+    (или выхода из блока with).
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Читает описание снимка.
+
+        Args:
+            directory: Каталог снимка.
+
+        Raises:
+            ValueError: Если снимок не завершен, имеет другую версию формата или порядок байтов.
+        """
+        self.directory: str = directory
+        manifest_path: str = os.path.join(directory, constants.SNAPSHOT_MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            raise ValueError(constants.MESSAGES['snapshot_missing'].format(path=directory))
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            self.manifest: Dict[str, Any] = json.load(manifest_file)
+        if (self.manifest['version'] != constants.SNAPSHOT_FORMAT_VERSION
+                or self.manifest['byteorder'] != sys.byteorder):
+            raise ValueError(constants.MESSAGES['snapshot_incompatible'].format(path=directory))
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    def __enter__(self) -> 'ColumnarSnapshot':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def column(self, name: str) -> memoryview:
+        """
+        Возвращает столбец как memoryview над отображенным в память файлом.
+
+        Args:
+            name: Имя столбца, например 'items.quantity'.
+
+        Returns:
+            memoryview: Значения столбца.
+        """
+        info: Dict[str, Any] = self.manifest['columns'][name]
+        if not info['length']:
+            return memoryview(array(info['typecode']))
+        if name not in self._maps:
+            with open(os.path.join(self.directory, info['file']), 'rb') as column_file:
+                self._maps[name] = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._maps[name]).cast(info['typecode'])
+
+    def numpy_column(self, name: str) -> Any:
+        """
+        Возвращает столбец как numpy.memmap (только при установленном NumPy).
+
+        Args:
+            name: Имя столбца, например 'items.quantity'.
+
+        Returns:
+            numpy.ndarray: Значения столбца без копирования в память.
+        """
+        info: Dict[str, Any] = self.manifest['columns'][name]
+        if not info['length']:
+            return numpy.empty(0, dtype=info['dtype'])
+        return numpy.memmap(os.path.join(self.directory, info['file']), dtype=info['dtype'], mode='r',
+                            shape=(info['length'],))
+
+    def close(self) -> None:
+        """
+        Закрывает отображенные в память файлы.
+        """
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+
+def snapshot_paid_revenue(snapshot: ColumnarSnapshot) -> Decimal:
+    """
+    Вычисляет по снимку выручку от оплаченных заказов (аналог reports.get_paid_revenue).
+
+    Args:
+        snapshot: Открытый снимок.
+
+    Returns:
+        Decimal: Сумма оплаченных заказов.
+    """
+    paid: int = STATUS_CODES[constants.REVENUE_CALCULATION_STATUS]
+    if numpy is not None:
+        status = snapshot.numpy_column('items.status')
+        amounts = (snapshot.numpy_column('items.unit_cents').astype(numpy.int64)
+                   * snapshot.numpy_column('items.quantity'))
+        cents: int = int(amounts[status == paid].sum())
+    else:
+        cents = sum(price * quantity for price, quantity, status in zip(
+            snapshot.column('items.unit_cents'), snapshot.column('items.quantity'), snapshot.column('items.status'))
+            if status == paid)
+    return Decimal(cents).scaleb(-constants.DISH_PRICE_DECIMAL_PLACES)
+
+
+def snapshot_dish_totals(snapshot: ColumnarSnapshot) -> List[Dict[str, Any]]:
+    """
+    Вычисляет по снимку количество порций каждого блюда и выручку по оплаченным заказам.
+
+    Args:
+        snapshot: Открытый снимок.
+
+    Returns:
+        List[Dict[str, Any]]: Блюда ('dish_id', 'dish', 'quantity', 'revenue') по убыванию количества порций.
+    """
+    paid: int = STATUS_CODES[constants.REVENUE_CALCULATION_STATUS]
+    quantities: Dict[int, int] = {}
+    revenue: Dict[int, int] = {}
+    if numpy is not None:
+        dish_ids = snapshot.numpy_column('items.dish_id')
+        quantity = snapshot.numpy_column('items.quantity').astype(numpy.int64)
+        amounts = numpy.where(snapshot.numpy_column('items.status') == paid,
+                              snapshot.numpy_column('items.unit_cents') * quantity, 0)
+        keys, index = numpy.unique(dish_ids, return_inverse=True)
+        quantity_sums = numpy.zeros(len(keys), dtype=numpy.int64)
+        revenue_sums = numpy.zeros(len(keys), dtype=numpy.int64)
+        numpy.add.at(quantity_sums, index, quantity)
+        numpy.add.at(revenue_sums, index, amounts)
+        quantities = dict(zip(keys.tolist(), quantity_sums.tolist()))
+        revenue = dict(zip(keys.tolist(), revenue_sums.tolist()))
+    else:
+        for dish_id, quantity, price, status in zip(
+                snapshot.column('items.dish_id'), snapshot.column('items.quantity'),
+                snapshot.column('items.unit_cents'), snapshot.column('items.status')):
+            quantities[dish_id] = quantities.get(dish_id, 0) + quantity
+            revenue[dish_id] = revenue.get(dish_id, 0) + (price * quantity if status == paid else 0)
+
+    dishes: Dict[str, str] = snapshot.manifest['dishes']
+    return [
+        {'dish_id': dish_id, 'dish': dishes.get(str(dish_id), ''), 'quantity': quantities[dish_id],
+         'revenue': Decimal(revenue[dish_id]).scaleb(-constants.DISH_PRICE_DECIMAL_PLACES)}
+        for dish_id in sorted(quantities, key=lambda dish_id: (-quantities[dish_id], dish_id))
+    ]
@@ -0,0 +1,95 @@
+"""
+Синхронизация клиентов (планшетов) по изменениям заказов.
+
+Клиент передает отметку времени последней синхронизации (updated_since) и получает только
+заказы, созданные или измененные после нее, и id заказов, удаленных после нее (по отметкам
+OrderTombstone). Объем ответа зависит от количества изменений, а не от размера истории.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import constants
+from .models import Order, OrderTombstone
+
+
+def parse_updated_since(value: str) -> Optional[datetime]:
+    """
+    Разбирает отметку времени последней синхронизации.
+
+    Args:
+        value: Дата и время в формате ISO 8601 (пустая строка — синхронизация с нуля).
+
+    Returns:
+        Optional[datetime]: Дата и время с часовым поясом или None.
+
+    Raises:
+        ValueError: Если значение не является датой и временем.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        # "+" смещения часового пояса в неэкранированном GET-параметре превращается в пробел.
+        parsed: Optional[datetime] = parse_datetime(value.replace(' ', '+'))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(constants.MESSAGES['sync_updated_since_invalid'])
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def get_sync_changes(updated_since: Optional[datetime]) -> Dict[str, Any]:
+    """
+    Возвращает изменения заказов после отметки времени.
+
+    Чтобы не потерять изменения из транзакций, зафиксированных с задержкой, выборка начинается
+    на SYNC_OVERLAP_SECONDS раньше отметки; повторно полученные заказы клиент просто обновляет.
+    Если отметка старше срока хранения отметок об удалении (или не передана), возвращаются все
+    заказы и признак полной синхронизации.
+
+    Args:
+        updated_since: Отметка времени последней синхронизации клиента.
+
+    Returns:
+        Dict[str, Any]: Заказы ('orders', QuerySet с предзагруженными позициями), id удаленных заказов
+        ('deleted'), новая отметка для следующей синхронизации ('watermark') и признак полной
+        синхронизации ('full_resync').
+    """
+    watermark: datetime = timezone.now()
+    orders: QuerySet[Order] = Order.objects.prefetch_related('items__dish').order_by('updated_at', 'id')
+    retention_start: datetime = watermark - timedelta(days=constants.TOMBSTONE_RETENTION_DAYS)
+    if updated_since is None or updated_since < retention_start:
+        return {'orders': orders, 'deleted': [], 'watermark': watermark, 'full_resync': True}
+
+    since: datetime = updated_since - timedelta(seconds=constants.SYNC_OVERLAP_SECONDS)
+    deleted: List[int] = sorted(set(
+        OrderTombstone.objects.filter(deleted_at__gt=since).values_list('order_id', flat=True)
+    ))
+    return {
+        'orders': orders.filter(updated_at__gt=since),
+        'deleted': deleted,
+        'watermark': watermark,
+        'full_resync': False,
+    }
+
+
+def purge_tombstones() -> int:
+    """
+    Удаляет отметки об удалении старше TOMBSTONE_RETENTION_DAYS дней.
+
+    Клиенты, не синхронизировавшиеся дольше этого срока, получают полную синхронизацию,
+    поэтому удаленные отметки им уже не нужны.
+
+    Returns:
+        int: Количество удаленных отметок.
+    """
+    cutoff: datetime = timezone.now() - timedelta(days=constants.TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = OrderTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,102 @@
+"""
+Теги шаблонов для кэширования фрагментов списка заказов.
+"""
+
+from typing import Any
+
+from django import template
+from django.core.cache import caches
+from django.template.base import FilterExpression, NodeList, Parser, Token
+
+from cafe_orders import constants
+from cafe_orders.detail_cache import get_menu_version
+
+register: template.Library = template.Library()
+
+
+def get_order_row_cache_key(order: Any) -> str:
+    """
+    Формирует ключ кэша строки заказа.
+
+    Ключ включает дату изменения заказа и версию меню, поэтому любое изменение заказа, его позиций
+    или блюд приводит к повторной отрисовке строки без явной инвалидации.
+
+    Args:
+        order: Заказ.
+
+    Returns:
+        str: Ключ кэша.
+    """
+    return constants.ORDER_ROW_CACHE_KEY_FORMAT.format(
+        version=constants.ORDER_ROW_CACHE_VERSION,
+        order_id=order.pk,
+        updated_at=order.updated_at.timestamp(),
+        menu_version=get_menu_version(),
+    )
+
+
+class OrderRowCacheNode(template.Node):
+    """
+    Узел шаблона, кэширующий отрисованную строку заказа.
+
+    CSRF-токен при отрисовке заменяется меткой, а при выводе — токеном текущего запроса,
+    поэтому закэшированная строка безопасно используется в разных сессиях.
+    """
+
+    def __init__(self, nodelist: NodeList, order: FilterExpression) -> None:
+        """
+        Инициализирует узел.
+
+        Args:
+            nodelist: Содержимое блока.
+            order: Выражение, возвращающее заказ.
+        """
+        self.nodelist = nodelist
+        self.order = order
+
+    def render(self, context: template.Context) -> str:
+        """
+        Возвращает строку заказа из кэша или отрисовывает и кэширует ее.
+
+        Args:
+            context: Контекст шаблона.
+
+        Returns:
+            str: Отрисованная строка заказа.
+        """
+        order: Any = self.order.resolve(context)
+        cache = caches[constants.FRAGMENT_CACHE_ALIAS]
+        key: str = get_order_row_cache_key(order)
+        fragment: Any = cache.get(key)
+        if fragment is None:
+            with context.push(csrf_token=constants.CSRF_TOKEN_SENTINEL):
+                fragment = self.nodelist.render(context)
+            cache.set(key, fragment, constants.ORDER_ROW_CACHE_TIMEOUT)
+        csrf_token: Any = context.get('csrf_token')
+        return fragment.replace(constants.CSRF_TOKEN_SENTINEL, str(csrf_token) if csrf_token else '')
+
+
+@register.tag('cache_order_row')
+def do_cache_order_row(parser: Parser, token: Token) -> OrderRowCacheNode:
+    """
+    Кэширует строку заказа по id, дате изменения заказа и версии меню.
+
+    Пример:
+        {% cache_order_row order %}<tr>...</tr>{% endcache_order_row %}
+
+    Args:
+        parser: Парсер шаблона.
+        token: Токен тега.
+
+    Returns:
+        OrderRowCacheNode: Узел шаблона.
+
+    Raises:
+        TemplateSyntaxError: Если не передан заказ.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"Тег '{bits[0]}' принимает один аргумент: заказ.")
+    nodelist: NodeList = parser.parse(('endcache_order_row',))
+    parser.delete_first_token()
+    return OrderRowCacheNode(nodelist, parser.compile_filter(bits[1]))
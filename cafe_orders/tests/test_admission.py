@@ -0,0 +1,137 @@
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.admission import TokenBucketRegistry, buckets, get_throttle_rates, parse_rate
+from cafe_orders.middleware import AdmissionControlMiddleware
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_parse_rate(self):
+        """
+        Проверяет разбор лимита в емкость и скорость пополнения.
+        """
+        self.assertEqual(parse_rate('30/min'), (30, 0.5))
+        for rate in ('abc', '0/s', '5/week'):
+            with self.assertRaises(ValueError):
+                parse_rate(rate)
+
+    def test_invalid_settings(self):
+        """
+        Проверяет, что некорректный лимит в настройках приводит к ImproperlyConfigured.
+        """
+        with override_settings(API_THROTTLE_RATES={'read': '30/min', 'write': ''}):
+            self.assertEqual(get_throttle_rates(), {'read': (30, 0.5)})
+        with override_settings(API_THROTTLE_RATES={'read': '30/week'}), self.assertRaises(ImproperlyConfigured):
+            get_throttle_rates()
+
+    def test_burst_and_refill(self):
+        """
+        Проверяет расход всплеска, время ожидания и пополнение корзины со временем.
+        """
+        now = [0.0]
+        registry = TokenBucketRegistry(timer=lambda: now[0])
+        key = ('read', '10.0.0.1')
+
+        self.assertEqual([registry.consume(key, 2, 1.0) for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(registry.consume(key, 2, 1.0), 1.0)
+        self.assertEqual(registry.consume(('read', '10.0.0.2'), 2, 1.0), 0.0)
+        now[0] = 1.5
+        self.assertEqual(registry.consume(key, 2, 1.0), 0.0)
+        self.assertAlmostEqual(registry.consume(key, 2, 1.0), 0.5)
+
+
+class OrderRateThrottleTest(APITestCase):
+    def setUp(self):
+        buckets.clear()
+        self.addCleanup(buckets.clear)
+
+    @override_settings(API_THROTTLE_RATES={'read': '2/min', 'write': '1/min', 'delete_all': '1/hour'})
+    def test_separate_budgets_per_scope(self):
+        """
+        Проверяет ответ 429 при исчерпании лимита чтения, не затрагивающий лимиты записи и удаления.
+        """
+        statuses = [self.client.get(reverse('order-list')).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        response = self.client.get(reverse('order-list'))
+        self.assertIn('Retry-After', response)
+
+        self.assertEqual(self.client.post(reverse('order-delete-all')).status_code, 200)
+        self.assertEqual(self.client.post(reverse('order-delete-all')).status_code, 429)
+        response = self.client.post(reverse('order-list'), {'table_number': 1, 'items': []}, format='json')
+        self.assertNotEqual(response.status_code, 429)
+
+    @override_settings(API_THROTTLE_RATES={'read': '1/min'})
+    def test_budget_per_client(self):
+        """
+        Проверяет, что лимит считается отдельно для каждого клиента.
+        """
+        self.assertEqual(self.client.get(reverse('order-list'), REMOTE_ADDR='10.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get(reverse('order-list'), REMOTE_ADDR='10.0.0.1').status_code, 429)
+        self.assertEqual(self.client.get(reverse('order-list'), REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_unlimited_by_default(self):
+        """
+        Проверяет, что без заданных лимитов запросы не ограничиваются.
+        """
+        for _ in range(5):
+            self.assertEqual(self.client.get(reverse('order-list')).status_code, 200)
+
+
+class AdmissionControlMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_disabled_by_default(self):
+        """
+        Проверяет, что без ADMISSION_MAX_IN_FLIGHT и ADMISSION_API_MAX_IN_FLIGHT middleware не используется.
+        """
+        with override_settings(ADMISSION_MAX_IN_FLIGHT=0, ADMISSION_API_MAX_IN_FLIGHT=0), \
+                self.assertRaises(MiddlewareNotUsed):
+            AdmissionControlMiddleware(lambda request: HttpResponse())
+
+    @override_settings(ADMISSION_MAX_IN_FLIGHT=0, ADMISSION_API_MAX_IN_FLIGHT=1)
+    def test_api_limit_without_total_limit(self):
+        """
+        Проверяет, что лимит запросов к API действует и без общего лимита.
+        """
+        middleware = AdmissionControlMiddleware(lambda request: HttpResponse())
+        middleware.api_slots.acquire()
+        self.assertEqual(middleware(self.factory.get('/api/orders/')).status_code, 503)
+        self.assertEqual(middleware(self.factory.get('/cafe_orders/orders/')).status_code, 200)
+
+    @override_settings(ADMISSION_MAX_IN_FLIGHT=2, ADMISSION_API_MAX_IN_FLIGHT=1)
+    def test_sheds_load_when_slots_are_busy(self):
+        """
+        Проверяет ответ 503 без вызова представления, когда все слоты заняты, и резерв слотов для веб-интерфейса.
+        """
+        calls = []
+        middleware = AdmissionControlMiddleware(lambda request: calls.append(request.path) or HttpResponse())
+
+        middleware.api_slots.acquire()
+        response = middleware(self.factory.get('/api/orders/'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(middleware(self.factory.get('/cafe_orders/orders/')).status_code, 200)
+
+        middleware.slots.acquire()
+        middleware.slots.acquire()
+        self.assertEqual(middleware(self.factory.get('/cafe_orders/orders/')).status_code, 503)
+        self.assertEqual(middleware(self.factory.get('/metrics')).status_code, 200)
+        self.assertEqual(calls, ['/cafe_orders/orders/', '/metrics'])
+
+    @override_settings(ADMISSION_MAX_IN_FLIGHT=1)
+    def test_releases_slot_after_response(self):
+        """
+        Проверяет освобождение слота после обработки запроса, в том числе при исключении.
+        """
+        def failing(request):
+            raise RuntimeError
+
+        middleware = AdmissionControlMiddleware(failing)
+        with self.assertRaises(RuntimeError):
+            middleware(self.factory.get('/api/orders/'))
+        middleware.get_response = lambda request: HttpResponse()
+        self.assertEqual(middleware(self.factory.get('/api/orders/')).status_code, 200)
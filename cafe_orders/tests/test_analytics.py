@@ -0,0 +1,105 @@
+import io
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.archive import archive_paid_orders
+from cafe_orders.models import DailyAnalytics, Dish, Order, OrderItem
+
+
+class MenuAnalyticsTest(APITestCase):
+    def setUp(self):
+        self.soup = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.tea = Dish.objects.create(name='Чай', price=Decimal('1.50'))
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def create_order(self, day, hour, table_number, items, status='pending'):
+        order = Order.objects.create(table_number=table_number, status=status)
+        for dish, quantity in items:
+            OrderItem.objects.create(order=order, dish=dish, quantity=quantity)
+        created_at = timezone.make_aware(datetime.combine(day, time(hour)))
+        Order.objects.filter(id=order.id).update(created_at=created_at, updated_at=created_at + timedelta(minutes=45))
+        return order
+
+    def analytics(self, **params):
+        params.setdefault('date_from', self.yesterday.isoformat())
+        params.setdefault('date_to', self.today.isoformat())
+        return self.client.get(reverse('analytics'), params)
+
+    def test_hot_and_archived_orders(self):
+        """
+        Проверяет популярные блюда, выручку, распределение по часам и дням недели и загрузку столов.
+        """
+        self.create_order(self.yesterday, 12, 1, [(self.soup, 2), (self.tea, 1)], status='paid')
+        self.create_order(self.yesterday, 12, 2, [(self.tea, 1)])
+        self.create_order(self.today, 0, 1, [(self.tea, 3)], status='paid')
+        archive_paid_orders(timezone.make_aware(datetime.combine(self.today, time.min)))
+
+        data = self.analytics().data
+        self.assertEqual(data['orders'], 3)
+        self.assertEqual(Decimal(data['revenue']), Decimal('12.00'))
+        self.assertEqual(data['top_dishes'], [
+            {'dish': 'Чай', 'quantity': 5, 'revenue': '6.00'},
+            {'dish': 'Суп', 'quantity': 2, 'revenue': '6.00'},
+        ])
+        self.assertEqual(data['hourly'][12], 2)
+        self.assertEqual(data['hourly'][0], 1)
+        self.assertEqual(data['heatmap'][self.yesterday.weekday()][12], 2)
+        self.assertEqual(data['tables'], [
+            {'table_number': 1, 'orders': 2, 'orders_per_day': 1.0, 'avg_occupancy_minutes': 45.0},
+            {'table_number': 2, 'orders': 1, 'orders_per_day': 0.5, 'avg_occupancy_minutes': None},
+        ])
+        self.assertEqual(self.analytics(top='1').data['top_dishes'][0]['dish'], 'Чай')
+
+    def test_closed_days_are_computed_once(self):
+        """
+        Проверяет, что закрытые дни берутся из сохраненной статистики, а текущий день пересчитывается.
+        """
+        self.create_order(self.yesterday, 10, 1, [(self.soup, 1)])
+        self.assertEqual(self.analytics().data['orders'], 1)
+        self.assertEqual(DailyAnalytics.objects.get().day, self.yesterday)
+
+        self.create_order(self.yesterday, 11, 1, [(self.soup, 1)])
+        self.create_order(self.today, 9, 3, [(self.tea, 1)])
+        self.assertEqual(self.analytics().data['orders'], 2)
+        self.assertEqual(DailyAnalytics.objects.count(), 1)
+
+        out = io.StringIO()
+        call_command('clear_analytics_cache', stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(self.analytics().data['orders'], 3)
+
+    def test_closed_day_follows_order_changes(self):
+        """
+        Проверяет пересчет закрытого дня после смены статуса и удаления его заказа.
+        """
+        order = self.create_order(self.yesterday, 10, 1, [(self.soup, 2)])
+        self.create_order(self.yesterday, 11, 2, [(self.tea, 1)])
+        self.assertEqual(Decimal(self.analytics().data['revenue']), Decimal('0'))
+
+        self.client.patch(reverse('order-detail', args=[order.id]), {'status': 'paid'}, format='json')
+        self.assertEqual(Decimal(self.analytics().data['revenue']), Decimal('6.00'))
+
+        Order.objects.get(id=order.id).delete()
+        data = self.analytics().data
+        self.assertEqual((data['orders'], Decimal(data['revenue'])), (1, Decimal('0')))
+        self.assertEqual(DailyAnalytics.objects.get().data['orders'], 1)
+
+        DailyAnalytics.objects.update(data={'orders': 5})
+        self.assertEqual(self.analytics().data['orders'], 1)
+
+    def test_invalid_params(self):
+        """
+        Проверяет ответ 400 на некорректные даты, слишком длинный период и параметр top.
+        """
+        self.assertEqual(self.analytics(date_from='2025-13-01').status_code, 400)
+        self.assertEqual(self.analytics(date_from=self.today.isoformat(),
+                                        date_to=self.yesterday.isoformat()).status_code, 400)
+        self.assertEqual(self.analytics(date_from='2000-01-01').status_code, 400)
+        self.assertEqual(self.analytics(top='0').status_code, 400)
+        self.assertEqual(self.client.get(reverse('analytics')).status_code, 200)
@@ -0,0 +1,102 @@
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.archive import archive_paid_orders, get_archive_cutoff
+from cafe_orders.exports import get_export_querysets, iter_ndjson
+from cafe_orders.models import Dish, Order, OrderItem, ArchivedOrder, ArchivedOrderItem
+from cafe_orders.reports import get_paid_revenue
+
+
+class ArchiveTestMixin:
+    def create_orders(self):
+        self.dish = Dish.objects.create(name='Блины', price=Decimal('4.00'))
+        old = timezone.now() - timedelta(days=60)
+        self.old_paid = Order.objects.create(table_number=1, status='paid')
+        OrderItem.objects.create(order=self.old_paid, dish=self.dish, quantity=3)
+        self.old_pending = Order.objects.create(table_number=2, status='pending')
+        OrderItem.objects.create(order=self.old_pending, dish=self.dish, quantity=1)
+        Order.objects.filter(id__in=[self.old_paid.id, self.old_pending.id]).update(created_at=old)
+        self.new_paid = Order.objects.create(table_number=3, status='paid')
+        OrderItem.objects.create(order=self.new_paid, dish=self.dish, quantity=1)
+
+
+class ArchivePaidOrdersTest(ArchiveTestMixin, TestCase):
+    def setUp(self):
+        self.create_orders()
+
+    def test_archive_moves_only_old_paid_orders(self):
+        """
+        Проверяет, что в архив переносятся только оплаченные заказы старше границы вместе с позициями.
+        """
+        progress = []
+        archived = archive_paid_orders(get_archive_cutoff(30), chunk_size=1, progress=progress.append)
+
+        self.assertEqual(archived, 1)
+        self.assertEqual(progress, [1])
+        self.assertFalse(Order.objects.filter(id=self.old_paid.id).exists())
+        self.assertTrue(Order.objects.filter(id=self.old_pending.id).exists())
+        self.assertTrue(Order.objects.filter(id=self.new_paid.id).exists())
+
+        archived_order = ArchivedOrder.objects.get(id=self.old_paid.id)
+        self.assertEqual(archived_order.total_price, Decimal('12.00'))
+        item = ArchivedOrderItem.objects.get(order=archived_order)
+        self.assertEqual((item.dish_name, item.quantity, item.unit_price), ('Блины', 3, Decimal('4.00')))
+
+    def test_archive_is_idempotent(self):
+        """
+        Проверяет, что повторный запуск ничего не переносит повторно.
+        """
+        archive_paid_orders(get_archive_cutoff(30))
+        self.assertEqual(archive_paid_orders(get_archive_cutoff(30)), 0)
+        self.assertEqual(ArchivedOrder.objects.count(), 1)
+
+    def test_revenue_and_export_cover_archive(self):
+        """
+        Проверяет, что выручка и выгрузка учитывают архивные заказы, а изменение цены блюда их не меняет.
+        """
+        archive_paid_orders(get_archive_cutoff(30))
+        Dish.objects.filter(id=self.dish.id).update(price=Decimal('10.00'))
+
+        self.assertEqual(get_paid_revenue(), Decimal('16.00'))
+        exported = [json.loads(line) for line in ''.join(iter_ndjson(get_export_querysets('paid'))).splitlines()]
+        self.assertEqual({order['id'] for order in exported}, {self.old_paid.id, self.new_paid.id})
+
+    def test_negative_days_rejected(self):
+        """
+        Проверяет, что отрицательное количество дней не принимается.
+        """
+        with self.assertRaises(ValueError):
+            get_archive_cutoff(-1)
+
+    def test_archive_orders_command(self):
+        """
+        Проверяет management-команду архивации.
+        """
+        out = io.StringIO()
+        call_command('archive_orders', '--days', '30', stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(ArchivedOrder.objects.count(), 1)
+
+
+class ArchiveActionTest(ArchiveTestMixin, APITestCase):
+    def setUp(self):
+        self.create_orders()
+
+    def test_archive_action(self):
+        """
+        Проверяет action архивации через API и ответ 400 на некорректный параметр.
+        """
+        response = self.client.post(reverse('order-archive'), {'days': 30}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['archived'], 1)
+
+        response = self.client.post(reverse('order-archive'), {'days': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
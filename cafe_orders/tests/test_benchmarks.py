@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from cafe_orders.benchmarks import percentile, compare_with_baseline, run_benchmarks
+from cafe_orders.datagen import generate_dataset
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class DatasetGeneratorTest(TestCase):
+    def _snapshot(self):
+        return (
+            list(Dish.objects.order_by('id').values_list('name', 'price')),
+            list(Order.objects.order_by('id').values_list('table_number', 'status')),
+            list(OrderItem.objects.order_by('id').values_list('dish__name', 'quantity', 'unit_price')),
+        )
+
+    def test_generate_dataset_is_deterministic(self):
+        """
+        Проверяет, что одинаковый seed дает одинаковые данные, а активных заказов не больше одного на стол.
+        """
+        counts = generate_dataset(dishes=5, tables=6, orders=20, items_per_order=2, seed=7, days=3)
+        self.assertEqual(counts, {'dishes': 5, 'orders': 20, 'items': 40})
+        first = self._snapshot()
+        active_tables = list(Order.objects.exclude(status='paid').values_list('table_number', flat=True))
+        self.assertEqual(len(active_tables), len(set(active_tables)))
+
+        OrderItem.objects.all().delete()
+        Order.objects.all().delete()
+        Dish.objects.all().delete()
+        generate_dataset(dishes=5, tables=6, orders=20, items_per_order=2, seed=7, days=3)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_generate_dataset_invalid_params(self):
+        """
+        Проверяет отклонение некорректных параметров генерации.
+        """
+        with self.assertRaises(ValueError):
+            generate_dataset(dishes=2, tables=5, orders=1, items_per_order=3)
+        with self.assertRaises(ValueError):
+            generate_dataset(dishes=2, tables=100, orders=1, items_per_order=1)
+
+
+class BenchmarkRunnerTest(TestCase):
+    def test_percentile(self):
+        """
+        Проверяет вычисление перцентилей методом ближайшего ранга.
+        """
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_compare_with_baseline(self):
+        """
+        Проверяет обнаружение регрессий по задержке и количеству запросов.
+        """
+        baseline = {'small': {'order_list': {'p50_ms': 10.0, 'queries': 3}}}
+        self.assertEqual(compare_with_baseline({'small': {'order_list': {'p50_ms': 11.0, 'queries': 3}}},
+                                               baseline, tolerance=0.2), [])
+        regressions = compare_with_baseline({'small': {'order_list': {'p50_ms': 13.0, 'queries': 5}}},
+                                            baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+
+    def test_run_benchmarks(self):
+        """
+        Проверяет прогон выбранных сценариев и структуру результатов.
+        """
+        sizes = {'tiny': {'dishes': 3, 'tables': 4, 'orders': 6, 'items_per_order': 2}}
+        results = run_benchmarks(sizes, repeat=2, case_names=['order_list', 'api_create', 'api_delete_all'])
+
+        self.assertEqual(set(results['tiny']), {'order_list', 'api_create', 'api_delete_all'})
+        self.assertEqual(results['tiny']['order_list']['status_codes'], [200])
+        self.assertEqual(results['tiny']['api_create']['status_codes'], [201])
+        self.assertIn('p99_ms', results['tiny']['order_list'])
+        self.assertGreater(results['tiny']['order_list']['queries'], 0)
+        self.assertEqual(Order.objects.count(), 0)
+
+        with self.assertRaises(ValueError):
+            run_benchmarks(sizes, case_names=['unknown'])
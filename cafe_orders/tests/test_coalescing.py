@@ -0,0 +1,92 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cafe_orders.coalescing import SingleFlight, single_flight
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class SingleFlightTest(SimpleTestCase):
+    def test_concurrent_calls_share_one_computation(self):
+        """
+        Проверяет, что одновременные вызовы с одинаковым ключом выполняют вычисление один раз.
+        """
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do('revenue', None, compute)))]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=lambda: results.append(flight.do('revenue', None, compute)))
+                    for _ in range(3)]
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [42] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_result_ttl_and_errors(self):
+        """
+        Проверяет переиспользование результата в течение ttl и то, что ошибки не сохраняются.
+        """
+        now = [0.0]
+        flight = SingleFlight(timer=lambda: now[0])
+        counter = iter(range(10))
+
+        self.assertEqual(flight.do('orders', ('a',), lambda: next(counter), ttl=2), 0)
+        self.assertEqual(flight.do('orders', ('a',), lambda: next(counter), ttl=2), 0)
+        self.assertEqual(flight.do('orders', ('b',), lambda: next(counter), ttl=2), 1)
+        now[0] = 3
+        self.assertEqual(flight.do('orders', ('a',), lambda: next(counter), ttl=2), 2)
+
+        with self.assertRaises(ZeroDivisionError):
+            flight.do('failing', None, lambda: 1 / 0, ttl=2)
+        self.assertEqual(flight.do('failing', None, lambda: 'ok', ttl=2), 'ok')
+
+
+@override_settings(COALESCING_RESULT_TTL=60)
+class CoalescedViewsTest(TestCase):
+    def setUp(self):
+        single_flight.clear()
+        self.addCleanup(single_flight.clear)
+        dish = Dish.objects.create(name='Чай', price=Decimal('5.00'))
+        order = Order.objects.create(table_number=1, status='paid')
+        OrderItem.objects.create(order=order, dish=dish, quantity=2)
+
+    def test_revenue_reuses_result(self):
+        """
+        Проверяет, что повторный расчет выручки в пределах ttl не выполняет агрегирующих запросов.
+        """
+        first = self.client.get(reverse('calculate_revenue'))
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(reverse('calculate_revenue'))
+        self.assertEqual(second.context['revenue'], first.context['revenue'])
+        self.assertFalse(any('SUM' in query['sql'].upper() for query in queries))
+
+    def test_order_list_keyed_by_filters(self):
+        """
+        Проверяет, что результат списка заказов переиспользуется только для тех же фильтров.
+        """
+        Order.objects.create(table_number=2)
+        self.assertEqual(len(self.client.get('/api/orders/', {'table': 1}).json()), 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self.client.get('/api/orders/', {'table': 1}).json()), 1)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(len(self.client.get('/api/orders/', {'table': 2}).json()), 1)
+        self.assertEqual(len(self.client.get('/api/orders/').json()), 2)
@@ -0,0 +1,54 @@
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from cafe_orders.deletion import delete_all_orders_chunked, delete_orders_range
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class ChunkedDeletionTest(TestCase):
+    def setUp(self):
+        self.dish = Dish.objects.create(name='Омлет', price=Decimal('5.00'))
+        self.orders = [Order.objects.create(table_number=table, status='pending') for table in range(1, 6)]
+        for order in self.orders:
+            OrderItem.objects.create(order=order, dish=self.dish, quantity=1)
+            OrderItem.objects.create(order=order, dish=self.dish, quantity=2)
+
+    def test_delete_all_orders_chunked(self):
+        """
+        Проверяет удаление всех заказов и позиций порциями с отчетом о прогрессе.
+        """
+        progress = []
+        deleted = delete_all_orders_chunked(chunk_size=2, progress=progress.append)
+
+        self.assertEqual(deleted, {'orders': 5, 'items': 10})
+        self.assertEqual([step['orders'] for step in progress], [2, 4, 5])
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertEqual(OrderItem.objects.count(), 0)
+        self.assertTrue(Dish.objects.filter(pk=self.dish.pk).exists())
+
+    def test_delete_all_orders_chunked_empty(self):
+        """
+        Проверяет, что при отсутствии заказов возвращаются нулевые счетчики.
+        """
+        delete_all_orders_chunked()
+        self.assertEqual(delete_all_orders_chunked(), {'orders': 0, 'items': 0})
+
+    def test_delete_orders_range(self):
+        """
+        Проверяет, что удаляется только указанный диапазон id.
+        """
+        deleted = delete_orders_range(self.orders[1].id, self.orders[2].id)
+        self.assertEqual(deleted, {'orders': 2, 'items': 4})
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_delete_all_orders_command(self):
+        """
+        Проверяет management-команду порционного удаления.
+        """
+        out = io.StringIO()
+        call_command('delete_all_orders', '--chunk-size', '3', '--noinput', stdout=out)
+        self.assertIn('Удалено заказов: 5, позиций: 10.', out.getvalue())
+        self.assertEqual(Order.objects.count(), 0)
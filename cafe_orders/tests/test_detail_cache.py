@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=60)
+class OrderDetailCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.dish = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.order = Order.objects.create(table_number=1)
+        self.item = OrderItem.objects.create(order=self.order, dish=self.dish, quantity=1)
+        self.url = reverse('order-detail', args=[self.order.id])
+
+    def get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_repeated_retrieve_skips_database(self):
+        """
+        Проверяет, что повторный запрос деталей заказа не выполняет запросов к базе данных.
+        """
+        first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get()
+        self.assertEqual(second, first)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'fields': 'id,status'})
+        self.assertEqual(set(response.data), {'id', 'status'})
+
+    def test_update_is_written_through(self):
+        """
+        Проверяет, что после изменения заказа через API следующий запрос получает новые данные из кэша.
+        """
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, {'status': 'ready'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get()['status'], 'ready')
+
+    def test_write_paths_invalidate(self):
+        """
+        Проверяет, что изменение позиции, переименование блюда и удаление заказа отражаются в ответе.
+        """
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.quantity = 4
+            self.item.save()
+        self.assertEqual(self.get()['items'][0]['quantity'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.name = 'Борщ'
+            self.dish.save()
+        self.assertEqual(self.get()['items'][0]['dish'], 'Борщ')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
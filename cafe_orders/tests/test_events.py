@@ -0,0 +1,188 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.archive import archive_paid_orders
+from cafe_orders.deletion import delete_all_orders_chunked
+from cafe_orders.models import Dish, Order, OrderEvent, OrderItem, ProjectionCheckpoint
+from cafe_orders.projections import PROJECTIONS, advance_projection, rebuild_projection
+from cafe_orders.reports import get_paid_revenue
+
+
+class OrderApiTestCase(APITestCase):
+    def setUp(self):
+        self.soup = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.tea = Dish.objects.create(name='Чай', price=Decimal('1.50'))
+
+    def create_order(self, table_number, items):
+        response = self.client.post(reverse('order-list'), {
+            'table_number': table_number,
+            'items': [{'dish': dish, 'quantity': quantity} for dish, quantity in items],
+        }, format='json')
+        return response.data['id']
+
+
+class OrderEventJournalTest(OrderApiTestCase):
+    def events(self, order_id):
+        return list(OrderEvent.objects.filter(order_id=order_id).order_by('id'))
+
+    def test_api_mutations_are_journaled(self):
+        """
+        Проверяет события создания и изменения заказа через API с состоянием заказа и изменениями.
+        """
+        order_id = self.create_order(1, [('Суп', 2)])
+        self.client.patch(reverse('order-detail', args=[order_id]), {'status': 'ready'}, format='json')
+        self.client.patch(reverse('order-detail', args=[order_id]), {'table_number': 1}, format='json')
+        self.client.delete(reverse('order-detail', args=[order_id]))
+
+        created, updated, deleted = self.events(order_id)
+        self.assertEqual(created.event_type, 'created')
+        self.assertEqual(created.payload['items'], [
+            {'dish_id': self.soup.id, 'dish': 'Суп', 'quantity': 2, 'unit_price': '3.00'}])
+        self.assertEqual(updated.event_type, 'updated')
+        self.assertEqual(updated.payload['changes'], ['status'])
+        self.assertEqual(updated.payload['previous'], {'status': 'pending'})
+        self.assertEqual(deleted.event_type, 'deleted')
+
+    def test_html_mutations_are_journaled(self):
+        """
+        Проверяет события при создании заказа, изменении позиций и смене статуса через веб-интерфейс.
+        """
+        self.client.post(reverse('add_order'), {
+            'table_number': '4',
+            'orderitems-TOTAL_FORMS': '1',
+            'orderitems-INITIAL_FORMS': '0',
+            'orderitems-MIN_NUM_FORMS': '0',
+            'orderitems-MAX_NUM_FORMS': '1000',
+            'orderitems-0-dish': str(self.tea.pk),
+            'orderitems-0-quantity': '2',
+        })
+        order = Order.objects.get(table_number=4)
+        item = order.items.get()
+        self.client.post(reverse('update_order', args=[order.id]), {
+            'orderitems-TOTAL_FORMS': '1',
+            'orderitems-INITIAL_FORMS': '1',
+            'orderitems-MIN_NUM_FORMS': '0',
+            'orderitems-MAX_NUM_FORMS': '1000',
+            'orderitems-0-id': str(item.id),
+            'orderitems-0-dish': str(self.tea.pk),
+            'orderitems-0-quantity': '5',
+        })
+        self.client.post(reverse('update_order_status', args=[order.id]), {'status': 'paid'})
+
+        events = self.events(order.id)
+        self.assertEqual([event.event_type for event in events], ['created', 'updated', 'updated'])
+        self.assertEqual(events[1].payload['changes'], ['items'])
+        self.assertEqual(events[1].payload['items'][0]['quantity'], 5)
+        self.assertEqual(events[2].payload['previous'], {'status': 'pending'})
+
+    def test_bulk_deletion_and_archive_are_journaled(self):
+        """
+        Проверяет события при порционном удалении и переносе в архив.
+        """
+        paid_id = self.create_order(1, [('Суп', 1)])
+        self.client.patch(reverse('order-detail', args=[paid_id]), {'status': 'paid'}, format='json')
+        archive_paid_orders(timezone.now() + timedelta(days=1))
+        other_id = self.create_order(2, [('Чай', 1)])
+        delete_all_orders_chunked()
+
+        self.assertEqual(self.events(paid_id)[-1].event_type, 'archived')
+        self.assertEqual(self.events(other_id)[-1].event_type, 'deleted')
+
+    def test_events_are_immutable(self):
+        """
+        Проверяет, что записанное событие нельзя изменить.
+        """
+        event = self.events(self.create_order(1, [('Суп', 1)]))[0]
+        event.event_type = 'deleted'
+        with self.assertRaises(ValueError):
+            event.save()
+
+
+class OrderProjectionTest(OrderApiTestCase):
+    def set_status(self, order_id, status):
+        self.client.patch(reverse('order-detail', args=[order_id]), {'status': status}, format='json')
+
+    def test_projections_match_tables(self):
+        """
+        Проверяет, что выручка, очередь кухни и состояние столов совпадают с данными в таблицах.
+        """
+        paid = self.create_order(1, [('Суп', 2), ('Чай', 1)])
+        archived = self.create_order(2, [('Чай', 2)])
+        deleted = self.create_order(3, [('Суп', 1)])
+        pending = self.create_order(4, [('Суп', 1)])
+        ready = self.create_order(5, [('Чай', 1)])
+        for order_id in (paid, archived, deleted):
+            self.set_status(order_id, 'paid')
+        self.set_status(ready, 'ready')
+        Order.objects.filter(id=archived).update(created_at=timezone.now() - timedelta(days=60))
+        archive_paid_orders(timezone.now() - timedelta(days=30))
+        self.client.delete(reverse('order-detail', args=[deleted]))
+
+        revenue = rebuild_projection(PROJECTIONS['revenue'])['state']
+        self.assertEqual(Decimal(revenue['total']), get_paid_revenue())
+        self.assertEqual(set(revenue), {'total'})
+
+        kitchen = advance_projection(PROJECTIONS['kitchen_queue'])['state']
+        self.assertEqual(set(kitchen['orders']), {str(pending)})
+        self.assertEqual(kitchen['orders'][str(pending)]['items'], [{'dish': 'Суп', 'quantity': 1}])
+
+        tables = advance_projection(PROJECTIONS['tables'])['state']
+        self.assertEqual(tables['tables'], {'4': {str(pending): 'pending'}, '5': {str(ready): 'ready'}})
+
+    def test_revenue_follows_paid_order_changes(self):
+        """
+        Проверяет выручку после изменения позиций оплаченного заказа, отмены оплаты и удаления.
+        """
+        first = self.create_order(1, [('Суп', 1)])
+        second = self.create_order(2, [('Чай', 2)])
+        OrderItem.objects.filter(order_id=second).update(unit_price=None)
+        self.set_status(first, 'paid')
+        self.set_status(second, 'paid')
+        self.client.put(reverse('order-detail', args=[first]), {
+            'table_number': 1, 'status': 'paid', 'items': [{'dish': 'Суп', 'quantity': 3}]}, format='json')
+        self.assertEqual(Decimal(advance_projection(PROJECTIONS['revenue'])['state']['total']), Decimal('12.00'))
+
+        self.set_status(second, 'ready')
+        self.assertEqual(Decimal(advance_projection(PROJECTIONS['revenue'])['state']['total']), Decimal('9.00'))
+        self.set_status(second, 'paid')
+        Order.objects.get(id=first).delete()
+        revenue = advance_projection(PROJECTIONS['revenue'])['state']
+        self.assertEqual(Decimal(revenue['total']), get_paid_revenue())
+        self.assertEqual(Decimal(revenue['total']), Decimal('3.00'))
+
+    def test_incremental_advance_from_checkpoint(self):
+        """
+        Проверяет, что проекция продолжает обработку с сохраненной позиции.
+        """
+        first = self.create_order(1, [('Суп', 1)])
+        result = advance_projection(PROJECTIONS['kitchen_queue'])
+        self.assertEqual(result['applied'], 1)
+
+        self.set_status(first, 'ready')
+        second = self.create_order(2, [('Чай', 1)])
+        result = advance_projection(PROJECTIONS['kitchen_queue'], batch_size=1)
+        self.assertEqual(result['applied'], 2)
+        self.assertEqual(set(result['state']['orders']), {str(second)})
+        checkpoint = ProjectionCheckpoint.objects.get(name='kitchen_queue')
+        self.assertEqual(checkpoint.position, OrderEvent.objects.latest('id').id)
+        self.assertEqual(advance_projection(PROJECTIONS['kitchen_queue'])['applied'], 0)
+
+    def test_command_seeds_orders_without_history(self):
+        """
+        Проверяет запись событий для заказов без истории и обновление проекций командой.
+        """
+        order = Order.objects.create(table_number=7)
+        OrderItem.objects.create(order=order, dish=self.soup, quantity=1)
+        out = io.StringIO()
+        call_command('order_projections', 'tables', '--seed', stdout=out)
+
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(ProjectionCheckpoint.objects.get(name='tables').state['tables'],
+                         {'7': {str(order.id): 'pending'}})
+        self.assertEqual(OrderEvent.objects.filter(order_id=order.id).count(), 1)
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.exports import parse_export_params, get_export_queryset, get_export_querysets, iter_csv, \
+    iter_ndjson
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class ExportTestMixin:
+    def create_orders(self):
+        self.coffee = Dish.objects.create(name='Кофе', price=Decimal('3.50'))
+        self.cake = Dish.objects.create(name='Торт', price=Decimal('6.00'))
+        self.paid_order = Order.objects.create(table_number=1, status='paid')
+        OrderItem.objects.create(order=self.paid_order, dish=self.coffee, quantity=2)
+        OrderItem.objects.create(order=self.paid_order, dish=self.cake, quantity=1)
+        self.pending_order = Order.objects.create(table_number=2, status='pending')
+        OrderItem.objects.create(order=self.pending_order, dish=self.coffee, quantity=1)
+
+
+class ExportParamsTest(TestCase):
+    def test_parse_export_params_maps_russian_status(self):
+        """
+        Проверяет, что статус можно передать по-русски, а даты разбираются в объекты date.
+        """
+        params = parse_export_params({'status': 'Оплачено', 'date_from': '2025-03-01', 'date_to': '2025-03-31'})
+        self.assertEqual(params['status'], 'paid')
+        self.assertEqual(params['file_format'], 'csv')
+        self.assertEqual(params['date_from'].day, 1)
+        self.assertEqual(params['date_to'].day, 31)
+
+    def test_parse_export_params_invalid(self):
+        """
+        Проверяет отклонение неизвестного формата, статуса и перевернутого периода.
+        """
+        with self.assertRaises(ValueError):
+            parse_export_params({'file_format': 'xlsx'})
+        with self.assertRaises(ValueError):
+            parse_export_params({'status': 'cancelled'})
+        with self.assertRaises(ValueError):
+            parse_export_params({'date_from': '2025-04-01', 'date_to': '2025-03-01'})
+
+
+class ExportGeneratorsTest(ExportTestMixin, TestCase):
+    def setUp(self):
+        self.create_orders()
+
+    def test_iter_csv_one_row_per_item(self):
+        """
+        Проверяет, что CSV содержит заголовок и по строке на каждую позицию, а чанкование не теряет строк.
+        """
+        rows = list(csv.reader(io.StringIO(''.join(iter_csv([Order.objects.all()], chunk_size=1)))))
+        self.assertEqual(rows[0][0], 'order_id')
+        self.assertEqual(len(rows), 4)
+        paid_rows = [row for row in rows[1:] if row[0] == str(self.paid_order.id)]
+        self.assertEqual({row[5] for row in paid_rows}, {'Кофе', 'Торт'})
+        self.assertTrue(all(Decimal(row[9]) == Decimal('13.00') for row in paid_rows))
+
+    def test_iter_ndjson_filtered_by_status(self):
+        """
+        Проверяет NDJSON-выгрузку оплаченных заказов с позициями и итоговой суммой.
+        """
+        lines = ''.join(iter_ndjson(get_export_querysets(status='paid'))).splitlines()
+        self.assertEqual(len(lines), 1)
+        data = json.loads(lines[0])
+        self.assertEqual(data['id'], self.paid_order.id)
+        self.assertEqual(len(data['items']), 2)
+        self.assertEqual(Decimal(data['total_price']), Decimal('13.00'))
+
+    def test_get_export_queryset_date_range(self):
+        """
+        Проверяет, что период фильтрует заказы по дате создания включительно.
+        """
+        today = timezone.localdate()
+        self.assertEqual(get_export_queryset(date_from=today, date_to=today).count(), 2)
+        self.assertEqual(get_export_queryset(date_to=today - timedelta(days=1)).count(), 0)
+
+    def test_export_orders_command(self):
+        """
+        Проверяет вывод management-команды и ошибку при некорректной дате.
+        """
+        out = io.StringIO()
+        call_command('export_orders', '--format', 'ndjson', '--status', 'pending', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['id'], self.pending_order.id)
+        with self.assertRaises(CommandError):
+            call_command('export_orders', '--date-from', '01.03.2025', stdout=io.StringIO())
+
+
+class ExportActionTest(ExportTestMixin, APITestCase):
+    def setUp(self):
+        self.create_orders()
+
+    def test_export_action_streams_csv(self):
+        """
+        Проверяет потоковую выгрузку CSV через API.
+        """
+        response = self.client.get(reverse('order-export'), {'status': 'paid'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(len(content.strip().splitlines()), 3)
+
+    def test_export_action_invalid_params(self):
+        """
+        Проверяет ответ 400 при неподдерживаемом формате.
+        """
+        response = self.client.get(reverse('order-export'), {'file_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
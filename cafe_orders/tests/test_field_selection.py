@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class FieldSelectionTest(APITestCase):
+    def setUp(self):
+        dish = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.orders = []
+        for table in range(1, 5):
+            order = Order.objects.create(table_number=table)
+            OrderItem.objects.create(order=order, dish=dish, quantity=table)
+            self.orders.append(order)
+
+    def get(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('order-list'), params)
+        return response, queries
+
+    def test_kitchen_fieldset(self):
+        """
+        Проверяет, что ответ и запросы к базе содержат только выбранные поля заказа и позиций.
+        """
+        response, queries = self.get({'fields': 'id,table_number,status', 'include': 'items.dish'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), {'id', 'table_number', 'status', 'items'})
+        self.assertEqual(response.data[0]['items'], [{'dish': 'Суп'}])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('created_at', queries[0]['sql'].split('ORDER BY')[0])
+        self.assertNotIn('unit_price', queries[1]['sql'])
+
+    def test_fields_without_items_skip_item_queries(self):
+        """
+        Проверяет, что без позиций и итоговой суммы позиции не загружаются.
+        """
+        response, queries = self.get({'fields': 'id,status'})
+        self.assertEqual(set(response.data[0]), {'id', 'status'})
+        self.assertEqual(len(queries), 1)
+
+    def test_total_price_without_items(self):
+        """
+        Проверяет расчет итоговой суммы без вывода позиций.
+        """
+        response, queries = self.get({'fields': 'id,total_price'})
+        totals = {row['id']: Decimal(row['total_price']) for row in response.data}
+        self.assertEqual(totals[self.orders[1].id], Decimal('6.00'))
+        self.assertEqual(len(queries), 2)
+
+    def test_default_list_has_constant_query_count(self):
+        """
+        Проверяет, что полный ответ не выполняет запросов на каждый заказ.
+        """
+        response, queries = self.get({})
+        self.assertEqual(set(response.data[0]), {'id', 'table_number', 'status', 'created_at', 'updated_at',
+                                                 'total_price', 'items'})
+        self.assertEqual(len(queries), 2)
+
+    def test_multi_get_by_ids(self):
+        """
+        Проверяет пакетное получение заказов по списку id.
+        """
+        ids = [self.orders[0].id, self.orders[2].id]
+        response, _ = self.get({'ids': ','.join(map(str, ids)), 'fields': 'id'})
+        self.assertEqual(sorted(row['id'] for row in response.data), ids)
+
+    def test_invalid_params(self):
+        """
+        Проверяет ответ 400 на неизвестные поля и некорректные id.
+        """
+        self.assertEqual(self.get({'fields': 'id,secret'})[0].status_code, 400)
+        self.assertEqual(self.get({'include': 'dish'})[0].status_code, 400)
+        self.assertEqual(self.get({'ids': '1,abc'})[0].status_code, 400)
+
+    def test_retrieve_with_fields(self):
+        """
+        Проверяет выбор полей при получении одного заказа.
+        """
+        response = self.client.get(reverse('order-detail', args=[self.orders[0].id]), {'fields': 'status'})
+        self.assertEqual(response.data, {'status': 'pending'})
@@ -39,6 +39,20 @@ class OrderItemFormTest(TestCase):
         form = OrderItemForm(data={'dish': self.dish.pk, 'quantity': 2})
         self.assertTrue(form.is_valid())
 
+    def test_order_item_form_excludes_archived_dishes(self):
+        """
+        Проверяет, что архивное блюдо нельзя выбрать для новой позиции,
+        но оно остается доступным в уже существующей позиции.
+        """
+        self.dish.archive()
+        form = OrderItemForm(data={'dish': self.dish.pk, 'quantity': 1})
+        self.assertFalse(form.is_valid())
+
+        order = Order.objects.create(table_number=3, status='pending')
+        item = order.items.create(dish=self.dish, quantity=1)
+        form = OrderItemForm(data={'dish': self.dish.pk, 'quantity': 2}, instance=item)
+        self.assertTrue(form.is_valid(), form.errors)
+
 
 class OrderItemFormSetTest(TestCase):
     def setUp(self):
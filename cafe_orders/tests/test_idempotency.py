@@ -0,0 +1,157 @@
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.models import Dish, IdempotencyKey, Order
+
+
+class IdempotencyKeyTest(APITestCase):
+    def setUp(self):
+        Dish.objects.create(name='Кофе', price=Decimal('2.00'))
+        self.payload = {'table_number': 3, 'items': [{'dish': 'Кофе', 'quantity': 2}]}
+
+    def post_order(self, key, payload=None):
+        return self.client.post(reverse('order-list'), json.dumps(payload or self.payload),
+                                content_type='application/json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_returns_stored_response(self):
+        """
+        Проверяет, что повтор создания заказа с тем же ключом не создает дубликат и не обращается к заказам.
+        """
+        first = self.post_order('tablet-1-op-1')
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post_order('tablet-1-op-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertFalse(any('cafe_orders_order' in query['sql'] for query in queries))
+
+    def test_different_payload_with_same_key(self):
+        """
+        Проверяет ответ 422 на повтор ключа с другим телом запроса.
+        """
+        self.post_order('key')
+        response = self.post_order('key', {'table_number': 4, 'items': [{'dish': 'Кофе', 'quantity': 1}]})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_client(self):
+        """
+        Проверяет, что одинаковый ключ разных клиентов не возвращает чужой ответ.
+        """
+        self.assertEqual(self.post_order('op-1').status_code, 201)
+        response = self.client.post(reverse('order-list'), json.dumps(self.payload), content_type='application/json',
+                                    HTTP_IDEMPOTENCY_KEY='op-1', REMOTE_ADDR='10.0.0.2')
+        self.assertNotIn('Idempotent-Replayed', response)
+
+        self.client.force_authenticate(User.objects.create_user('waiter', password='secret'))
+        self.assertNotIn('Idempotent-Replayed', self.post_order('op-1'))
+        self.assertEqual(self.post_order('op-1')['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(sorted(IdempotencyKey.objects.values_list('client', flat=True)),
+                         ['ip:10.0.0.2', 'ip:127.0.0.1', f'user:{User.objects.get().pk}'])
+
+    def test_request_in_progress(self):
+        """
+        Проверяет ответ 409, пока исходный запрос с тем же ключом не завершен.
+        """
+        self.post_order('key')
+        IdempotencyKey.objects.filter(key='key').update(completed=False, response_data=None)
+        self.assertEqual(self.post_order('key').status_code, 409)
+
+    def test_abandoned_claim_is_taken_over(self):
+        """
+        Проверяет, что резервирование, брошенное аварийно завершенным процессом, перехватывается повтором.
+        """
+        self.post_order('key')
+        Order.objects.all().delete()
+        IdempotencyKey.objects.filter(key='key').update(
+            completed=False, status_code=None, response_data=None, claimed_at=timezone.now() - timedelta(minutes=5))
+
+        response = self.post_order('key')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertTrue(IdempotencyKey.objects.get(key='key').completed)
+        self.assertEqual(self.post_order('key')['Idempotent-Replayed'], 'true')
+
+    def test_multipart_request_with_session_csrf(self):
+        """
+        Проверяет запрос формы с сессионной аутентификацией: тело уже прочитано проверкой CSRF.
+        """
+        User.objects.create_user('waiter', password='secret')
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='waiter', password='secret')
+        token = 'a' * 32
+        client.cookies['csrftoken'] = token
+        data = {'csrfmiddlewaretoken': token, 'table_number': 3, 'items': 'Кофе'}
+
+        plain = client.post(reverse('order-list'), data)
+        first = client.post(reverse('order-list'), data, HTTP_IDEMPOTENCY_KEY='form-1')
+        retry = client.post(reverse('order-list'), data, HTTP_IDEMPOTENCY_KEY='form-1')
+
+        self.assertEqual(plain.status_code, 400)
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(retry.status_code, 400)
+        self.assertEqual(first.json(), plain.json())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_expired_key_is_reused(self):
+        """
+        Проверяет, что после истечения срока хранения ключ выполняет запрос заново.
+        """
+        self.post_order('key')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        response = self.post_order('key')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_status_change_and_bulk_actions(self):
+        """
+        Проверяет идемпотентность смены статуса и порционного удаления.
+        """
+        order_id = self.post_order('create').data['id']
+        url = reverse('order-detail', args=[order_id])
+        for _ in range(2):
+            response = self.client.patch(url, {'status': 'ready'}, format='json', HTTP_IDEMPOTENCY_KEY='ready')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+
+        first = self.client.post(reverse('order-delete-all'), HTTP_IDEMPOTENCY_KEY='wipe')
+        Order.objects.create(table_number=5)
+        retry = self.client.post(reverse('order-delete-all'), HTTP_IDEMPOTENCY_KEY='wipe')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_without_key_and_invalid_key(self):
+        """
+        Проверяет обычную обработку без заголовка и ответ 400 на некорректный ключ.
+        """
+        self.client.post(reverse('order-list'), self.payload, format='json')
+        self.client.post(reverse('order-list'), self.payload, format='json')
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(self.post_order('x' * 256).status_code, 400)
+
+    def test_purge_command(self):
+        """
+        Проверяет удаление устаревших ключей командой purge_idempotency_keys.
+        """
+        self.post_order('old')
+        self.post_order('new', {'table_number': 5, 'items': [{'dish': 'Кофе', 'quantity': 1}]})
+        IdempotencyKey.objects.filter(key='old').update(created_at=timezone.now() - timedelta(days=2))
+        call_command('purge_idempotency_keys', stdout=io.StringIO())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
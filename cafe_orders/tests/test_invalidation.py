@@ -0,0 +1,114 @@
+import io
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from cafe_orders import constants
+from cafe_orders.detail_cache import apply_invalidation
+from cafe_orders.invalidation import InvalidationBus
+from cafe_orders.models import CacheInvalidation, Dish, Order
+
+
+class InvalidationBusTest(TestCase):
+    def setUp(self):
+        self.publisher = InvalidationBus()
+        self.published = []
+        self.publisher.subscribe('test', self.published.append)
+        self.publisher.poll(force=True)
+        self.other = InvalidationBus()
+        self.received = []
+        self.other.subscribe('test', self.received.append)
+        self.other.poll(force=True)
+
+    def test_invalidations_reach_other_process(self):
+        """
+        Проверяет, что сброс применяется сразу в публикующем процессе и после чтения журнала в другом.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.publish('test', [1, 2, 1])
+        self.assertEqual(self.published, [['1', '2']])
+        self.assertEqual(self.received, [])
+
+        self.assertEqual(self.other.poll(force=True), 2)
+        self.assertEqual(self.received, [['1', '2']])
+        self.assertEqual(self.publisher.poll(force=True), 2)
+        self.assertEqual(self.published, [['1', '2']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.publish('test', range(constants.INVALIDATION_MAX_KEYS + 1))
+            self.publisher.publish('test', [3])
+        self.other.poll(force=True)
+        self.assertEqual(self.received, [['1', '2'], None])
+
+    def test_rolled_back_invalidation_is_not_published(self):
+        """
+        Проверяет, что сброс из отмененной транзакции не записывается в журнал и не применяется.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                self.publisher.publish('test', [1])
+                raise ValueError
+        self.assertEqual(self.published, [])
+        self.assertEqual(self.other.poll(force=True), 0)
+
+    @override_settings(INVALIDATION_POLL_INTERVAL=60)
+    def test_order_change_in_other_process(self):
+        """
+        Проверяет, что детали заказа, измененного другим процессом, обновляются после чтения журнала.
+        """
+        cache.clear()
+        self.other.subscribe(constants.INVALIDATION_SCOPE_ORDER_DETAIL, apply_invalidation)
+        order = Order.objects.create(table_number=1)
+        url = reverse('order-detail', args=[order.id])
+        self.assertEqual(self.client.get(url).data['status'], 'pending')
+
+        Order.objects.filter(id=order.id).update(status='ready')
+        CacheInvalidation.objects.create(scope=constants.INVALIDATION_SCOPE_ORDER_DETAIL, key=str(order.id))
+        self.assertEqual(self.client.get(url).data['status'], 'pending')
+        self.other.poll(force=True)
+        self.assertEqual(self.client.get(url).data['status'], 'ready')
+
+    @override_settings(INVALIDATION_POLL_INTERVAL=60)
+    def test_order_items_publish_once_per_mutation(self):
+        """
+        Проверяет, что сохранение нескольких позиций обновляет заказ и пишет в журнал один раз, а не на каждую позицию.
+        """
+        for name in ('Кофе', 'Чай', 'Сок'):
+            Dish.objects.create(name=name, price='2.00')
+        items = [{'dish': name, 'quantity': 1} for name in ('Кофе', 'Чай', 'Сок')]
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('order-list'), json.dumps({'table_number': 1, 'items': items}),
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        order_updates = [query for query in queries if query['sql'].startswith('UPDATE "cafe_orders_order"')]
+        self.assertEqual(len(order_updates), 1)
+        self.assertEqual(CacheInvalidation.objects.filter(scope=constants.INVALIDATION_SCOPE_ORDER_DETAIL).count(), 2)
+
+        CacheInvalidation.objects.all().delete()
+        items = [{'dish': name, 'quantity': 2} for name in ('Кофе', 'Чай', 'Сок')]
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.client.put(reverse('order-detail', args=[response.data['id']]),
+                                       json.dumps({'table_number': 1, 'items': items}),
+                                       content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        order_updates = [query for query in queries if query['sql'].startswith('UPDATE "cafe_orders_order"')]
+        self.assertEqual(len(order_updates), 2)
+        self.assertEqual(CacheInvalidation.objects.filter(scope=constants.INVALIDATION_SCOPE_ORDER_DETAIL).count(), 2)
+
+    def test_purge_command(self):
+        """
+        Проверяет удаление записей журнала старше срока хранения.
+        """
+        CacheInvalidation.objects.create(scope='test', created_at=timezone.now() - timedelta(days=1))
+        CacheInvalidation.objects.create(scope='test')
+        out = io.StringIO()
+        call_command('purge_invalidations', stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(CacheInvalidation.objects.count(), 1)
@@ -0,0 +1,140 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders import constants
+from cafe_orders.jobs import get_result_path, recover_jobs, requeue_stale_jobs, run_job, run_pending_jobs
+from cafe_orders.models import Dish, Order, OrderItem, ReportJob
+
+
+class ReportJobTest(APITestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(REPORT_JOB_WORKERS=0, REPORT_JOBS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        dish = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        order = Order.objects.create(table_number=2, status='paid')
+        OrderItem.objects.create(order=order, dish=dish, quantity=2)
+
+    def submit(self, kind, params=None):
+        return self.client.post(reverse('report-jobs'), {'kind': kind, 'params': params or {}}, format='json')
+
+    def test_revenue_job_lifecycle(self):
+        """
+        Проверяет постановку задания, опрос состояния и получение результата после выполнения.
+        """
+        response = self.submit('revenue')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(self.client.get(response['Location']).data['status'], 'queued')
+        result_url = reverse('report-job-result', args=[response.data['id']])
+        self.assertEqual(self.client.get(result_url).status_code, 409)
+
+        self.assertEqual(run_pending_jobs(), {'done': 1, 'failed': 0})
+        self.assertEqual(self.client.get(response['Location']).data['status'], 'done')
+        self.assertEqual(Decimal(self.client.get(result_url).data['revenue']), Decimal('6.00'))
+
+    def test_export_job_file(self):
+        """
+        Проверяет, что результат задания выгрузки отдается файлом, а после удаления файла — ответ 410.
+        """
+        job_id = self.submit('export', {'file_format': 'ndjson', 'status': 'paid'}).data['id']
+        call_command('run_jobs', stdout=io.StringIO())
+        response = self.client.get(reverse('report-job-result', args=[job_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('orders.ndjson', response['Content-Disposition'])
+        self.assertIn('"table_number": 2', b''.join(response.streaming_content).decode())
+
+        os.remove(get_result_path(ReportJob.objects.get(pk=job_id)))
+        self.assertEqual(self.client.get(reverse('report-job-result', args=[job_id])).status_code, 410)
+
+    def test_invalid_jobs_and_full_queue(self):
+        """
+        Проверяет ответ 400 на некорректные задания и 503, когда очередь заполнена.
+        """
+        self.assertEqual(self.submit('unknown').status_code, 400)
+        self.assertEqual(self.submit('analytics', {'top': '0'}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('report-jobs'), {'kind': 'export', 'params': [1]},
+                                          format='json').status_code, 400)
+        ReportJob.objects.bulk_create(
+            ReportJob(kind='revenue') for _ in range(constants.REPORT_JOB_MAX_QUEUED))
+        response = self.submit('revenue')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_failed_job(self):
+        """
+        Проверяет сохранение ошибки задания и ответ 409 при запросе результата.
+        """
+        job = ReportJob.objects.create(kind='analytics', params={})
+        with self.assertLogs(constants.REPORT_JOB_LOGGER_NAME, 'ERROR'):
+            self.assertEqual(run_job(job.id), 'failed')
+        response = self.client.get(reverse('report-job-result', args=[job.id]))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(reverse('report-job-detail', args=[job.id])).data['status'], 'failed')
+
+    def test_job_runs_once_and_stale_jobs_are_requeued(self):
+        """
+        Проверяет, что захваченное задание не выполняется повторно, а зависшее возвращается в очередь.
+        """
+        job = ReportJob.objects.create(kind='revenue')
+        self.assertEqual(run_job(job.id), 'done')
+        self.assertIsNone(run_job(job.id))
+
+        stale = ReportJob.objects.create(kind='revenue', status='running',
+                                         started_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertEqual(ReportJob.objects.get(id=stale.id).status, 'queued')
+
+    def test_pool_start_recovers_interrupted_jobs(self):
+        """
+        Проверяет, что при запуске пула прерванное задание возвращается в очередь вместе с ожидающими.
+        """
+        queued = ReportJob.objects.create(kind='revenue')
+        interrupted = ReportJob.objects.create(kind='revenue', status='running',
+                                               started_at=timezone.now() - timedelta(days=1))
+        ReportJob.objects.create(kind='revenue', status='running', started_at=timezone.now())
+
+        with self.assertLogs(constants.REPORT_JOB_LOGGER_NAME, 'WARNING'):
+            self.assertEqual(recover_jobs(), [queued.id, interrupted.id])
+        self.assertEqual(ReportJob.objects.get(id=interrupted.id).status, 'queued')
+
+    def test_purge_command(self):
+        """
+        Проверяет удаление старых завершенных заданий вместе с файлами выгрузок.
+        """
+        old_id = self.submit('export', {'file_format': 'csv'}).data['id']
+        failed = ReportJob.objects.create(kind='analytics', status='failed')
+        call_command('run_jobs', stdout=io.StringIO())
+        old_path = get_result_path(ReportJob.objects.get(id=old_id))
+        ReportJob.objects.filter(id__in=[old_id, failed.id]).update(finished_at=timezone.now() - timedelta(days=30))
+        recent_id = self.submit('export', {'file_format': 'csv'}).data['id']
+        call_command('run_jobs', stdout=io.StringIO())
+        pending = ReportJob.objects.create(kind='revenue')
+
+        out = io.StringIO()
+        call_command('purge_report_jobs', stdout=out)
+        self.assertIn('2', out.getvalue())
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(get_result_path(ReportJob.objects.get(id=recent_id))))
+        self.assertEqual(sorted(ReportJob.objects.values_list('id', flat=True)), [recent_id, pending.id])
+
+    def test_worker_pool_receives_job_after_commit(self):
+        """
+        Проверяет, что при включенном пуле задание передается ему после фиксации транзакции.
+        """
+        with override_settings(REPORT_JOB_WORKERS=1):
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.submit('revenue')
+        self.assertEqual(len(callbacks), 1)
@@ -0,0 +1,102 @@
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.deletion import delete_all_orders_chunked
+from cafe_orders.kitchen import get_kitchen_queue
+from cafe_orders.models import Dish, KitchenQueueEntry, Order, OrderItem
+from cafe_orders.serializers import OrderSerializer
+
+
+class KitchenQueueTest(APITestCase):
+    def setUp(self):
+        self.soup = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.tea = Dish.objects.create(name='Чай', price=Decimal('1.50'))
+
+    def create_order(self, table_number, items):
+        return self.client.post(reverse('order-list'), {
+            'table_number': table_number,
+            'items': [{'dish': dish, 'quantity': quantity} for dish, quantity in items],
+        }, format='json').data['id']
+
+    def queue(self):
+        return {entry['dish']: entry['quantity'] for entry in self.client.get(reverse('kitchen-queue')).data}
+
+    def test_queue_follows_order_changes(self):
+        """
+        Проверяет обновление очереди при создании, изменении позиций, смене статуса и удалении заказов.
+        """
+        first = self.create_order(1, [('Суп', 2), ('Чай', 1)])
+        second = self.create_order(2, [('Суп', 1)])
+        self.assertEqual(self.queue(), {'Суп': 3, 'Чай': 1})
+
+        self.client.patch(reverse('order-detail', args=[second]), {'items': [{'dish': 'Чай', 'quantity': 4}]},
+                          format='json')
+        self.assertEqual(self.queue(), {'Суп': 2, 'Чай': 5})
+
+        self.client.patch(reverse('order-detail', args=[first]), {'status': 'ready'}, format='json')
+        self.assertEqual(self.queue(), {'Чай': 4})
+
+        self.client.patch(reverse('order-detail', args=[first]), {'status': 'pending'}, format='json')
+        self.client.delete(reverse('order-detail', args=[second]))
+        self.assertEqual(self.queue(), {'Суп': 2, 'Чай': 1})
+
+        delete_all_orders_chunked()
+        self.assertEqual(self.queue(), {})
+
+    def test_html_status_change(self):
+        """
+        Проверяет, что перевод заказа в статус "Готово" через веб-интерфейс убирает его из очереди.
+        """
+        order_id = self.create_order(1, [('Суп', 2)])
+        self.client.post(reverse('update_order_status', args=[order_id]), {'status': 'ready'})
+        self.assertEqual(self.queue(), {})
+
+    def test_update_of_stale_instance(self):
+        """
+        Проверяет, что разница для очереди считается от состояния заказа в базе, а не от устаревшего объекта.
+        """
+        order = Order.objects.get(id=self.create_order(1, [('Суп', 2)]))
+        stale = Order.objects.get(id=order.id)
+        self.client.patch(reverse('order-detail', args=[order.id]), {'status': 'ready'}, format='json')
+        self.assertEqual(self.queue(), {})
+
+        serializer = OrderSerializer(stale, data={'table_number': 2, 'status': 'ready'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(serializer.previous_state['status'], 'ready')
+        self.assertEqual(self.queue(), {})
+
+    def test_read_in_one_query(self):
+        """
+        Проверяет, что очередь читается одним запросом.
+        """
+        self.create_order(1, [('Суп', 2), ('Чай', 1)])
+        with self.assertNumQueries(1):
+            queue = get_kitchen_queue()
+        self.assertEqual([entry['dish'] for entry in queue], ['Суп', 'Чай'])
+
+    def test_rebuild_command(self):
+        """
+        Проверяет пересчет очереди по заказам, созданным в обход приложения.
+        """
+        order = Order.objects.create(table_number=3)
+        OrderItem.objects.create(order=order, dish=self.tea, quantity=3)
+        Order.objects.create(table_number=4, status='paid').items.create(dish=self.soup, quantity=1)
+        KitchenQueueEntry.objects.create(dish=self.soup, quantity=7)
+
+        call_command('rebuild_kitchen_queue', stdout=io.StringIO())
+        self.assertEqual(self.queue(), {'Чай': 3})
+
+    def test_html_view(self):
+        """
+        Проверяет страницу очереди кухни.
+        """
+        self.create_order(1, [('Суп', 2)])
+        response = self.client.get(reverse('kitchen_queue'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'cafe_orders/kitchen_queue.html')
+        self.assertContains(response, 'Суп')
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TransactionTestCase
+
+from cafe_orders.loadgen import ClientTransport, LoadStats, is_lock_error, run_simulation
+from cafe_orders.models import Dish, Order
+
+
+class LoadStatsTest(SimpleTestCase):
+    def test_summary(self):
+        """
+        Проверяет подсчет запросов, пропускной способности, ошибок и ошибок блокировки.
+        """
+        stats = LoadStats()
+        for elapsed in [1.0, 2.0, 3.0, 4.0]:
+            stats.record('api_create', elapsed, ok=True)
+        stats.record('api_create', 10.0, ok=False, lock_error=True)
+
+        summary = stats.summary(duration=2.0)['api_create']
+        self.assertEqual(summary['requests'], 5)
+        self.assertEqual(summary['throughput'], 2.5)
+        self.assertEqual(summary['p50_ms'], 3.0)
+        self.assertEqual(summary['p99_ms'], 10.0)
+        self.assertEqual((summary['errors'], summary['lock_errors']), (1, 1))
+
+    def test_is_lock_error(self):
+        """
+        Проверяет распознавание ошибок блокировки SQLite.
+        """
+        self.assertTrue(is_lock_error('OperationalError: database is locked'))
+        self.assertTrue(is_lock_error('database table is locked: cafe_orders_order'))
+        self.assertFalse(is_lock_error('UNIQUE constraint failed'))
+
+
+class SimulationTest(TransactionTestCase):
+    def test_run_simulation_follows_order_lifecycle(self):
+        """
+        Проверяет, что участники проходят жизненный цикл заказа и статистика собирается по эндпоинтам.
+        """
+        Dish.objects.create(name='Кофе', price=Decimal('2.00'))
+        Dish.objects.create(name='Чай', price=Decimal('1.50'))
+
+        result = run_simulation(ClientTransport, ['Кофе', 'Чай'], waiters=1, kitchens=1, managers=1,
+                                duration=1.0, seed=1)
+
+        self.assertTrue({'api_create', 'kitchen_queue', 'revenue'} <= set(result['endpoints']))
+        self.assertEqual(result['total']['requests'],
+                         sum(stats['requests'] for stats in result['endpoints'].values()))
+        self.assertTrue(Order.objects.exists())
+
+    def test_run_simulation_requires_dishes(self):
+        """
+        Проверяет, что симуляция без блюд не запускается.
+        """
+        with self.assertRaises(ValueError):
+            run_simulation(ClientTransport, [], duration=0.1)
+
+    def test_command_requires_dishes_for_url(self):
+        """
+        Проверяет, что для внешнего сервера необходимо указать блюда.
+        """
+        with self.assertRaises(CommandError):
+            call_command('simulate_shift', '--url', 'http://127.0.0.1:8000')
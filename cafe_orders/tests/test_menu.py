@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.menu import parse_menu
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class MenuBulkUpdateTest(APITestCase):
+    def setUp(self):
+        self.soup = Dish.objects.create(name='Суп', price=Decimal('3.00'))
+        self.juice = Dish.objects.create(name='Компот', price=Decimal('1.00'), is_archived=True)
+        self.order = Order.objects.create(table_number=1)
+        OrderItem.objects.create(order=self.order, dish=self.soup, quantity=1)
+        admin = User.objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_authenticate(admin)
+
+    def upload(self, content, name='menu.csv', **data):
+        return self.client.post(reverse('menu-import'), {
+            'file': SimpleUploadedFile(name, content.encode('utf-8')), **data}, format='multipart')
+
+    def prices(self):
+        return dict(Dish.objects.values_list('name', 'price'))
+
+    def test_import_dry_run_and_apply(self):
+        """
+        Проверяет список изменений пробного запуска и импорт меню с добавлением, изменением и возвратом из архива.
+        """
+        content = 'name,price\nСуп,3.50\nЧай,1.25\nКомпот,1.00\n'
+        response = self.upload(content, dry_run='true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], [{'name': 'Чай', 'price': '1.25'}])
+        self.assertEqual([(dish['name'], dish['old_price'], dish['price'], dish['restored'])
+                          for dish in response.data['updated']],
+                         [('Суп', '3.00', '3.50', False), ('Компот', '1.00', '1.00', True)])
+        self.assertTrue(response.data['dry_run'])
+        self.assertEqual(self.prices(), {'Суп': Decimal('3.00'), 'Компот': Decimal('1.00')})
+
+        updated_at = Order.objects.get(id=self.order.id).updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(content)
+        self.assertFalse(response.data['dry_run'])
+        self.assertEqual(self.prices(), {'Суп': Decimal('3.50'), 'Чай': Decimal('1.25'), 'Компот': Decimal('1.00')})
+        self.assertFalse(Dish.objects.get(name='Компот').is_archived)
+        self.assertEqual(Order.objects.get(id=self.order.id).updated_at, updated_at)
+
+        response = self.upload(json.dumps([{'name': 'Суп', 'price': '3.50'}]), name='menu.json')
+        self.assertEqual((response.data['updated'], response.data['unchanged']), ([], 1))
+
+    def test_price_adjustment(self):
+        """
+        Проверяет изменение цен на процент и по таблице цен.
+        """
+        response = self.client.post(reverse('menu-prices'), {'percent': '10.5', 'dry_run': True}, format='json')
+        self.assertEqual(response.data['updated'][0]['price'], '3.32')
+        self.assertEqual(self.prices()['Суп'], Decimal('3.00'))
+
+        response = self.client.post(reverse('menu-prices'), {'percent': '10'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.prices(), {'Суп': Decimal('3.30'), 'Компот': Decimal('1.00')})
+
+        response = self.client.post(reverse('menu-prices'), {'prices': [
+            {'name': 'Компот', 'price': '1.20'}]}, format='json')
+        self.assertEqual(self.prices(), {'Суп': Decimal('3.30'), 'Компот': Decimal('1.20')})
+        self.assertTrue(Dish.objects.get(name='Компот').is_archived)
+
+        for data in ({}, {'percent': '5', 'prices': []}, {'percent': '-100'},
+                     {'prices': [{'name': 'Борщ', 'price': '2.00'}]}):
+            response = self.client.post(reverse('menu-prices'), data, format='json')
+            self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(reverse('menu-prices'), {'percent': '5'}, format='json').status_code, 403)
+
+    def test_invalid_files_and_commands(self):
+        """
+        Проверяет сообщения об ошибках в файле меню и команды импорта меню и изменения цен.
+        """
+        for content, file_format in (('name,price\nСуп,1\nСуп,2\n', 'csv'), ('name,price\nСуп,1.234\n', 'csv'),
+                                     ('title,price\nСуп,1\n', 'csv'), ('{"name": "Суп"}', 'json'), ('', 'csv')):
+            with self.assertRaises(ValueError):
+                parse_menu(content, file_format)
+        self.assertEqual(self.upload('name,price\nСуп,-1\n').status_code, 400)
+        self.assertEqual(self.prices()['Суп'], Decimal('3.00'))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as menu_file:
+            json.dump([{'name': 'Чай', 'price': 1.5}], menu_file)
+        self.addCleanup(os.remove, menu_file.name)
+        out = io.StringIO()
+        call_command('import_menu', menu_file.name, stdout=out)
+        self.assertIn('+ Чай: 1.50', out.getvalue())
+
+        out = io.StringIO()
+        call_command('adjust_prices', '--percent', '-50', '--dry-run', stdout=out)
+        self.assertIn('~ Суп: 3.00 -> 1.50', out.getvalue())
+        self.assertEqual(self.prices()['Чай'], Decimal('1.50'))
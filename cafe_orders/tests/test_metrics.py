@@ -0,0 +1,138 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.metrics import MetricsRegistry, merge_snapshots, render_metrics, registry
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+def get_dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    def test_render_histogram_and_counters(self):
+        """
+        Проверяет формат экспозиции: накопительные интервалы гистограммы, сумму, количество и экранирование меток.
+        """
+        metrics = MetricsRegistry(buckets=[0.1, 1.0])
+        metrics.observe('cafe_http_request_duration_seconds', 0.05, {'route': 'order-list'})
+        metrics.observe('cafe_http_request_duration_seconds', 0.5, {'route': 'order-list'})
+        metrics.observe('cafe_http_request_duration_seconds', 5, {'route': 'order-list'})
+        metrics.inc('cafe_orders_created_total', {'source': 'a"b'})
+
+        text = render_metrics(merge_snapshots([metrics.snapshot()]))
+
+        self.assertIn('# TYPE cafe_http_request_duration_seconds histogram', text)
+        self.assertIn('cafe_http_request_duration_seconds_bucket{route="order-list",le="0.1"} 1', text)
+        self.assertIn('cafe_http_request_duration_seconds_bucket{route="order-list",le="1"} 2', text)
+        self.assertIn('cafe_http_request_duration_seconds_bucket{route="order-list",le="+Inf"} 3', text)
+        self.assertIn('cafe_http_request_duration_seconds_sum{route="order-list"} 5.55', text)
+        self.assertIn('cafe_http_request_duration_seconds_count{route="order-list"} 3', text)
+        self.assertIn('cafe_orders_created_total{source="a\\"b"} 1', text)
+
+    def test_merge_across_processes(self):
+        """
+        Проверяет суммирование снимков процессов: счетчики завершившихся процессов сохраняются, показатели — нет.
+        """
+        current = MetricsRegistry()
+        current.inc('cafe_orders_created_total', {'source': 'api'}, 2)
+        current.add_gauge('cafe_http_requests_in_flight', 1)
+        with tempfile.TemporaryDirectory() as directory:
+            current.flush(directory, force=True)
+            dead = current.snapshot()
+            dead['pid'] = get_dead_pid()
+            with open(os.path.join(directory, f"metrics_{dead['pid']}.json"), 'w', encoding='utf-8') as file:
+                json.dump(dead, file)
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+            merged = merge_snapshots([current.snapshot(), dead])
+
+        self.assertEqual(merged['counters'][('cafe_orders_created_total', (('source', 'api'),))], 4)
+        self.assertEqual(merged['gauges'][('cafe_http_requests_in_flight', ())], 1)
+
+
+class MetricsEndpointTest(APITestCase):
+    def setUp(self):
+        Dish.objects.create(name='Кофе', price=Decimal('2.50'))
+
+    def test_domain_counters_from_api(self):
+        """
+        Проверяет счетчики созданных заказов, смен статуса и оплаченной выручки при работе через API.
+        """
+        created = registry.get_value('cafe_orders_created_total', {'source': 'api'})
+        transitions = registry.get_value('cafe_order_status_transitions_total', {'from': 'pending', 'to': 'paid'})
+        revenue = registry.get_value('cafe_revenue_paid_total')
+
+        response = self.client.post(reverse('order-list'), {
+            'table_number': 1, 'status': 'pending', 'items': [{'dish': 'Кофе', 'quantity': 2}]}, format='json')
+        self.client.patch(reverse('order-detail', args=[response.data['id']]), {'status': 'paid'}, format='json')
+
+        self.assertEqual(registry.get_value('cafe_orders_created_total', {'source': 'api'}), created + 1)
+        self.assertEqual(registry.get_value('cafe_order_status_transitions_total',
+                                            {'from': 'pending', 'to': 'paid'}), transitions + 1)
+        self.assertEqual(registry.get_value('cafe_revenue_paid_total'), revenue + 5.0)
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_metrics_endpoint(self):
+        """
+        Проверяет эндпоинт /metrics: формат ответа, метрики маршрутов и времени SQL.
+        """
+        self.client.get(reverse('order-list'))
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-token')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        text = response.content.decode()
+        self.assertIn('cafe_http_request_duration_seconds_count{route="order-list"}', text)
+        self.assertIn('cafe_http_requests_in_flight 1', text)
+        self.assertIn('cafe_db_time_seconds_total{route="order-list"}', text)
+
+    def test_metrics_access(self):
+        """
+        Проверяет, что метрики недоступны анонимным клиентам и клиентам с неверным токеном и выключаются настройкой.
+        """
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(METRICS_TOKEN='scrape-token'):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(response.status_code, 403)
+        self.client.force_login(User.objects.create_user('admin', password='secret', is_staff=True))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+        with override_settings(METRICS_ENABLED=False):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+    def test_metrics_endpoint_with_multiprocess_dir(self):
+        """
+        Проверяет, что при заданном каталоге снимок процесса сохраняется при запросе метрик.
+        """
+        self.client.force_login(User.objects.create_user('admin', password='secret', is_staff=True))
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            response = self.client.get(reverse('metrics'))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(f'metrics_{os.getpid()}.json', os.listdir(directory))
+
+
+class HtmlStatusTransitionMetricsTest(TestCase):
+    def test_update_order_status_counts_transition(self):
+        """
+        Проверяет учет смены статуса из HTML-представления.
+        """
+        dish = Dish.objects.create(name='Чай', price=Decimal('1.00'))
+        order = Order.objects.create(table_number=2)
+        OrderItem.objects.create(order=order, dish=dish, quantity=1)
+        before = registry.get_value('cafe_order_status_transitions_total', {'from': 'pending', 'to': 'ready'})
+
+        self.client.post(reverse('update_order_status', args=[order.pk]), {'status': 'ready'})
+
+        self.assertEqual(registry.get_value('cafe_order_status_transitions_total',
+                                            {'from': 'pending', 'to': 'ready'}), before + 1)
@@ -0,0 +1,73 @@
+import json
+import re
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+def parse_server_timing(header):
+    return {
+        match.group(1): float(match.group(2))
+        for match in re.finditer(r'(\w+);dur=([\d.]+)', header)
+    }
+
+
+@override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_QUERY_BUDGET=50)
+class RequestTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        dish = Dish.objects.create(name='Кофе', price=Decimal('2.00'))
+        for table in range(1, 4):
+            order = Order.objects.create(table_number=table)
+            OrderItem.objects.create(order=order, dish=dish, quantity=1)
+
+    def test_server_timing_for_html_view(self):
+        """
+        Проверяет заголовок Server-Timing и строку лога для HTML-представления.
+        """
+        with self.assertLogs('cafe_orders.timing', level='INFO') as logs:
+            response = self.client.get(reverse('order_list'))
+
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(metrics), {'sql', 'view', 'render', 'total'})
+        self.assertGreater(metrics['render'], 0)
+        self.assertLessEqual(metrics['view'] + metrics['render'], metrics['total'] + 0.01)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['route'], 'order_list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertFalse(record['over_budget'])
+
+    def test_server_timing_for_api_view(self):
+        """
+        Проверяет, что для API учитывается отложенный рендеринг ответа.
+        """
+        with self.assertLogs('cafe_orders.timing', level='INFO') as logs:
+            response = self.client.get(reverse('order-list'))
+
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['route'], 'order-list')
+
+    @override_settings(REQUEST_TIMING_QUERY_BUDGET=1)
+    def test_query_budget_exceeded(self):
+        """
+        Проверяет, что превышение бюджета SQL-запросов отмечается в заголовке и логе.
+        """
+        with self.assertLogs('cafe_orders.timing', level='WARNING') as logs:
+            response = self.client.get(reverse('order-list'))
+
+        self.assertIn('budget;', response['Server-Timing'])
+        self.assertTrue(json.loads(logs.records[0].getMessage())['over_budget'])
+
+
+class RequestTimingDisabledTest(TestCase):
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled_by_default(self):
+        """
+        Проверяет, что без включения настройки заголовок не добавляется.
+        """
+        response = self.client.get(reverse('order_list'))
+        self.assertNotIn('Server-Timing', response)
@@ -1,5 +1,6 @@
 from django.test import TestCase
 from django.core.exceptions import ValidationError
+from django.db.models import ProtectedError
 from decimal import Decimal
 from cafe_orders.models import Dish, Order, OrderItem
 
@@ -20,6 +21,24 @@ class DishModelTest(TestCase):
         with self.assertRaises(ValidationError):
             dish.full_clean()
 
+    def test_dish_archive(self):
+        """
+        Тестирует перевод блюда в архив и его исключение из актуального меню.
+        """
+        dish = Dish.objects.create(name='Компот', price=Decimal('2.00'))
+        dish.archive()
+        self.assertTrue(Dish.objects.get(pk=dish.pk).is_archived)
+        self.assertFalse(Dish.active.filter(pk=dish.pk).exists())
+
+    def test_dish_with_orders_cannot_be_hard_deleted(self):
+        """
+        Тестирует, что физическое удаление блюда не удаляет каскадно историю заказов.
+        """
+        dish = Dish.objects.create(name='Морс', price=Decimal('3.00'))
+        OrderItem.objects.create(order=Order.objects.create(table_number=2), dish=dish, quantity=1)
+        with self.assertRaises(ProtectedError):
+            dish.delete()
+
 
 class OrderItemModelTest(TestCase):
     def setUp(self):
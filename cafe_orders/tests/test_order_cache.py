@@ -0,0 +1,82 @@
+import re
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cafe_orders.models import Dish, Order, OrderItem
+
+
+class OrderRowCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dish = Dish.objects.create(name='Кофе', price=Decimal('2.00'))
+        self.orders = []
+        for table in range(1, 4):
+            order = Order.objects.create(table_number=table)
+            OrderItem.objects.create(order=order, dish=self.dish, quantity=1)
+            self.orders.append(order)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('order_list'))
+        return response, len(queries)
+
+    def test_cached_rows_skip_item_queries(self):
+        """
+        Проверяет, что повторная отрисовка списка не выполняет запросов к позициям заказов.
+        """
+        _, first = self.count_queries()
+        response, second = self.count_queries()
+        self.assertLess(second, first)
+        self.assertContains(response, 'Кофе x 1')
+
+    def test_item_change_rerenders_row(self):
+        """
+        Проверяет, что изменение позиции обновляет дату изменения заказа и строка отрисовывается заново.
+        """
+        self.count_queries()
+        order = self.orders[0]
+        updated_at = Order.objects.get(pk=order.pk).updated_at
+        item = order.items.get()
+        item.quantity = 5
+        item.save()
+
+        self.assertGreater(Order.objects.get(pk=order.pk).updated_at, updated_at)
+        response, _ = self.count_queries()
+        self.assertContains(response, 'Кофе x 5')
+
+    def test_dish_rename_rerenders_rows(self):
+        """
+        Проверяет, что переименование блюда отражается в закэшированных строках без изменения заказов.
+        """
+        self.count_queries()
+        updated_at = Order.objects.get(pk=self.orders[0].pk).updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.name = 'Капучино'
+            self.dish.save()
+        self.assertEqual(Order.objects.get(pk=self.orders[0].pk).updated_at, updated_at)
+        response, _ = self.count_queries()
+        self.assertContains(response, 'Капучино x 1', count=3)
+
+    def test_cached_row_uses_current_csrf_token(self):
+        """
+        Проверяет, что закэшированная строка содержит CSRF-токен текущей сессии и форма в ней работает.
+        """
+        Client().get(reverse('order_list'))
+
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse('order_list'))
+        content = response.content.decode()
+        self.assertNotIn('__order_row_csrf_token__', content)
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', content).group(1)
+
+        order = self.orders[0]
+        response = client.post(reverse('update_order_status', args=[order.pk]),
+                               {'status': 'ready', 'csrfmiddlewaretoken': token})
+        self.assertEqual(response.status_code, 302)
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'ready')
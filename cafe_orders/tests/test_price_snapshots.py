@@ -0,0 +1,87 @@
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cafe_orders.models import Dish, Order, OrderItem
+from cafe_orders.price_snapshots import backfill_unit_prices
+from cafe_orders.reports import get_paid_revenue
+
+
+class UnitPriceSnapshotTest(TestCase):
+    def setUp(self):
+        self.tea = Dish.objects.create(name='Чай', price=Decimal('2.00'))
+        self.soup = Dish.objects.create(name='Суп дня', price=Decimal('6.00'))
+        self.order = Order.objects.create(table_number=4, status='paid')
+
+    def test_price_is_captured_on_create(self):
+        """
+        Проверяет, что цена фиксируется при создании позиции и не меняется вслед за меню.
+        """
+        item = OrderItem.objects.create(order=self.order, dish=self.tea, quantity=3)
+        Dish.objects.filter(pk=self.tea.pk).update(price=Decimal('5.00'))
+
+        item = OrderItem.objects.get(pk=item.pk)
+        self.assertEqual(item.unit_price, Decimal('2.00'))
+        self.assertEqual(item.price, Decimal('6.00'))
+        self.assertEqual(get_paid_revenue(), Decimal('6.00'))
+
+    def test_price_is_recaptured_when_dish_changes(self):
+        """
+        Проверяет, что при смене блюда в позиции фиксируется цена нового блюда.
+        """
+        item = OrderItem.objects.create(order=self.order, dish=self.tea, quantity=1)
+        item = OrderItem.objects.get(pk=item.pk)
+        item.dish = self.soup
+        item.save()
+        self.assertEqual(OrderItem.objects.get(pk=item.pk).unit_price, Decimal('6.00'))
+
+        item.quantity = 2
+        item.save()
+        self.assertEqual(OrderItem.objects.get(pk=item.pk).unit_price, Decimal('6.00'))
+
+    def test_legacy_items_count_at_dish_price(self):
+        """
+        Проверяет, что позиции без зафиксированной цены учитываются в выручке по текущей цене блюда.
+        """
+        OrderItem.objects.create(order=self.order, dish=self.tea, quantity=2)
+        legacy = OrderItem.objects.create(order=self.order, dish=self.soup, quantity=1)
+        OrderItem.objects.filter(pk=legacy.pk).update(unit_price=None)
+        self.assertEqual(get_paid_revenue(), Decimal('10.00'))
+
+    def test_put_keeps_prices_of_unchanged_items(self):
+        """
+        Проверяет, что полное обновление заказа через API не пересчитывает цены сохраненных позиций.
+        """
+        item = OrderItem.objects.create(order=self.order, dish=self.tea, quantity=1)
+        Dish.objects.filter(pk=self.tea.pk).update(price=Decimal('5.00'))
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('waiter', password='secret'))
+
+        response = client.put(reverse('order-detail', args=[self.order.id]), {
+            'table_number': 4, 'status': 'paid',
+            'items': [{'dish': 'Чай', 'quantity': 2}, {'dish': 'Суп дня', 'quantity': 1}]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(OrderItem.objects.get(pk=item.pk).quantity, 2)
+        self.assertEqual(OrderItem.objects.get(pk=item.pk).unit_price, Decimal('2.00'))
+        self.assertEqual(get_paid_revenue(), Decimal('10.00'))
+
+    def test_backfill_unit_prices(self):
+        """
+        Проверяет заполнение цены в позициях, созданных без нее, порциями и через команду.
+        """
+        items = [OrderItem.objects.create(order=self.order, dish=self.soup, quantity=1) for _ in range(3)]
+        OrderItem.objects.filter(pk__in=[item.pk for item in items]).update(unit_price=None)
+
+        progress = []
+        self.assertEqual(backfill_unit_prices(chunk_size=2, progress=progress.append), 3)
+        self.assertEqual(progress, [2, 3])
+        self.assertFalse(OrderItem.objects.filter(unit_price__isnull=True).exists())
+
+        out = io.StringIO()
+        call_command('backfill_unit_prices', stdout=out)
+        self.assertIn('0', out.getvalue())
@@ -0,0 +1,91 @@
+import io
+import os
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from cafe_orders.profiling import list_profiles, summarize_profiles
+
+
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_profile_by_header_token(self):
+        """
+        Проверяет, что запрос с верным токеном профилируется, а профиль сохраняется в каталог.
+        """
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_TOKEN='secret'):
+            response = self.client.get(reverse('add_order'), HTTP_X_PROFILE='secret')
+
+        profile_id = response['X-Profile-Id']
+        self.assertIn('_add_order_GET_', profile_id)
+        profiles = list_profiles(self.directory.name)
+        self.assertEqual([(p['name'], p['route']) for p in profiles], [(profile_id, 'add_order')])
+
+        rows = summarize_profiles([os.path.join(self.directory.name, profile_id)], sort='cumulative', limit=5)
+        self.assertEqual(len(rows), 5)
+        self.assertGreaterEqual(rows[0]['cumulative'], rows[-1]['cumulative'])
+
+    def test_wrong_token_is_not_profiled(self):
+        """
+        Проверяет, что запрос с неверным токеном или без него не профилируется.
+        """
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_TOKEN='secret'):
+            response = self.client.get(reverse('order_list'), HTTP_X_PROFILE='guess')
+            self.assertNotIn('X-Profile-Id', response)
+            response = self.client.get(reverse('order_list'))
+            self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(list_profiles(self.directory.name), [])
+
+    def test_sampling(self):
+        """
+        Проверяет профилирование случайной выборки запросов без токена.
+        """
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_SAMPLE_RATE=1.0):
+            response = self.client.get(reverse('order-list'))
+        self.assertIn('X-Profile-Id', response)
+
+    def test_profiles_command(self):
+        """
+        Проверяет вывод списка профилей и сводки по самым затратным функциям.
+        """
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_TOKEN='secret'):
+            self.client.get(reverse('add_order'), HTTP_X_PROFILE='secret')
+            self.client.get(reverse('order_list'), HTTP_X_PROFILE='secret')
+
+            out = io.StringIO()
+            call_command('profiles', stdout=out)
+            self.assertIn('Всего профилей: 2', out.getvalue())
+
+            out = io.StringIO()
+            call_command('profiles', '--summary', '--route', 'order_list', '--sort', 'tottime', '--top', '3',
+                         stdout=out)
+            self.assertIn('Профилей в сводке: 1', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command('profiles', '--summary', '--route', 'dish_list', stdout=io.StringIO())
+
+    def test_profiles_are_rotated(self):
+        """
+        Проверяет удаление самых старых профилей при сохранении и устаревших профилей командой.
+        """
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_TOKEN='secret', PROFILING_MAX_FILES=2):
+            for _ in range(3):
+                self.client.get(reverse('add_order'), HTTP_X_PROFILE='secret')
+            latest = self.client.get(reverse('order_list'), HTTP_X_PROFILE='secret')['X-Profile-Id']
+        profiles = list_profiles(self.directory.name)
+        self.assertEqual(len(profiles), 2)
+        self.assertEqual(profiles[0]['name'], latest)
+
+        old = os.path.join(self.directory.name, profiles[1]['name'])
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        out = io.StringIO()
+        call_command('profiles', '--prune', '--dir', self.directory.name, '--max-age-hours', '1', stdout=out)
+        self.assertIn('Удалено профилей: 1', out.getvalue())
+        self.assertEqual([p['name'] for p in list_profiles(self.directory.name)], [latest])
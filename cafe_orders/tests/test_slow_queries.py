@@ -0,0 +1,71 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from cafe_orders.models import Order
+from cafe_orders.slow_queries import slow_query_log, read_log_file
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001)
+class SlowQueryLogTest(APITestCase):
+    def setUp(self):
+        slow_query_log.clear()
+        Order.objects.create(table_number=5)
+
+    def test_records_query_with_plan_and_origin(self):
+        """
+        Проверяет, что запрос сверх порога записывается с планом выполнения, маршрутом и параметрами.
+        """
+        self.client.get(reverse('order-search'), {'q': '5'})
+
+        entries = [entry for entry in slow_query_log.entries() if 'table_number' in entry['sql']]
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertEqual(entry['route'], 'order-search')
+        self.assertEqual(entry['query_params'], {'q': '5'})
+        self.assertIn(5, entry['params'])
+        self.assertTrue(entry['plan'])
+
+    def test_admin_only_endpoint(self):
+        """
+        Проверяет, что журнал доступен только администраторам.
+        """
+        self.client.get(reverse('order-list'))
+        self.assertEqual(self.client.get(reverse('slow-queries')).status_code, 403)
+
+        admin = User.objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse('slow-queries'), {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['entries']), 2)
+
+    def test_log_file_and_command(self):
+        """
+        Проверяет запись журнала в JSONL-файл, вывод и очистку через management-команду.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'slow.jsonl')
+            with override_settings(SLOW_QUERY_LOG_FILE=log_file):
+                self.client.get(reverse('order-list'), {'status': 'в ожидании'})
+                self.assertTrue(read_log_file(log_file, limit=1))
+
+                out = io.StringIO()
+                call_command('slow_queries', '--limit', '5', stdout=out)
+                self.assertIn('маршрут=order-list', out.getvalue())
+
+                call_command('slow_queries', '--clear', stdout=io.StringIO())
+                self.assertEqual(read_log_file(log_file), [])
+
+    def test_command_requires_log_file(self):
+        """
+        Проверяет, что без файла журнала команда сообщает об ошибке.
+        """
+        with self.assertRaises(CommandError):
+            call_command('slow_queries')
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from cafe_orders.archive import archive_paid_orders
+from cafe_orders.models import ArchivedOrder, Dish, Order, OrderItem
+from cafe_orders.reports import get_paid_revenue
+from cafe_orders.snapshot import ColumnarSnapshot, snapshot_dish_totals, snapshot_paid_revenue, write_snapshot
+
+
+class ColumnarSnapshotTest(TestCase):
+    def setUp(self):
+        self.soup = Dish.objects.create(name='Суп', price=Decimal('3.50'))
+        self.tea = Dish.objects.create(name='Чай', price=Decimal('1.25'))
+        archived = Order.objects.create(table_number=1, status='paid')
+        OrderItem.objects.create(order=archived, dish=self.soup, quantity=2)
+        Order.objects.filter(id=archived.id).update(created_at=timezone.now() - timedelta(days=60))
+        archive_paid_orders(timezone.now() - timedelta(days=30))
+        paid = Order.objects.create(table_number=2, status='paid')
+        OrderItem.objects.create(order=paid, dish=self.tea, quantity=3)
+        pending = Order.objects.create(table_number=3)
+        OrderItem.objects.create(order=pending, dish=self.soup, quantity=1)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_snapshot_reproduces_reports(self):
+        """
+        Проверяет, что выручка и итоги по блюдам по снимку совпадают с данными базы.
+        """
+        manifest = write_snapshot(self.directory, chunk_size=1)
+        self.assertEqual(manifest['columns']['orders.id']['length'], 3)
+        self.assertEqual(manifest['columns']['items.quantity']['length'], 3)
+
+        with ColumnarSnapshot(self.directory) as snapshot:
+            self.assertEqual(sorted(snapshot.column('orders.table_number')), [1, 2, 3])
+            self.assertEqual(snapshot_paid_revenue(snapshot), get_paid_revenue())
+            self.assertEqual(snapshot_dish_totals(snapshot), [
+                {'dish_id': self.soup.id, 'dish': 'Суп', 'quantity': 3, 'revenue': Decimal('7.00')},
+                {'dish_id': self.tea.id, 'dish': 'Чай', 'quantity': 3, 'revenue': Decimal('3.75')},
+            ])
+
+    def test_incomplete_snapshot_is_rejected(self):
+        """
+        Проверяет, что каталог без описания снимка не открывается.
+        """
+        write_snapshot(self.directory)
+        os.remove(os.path.join(self.directory, 'manifest.json'))
+        with self.assertRaises(ValueError):
+            ColumnarSnapshot(self.directory)
+
+    def test_empty_snapshot(self):
+        """
+        Проверяет чтение снимка без заказов.
+        """
+        Order.objects.all().delete()
+        ArchivedOrder.objects.all().delete()
+        write_snapshot(self.directory)
+        with ColumnarSnapshot(self.directory) as snapshot:
+            self.assertEqual(snapshot_paid_revenue(snapshot), Decimal('0'))
+            self.assertEqual(snapshot_dish_totals(snapshot), [])
+            self.assertEqual(len(snapshot.column('items.status')), 0)
+
+    def test_command(self):
+        """
+        Проверяет запись снимка и вывод итогов командой.
+        """
+        call_command('snapshot_orders', self.directory, stdout=io.StringIO())
+        out = io.StringIO()
+        call_command('snapshot_orders', self.directory, '--read', stdout=out)
+        summary = json.loads(out.getvalue())
+        self.assertEqual(Decimal(summary['revenue']), get_paid_revenue())
+        self.assertEqual([dish['dish'] for dish in summary['dishes']], ['Суп', 'Чай'])
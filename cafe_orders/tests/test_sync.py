@@ -0,0 +1,96 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cafe_orders.archive import archive_paid_orders
+from cafe_orders.deletion import delete_all_orders_chunked
+from cafe_orders.models import Dish, Order, OrderItem, OrderTombstone
+
+
+class OrderSyncTest(APITestCase):
+    def setUp(self):
+        self.dish = Dish.objects.create(name='Кофе', price=Decimal('2.00'))
+        self.old = Order.objects.create(table_number=1)
+        self.changed = Order.objects.create(table_number=2)
+        past = timezone.now() - timedelta(hours=1)
+        Order.objects.filter(id__in=[self.old.id, self.changed.id]).update(updated_at=past)
+
+    def sync(self, updated_since=None):
+        params = {'updated_since': updated_since.isoformat()} if updated_since else {}
+        return self.client.get(reverse('order-sync'), params)
+
+    def test_full_sync_without_watermark(self):
+        """
+        Проверяет, что без отметки возвращаются все заказы и признак полной синхронизации.
+        """
+        response = self.sync()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['full_resync'])
+        self.assertEqual({order['id'] for order in response.data['orders']}, {self.old.id, self.changed.id})
+
+    def test_delta_contains_only_changes_and_tombstones(self):
+        """
+        Проверяет, что дельта содержит только измененные, созданные и удаленные после отметки заказы.
+        """
+        since = timezone.now() - timedelta(minutes=10)
+        OrderItem.objects.create(order=self.changed, dish=self.dish, quantity=1)
+        created = Order.objects.create(table_number=3)
+        self.client.delete(reverse('order-detail', args=[self.old.id]))
+
+        response = self.sync(since)
+
+        self.assertFalse(response.data['full_resync'])
+        self.assertEqual([order['id'] for order in response.data['orders']], [self.changed.id, created.id])
+        self.assertEqual(response.data['deleted'], [self.old.id])
+
+        response = self.sync(timezone.now() + timedelta(minutes=1))
+        self.assertEqual((response.data['orders'], response.data['deleted']), ([], []))
+
+    def test_bulk_deletions_leave_tombstones(self):
+        """
+        Проверяет отметки об удалении при порционном удалении и архивации заказов.
+        """
+        Order.objects.filter(id=self.old.id).update(status='paid', created_at=timezone.now() - timedelta(days=60))
+        archive_paid_orders()
+        delete_all_orders_chunked(chunk_size=1)
+
+        self.assertEqual(
+            set(OrderTombstone.objects.values_list('order_id', 'reason')),
+            {(self.old.id, 'archived'), (self.changed.id, 'deleted')},
+        )
+
+    def test_html_delete_leaves_tombstone(self):
+        """
+        Проверяет отметку об удалении при удалении заказа через веб-интерфейс.
+        """
+        self.client.post(reverse('delete_order', args=[self.old.id]))
+        self.assertTrue(OrderTombstone.objects.filter(order_id=self.old.id).exists())
+
+    def test_stale_watermark_requires_full_resync(self):
+        """
+        Проверяет, что отметка старше срока хранения приводит к полной синхронизации.
+        """
+        response = self.sync(timezone.now() - timedelta(days=365))
+        self.assertTrue(response.data['full_resync'])
+
+    def test_invalid_watermark(self):
+        """
+        Проверяет ответ 400 на некорректную отметку времени.
+        """
+        response = self.client.get(reverse('order-sync'), {'updated_since': 'вчера'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_purge_tombstones_command(self):
+        """
+        Проверяет удаление отметок старше срока хранения.
+        """
+        OrderTombstone.objects.create(order_id=100, deleted_at=timezone.now() - timedelta(days=365))
+        OrderTombstone.objects.create(order_id=101)
+
+        call_command('purge_tombstones', stdout=io.StringIO())
+        self.assertEqual(list(OrderTombstone.objects.values_list('order_id', flat=True)), [101])
@@ -96,12 +96,26 @@ class DishViewsTests(TestCase):
 
     def test_delete_dish_post(self):
         """
-        Тестирование удаления блюда по POST запросу.
+        Тестирование удаления блюда по POST запросу: блюдо переводится в архив и исчезает из меню.
         """
         url = reverse('delete_dish', kwargs={'pk': self.dish.pk})
         response = self.client.post(url)
         self.assertRedirects(response, reverse('dish_list'))
-        self.assertFalse(Dish.objects.filter(pk=self.dish.pk).exists())
+        self.dish.refresh_from_db()
+        self.assertTrue(self.dish.is_archived)
+        self.assertFalse(Dish.active.filter(pk=self.dish.pk).exists())
+
+    def test_delete_dish_keeps_order_history(self):
+        """
+        Тестирование того, что удаление блюда не затрагивает позиции существующих заказов.
+        """
+        order = Order.objects.create(table_number=4, status='paid')
+        item = OrderItem.objects.create(order=order, dish=self.dish, quantity=2)
+        self.client.post(reverse('delete_dish', kwargs={'pk': self.dish.pk}))
+        self.assertTrue(OrderItem.objects.filter(pk=item.pk, dish=self.dish).exists())
+
+        response = self.client.get(reverse('dish_list'))
+        self.assertNotIn(self.dish, response.context['dishes'])
 
 
 class OrderViewsTests(TestCase):
@@ -0,0 +1,135 @@
+"""
+Сбор замеров времени обработки запроса: SQL-запросы, представление и рендеринг шаблонов.
+
+Замеры текущего запроса хранятся в контекстной переменной, поэтому корректно разделяются
+между потоками. Бэкенд шаблонов TimedDjangoTemplates добавляет время рендеринга в замеры
+текущего запроса; вне запроса (или при выключенных замерах) он работает как обычный бэкенд.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+
+class RequestTimings:
+    """
+    Накопитель замеров одного запроса. Все длительности хранятся в секундах.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует пустые замеры.
+        """
+        self.queries: int = 0
+        self.sql_time: float = 0.0
+        self.render_time: float = 0.0
+
+    def execute_wrapper(self, execute: Callable, sql: str, params: Any, many: bool,
+                        context: Dict[str, Any]) -> Any:
+        """
+        Обертка выполнения SQL для connection.execute_wrapper: считает запросы и их время.
+
+        Args:
+            execute: Следующая функция выполнения в цепочке.
+            sql: Текст SQL-запроса.
+            params: Параметры запроса.
+            many: Признак executemany.
+            context: Контекст выполнения.
+
+        Returns:
+            Any: Результат выполнения запроса.
+        """
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar('current_timings', default=None)
+"""Замеры текущего запроса (None вне инструментированного запроса)."""
+
+
+class TimedTemplate(Template):
+    """
+    Шаблон, добавляющий время своего рендеринга в замеры текущего запроса.
+    """
+
+    def render(self, context: Optional[Dict[str, Any]] = None, request: Any = None) -> str:
+        """
+        Рендерит шаблон и учитывает время рендеринга.
+
+        Args:
+            context: Контекст шаблона.
+            request: Текущий HTTP-запрос.
+
+        Returns:
+            str: Результат рендеринга.
+        """
+        timings: Optional[RequestTimings] = current_timings.get()
+        if timings is None:
+            return super().render(context, request)
+        started: float = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.render_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд шаблонов Django, возвращающий шаблоны с замером времени рендеринга.
+    """
+
+    def from_string(self, template_code: str) -> TimedTemplate:
+        """
+        Создает шаблон из строки.
+
+        Args:
+            template_code: Исходный код шаблона.
+
+        Returns:
+            TimedTemplate: Шаблон с замером времени рендеринга.
+        """
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        """
+        Загружает шаблон по имени.
+
+        Args:
+            template_name: Имя шаблона.
+
+        Returns:
+            TimedTemplate: Шаблон с замером времени рендеринга.
+
+        Raises:
+            TemplateDoesNotExist: Если шаблон не найден.
+        """
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def format_server_timing(metrics: Dict[str, Tuple[float, str]]) -> str:
+    """
+    Формирует значение заголовка Server-Timing.
+
+    Args:
+        metrics: Метрики в виде {имя: (длительность в миллисекундах, описание)}.
+
+    Returns:
+        str: Значение заголовка, например 'sql;dur=1.20;desc="3 queries", total;dur=5.00'.
+    """
+    parts = []
+    for name, (duration_ms, description) in metrics.items():
+        part: str = f'{name};dur={duration_ms:.2f}'
+        if description:
+            part += f';desc="{description}"'
+        parts.append(part)
+    return ', '.join(parts)
@@ -22,4 +22,5 @@ urlpatterns: List[URLPattern] = [
     path(URL_PATHS['delete_all_orders'], views.delete_all_orders, name=URL_NAMES['delete_all_orders']),
     path(URL_PATHS['update_order_status'], views.update_order_status, name=URL_NAMES['update_order_status']),
     path(URL_PATHS['calculate_revenue'], views.calculate_revenue, name=URL_NAMES['calculate_revenue']),
+    path(URL_PATHS['kitchen_queue'], views.kitchen_queue, name=URL_NAMES['kitchen_queue']),
 ]
\ No newline at end of file
@@ -1,18 +1,42 @@
-from django.db.models.fields import DecimalField
 from django.forms.models import ModelForm
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpRequest, HttpResponse
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseForbidden, \
+    StreamingHttpResponse
 from rest_framework import viewsets, filters, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Sum, ExpressionWrapper, F, QuerySet
+from django.db import transaction
+from django.db.models import QuerySet
+from django.urls import reverse
 from django.contrib import messages
-from typing import List, Dict, Any, Optional
+from decimal import Decimal
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 from . import constants
-from .models import Order, OrderItem, Dish
+from .admission import OrderRateThrottle
+from .analytics import parse_analytics_params, build_analytics
+from .archive import get_archive_cutoff, archive_paid_orders
+from .coalescing import coalesce
+from .deletion import delete_all_orders_chunked
+from .detail_cache import get_order_detail, store_order_detail
+from .exports import parse_export_params, get_export_querysets, iter_export
+from .events import append_order_created, append_order_updated, snapshot_locked_order
+from .field_selection import parse_field_selection, apply_field_selection, parse_ids
+from .idempotency import idempotent
+from .jobs import get_result_path, is_queue_full, submit_job
+from .kitchen import get_kitchen_queue
+from .menu import adjust_prices, import_menu, iter_json_rows, parse_flag, parse_menu, parse_menu_format, \
+    parse_menu_rows, parse_percent
+from .metrics import collect_metrics, is_metrics_access_allowed, record_order_created, record_status_transition
+from .models import Order, OrderItem, Dish, ReportJob
+from .reports import get_paid_revenue
+from .slow_queries import get_slow_queries, get_threshold_ms
+from .sync import parse_updated_since, get_sync_changes
 from .forms import OrderForm, OrderItemFormSet, OrderItemEditFormSet
-from .serializers import OrderSerializer
+from .serializers import OrderSerializer, ReportJobSerializer
 
 
 class DishForm(ModelForm):
@@ -29,7 +53,7 @@ class DishForm(ModelForm):
 
 def dish_list(request: HttpRequest) -> HttpResponse:
     """
-    Отображает список всех блюд.
+    Отображает список блюд актуального меню (без архивных).
 
     Args:
         request: Объект HTTP-запроса.
@@ -37,7 +61,7 @@ def dish_list(request: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: Ответ со списком блюд.
     """
-    dishes: QuerySet[Dish] = Dish.objects.all()
+    dishes: QuerySet[Dish] = Dish.active.all()
     return render(request, 'cafe_orders/dish_list.html', {'dishes': dishes})
 
 
@@ -93,7 +117,9 @@ def edit_dish(request: HttpRequest, pk: int) -> HttpResponse:
 
 def delete_dish(request: HttpRequest, pk: int) -> HttpResponse:
     """
-    Удаляет блюдо.
+    Удаляет блюдо из меню, переводя его в архив.
+
+    Позиции заказов, ссылающиеся на блюдо, не изменяются, поэтому история заказов сохраняется.
 
     Args:
         request: Объект HTTP-запроса.
@@ -102,10 +128,10 @@ def delete_dish(request: HttpRequest, pk: int) -> HttpResponse:
     Returns:
         HttpResponse: Ответ с подтверждением удаления блюда или перенаправление на список блюд после успешного удаления.
     """
-    dish: Dish = get_object_or_404(Dish, pk=pk)
+    dish: Dish = get_object_or_404(Dish.active, pk=pk)
     if request.method == 'POST':
         try:
-            dish.delete()
+            dish.archive()
             messages.success(request, constants.MESSAGES['dish_deleted_success'])
             return redirect('dish_list')
         except Exception as e:
@@ -183,7 +209,11 @@ def add_order(request: HttpRequest) -> HttpResponse:
                 order.save()
                 formset.instance = order
                 if formset.has_changed():
-                    formset.save()
+                    with transaction.atomic():
+                        with Order.deferred_touch():
+                            formset.save()
+                        append_order_created(order)
+                    record_order_created('html')
                 else:
                     messages.warning(request, constants.MESSAGES['add_at_least_one_dish'])
                     return render(
@@ -231,7 +261,11 @@ def update_order(request: HttpRequest, order_id: int) -> HttpResponse:
         if formset.is_valid():
             try:
                 if formset.has_changed():
-                    formset.save()
+                    with transaction.atomic():
+                        before: Dict[str, Any] = snapshot_locked_order(order.pk)
+                        with Order.deferred_touch():
+                            formset.save()
+                        append_order_updated(order, before)
                     messages.success(request, constants.MESSAGES['order_updated_success'])
                     return redirect('order_list')
                 else:
@@ -266,7 +300,11 @@ def edit_order_status(request: HttpRequest, pk: int) -> HttpResponse:
         form: OrderForm = OrderForm(request.POST, instance=order)
         if form.is_valid():
             try:
-                form.save()
+                with transaction.atomic():
+                    before: Dict[str, Any] = snapshot_locked_order(order.pk)
+                    form.save()
+                    append_order_updated(order, before)
+                record_status_transition(order, before['status'])
                 messages.success(request, constants.MESSAGES['order_status_updated_success'])
                 return redirect('order_list')
             except Exception as e:
@@ -299,7 +337,7 @@ def delete_order(request: HttpRequest, pk: int) -> HttpResponse:
 
 def delete_all_orders(request: HttpRequest) -> HttpResponse:
     """
-    Удаляет все заказы.
+    Удаляет все заказы порциями, не блокируя запись надолго.
 
     Args:
         request: Объект HTTP-запроса.
@@ -309,8 +347,9 @@ def delete_all_orders(request: HttpRequest) -> HttpResponse:
     """
     if request.method == 'POST':
         try:
-            Order.objects.all().delete()
+            deleted: Dict[str, int] = delete_all_orders_chunked()
             messages.success(request, constants.MESSAGES['all_orders_deleted_success'])
+            messages.info(request, constants.MESSAGES['orders_deleted_progress'].format(**deleted))
         except Exception as e:
             messages.error(request, constants.MESSAGES['all_orders_deleted_error'].format(error=str(e)))
         return redirect('order_list')
@@ -334,8 +373,12 @@ def update_order_status(request: HttpRequest, pk: int) -> HttpResponse:
         valid_statuses = dict(Order.STATUS_CHOICES).keys()
         if new_status in valid_statuses:
             try:
-                order.status = new_status  # type: ignore
-                order.save()
+                with transaction.atomic():
+                    before: Dict[str, Any] = snapshot_locked_order(order.pk)
+                    order.status = new_status  # type: ignore
+                    order.save()
+                    append_order_updated(order, before)
+                record_status_transition(order, before['status'])
                 messages.success(request, constants.MESSAGES['order_status_updated_success'])
             except Exception as e:
                 messages.error(request, constants.MESSAGES['order_status_updated_error'].format(error=str(e)))
@@ -346,7 +389,9 @@ def update_order_status(request: HttpRequest, pk: int) -> HttpResponse:
 
 def calculate_revenue(request: HttpRequest) -> HttpResponse:
     """
-    Вычисляет выручку от оплаченных заказов.
+    Вычисляет выручку от оплаченных заказов, включая перенесенные в архив.
+
+    Одновременные запросы страницы выручки выполняют один общий расчет.
 
     Args:
         request: Объект HTTP-запроса.
@@ -355,19 +400,231 @@ def calculate_revenue(request: HttpRequest) -> HttpResponse:
         HttpResponse: Ответ с суммой выручки.
     """
     try:
-        revenue_data: Dict[str, Any] = OrderItem.objects.filter(
-            order__status=constants.REVENUE_CALCULATION_STATUS).aggregate(
-            total_revenue=Sum(
-                ExpressionWrapper(F('dish__price') * F('quantity'), output_field=DecimalField())
-            )
-        )
-        revenue: Any = revenue_data.get('total_revenue') or 0
+        revenue: Any = coalesce('revenue', None, get_paid_revenue)
     except Exception as e:
         messages.error(request, constants.MESSAGES['revenue_calculation_error'].format(error=str(e)))
         revenue = 0
     return render(request, constants.TEMPLATE_PATHS['revenue'], {'revenue': revenue})
 
 
+def kitchen_queue(request: HttpRequest) -> HttpResponse:
+    """
+    Отображает очередь кухни: сколько порций каждого блюда осталось приготовить.
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        HttpResponse: Ответ с очередью кухни.
+    """
+    return render(request, constants.TEMPLATE_PATHS['kitchen_queue'], {'queue': get_kitchen_queue()})
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Отдает метрики приложения в текстовом формате экспозиции (администраторам и сборщику метрик с токеном).
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        HttpResponse: Ответ с текстом метрик или 403 без доступа.
+
+    Raises:
+        Http404: Если метрики выключены настройкой METRICS_ENABLED.
+    """
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        raise Http404
+    if not is_metrics_access_allowed(request):
+        return HttpResponseForbidden(constants.MESSAGES['metrics_forbidden'])
+    return HttpResponse(collect_metrics(), content_type=constants.METRICS_CONTENT_TYPE)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def slow_queries(request: HttpRequest) -> Response:
+    """
+    Возвращает журнал медленных SQL-запросов (только для администраторов).
+
+    Поддерживается GET-параметр limit (по умолчанию SLOW_QUERY_COMMAND_LIMIT).
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        Response: Порог медленного запроса и записи журнала, начиная с самых новых.
+    """
+    limit_raw: str = request.query_params.get('limit', '').strip()
+    limit: int = int(limit_raw) if limit_raw.isdigit() else constants.SLOW_QUERY_COMMAND_LIMIT
+    return Response({'threshold_ms': get_threshold_ms(), 'entries': get_slow_queries(limit)})
+
+
+@api_view(['GET'])
+def kitchen_queue_api(request: HttpRequest) -> Response:
+    """
+    Возвращает очередь кухни: блюда и количество порций в заказах в ожидании.
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        Response: Ответ со списком блюд ('dish_id', 'dish', 'quantity').
+    """
+    return Response(get_kitchen_queue())
+
+
+@api_view(['GET'])
+def menu_analytics(request: HttpRequest) -> Response:
+    """
+    Возвращает аналитику меню за период: популярные блюда, заказы по часам и дням недели, загрузку столов.
+
+    Поддерживаются GET-параметры date_from и date_to (ГГГГ-ММ-ДД, по умолчанию — последние
+    ANALYTICS_DEFAULT_DAYS дней) и top (количество популярных блюд).
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        Response: Аналитика за период или ответ 400 при некорректных параметрах.
+    """
+    try:
+        params: Dict[str, Any] = parse_analytics_params(request.query_params)
+    except ValueError as e:
+        return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(build_analytics(params['date_from'], params['date_to'], params['top']))
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def menu_import(request: HttpRequest) -> Response:
+    """
+    Импортирует меню из файла CSV или JSON (только для администраторов).
+
+    Блюда сопоставляются по названию: новые добавляются, у существующих меняется цена, блюда
+    из архива возвращаются в меню. Формат определяется параметром file_format или расширением
+    файла. При dry_run=true возвращается только список изменений.
+
+    Args:
+        request: Объект HTTP-запроса с файлом в поле file.
+
+    Returns:
+        Response: Список изменений или ответ 400 при некорректном файле.
+    """
+    upload: Any = request.FILES.get('file')
+    if upload is None:
+        return Response({'status': constants.MESSAGES['menu_file_missing']}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        file_format: str = parse_menu_format(request.data.get('file_format') or upload.name)
+        prices: Dict[str, Decimal] = parse_menu(upload.read().decode('utf-8-sig'), file_format)
+        changes: Dict[str, Any] = import_menu(prices, dry_run=parse_flag(request.data.get('dry_run', '')))
+    except ValueError as e:
+        return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(changes)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def menu_prices(request: HttpRequest) -> Response:
+    """
+    Изменяет цены меню одной операцией (только для администраторов).
+
+    Принимает либо percent — процент изменения цен всех блюд актуального меню, либо prices —
+    список объектов с полями name и price. При dry_run=true возвращается только список изменений.
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        Response: Список изменений или ответ 400 при некорректных параметрах.
+    """
+    percent_raw: Any = request.data.get('percent')
+    prices_raw: Any = request.data.get('prices')
+    try:
+        percent: Optional[Decimal] = parse_percent(percent_raw) if percent_raw not in (None, '') else None
+        prices: Optional[Dict[str, Decimal]] = parse_menu_rows(iter_json_rows(prices_raw)) \
+            if prices_raw is not None else None
+        changes: Dict[str, Any] = adjust_prices(percent, prices, dry_run=parse_flag(request.data.get('dry_run', '')))
+    except ValueError as e:
+        return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(changes)
+
+
+@api_view(['POST'])
+@throttle_classes([OrderRateThrottle])
+def report_jobs(request: HttpRequest) -> Response:
+    """
+    Ставит в очередь фоновое задание отчета или выгрузки.
+
+    Ожидает тип задания ("kind": export, analytics или revenue) и параметры ("params") в тех же
+    форматах, что и выгрузка заказов и аналитика меню.
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        Response: Ответ 202 с заданием и адресом для опроса в заголовке Location, 400 при некорректных
+            параметрах или 503 с заголовком Retry-After, если очередь заполнена.
+    """
+    if is_queue_full():
+        response: Response = Response({'status': constants.MESSAGES['report_job_queue_full']},
+                                      status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = str(constants.REPORT_JOB_RETRY_AFTER)
+        return response
+    try:
+        job: ReportJob = submit_job(str(request.data.get('kind', '')).strip(), request.data.get('params') or {})
+    except ValueError as e:
+        return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    response = Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = reverse('report-job-detail', args=[job.id])
+    return response
+
+
+@api_view(['GET'])
+def report_job_detail(request: HttpRequest, job_id: int) -> Response:
+    """
+    Возвращает состояние фонового задания.
+
+    Args:
+        request: Объект HTTP-запроса.
+        job_id: Идентификатор задания.
+
+    Returns:
+        Response: Ответ с заданием.
+    """
+    return Response(ReportJobSerializer(get_object_or_404(ReportJob, pk=job_id)).data)
+
+
+@api_view(['GET'])
+def report_job_result(request: HttpRequest, job_id: int) -> HttpResponse:
+    """
+    Отдает результат выполненного фонового задания: файл выгрузки или данные отчета.
+
+    Args:
+        request: Объект HTTP-запроса.
+        job_id: Идентификатор задания.
+
+    Returns:
+        HttpResponse: Файл выгрузки, ответ с данными отчета, ответ 409, если задание не выполнено,
+        или ответ 410, если файл выгрузки уже удален.
+    """
+    job: ReportJob = get_object_or_404(ReportJob, pk=job_id)
+    if job.status == constants.REPORT_JOB_FAILED:
+        return Response({'status': constants.MESSAGES['report_job_failed'].format(error=job.error)},
+                        status=status.HTTP_409_CONFLICT)
+    if job.status != constants.REPORT_JOB_DONE:
+        return Response({'status': constants.MESSAGES['report_job_not_ready'].format(status=job.status)},
+                        status=status.HTTP_409_CONFLICT)
+    if job.kind == constants.REPORT_JOB_KIND_EXPORT:
+        try:
+            result_file = open(get_result_path(job), 'rb')
+        except FileNotFoundError:
+            return Response({'status': constants.MESSAGES['report_job_result_gone']}, status=status.HTTP_410_GONE)
+        return FileResponse(result_file, as_attachment=True,
+                            content_type=job.result['content_type'],
+                            filename=constants.EXPORT_FILENAME_FORMAT.format(extension=job.params['file_format']))
+    return Response(job.result)
+
+
 class OrderViewSet(viewsets.ModelViewSet):
     """
     API endpoint для просмотра, создания, редактирования и удаления заказов.
@@ -377,15 +634,59 @@ class OrderViewSet(viewsets.ModelViewSet):
     serializer_class: type = OrderSerializer
     filter_backends: List = [filters.SearchFilter]
     search_fields: List[str] = constants.ORDER_SEARCH_FIELDS
+    throttle_classes: List[type] = [OrderRateThrottle]
+
+    def get_field_selection(self) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает поля ответа, выбранные GET-параметрами fields и include (только для чтения).
+
+        Returns:
+            Optional[Dict[str, Any]]: Выбранные поля или None (все поля).
+
+        Raises:
+            ValidationError: Если указаны неизвестные поля.
+        """
+        if self.request.method != 'GET':
+            return None
+        if not hasattr(self, '_field_selection'):
+            try:
+                self._field_selection = parse_field_selection(self.request.query_params)
+            except ValueError as e:
+                raise ValidationError({'status': str(e)})
+        return self._field_selection
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> OrderSerializer:
+        """
+        Возвращает сериализатор с полями, выбранными параметрами запроса.
+
+        Returns:
+            OrderSerializer: Сериализатор заказа.
+        """
+        kwargs.setdefault('selection', self.get_field_selection())
+        return super().get_serializer(*args, **kwargs)
 
     def get_queryset(self) -> QuerySet[Order]:
         """
         Возвращает queryset заказов с возможностью фильтрации по параметрам запроса.
 
+        Поддерживается пакетное получение заказов по GET-параметру ids (через запятую). Для запросов
+        на чтение загружаются только столбцы и позиции, нужные для выбранных полей ответа.
+
         Returns:
             QuerySet: Отфильтрованный queryset заказов.
+
+        Raises:
+            ValidationError: Если параметры ids, fields или include некорректны.
         """
         queryset: QuerySet[Order] = Order.objects.all().order_by('-created_at')
+        if self.request.method == 'GET':
+            try:
+                ids: Optional[List[int]] = parse_ids(self.request.query_params)
+            except ValueError as e:
+                raise ValidationError({'status': str(e)})
+            if ids is not None:
+                queryset = queryset.filter(id__in=ids)
+            queryset = apply_field_selection(queryset, self.get_field_selection())
         table_query: str = self.request.query_params.get('table', '').strip()
         status_query: str = self.request.query_params.get('status', '').strip()
 
@@ -402,6 +703,96 @@ class OrderViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(status__iexact=mapped_status)
         return queryset
 
+    def list(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        """
+        Возвращает список заказов.
+
+        Одновременные запросы с одинаковыми параметрами из COALESCING_ORDER_LIST_PARAMS получают
+        результат одной общей выборки; запросы с другими параметрами выполняются отдельно.
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с сериализованными данными заказов.
+        """
+        params: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(sorted(
+            (name, tuple(values)) for name, values in request.query_params.lists()
+        ))
+        if any(name not in constants.COALESCING_ORDER_LIST_PARAMS for name, _ in params):
+            return super().list(request, *args, **kwargs)
+        list_orders: Callable[..., Response] = super().list
+        data: Any = coalesce('order_list', params, lambda: list_orders(request, *args, **kwargs).data)
+        return Response(data)
+
+    def retrieve(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        """
+        Возвращает заказ.
+
+        Запрос без GET-параметров обслуживается из кэша деталей заказа (см. detail_cache);
+        запросы с выбором полей или фильтрами выполняются без кэша.
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с сериализованным заказом.
+        """
+        if request.query_params or not str(kwargs['pk']).isdigit():
+            return super().retrieve(request, *args, **kwargs)
+        retrieve_order: Callable[..., Response] = super().retrieve
+        return Response(get_order_detail(int(kwargs['pk']), lambda: retrieve_order(request, *args, **kwargs).data))
+
+    @idempotent
+    def create(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        """
+        Создает заказ. При повторе запроса с тем же заголовком Idempotency-Key возвращает сохраненный ответ.
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с созданным заказом.
+        """
+        return super().create(request, *args, **kwargs)
+
+    @idempotent
+    def update(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        """
+        Обновляет заказ (в том числе его статус через PATCH). При повторе запроса с тем же заголовком
+        Idempotency-Key возвращает сохраненный ответ.
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с обновленным заказом (сразу сохраняется в кэш деталей заказа).
+        """
+        response: Response = super().update(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            store_order_detail(int(kwargs['pk']), response.data)
+        return response
+
+    def perform_create(self, serializer: OrderSerializer) -> None:
+        """
+        Создает заказ и учитывает его в метриках.
+
+        Args:
+            serializer: Валидированный сериализатор заказа.
+        """
+        serializer.save()
+        record_order_created('api')
+
+    def perform_update(self, serializer: OrderSerializer) -> None:
+        """
+        Обновляет заказ и учитывает смену статуса в метриках.
+
+        Args:
+            serializer: Валидированный сериализатор заказа.
+        """
+        order: Order = serializer.save()
+        record_status_transition(order, serializer.previous_state['status'])
+
     @action(detail=False, methods=['get'])
     def search(self, request: HttpRequest) -> Response:
         """
@@ -423,10 +814,40 @@ class OrderViewSet(viewsets.ModelViewSet):
         serializer: OrderSerializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def sync(self, request: HttpRequest) -> Response:
+        """
+        Action для синхронизации клиентов по изменениям.
+
+        Принимает GET-параметр updated_since (ISO 8601, значение watermark из предыдущего ответа) и
+        возвращает заказы, созданные или измененные после него, и id удаленных после него заказов.
+        Клиент сначала удаляет заказы из deleted, затем обновляет заказы из orders. При full_resync
+        клиент заменяет все свои заказы полученными.
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с ключами orders, deleted, watermark и full_resync.
+        """
+        try:
+            updated_since = parse_updated_since(request.query_params.get('updated_since', ''))
+        except ValueError as e:
+            return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        changes: Dict[str, Any] = get_sync_changes(updated_since)
+        serializer: OrderSerializer = self.get_serializer(changes['orders'], many=True)
+        return Response({
+            'orders': serializer.data,
+            'deleted': changes['deleted'],
+            'watermark': changes['watermark'].isoformat(),
+            'full_resync': changes['full_resync'],
+        })
+
     @action(detail=False, methods=['post'])
+    @idempotent(atomic=False)
     def delete_all(self, request: HttpRequest) -> Response:
         """
-        Action для удаления всех заказов.
+        Action для порционного удаления всех заказов.
 
         Args:
             request: Объект HTTP-запроса.
@@ -435,8 +856,58 @@ class OrderViewSet(viewsets.ModelViewSet):
             Response: Ответ с подтверждением удаления всех заказов.
         """
         try:
-            Order.objects.all().delete()
-            return Response({'status': 'Все заказы удалены'}, status=status.HTTP_200_OK)
+            deleted: Dict[str, int] = delete_all_orders_chunked()
+            return Response({'status': 'Все заказы удалены', 'deleted': deleted}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'status': f'Ошибка при удалении заказов: {str(e)}'},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request: HttpRequest) -> Any:
+        """
+        Action для потоковой выгрузки заказов с позициями в CSV или NDJSON.
+
+        Поддерживаются GET-параметры file_format (csv, ndjson), status, date_from и date_to (ГГГГ-ММ-ДД).
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            StreamingHttpResponse: Потоковый ответ с выгрузкой или Response с ошибкой валидации.
+        """
+        try:
+            params: Dict[str, Any] = parse_export_params(request.query_params)
+        except ValueError as e:
+            return Response({'status': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        querysets: List[QuerySet] = get_export_querysets(params['status'], params['date_from'], params['date_to'])
+        file_format: str = params['file_format']
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            iter_export(file_format, querysets),
+            content_type=constants.EXPORT_CONTENT_TYPES[file_format],
+        )
+        filename: str = constants.EXPORT_FILENAME_FORMAT.format(extension=file_format)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['post'])
+    @idempotent(atomic=False)
+    def archive(self, request: HttpRequest) -> Response:
+        """
+        Action для переноса в архив оплаченных заказов старше заданного количества дней.
+
+        Количество дней передается параметром "days" (по умолчанию ARCHIVE_AFTER_DAYS).
+
+        Args:
+            request: Объект HTTP-запроса.
+
+        Returns:
+            Response: Ответ с количеством перенесенных в архив заказов.
+        """
+        days_raw: str = str(request.data.get('days', constants.ARCHIVE_AFTER_DAYS)).strip()
+        if not days_raw.isdigit():
+            return Response({'status': constants.MESSAGES['archive_days_invalid']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        archived: int = archive_paid_orders(get_archive_cutoff(int(days_raw)))
+        return Response({'status': constants.MESSAGES['orders_archived_success'].format(count=archived),
+                         'archived': archived}, status=status.HTTP_200_OK)
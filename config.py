@@ -10,10 +10,53 @@ class Config:
 
     Атрибуты:
         SECRET_KEY (str): Секретный ключ для шифрования данных.
+        REQUEST_TIMING_ENABLED (bool): Включает замеры времени обработки запросов (REQUEST_TIMING_ENABLED=1).
+        REQUEST_TIMING_QUERY_BUDGET (int): Допустимое количество SQL-запросов на один HTTP-запрос.
+        METRICS_ENABLED (bool): Включает сбор метрик и эндпоинт /metrics (METRICS_ENABLED=0 — выключено).
+        METRICS_TOKEN (str): Токен Bearer для чтения /metrics сборщиком метрик без входа администратора.
+        METRICS_MULTIPROCESS_DIR (str): Каталог для агрегации метрик между рабочими процессами.
+        SLOW_QUERY_THRESHOLD_MS (float): Порог медленного SQL-запроса в миллисекундах (0 — выключено).
+        SLOW_QUERY_LOG_FILE (str): JSONL-файл журнала медленных запросов.
+        PROFILING_DIR (str): Каталог профилей запросов (пустая строка — профилирование выключено).
+        PROFILING_TOKEN (str): Токен заголовка X-Profile для профилирования отдельного запроса.
+        PROFILING_SAMPLE_RATE (float): Доля случайно профилируемых запросов.
+        PROFILING_MAX_FILES (int): Максимальное количество хранимых профилей (0 — без ограничения).
+        PROFILING_MAX_AGE_HOURS (float): Срок хранения профилей в часах (0 — без ограничения).
+        API_THROTTLE_READ_RATE (str): Лимит запросов клиента на чтение заказов (например, "120/min").
+        API_THROTTLE_WRITE_RATE (str): Лимит запросов клиента на изменение заказов.
+        API_THROTTLE_DELETE_ALL_RATE (str): Лимит запросов клиента на удаление всех заказов.
+        ADMISSION_MAX_IN_FLIGHT (int): Максимум одновременно обрабатываемых запросов (0 — без ограничения).
+        ADMISSION_API_MAX_IN_FLIGHT (int): Максимум одновременно обрабатываемых запросов к API.
+        COALESCING_RESULT_TTL (float): Время переиспользования результатов дорогих запросов в секундах.
+        REPORT_JOB_WORKERS (int): Количество потоков процесса для фоновых заданий (0 — только команда run_jobs).
+        REPORT_JOBS_DIR (str): Каталог файлов результатов фоновых заданий.
+        INVALIDATION_POLL_INTERVAL (float): Интервал чтения журнала сброса кэшей процессами в секундах.
     """
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     if not SECRET_KEY:
         raise ValueError("Необходимо указать SECRET_KEY в .env файле.")
     if not isinstance(SECRET_KEY, str):
-        raise TypeError("SECRET_KEY должен быть строкой.")
\ No newline at end of file
+        raise TypeError("SECRET_KEY должен быть строкой.")
+
+    REQUEST_TIMING_ENABLED: bool = os.getenv("REQUEST_TIMING_ENABLED", "0") == "1"
+    REQUEST_TIMING_QUERY_BUDGET: int = int(os.getenv("REQUEST_TIMING_QUERY_BUDGET", "50"))
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    METRICS_MULTIPROCESS_DIR: str = os.getenv("METRICS_MULTIPROCESS_DIR", "")
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "")
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "")
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_MAX_FILES: int = int(os.getenv("PROFILING_MAX_FILES", "200"))
+    PROFILING_MAX_AGE_HOURS: float = float(os.getenv("PROFILING_MAX_AGE_HOURS", "72"))
+    API_THROTTLE_READ_RATE: str = os.getenv("API_THROTTLE_READ_RATE", "")
+    API_THROTTLE_WRITE_RATE: str = os.getenv("API_THROTTLE_WRITE_RATE", "")
+    API_THROTTLE_DELETE_ALL_RATE: str = os.getenv("API_THROTTLE_DELETE_ALL_RATE", "")
+    ADMISSION_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "0"))
+    ADMISSION_API_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_API_MAX_IN_FLIGHT", "0"))
+    COALESCING_RESULT_TTL: float = float(os.getenv("COALESCING_RESULT_TTL", "0"))
+    REPORT_JOB_WORKERS: int = int(os.getenv("REPORT_JOB_WORKERS", "0"))
+    REPORT_JOBS_DIR: str = os.getenv("REPORT_JOBS_DIR", "")
+    INVALIDATION_POLL_INTERVAL: float = float(os.getenv("INVALIDATION_POLL_INTERVAL", "1"))